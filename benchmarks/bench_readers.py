@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reader throughput benchmark on synthetic volumes.
+
+For every requested format and compression the script writes one synthetic volume (see
+``synthetic.py``) and reads it ``--repeat`` times, each read in a fresh process so peak RSS
+belongs to that read alone. A read is split into the stages of ``read_auto``:
+
+- decompress: pulling the whole (decompressed) byte stream, i.e. gzip/bz2 inflation, or the
+  plain file read for uncompressed inputs
+- detect: ``radar_format`` on the already decompressed bytes
+- decode: the format's BaseData reader (NEXRAD LDM record inflation is part of this stage)
+- build: the reader bridge and ``ToPRD``, including gate geometry
+
+Example:
+
+    python benchmarks/bench_readers.py --formats WSR98D SAB --compression none bz2 --json now.json
+    python benchmarks/bench_readers.py --compare now.json --threshold 0.2
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib import import_module
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+# benchmark the checkout this script lives in, not an installed pycwr
+_HERE = Path(__file__).resolve().parent
+sys.path[:0] = [str(_HERE), str(_HERE.parent)]
+
+from synthetic import GENERATORS, STATION, compress_file, generate  # noqa: E402
+
+# Reader module, base-data class and bridge class of every detected format.
+READERS = {
+    "WSR98D": ("WSR98DFile", "WSR98DBaseData", "WSR98D2NRadar"),
+    "PA": ("PAFile", "PABaseData", "PA2NRadar"),
+    "SAB": ("SABFile", "SABBaseData", "SAB2NRadar"),
+    "CC": ("CCFile", "CCBaseData", "CC2NRadar"),
+    "SC": ("SCFile", "SCBaseData", "SC2NRadar"),
+    "NEXRAD_LEVEL2": ("NEXRADLevel2File", "NEXRADLevel2BaseData", "NEXRAD2NRadar"),
+}
+STAGES = ("decompress", "detect", "decode", "build")
+COMPRESSIONS = ("none", "bz2", "gz")
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where it cannot be read."""
+    try:
+        with open("/proc/self/status", "r") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def _reset_peak_rss():
+    """Lower the peak RSS mark to the current RSS (Linux only), so import peaks do not mask the read."""
+    try:
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+    except OSError:
+        pass
+
+
+def measure_read(path, station=None):
+    """
+    Read ``path`` once stage by stage.
+    :param station: optional (lon, lat, alt) passed to the reader, e.g. for MSG1 archives
+    :return: dict with the stage times (s), decoded size (bytes) and peak RSS (MB) before and after
+    """
+    from pycwr.io.util import _prepare_for_read, _read_all, _shared_decoding, radar_format
+
+    station = station or (None, None, None)
+    _reset_peak_rss()
+    baseline_rss = _peak_rss_mb()
+    times = {}
+    with _shared_decoding(path):
+        # fill the shared buffer first: detection seeks to the end of SAB/CC/SC candidates,
+        # which would otherwise charge the whole decompression to "detect"
+        start = time.perf_counter()
+        fh = _prepare_for_read(path)
+        try:
+            data = _read_all(fh, "Benchmark radar file")
+            decoded_bytes = len(data)
+            del data
+        finally:
+            fh.close()
+        times["decompress"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        radar_type = radar_format(path)
+        times["detect"] = time.perf_counter() - start
+        if radar_type not in READERS:
+            raise TypeError("%s is not a supported radar file." % path)
+        module_name, reader_name, bridge_name = READERS[radar_type]
+        module = import_module("pycwr.io.%s" % module_name)
+
+        start = time.perf_counter()
+        base = getattr(module, reader_name)(path, *station)
+        times["decode"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        prd = getattr(module, bridge_name)(base).ToPRD()
+        times["build"] = time.perf_counter() - start
+    return {
+        "format": radar_type,
+        "times": times,
+        "decoded_bytes": decoded_bytes,
+        "nrays": int(prd.nrays),
+        "nsweeps": int(prd.nsweeps),
+        "baseline_rss_mb": baseline_rss,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _import_readers():
+    for module_name, _, _ in READERS.values():
+        import_module("pycwr.io.%s" % module_name)
+
+
+def _run_isolated(path, station, isolate):
+    if not isolate:
+        return measure_read(path, station)
+    with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as executor:
+        # import the readers in the worker first so neither the times nor the baseline RSS
+        # include the import cost
+        executor.submit(_import_readers).result()
+        return executor.submit(measure_read, path, station).result()
+
+
+def prepare_case(radar_format, compression, workdir, options):
+    """Write the synthetic volume of one case, compressed as requested, and return its path."""
+    path = generate(radar_format, workdir, **options)
+    if compression != "none":
+        plain = path
+        path = compress_file(plain, compression)
+        os.remove(plain)
+    # read the volume as an archived file: freshly written files are copied instead of mapped
+    settled = os.path.getmtime(path) - 60.0
+    os.utime(path, (settled, settled))
+    return path
+
+
+def run_case(radar_format, compression, path, repeat, isolate):
+    """Summarise ``repeat`` reads of the volume at ``path``."""
+    station = (STATION["longitude"], STATION["latitude"], STATION["altitude"]) \
+        if radar_format == "NEXRAD_MSG1" else None
+    runs = [_run_isolated(path, station, isolate) for _ in range(repeat)]
+    input_mb = os.path.getsize(path) / 1e6
+    decoded_mb = runs[0]["decoded_bytes"] / 1e6
+    stages = {stage: statistics.median(run["times"][stage] for run in runs) for stage in STAGES}
+    total = statistics.median(sum(run["times"].values()) for run in runs)
+    peaks = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    growth = [run["peak_rss_mb"] - run["baseline_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    return {
+        "case": "%s/%s" % (radar_format, compression),
+        "format": runs[0]["format"],
+        "nrays": runs[0]["nrays"],
+        "nsweeps": runs[0]["nsweeps"],
+        "input_mb": input_mb,
+        "decoded_mb": decoded_mb,
+        "stages_s": stages,
+        "total_s": total,
+        "input_mb_per_s": input_mb / total,
+        "decoded_mb_per_s": decoded_mb / total,
+        "peak_rss_mb": max(peaks) if peaks else None,
+        "rss_growth_mb": max(growth) if growth else None,
+    }
+
+
+def _format_table(results):
+    header = ("case", "rays", "in MB", "dec MB", "decomp", "detect", "decode", "build", "total s", "MB/s",
+              "dec MB/s", "peak MB", "+RSS MB")
+    rows = [header]
+    for result in results:
+        stages = result["stages_s"]
+        rows.append((
+            result["case"], str(result["nrays"]), "%.1f" % result["input_mb"], "%.1f" % result["decoded_mb"],
+            *("%.3f" % stages[stage] for stage in STAGES), "%.3f" % result["total_s"],
+            "%.1f" % result["input_mb_per_s"], "%.1f" % result["decoded_mb_per_s"],
+            "-" if result["peak_rss_mb"] is None else "%.0f" % result["peak_rss_mb"],
+            "-" if result["rss_growth_mb"] is None else "%.0f" % result["rss_growth_mb"],
+        ))
+    widths = [max(len(row[column]) for row in rows) for column in range(len(header))]
+    return "\n".join("  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows)
+
+
+def compare(results, baseline, threshold):
+    """Return the cases whose median total time grew by more than ``threshold`` over ``baseline``."""
+    reference = {item["case"]: item for item in baseline["results"]}
+    regressions = []
+    for result in results:
+        previous = reference.get(result["case"])
+        if previous is not None and result["total_s"] > previous["total_s"] * (1.0 + threshold):
+            regressions.append((result["case"], previous["total_s"], result["total_s"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--formats", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--compression", nargs="+", default=["none", "bz2"], choices=COMPRESSIONS)
+    parser.add_argument("--cuts", type=int, default=None, help="cuts per volume (format default when omitted)")
+    parser.add_argument("--rays", type=int, default=None, help="rays per cut")
+    parser.add_argument("--gates", type=int, default=None, help="gates per ray")
+    parser.add_argument("--fields", nargs="+", default=None, help="moments to write, e.g. dBZ V W")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="reads per case; medians are reported")
+    parser.add_argument("--in-process", action="store_true",
+                        help="read in this process (faster, but peak RSS then accumulates over cases)")
+    parser.add_argument("--workdir", default=None, help="directory for the generated volumes")
+    parser.add_argument("--json", default=None, help="write the results to this JSON file")
+    parser.add_argument("--compare", default=None, help="baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slow-down of the median total time reported as a regression")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    import pycwr
+
+    options = {"cuts": args.cuts, "rays": args.rays, "gates": args.gates, "seed": args.seed,
+               "fields": None if args.fields is None else tuple(args.fields)}
+    results = []
+    with tempfile.TemporaryDirectory(dir=args.workdir) as workdir:
+        for radar_format in args.formats:
+            for compression in args.compression:
+                # NEXRAD LDM archives compress their records themselves
+                if radar_format == "NEXRAD_LDM" and compression != "none":
+                    continue
+                try:
+                    path = prepare_case(radar_format, compression, workdir, options)
+                except ValueError as error:
+                    # fixed-geometry formats (CC, SC) reject shapes they cannot hold
+                    print("skipped %s/%s: %s" % (radar_format, compression, error), file=sys.stderr)
+                    continue
+                try:
+                    results.append(run_case(radar_format, compression, path, args.repeat, not args.in_process))
+                finally:
+                    os.remove(path)
+    print(_format_table(results))
+    report = {"pycwr_version": getattr(pycwr, "__version__", None), "python": sys.version.split()[0],
+              "options": options, "repeat": args.repeat, "results": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as fh:
+            regressions = compare(results, json.load(fh), args.threshold)
+        for case, before, after in regressions:
+            print("REGRESSION %s: %.3f s -> %.3f s" % (case, before, after))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,488 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic radar volumes for the reader benchmarks.
+
+Every generator builds the same kind of scene (a few convective cells over weak stratiform echo,
+a uniform wind, and consistent dual-polarisation moments) on a configurable number of cuts,
+rays per cut and gates, and writes it in one of the formats ``pycwr.io.read_auto`` detects:
+
+- WSR98D and NEXRAD Level II through the pycwr writers (``write_wsr98d``,
+  ``write_nexrad_level2_msg31``, ``write_nexrad_level2_msg1``)
+- PA, SA/SB/CB, CC and SC/CD by filling the record layouts of ``pycwr.io.BaseDataProtocol``
+
+``compress_file`` wraps any volume in gzip or bzip2 the way archived CMA files are delivered.
+"""
+import bz2
+import datetime
+import gzip
+import shutil
+
+import numpy as np
+
+from pycwr.core.NRadar import PRD
+from pycwr.io.BaseDataProtocol.CCProtocol import dtype_cc
+from pycwr.io.BaseDataProtocol.PAProtocol import dtype_PA
+from pycwr.io.BaseDataProtocol.SABProtocol import dtype_sab
+from pycwr.io.BaseDataProtocol.SCProtocol import dtype_sc
+from pycwr.io.NEXRADLevel2File import write_nexrad_level2_msg1, write_nexrad_level2_msg31
+from pycwr.io.WSR98DFile import WSR98D_WRITE_FIELD_SPECS, write_wsr98d
+from pycwr.io.util import _structure_dtype
+
+# VCP21-like elevations; volumes with more cuts continue the spacing of the top cuts.
+BASE_ELEVATIONS = (0.5, 1.5, 2.4, 3.4, 4.3, 6.0, 9.9, 14.6, 19.5)
+DEFAULT_FIELDS = ("dBZ", "V", "W", "ZDR", "CC", "PhiDP", "KDP")
+START_TIME = datetime.datetime(2026, 3, 17, 7, 0, 0)
+STATION = {"latitude": 30.0, "longitude": 120.0, "altitude": 50.0}
+NYQUIST_VELOCITY = 27.0
+UNAMBIGUOUS_RANGE = 230000.0
+VOLUME_SECONDS = 360.0
+
+# PA radials share the WSR98D moment codes and scalings.
+_PA_FIELD_SPECS = WSR98D_WRITE_FIELD_SPECS
+_SAB_RECORD_SIZES = (2432, 3132, 4132)
+_SAB_FIELDS = ("dBZ", "V", "W")
+_CC_FIELDS = ("dBZ", "V", "W")
+_CC_GATES = dtype_cc.PerRadialSize // 6
+_SC_FIELDS = ("dBZ", "dBT", "V", "W")
+_SC_GATES = 500
+_SC_RAYS = 360
+
+
+def elevation_angles(cuts):
+    """Return ``cuts`` fixed elevation angles //units: degree"""
+    cuts = int(cuts)
+    if cuts < 1:
+        raise ValueError("cuts must be a positive integer.")
+    angles = list(BASE_ELEVATIONS[:cuts])
+    while len(angles) < cuts:
+        angles.append(angles[-1] + (BASE_ELEVATIONS[-1] - BASE_ELEVATIONS[-2]))
+    return np.asarray(angles, dtype=np.float64)
+
+
+def synthetic_moments(azimuth, elevation, ranges, fields=DEFAULT_FIELDS, seed=0):
+    """
+    Simulate one sweep of moments.
+    :param azimuth: ray azimuths //units: degree
+    :param elevation: sweep elevation //units: degree
+    :param ranges: gate ranges //units: meters
+    :param fields: field names; dBZ, dBT, V, W, ZDR, CC, PhiDP, KDP, SQI, SNRH and SNRV are simulated
+    :param seed: random seed; the same seed gives the same scene for every format
+    :return: dict of float32 (nrays, ngates) arrays with NaN for gates without echo
+    """
+    rng = np.random.default_rng([int(seed), int(round(float(elevation) * 100))])
+    az = np.deg2rad(np.asarray(azimuth, dtype=np.float64))[:, None]
+    rng_km = np.asarray(ranges, dtype=np.float64)[None, :] / 1000.0
+    x = rng_km * np.sin(az)
+    y = rng_km * np.cos(az)
+    # cells shrink with elevation, as the beam rises above their tops
+    cells = np.random.default_rng(int(seed)).uniform([-150, -150, 8, 40], [150, 150, 25, 62], size=(6, 4))
+    reflectivity = 12.0 + 6.0 * np.sin(x / 37.0) * np.cos(y / 53.0)
+    for cx, cy, size, peak in cells:
+        distance2 = (x - cx) ** 2 + (y - cy) ** 2
+        reflectivity = np.maximum(reflectivity, peak * np.exp(-distance2 / (2 * size ** 2)) - 0.6 * float(elevation))
+    reflectivity = reflectivity + rng.normal(0.0, 1.5, reflectivity.shape)
+    echo = (reflectivity > 5.0) & (rng_km * np.sin(np.deg2rad(float(elevation) + 0.5)) < 15.0)
+    kdp = np.clip((reflectivity - 38.0) / 8.0, 0.0, None)
+    simulated = {
+        "dBZ": reflectivity,
+        "dBT": reflectivity + 1.5,
+        "V": np.clip(12.0 * np.cos(az - np.deg2rad(225.0)) * np.cos(np.deg2rad(float(elevation)))
+                     + rng.normal(0.0, 1.0, reflectivity.shape), -NYQUIST_VELOCITY, NYQUIST_VELOCITY),
+        "W": np.clip(1.5 + reflectivity / 25.0 + rng.normal(0.0, 0.5, reflectivity.shape), 0.0, 15.0),
+        "ZDR": np.clip(0.2 + (reflectivity - 10.0) / 15.0 + rng.normal(0.0, 0.3, reflectivity.shape), -2.0, 6.0),
+        "CC": np.clip(0.985 - kdp / 60.0 + rng.normal(0.0, 0.01, reflectivity.shape), 0.3, 1.0),
+        "PhiDP": 40.0 + 2.0 * np.cumsum(kdp, axis=1) * (np.diff(ranges[:2]) / 1000.0 if len(ranges) > 1 else 1.0),
+        "KDP": kdp,
+        "SQI": np.clip(0.6 + reflectivity / 200.0, 0.0, 1.0),
+        "SNRH": reflectivity + 12.0,
+        "SNRV": reflectivity + 11.0,
+    }
+    moments = {}
+    for name in fields:
+        if name not in simulated:
+            raise ValueError("Field %s is not simulated." % name)
+        moments[name] = np.where(echo, simulated[name], np.nan).astype(np.float32)
+    return moments
+
+
+def synthetic_prd(cuts=9, rays=360, gates=920, gate_spacing=250.0, fields=DEFAULT_FIELDS, seed=0):
+    """
+    Simulate a PPI volume as a PRD.
+    :param cuts: number of sweeps
+    :param rays: rays per sweep
+    :param gates: gates per ray
+    :param gate_spacing: //units: meters
+    :return: PRD
+    """
+    angles = elevation_angles(cuts)
+    rays = int(rays)
+    gates = int(gates)
+    ranges = gate_spacing * (np.arange(gates, dtype=np.float64) + 0.5)
+    azimuth = (np.arange(rays, dtype=np.float64) + 0.5) * 360.0 / rays
+    moments = [synthetic_moments(azimuth, angle, ranges, fields, seed) for angle in angles]
+    nrays = rays * angles.size
+    seconds = np.linspace(0.0, VOLUME_SECONDS, nrays, endpoint=False)
+    time = np.datetime64(START_TIME, "ns") + (seconds * 1e9).astype("timedelta64[ns]")
+    starts = np.arange(angles.size) * rays
+    return PRD(
+        fields={name: np.concatenate([sweep[name] for sweep in moments]) for name in fields},
+        scan_type="ppi",
+        time=time,
+        range=ranges,
+        azimuth=np.tile(azimuth, angles.size),
+        elevation=np.repeat(angles, rays),
+        latitude=STATION["latitude"],
+        longitude=STATION["longitude"],
+        altitude=STATION["altitude"],
+        sweep_start_ray_index=starts,
+        sweep_end_ray_index=starts + rays - 1,
+        fixed_angle=angles,
+        bins_per_sweep=np.full(angles.size, gates, dtype=np.int32),
+        nyquist_velocity=np.full(angles.size, NYQUIST_VELOCITY),
+        frequency=2.8,
+        unambiguous_range=np.full(angles.size, UNAMBIGUOUS_RANGE),
+        nrays=nrays,
+        nsweeps=int(angles.size),
+        sitename="SYNTH",
+    )
+
+
+def _encode(values, scale, offset, dtype=np.uint8, minimum=2):
+    """Quantize physical values to codes ``value * scale + offset``; NaN becomes code 0."""
+    info = np.iinfo(dtype)
+    codes = np.clip(np.rint(values * scale + offset), minimum, info.max)
+    return np.where(np.isnan(values), 0, codes).astype(dtype)
+
+
+def write_wsr98d_volume(path, cuts=9, rays=360, gates=920, fields=DEFAULT_FIELDS, seed=0):
+    """Write a synthetic WSR98D (standard format) volume with ``write_wsr98d``."""
+    prd = synthetic_prd(cuts, rays, gates, 250.0, fields, seed)
+    write_wsr98d(prd, str(path), overwrite=True, site_code="Z9999", task_name="VCP21D")
+    return path
+
+
+def write_nexrad_volume(path, cuts=9, rays=720, gates=1832, fields=("dBZ", "V", "W", "ZDR", "CC", "PhiDP"),
+                        seed=0, compress=False, message=31):
+    """
+    Write a synthetic NEXRAD Level II archive.
+    :param compress: write bzip2-compressed LDM records, as operational AR2V files are
+    :param message: 31 for AR2V MSG31 radials, 1 for legacy ARCHIVE2 MSG1 radials (dBZ, V and W only)
+    """
+    prd = synthetic_prd(cuts, rays, gates, 250.0, fields, seed)
+    if message == 31:
+        write_nexrad_level2_msg31(prd, str(path), overwrite=True, icao="KPYC", compress=compress)
+    elif message == 1:
+        write_nexrad_level2_msg1(prd, str(path), field_names=("dBZ", "V", "W"), overwrite=True, icao="KPYC",
+                                 compress=compress)
+    else:
+        raise ValueError("message must be 31 or 1.")
+    return path
+
+
+def _radial_records(header_dtype, moment_dtype, moments, specs, nrays):
+    """
+    Lay out ``nrays`` radials of one cut as header, then one (moment header, gate codes) pair per moment.
+    :return: (record array, list of moment names in record order)
+    """
+    layout = [("header", header_dtype)]
+    names = []
+    for name, values in moments.items():
+        spec = specs[name]
+        word = np.dtype("<u2") if spec["bin_length"] == 2 else np.dtype("u1")
+        layout += [("%s_head" % name, moment_dtype), (name, word, (values.shape[1],))]
+        names.append(name)
+    records = np.zeros(nrays, dtype=np.dtype(layout))
+    for name in names:
+        spec = specs[name]
+        head = records["%s_head" % name]
+        head["DataType"] = spec["data_type"]
+        head["Scale"] = spec["scale"]
+        head["Offset"] = spec["offset"]
+        head["BinLength"] = spec["bin_length"]
+        head["Length"] = records.dtype.fields[name][0].itemsize
+        records[name] = _encode(moments[name], spec["scale"], spec["offset"], records.dtype.fields[name][0].base)
+    return records, names
+
+
+def write_pa_volume(path, cuts=9, rays=360, gates=1000, fields=("dBZ", "V", "W", "ZDR", "CC", "PhiDP", "KDP"),
+                    seed=0):
+    """Write a synthetic phased-array (PA) volume from the ``PAProtocol`` layouts."""
+    header = dtype_PA.BaseDataHeader
+    angles = elevation_angles(cuts)
+    ranges = 30.0 * (np.arange(gates, dtype=np.float64) + 0.5)
+    azimuth = (np.arange(rays, dtype=np.float64) + 0.5) * 360.0 / rays
+    start = int((START_TIME - datetime.datetime(1970, 1, 1)).total_seconds())
+    generic = np.zeros(1, dtype=_structure_dtype(header["GenericHeaderBlock"]))
+    generic["MagicWord"] = 1297371986
+    generic["MajorVersion"] = 1
+    generic["GenericType"] = 16
+    site = np.zeros(1, dtype=_structure_dtype(header["SiteConfigurationBlock"]))
+    site["SiteCode"] = np.void(b"ZA460".ljust(8, b"\0"))
+    site["SiteName"] = np.void(b"SYNTH".ljust(32, b"\0"))
+    site["Latitude"], site["Longitude"] = STATION["latitude"], STATION["longitude"]
+    site["Height"] = site["Ground"] = STATION["altitude"]
+    site["Frequency"] = 9400.0
+    site["BeamWidthHori"] = site["BeamWidthVert"] = 1.0
+    task = np.zeros(1, dtype=_structure_dtype(header["TaskConfigurationBlock"]))
+    task["TaskName"] = np.void(b"PA".ljust(32, b"\0"))
+    task["PolarizationType"] = 3
+    task["BeamNumber"] = 1
+    task["CutNumber"] = angles.size
+    task["VolumeStartTime"] = start
+    cut_config = np.zeros(angles.size, dtype=header["CutConfigurationBlock"])
+    cut_config["Elevation"] = angles
+    cut_config["LogResolution"] = cut_config["DopplerResolution"] = 30.0
+    cut_config["MaximumRange"] = int(ranges[-1])
+    cut_config["NyquistSpeed"] = NYQUIST_VELOCITY
+    blocks = [generic.tobytes(), site.tobytes(), task.tobytes(),
+              np.zeros(1, dtype=header["BeamConfigurationBlock"]).tobytes(), cut_config.tobytes()]
+    header_dtype = _structure_dtype(dtype_PA.RadialHeader())
+    moment_dtype = _structure_dtype(dtype_PA.RadialData())
+    for icut, angle in enumerate(angles):
+        moments = synthetic_moments(azimuth, angle, ranges, fields, seed)
+        records, names = _radial_records(header_dtype, moment_dtype, moments, _PA_FIELD_SPECS, rays)
+        head = records["header"]
+        head["RadialState"] = 1
+        head["SequenceNumber"] = icut * rays + np.arange(1, rays + 1)
+        head["RadialNumber"] = np.arange(1, rays + 1)
+        head["ElevationNumber"] = icut + 1
+        head["Azimuth"] = azimuth
+        head["Elevation"] = angle
+        head["Seconds"] = start + (icut * rays + np.arange(rays)) * VOLUME_SECONDS / (angles.size * rays)
+        head["LengthOfData"] = records.dtype.itemsize - header_dtype.itemsize
+        head["MomentNumber"] = len(names)
+        blocks.append(records.tobytes())
+    with open(path, "wb") as fh:
+        fh.write(b"".join(blocks))
+    return path
+
+
+def write_sab_volume(path, cuts=9, rays=360, gates=920, fields=_SAB_FIELDS, seed=0):
+    """
+    Write a synthetic SA/SB/CB volume of fixed-size radial records from the ``SABProtocol`` layout.
+    ``gates`` counts the 250 m Doppler gates; reflectivity uses 1 km gates covering the same range.
+    The record size is the smallest SA/SB (2432), SC (3132) or CB (4132) record that holds the gates.
+    """
+    unknown = set(fields) - set(_SAB_FIELDS)
+    if unknown:
+        raise ValueError("SA/SB/CB volumes carry dBZ, V and W only, not %s." % ", ".join(sorted(unknown)))
+    ndop = int(gates) if ("V" in fields or "W" in fields) else 0
+    nref = -(-int(gates) // 4) if "dBZ" in fields else 0
+    payload = dtype_sab.RadialHeaderSize + nref + 2 * ndop
+    record_size = next((size for size in _SAB_RECORD_SIZES if size >= payload), None)
+    if record_size is None:
+        raise ValueError("%d gates do not fit in a SA/SB/CB radial record." % gates)
+    angles = elevation_angles(cuts)
+    azimuth = (np.arange(rays, dtype=np.float64) + 0.5) * 360.0 / rays
+    header_dtype = _structure_dtype(dtype_sab.RadialHeader())
+    record_dtype = np.dtype([("header", header_dtype), ("payload", "u1", (record_size - header_dtype.itemsize,))])
+    day = (START_TIME - datetime.datetime(1969, 12, 31)).days
+    msec0 = (START_TIME.hour * 3600 + START_TIME.minute * 60 + START_TIME.second) * 1000
+    blocks = []
+    for icut, angle in enumerate(angles):
+        records = np.zeros(rays, dtype=record_dtype)
+        head = records["header"]
+        head["flag"] = 1
+        head["mSends"] = msec0 + (icut * rays + np.arange(rays)) * VOLUME_SECONDS * 1000 // (angles.size * rays)
+        head["JulianDate"] = day
+        head["URange"] = UNAMBIGUOUS_RANGE / 100.0
+        head["AZ"] = np.rint(azimuth / 180.0 * 4096 * 8)
+        head["RadialNumber"] = np.arange(1, rays + 1)
+        head["RadialStatus"] = 1
+        head["RadialStatus"][0] = 3 if icut == 0 else 0
+        head["RadialStatus"][-1] = 4 if icut == angles.size - 1 else 2
+        head["El"] = np.rint(angle / 180.0 * 4096 * 8)
+        head["ElNumber"] = icut + 1
+        head["RangeToFirstGateOfRef"] = 0
+        head["RangeToFirstGateOfDop"] = 0
+        head["GateSizeOfReflectivity"] = 1000
+        head["GateSizeOfDoppler"] = 250
+        head["GatesNumberOfReflectivity"] = nref
+        head["GatesNumberOfDoppler"] = ndop
+        head["PtrOfReflectivity"] = 100
+        head["PtrOfVelocity"] = 100 + nref
+        head["PtrOfSpectrumWidth"] = 100 + nref + ndop
+        head["ResolutionOfVelocity"] = 2
+        head["VcpNumber"] = 21
+        head["Nyquist"] = NYQUIST_VELOCITY * 100
+        body = records["payload"]
+        if nref:
+            ranges = 1000.0 * (np.arange(nref) + 0.5)
+            dbz = synthetic_moments(azimuth, angle, ranges, ("dBZ",), seed)["dBZ"]
+            body[:, 0:nref] = _encode(dbz + 32.0, 2.0, 2.0)
+        if ndop:
+            ranges = 250.0 * (np.arange(ndop) + 0.5)
+            doppler = synthetic_moments(azimuth, angle, ranges, ("V", "W"), seed)
+            for pos, name in ((nref, "V"), (nref + ndop, "W")):
+                if name in fields:
+                    body[:, pos:pos + ndop] = _encode(doppler[name] + 63.5, 2.0, 2.0)
+        blocks.append(records.tobytes())
+    with open(path, "wb") as fh:
+        fh.write(b"".join(blocks))
+    return path
+
+
+def _pack_block(structure, values):
+    """Pack one ``BaseDataProtocol`` struct layout, leaving unset members zero."""
+    record = np.zeros(1, dtype=_structure_dtype(structure))
+    for name, value in values.items():
+        if isinstance(value, bytes):
+            value = np.void(value.ljust(record.dtype.fields[name][0].itemsize, b"\0"))
+        record[name] = value
+    return record.tobytes()
+
+
+def write_cc_volume(path, cuts=9, rays=512, gates=_CC_GATES, fields=_CC_FIELDS, seed=0):
+    """Write a synthetic CINRAD/CC volume from the ``CCProtocol`` layout (500 gates of 300 m per radial)."""
+    unknown = set(fields) - set(_CC_FIELDS)
+    if unknown:
+        raise ValueError("CC volumes carry dBZ, V and W only, not %s." % ", ".join(sorted(unknown)))
+    if int(gates) != _CC_GATES:
+        raise ValueError("CC radials hold exactly %d gates." % _CC_GATES)
+    angles = elevation_angles(cuts)
+    if angles.size > 30:
+        raise ValueError("CC headers describe at most 30 cuts.")
+    end = START_TIME + datetime.timedelta(seconds=VOLUME_SECONDS)
+    header = bytearray(dtype_cc.BaseDataHeaderSize)
+    header[dtype_cc.HeaderSize1_pos:dtype_cc.HeaderSize1_pos + dtype_cc.HeaderSize1] = _pack_block(
+        dtype_cc.BaseDataHeader["RadarHeader1"],
+        {
+            "cFileType": b"CINRADC", "cStation": b"SYNTH", "cStationNumber": b"Z9999", "cRadarType": b"CINRAD/CC",
+            "lLongitudeValue": STATION["longitude"] * 3600000, "lLatitudeValue": STATION["latitude"] * 3600000,
+            "lHeight": STATION["altitude"] * 1000,
+            "ucSYear1": START_TIME.year // 100, "ucSYear2": START_TIME.year % 100, "ucSMonth": START_TIME.month,
+            "ucSDay": START_TIME.day, "ucSHour": START_TIME.hour, "ucSMinute": START_TIME.minute,
+            "ucSSecond": START_TIME.second, "ucEYear1": end.year // 100, "ucEYear2": end.year % 100,
+            "ucEMonth": end.month, "ucEDay": end.day, "ucEHour": end.hour, "ucEMinute": end.minute,
+            "ucESecond": end.second, "ucScanMode": 100 + angles.size,
+        },
+    )
+    cut_config = np.zeros(angles.size, dtype=dtype_cc.BaseDataHeader["CutConfigX30"])
+    cut_config["usMaxV"] = NYQUIST_VELOCITY * 100
+    cut_config["usMaxL"] = UNAMBIGUOUS_RANGE / 10
+    cut_config["usBindWidth"] = 150
+    cut_config["usBinNumber"] = gates
+    cut_config["usRecordNumber"] = rays
+    cut_config["usAngle"] = np.rint(angles * 100)
+    cut_config["cSweepStatus"] = 2
+    header[dtype_cc.CutSize_pos:dtype_cc.CutSize_pos + cut_config.nbytes] = cut_config.tobytes()
+    header[dtype_cc.HeaderSize2_pos:dtype_cc.HeaderSize2_pos + dtype_cc.HeaderSize2] = _pack_block(
+        dtype_cc.BaseDataHeader["RadarHeader2"], {"lWavelength": 53000, "usBeamH": 3600, "usBeamL": 3600})
+    # the reader spreads each cut's rays evenly over 0-360 degrees and uses 2 * usBindWidth gates
+    azimuth = np.linspace(0.0, 360.0, rays)
+    ranges = 300.0 * (np.arange(gates) + 1.0)
+    radial_dtype = np.dtype([("data", dtype_cc.RadialData(gates)),
+                             ("pad", "V%d" % (dtype_cc.PerRadialSize - dtype_cc.RadialData(gates).itemsize))])
+    blocks = [bytes(header)]
+    for angle in angles:
+        moments = synthetic_moments(azimuth, angle, ranges, fields, seed)
+        records = np.zeros(rays, dtype=radial_dtype)
+        for name in _CC_FIELDS:
+            values = moments.get(name)
+            records["data"][name] = -32768 if values is None else np.where(
+                np.isnan(values), -32768, np.rint(np.nan_to_num(values) * 10)).astype(np.int16)
+        blocks.append(records.tobytes())
+    with open(path, "wb") as fh:
+        fh.write(b"".join(blocks))
+    return path
+
+
+def write_sc_volume(path, cuts=9, rays=_SC_RAYS, gates=_SC_GATES, fields=_SC_FIELDS, seed=0):
+    """Write a synthetic CINRAD/SC volume from the ``SCProtocol`` layout (360 rays of 500 gates per cut)."""
+    unknown = set(fields) - set(_SC_FIELDS)
+    if unknown:
+        raise ValueError("SC volumes carry dBZ, dBT, V and W only, not %s." % ", ".join(sorted(unknown)))
+    if int(rays) != _SC_RAYS or int(gates) > _SC_GATES:
+        raise ValueError("SC volumes hold %d rays of at most %d gates per cut." % (_SC_RAYS, _SC_GATES))
+    angles = elevation_angles(cuts)
+    if angles.size > 30:
+        raise ValueError("SC headers describe at most 30 cuts.")
+    # SC headers record Beijing time
+    local_start = START_TIME + datetime.timedelta(hours=8)
+    local_end = local_start + datetime.timedelta(seconds=VOLUME_SECONDS)
+    layer = np.zeros(angles.size, dtype=dtype_sc.BaseDataHeader["LayerParamX30"])
+    layer["MaxV"] = NYQUIST_VELOCITY * 100
+    layer["MaxL"] = UNAMBIGUOUS_RANGE / 10
+    layer["binWidth"] = 5000
+    layer["binnumber"] = gates
+    layer["recordnumber"] = rays
+    layer["Swangles"] = np.rint(angles * 100)
+    header = bytearray(dtype_sc.BaseDataHeaderSize)
+    for pos, structure, values in (
+        (dtype_sc.RadarSitePos, dtype_sc.BaseDataHeader["RadarSite"],
+         {"station": b"SYNTH", "stationnumber": b"Z9999", "radartype": b"CINRAD/SC",
+          "longitudevalue": STATION["longitude"] * 100, "latitudevalue": STATION["latitude"] * 100,
+          "height": STATION["altitude"] * 1000}),
+        (dtype_sc.RadarPerformanceParamPos, dtype_sc.BaseDataHeader["RadarPerformanceParam"], {"wavelength": 107000}),
+        (dtype_sc.RadarObserationParamPos_1, dtype_sc.BaseDataHeader["RadarObserationParam_1"],
+         {"stype": 100 + angles.size, "syear": local_start.year, "smonth": local_start.month,
+          "sday": local_start.day, "shour": local_start.hour, "sminute": local_start.minute,
+          "ssecond": local_start.second}),
+        (dtype_sc.RadarObserationParamPos_2, dtype_sc.BaseDataHeader["RadarObserationParam_2"],
+         {"Eyear": local_end.year, "Emonth": local_end.month, "Eday": local_end.day, "Ehour": local_end.hour,
+          "Eminute": local_end.minute, "Esecond": local_end.second}),
+    ):
+        block = _pack_block(structure, values)
+        header[pos:pos + len(block)] = block
+    header[dtype_sc.LayerParamPos:dtype_sc.LayerParamPos + layer.nbytes] = layer.tobytes()
+    radial_header = _structure_dtype(dtype_sc.RadialHeader())
+    data_dtype = np.dtype((dtype_sc.RadialData(), (_SC_GATES,)))
+    radial_dtype = np.dtype([("header", radial_header), ("data", data_dtype),
+                             ("pad", "V%d" % (dtype_sc.PerRadialSize - radial_header.itemsize - data_dtype.itemsize))])
+    # the reader assigns whole-degree azimuths and 500 m gates whatever the header says
+    azimuth = np.arange(rays, dtype=np.float64)
+    ranges = 500.0 * (np.arange(gates) + 1.0)
+    blocks = [bytes(header)]
+    for angle in angles:
+        moments = synthetic_moments(azimuth, angle, ranges, fields, seed)
+        records = np.zeros(rays, dtype=radial_dtype)
+        records["header"]["sStrAz"] = np.rint(azimuth * 65536 / 360.0)
+        records["header"]["sEndAz"] = np.rint((azimuth + 1.0) % 360.0 * 65536 / 360.0)
+        records["header"]["sStrEl"] = records["header"]["sEndEl"] = np.rint(angle * 65536 / 360.0)
+        data = records["data"][:, :gates]
+        for name, scale, offset in (("dBZ", 2.0, 64.0), ("dBT", 2.0, 64.0),
+                                    ("V", 128.0 / NYQUIST_VELOCITY, 128.0), ("W", 256.0 / NYQUIST_VELOCITY, 0.0)):
+            if name in moments:
+                data[name] = _encode(moments[name], scale, offset, minimum=1)
+        blocks.append(records.tobytes())
+    with open(path, "wb") as fh:
+        fh.write(b"".join(blocks))
+    return path
+
+
+# Format name: (writer, file name, default keyword arguments).
+GENERATORS = {
+    "WSR98D": (write_wsr98d_volume, "Z_RADR_I_Z9999_20260317070000_O_DOR_SAD_CAP_FMT.bin", {}),
+    "PA": (write_pa_volume, "Z_RADR_I_ZA460_20260317070000_O_DOR-XPD-CAP-FMT.BIN", {}),
+    "SAB": (write_sab_volume, "Z_RADR_I_Z9517_20260317070000_O_DOR_SA_CAP.bin", {}),
+    "CC": (write_cc_volume, "Z_RADR_I_Z9999_20260317070000_O_DOR_CC_CAP.bin", {}),
+    "SC": (write_sc_volume, "Z_RADR_I_Z9999_20260317070000_O_DOR_SC_CAP.bin", {}),
+    "NEXRAD": (write_nexrad_volume, "KPYC20260317_070000_V06", {}),
+    "NEXRAD_LDM": (write_nexrad_volume, "KPYC20260317_070000_V06.ldm", {"compress": True}),
+    "NEXRAD_MSG1": (write_nexrad_volume, "KPYC20260317_070000", {"message": 1}),
+}
+
+
+def generate(radar_format, directory, **options):
+    """
+    Write one synthetic volume of ``radar_format`` into ``directory``.
+    :param options: cuts, rays, gates, fields and seed; None values keep the format defaults
+    :return: path of the written file
+    """
+    if radar_format not in GENERATORS:
+        raise ValueError("Unknown synthetic format %s; choose from %s." % (radar_format, ", ".join(GENERATORS)))
+    writer, name, defaults = GENERATORS[radar_format]
+    kwargs = dict(defaults)
+    kwargs.update((key, value) for key, value in options.items() if value is not None)
+    return writer("%s/%s" % (directory, name), **kwargs)
+
+
+def compress_file(path, method="bz2"):
+    """Compress ``path`` with gzip or bzip2 next to the original and return the new path."""
+    openers = {"bz2": bz2.open, "gz": gzip.open}
+    if method not in openers:
+        raise ValueError("method must be 'bz2' or 'gz'.")
+    target = "%s.%s" % (path, method)
+    with open(path, "rb") as src, openers[method](target, "wb") as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+    return target
@@ -34,7 +34,8 @@ from ..draw._plot_core import (
     resolve_field_data,
 )
 from ..interp import parse_radar_time_from_filename
-from ..io import read_auto
+from ..io import read_auto, read_metadata
+from ..io.archive_index import ArchiveIndex
 from ..io.util import radar_format
 from .web_colors import SPECIAL_COLORS, build_web_style
 
@@ -45,11 +46,21 @@ PREFERRED_FIELDS = ("dBZ", "V", "W", "ZDR", "KDP", "CC", "SNRH", "SNRV", "SQI",
 IGNORED_DIRECTORIES = {"__pycache__", ".git", ".hg", ".svn", "dist", "build", ".venv", "venv", "node_modules"}
 IGNORED_SUFFIXES = {".py", ".pyc", ".pyo", ".so", ".pyd", ".dll", ".dylib", ".md", ".txt", ".json", ".yaml", ".yml", ".toml", ".ini", ".cfg", ".log", ".html", ".css", ".js"}
 _STATION_CODE_RE = re.compile(r"(Z[A-Z]?\d{3,4})", re.IGNORECASE)
+# header probes of catalog files whose names lack a station or scan time, keyed by (path, mtime, size)
+CATALOG_METADATA_CACHE_ITEMS = 4096
+_catalog_metadata = OrderedDict()
+_catalog_metadata_lock = threading.Lock()
 
 
 class RadarFileCache(object):
-    def __init__(self, max_items=6):
+    def __init__(self, max_items=6, prd_cache_bytes=None):
+        """
+        :param max_items: number of decoded volumes kept
+        :param prd_cache_bytes: optional budget of the derived-view caches of each volume
+            (``PRD.configure_caches``); None keeps the PRD default
+        """
         self.max_items = max_items
+        self.prd_cache_bytes = prd_cache_bytes
         self._items = OrderedDict()
 
     def get(self, file_path):
@@ -59,11 +70,15 @@ class RadarFileCache(object):
         if cached is not None and cached["mtime"] == mtime:
             self._items.move_to_end(file_path)
             return cached["radar"]
-        radar = read_auto(file_path)
+        radar = read_auto(file_path, quantized=True)
+        if self.prd_cache_bytes is not None:
+            radar.configure_caches(max_bytes=self.prd_cache_bytes)
         self._items[file_path] = {"mtime": mtime, "radar": radar}
         self._items.move_to_end(file_path)
         while len(self._items) > self.max_items:
-            self._items.popitem(last=False)
+            # requests still rendering from an evicted volume keep it alive, but not its cached views
+            _, evicted = self._items.popitem(last=False)
+            evicted["radar"].clear_caches()
         return radar
 
 
@@ -163,11 +178,14 @@ def _matches_supported_filename(name):
     return any(lower_name.endswith(pattern) for pattern in SUPPORTED_PATTERNS)
 
 
-def _scan_tree(directory):
+def _scan_tree(directory, index=None):
     directory = os.path.abspath(directory)
     if not os.path.isdir(directory):
         raise FileNotFoundError("Directory does not exist.")
-    node = _tree_directory_node(Path(directory))
+    if index is not None:
+        node = _index_tree_node(Path(directory), index)
+    else:
+        node = _tree_directory_node(Path(directory))
     return node or {
         "type": "directory",
         "name": Path(directory).name or Path(directory).anchor,
@@ -212,6 +230,54 @@ def _tree_directory_node(directory):
     }
 
 
+def _index_tree_node(directory, index):
+    """Build the ``_tree_directory_node`` layout from an ``ArchiveIndex`` refreshed for ``directory``."""
+    index.update([directory])
+    root = {"children": {}, "files": []}
+    for row in index.query(root=directory):
+        if not _matches_supported_filename(row["name"]):
+            continue
+        parts = Path(row["directory"]).relative_to(directory).parts
+        if any(part in IGNORED_DIRECTORIES for part in parts):
+            continue
+        node = root
+        for part in parts:
+            node = node["children"].setdefault(part, {"children": {}, "files": []})
+        node["files"].append(
+            {
+                "type": "file",
+                "name": row["name"],
+                "path": row["path"],
+                "size": row["size"],
+                "format": row["format"],
+                # the index already consulted the filename and headers, so the catalog needs neither
+                "station": row["station"],
+                "scan_time": row["scan_time"].isoformat() if row["scan_time"] is not None else None,
+            }
+        )
+
+    def build(path, node):
+        children = []
+        file_count = 0
+        for name in sorted(node["children"], key=str.lower):
+            child = build(path / name, node["children"][name])
+            children.append(child)
+            file_count += child["file_count"]
+        children.extend(sorted(node["files"], key=lambda item: item["name"].lower()))
+        file_count += len(node["files"])
+        return {
+            "type": "directory",
+            "name": path.name or path.anchor,
+            "path": str(path),
+            "children": children,
+            "file_count": file_count,
+        }
+
+    if not root["children"] and not root["files"]:
+        return None
+    return build(directory, root)
+
+
 def _flatten_file_nodes(node, files=None):
     files = [] if files is None else files
     if not node:
@@ -238,16 +304,63 @@ def _safe_parse_scan_time(path):
         return None
 
 
+def _safe_read_metadata(path):
+    try:
+        return read_metadata(path)
+    except Exception:
+        return None
+
+
+def _cached_read_metadata(path):
+    """Return ``_safe_read_metadata(path)``, reused while the file keeps its mtime and size."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _catalog_metadata_lock:
+        if key in _catalog_metadata:
+            _catalog_metadata.move_to_end(key)
+            return _catalog_metadata[key]
+    metadata = _safe_read_metadata(path)
+    with _catalog_metadata_lock:
+        _catalog_metadata[key] = metadata
+        while len(_catalog_metadata) > CATALOG_METADATA_CACHE_ITEMS:
+            _catalog_metadata.popitem(last=False)
+    return metadata
+
+
+def _describe_catalog_file(item):
+    """
+    Return (station id, station name, ISO scan time) of a catalog file node.
+    Nodes built from an ``ArchiveIndex`` carry what the index recorded. Other files are named
+    from their filename; their headers are only probed when the name lacks the station or the
+    scan time.
+    """
+    if "station" in item:
+        station_id = item["station"] or "UNKNOWN"
+        return station_id, station_id, item["scan_time"]
+    station_id = _extract_station_code(item["path"])
+    scan_time = _safe_parse_scan_time(item["path"])
+    station_name = None
+    if station_id == "UNKNOWN" or scan_time is None:
+        metadata = _cached_read_metadata(item["path"]) or {}
+        if station_id == "UNKNOWN" and metadata.get("site_code"):
+            station_id = metadata["site_code"].upper()
+        scan_time = scan_time or metadata.get("start_time")
+        station_name = metadata.get("site_name")
+    return station_id, station_name or station_id, scan_time.isoformat() if scan_time is not None else None
+
+
 def _build_catalog(tree):
     stations = {}
     for item in _flatten_file_nodes(tree):
-        station_id = _extract_station_code(item["path"])
-        scan_time = _safe_parse_scan_time(item["path"])
+        station_id, station_name, scan_time = _describe_catalog_file(item)
         station = stations.setdefault(
             station_id,
             {
                 "station_id": station_id,
-                "station_name": station_id,
+                "station_name": station_name,
                 "files": [],
             },
         )
@@ -256,7 +369,7 @@ def _build_catalog(tree):
                 "name": item["name"],
                 "path": item["path"],
                 "format": item.get("format"),
-                "scan_time": scan_time.isoformat() if scan_time is not None else None,
+                "scan_time": scan_time,
             }
         )
     ordered_stations = []
@@ -655,9 +768,11 @@ def _render_section_png(radar, field_name, start_xy_km, end_xy_km, width, height
     return send_file(buffer, mimetype="image/png")
 
 
-def create_app(allowed_roots=None, auth_token=None):
+def create_app(allowed_roots=None, auth_token=None, index_path=None):
     app = Flask(__name__, template_folder="templates", static_folder="static")
     cache = RadarFileCache()
+    # the tree and catalog views list directories from a persistent index when one is configured
+    archive_index = ArchiveIndex(index_path) if index_path is not None else None
     configured_roots = _normalize_allowed_roots(allowed_roots)
     viewer_token = auth_token or secrets.token_urlsafe(24)
     allowed_roots_label = ", ".join(str(root) for root in configured_roots) if configured_roots else "local filesystem"
@@ -698,7 +813,7 @@ def create_app(allowed_roots=None, auth_token=None):
         directory = request.args.get("dir", "").strip() or _default_directory()
         try:
             safe_directory = _resolve_within_roots(directory, configured_roots, expect_directory=True)
-            tree = _scan_tree(safe_directory)
+            tree = _scan_tree(safe_directory, index=archive_index)
         except PermissionError:
             return jsonify({"ok": False, "error": "Requested directory is outside the allowed roots."}), 403
         except Exception as exc:
@@ -710,7 +825,7 @@ def create_app(allowed_roots=None, auth_token=None):
         directory = request.args.get("dir", "").strip() or _default_directory()
         try:
             safe_directory = _resolve_within_roots(directory, configured_roots, expect_directory=True)
-            tree = _scan_tree(safe_directory)
+            tree = _scan_tree(safe_directory, index=archive_index)
             catalog = _build_catalog(tree)
         except PermissionError:
             return jsonify({"ok": False, "error": "Requested directory is outside the allowed roots."}), 403
@@ -836,11 +951,11 @@ def create_app(allowed_roots=None, auth_token=None):
     return app
 
 
-def launch(host="127.0.0.1", port=8787, open_browser=True):
+def launch(host="127.0.0.1", port=8787, open_browser=True, index_path=None):
     normalized_host = str(host).strip()
     if normalized_host not in ("127.0.0.1", "localhost"):
         raise ValueError("The built-in web viewer only supports loopback hosts.")
-    app = create_app()
+    app = create_app(index_path=index_path)
     url = "http://%s:%s/" % (host, port)
     if open_browser:
         threading.Timer(0.8, lambda: webbrowser.open(url)).start()
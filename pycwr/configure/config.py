@@ -35,6 +35,7 @@ __C.network.fillvalue = -999.0
 __C.network.output_dir = None
 __C.network.effective_earth_radius = None
 __C.network.file_pattern = "*.bin*"
+__C.network.archive_index = None
 __C.network.parallel = True
 __C.network.max_workers = None
 __C.network.blind_method = "hybrid"
@@ -456,6 +456,32 @@ CINRAD_field_bins = {
     "interpolated_profile": 16,
 }
 
+# CF packing (dtype, scale_factor, add_offset, _FillValue) used by PRD.quantize_fields;
+# fields without an entry keep their decoded float values.
+_DB_PACKING = {"dtype": "uint16", "scale_factor": 1. / 128, "add_offset": -256., "_FillValue": 65535}
+CINRAD_field_encoding = {
+    # radar field name: packing
+    'total_power': _DB_PACKING,
+    "reflectivity": _DB_PACKING,
+    "corrected_reflectivity": _DB_PACKING,
+    "velocity": _DB_PACKING,
+    "corrected_velocity": _DB_PACKING,
+    "spectrum_width": _DB_PACKING,
+    "spectrum_width_corrected": _DB_PACKING,
+    "horizontal_signal_noise_ratio": _DB_PACKING,
+    "vertical_signal_noise_ratio": _DB_PACKING,
+    "linear_depolarization_ratio": _DB_PACKING,
+    "differential_reflectivity": {"dtype": "uint16", "scale_factor": 1. / 1024, "add_offset": -32., "_FillValue": 65535},
+    "corrected_differential_reflectivity": {"dtype": "uint16", "scale_factor": 1. / 1024, "add_offset": -32.,
+                                            "_FillValue": 65535},
+    "cross_correlation_ratio": {"dtype": "uint16", "scale_factor": 1e-4, "add_offset": 0., "_FillValue": 65535},
+    "normalized_coherent_power": {"dtype": "uint16", "scale_factor": 1e-4, "add_offset": 0., "_FillValue": 65535},
+    "differential_phase": {"dtype": "uint16", "scale_factor": 0.01, "add_offset": -180., "_FillValue": 65535},
+    "specific_differential_phase": {"dtype": "uint16", "scale_factor": 0.01, "add_offset": -327.68, "_FillValue": 65535},
+    "corrected_specific_differential_phase": {"dtype": "uint16", "scale_factor": 0.01, "add_offset": -327.68,
+                                              "_FillValue": 65535},
+}
+
 CINRAD_field_normvar = {
     # moment: radar field name
     'total_power':(-5,75),
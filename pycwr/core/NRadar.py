@@ -4,21 +4,137 @@ The PRD object adapts to Chinese radar volumes where sweep ranges differ
 between elevation angles and low-elevation Doppler and reflectivity scans
 may be collected separately.
 """
+import copy
 import json
+import pickle
 import numpy as np
 import xarray as xr
 import pyproj
-from ..configure.default_config import DEFAULT_METADATA, CINRAD_field_mapping
+from xarray.conventions import decode_cf_variable
+from ..configure.default_config import DEFAULT_METADATA, CINRAD_field_mapping, CINRAD_field_encoding
 from ..core.RadarProduct import PRODUCT_REFERENCE_NOTES, derive_et, derive_vil
 from ..core.transforms import  antenna_to_cartesian_cwr, cartesian_to_geographic_aeqd,\
-    antenna_vectors_to_cartesian_cwr, antenna_vectors_to_cartesian_rhi, cartesian_to_antenna_cwr,\
+    antenna_vectors_to_cartesian_rhi, cartesian_to_antenna_cwr,\
     antenna_vectors_to_cartesian_vcs, geographic_to_cartesian_aeqd, resolve_effective_earth_radius
+from .sweep_store import SweepStore, _SweepGeometry
+from .view_cache import ViewCache
+from .shared_arrays import DEFAULT_SHARED_MIN_BYTES, SharedArrayExporter, dumps as _dumps_shared
 from .interop import build_xradar_sweep_datasets, export_pyart_radar, export_xradar_tree
 try:
     from .RadarGridC import get_CR_xy, get_CAPPI_xy, get_CAPPI_3d, get_mosaic_CAPPI_3d
 except ImportError:
     from .RadarGrid import get_CR_xy, get_CAPPI_xy, get_CAPPI_3d, get_mosaic_CAPPI_3d
 
+
+def _resolve_sweep_selection(fixed_angle, sweeps=None, max_elevation=None):
+    """
+    Resolve a sweep selection against the fixed angles of a volume.
+    :param fixed_angle: fixed angle of every sweep, in volume order.
+    :param sweeps: optional sweep indices to keep.
+    :param max_elevation: optional upper bound on the fixed angle //units: degree
+    :return: sorted array of selected sweep indices.
+    """
+    fixed_angle = np.asarray(fixed_angle, dtype=np.float64).reshape(-1)
+    nsweeps = fixed_angle.size
+    selected = np.ones(nsweeps, dtype=bool)
+    if sweeps is not None:
+        requested = np.asarray(sweeps).reshape(-1)
+        if requested.size and not np.issubdtype(requested.dtype, np.integer):
+            raise TypeError("sweeps must be integer sweep indices.")
+        if np.any((requested < 0) | (requested >= nsweeps)):
+            raise ValueError("sweep index is out of range for a volume with %d sweeps." % nsweeps)
+        selected[:] = False
+        selected[requested] = True
+    if max_elevation is not None:
+        # fixed angles are stored as float32, so compare at that precision
+        selected &= fixed_angle.astype(np.float32) <= np.float32(max_elevation)
+    if not np.any(selected):
+        raise ValueError("No sweeps match the requested sweep selection.")
+    return np.flatnonzero(selected)
+
+
+def _select_sweep_rays(sweep_start_ray_index, sweep_end_ray_index, sweep_index):
+    """
+    Gather the rays of the selected sweeps.
+    :return: (ray indices, new sweep start indices, new sweep end indices)
+    """
+    starts = np.asarray(sweep_start_ray_index, dtype=np.int64)[sweep_index]
+    ends = np.asarray(sweep_end_ray_index, dtype=np.int64)[sweep_index]
+    counts = ends - starts + 1
+    new_end = np.cumsum(counts) - 1
+    new_start = new_end - counts + 1
+    rays = np.concatenate([np.arange(start, end + 1) for start, end in zip(starts, ends)])
+    return rays, new_start, new_end
+
+
+def _select_sector_rays(azimuth, azimuth_sector):
+    """
+    Select the rays of a sweep inside an azimuth sector.
+    :param azimuth_sector: (start, end) swept clockwise from start to end, may cross north //units: degree
+    :return: slice when the rays are contiguous, else an index array
+    """
+    start, end = (float(value) for value in azimuth_sector)
+    width = (end - start) % 360.0
+    if width == 0.0 and end != start:
+        width = 360.0
+    rays = np.flatnonzero((np.asarray(azimuth, dtype=np.float64) - start) % 360.0 <= width)
+    if rays.size == 0:
+        raise ValueError("No rays fall inside azimuth_sector %s." % (tuple(azimuth_sector),))
+    if rays[-1] - rays[0] + 1 == rays.size:
+        return slice(int(rays[0]), int(rays[-1]) + 1)
+    return rays
+
+
+def _select_range_gates(ranges, max_range_km):
+    """Select the gates up to ``max_range_km``, keeping at least the first one, as a slice."""
+    nbins = int(np.count_nonzero(np.asarray(ranges, dtype=np.float64) <= float(max_range_km) * 1000.0))
+    return slice(0, max(nbins, 1))
+
+
+def _pack_variable(name, variable, encoding):
+    """
+    Pack a float variable into integer codes and wrap it in a lazily decoded CF variable.
+    :param encoding: dict with dtype, scale_factor, add_offset and _FillValue; NaN gates get
+        ``_FillValue`` and values outside the code range are clipped to it.
+    :return: xarray.Variable holding the codes; physical values are computed on every read.
+    """
+    dtype = np.dtype(encoding["dtype"])
+    scale_factor = np.float32(encoding["scale_factor"])
+    add_offset = np.float32(encoding["add_offset"])
+    fill_value = dtype.type(encoding["_FillValue"])
+    info = np.iinfo(dtype)
+    low, high = (info.min + 1, info.max) if fill_value == info.min else (info.min, info.max - 1)
+    codes = np.rint((np.asarray(variable.values, dtype=np.float64) - add_offset) / scale_factor)
+    codes = np.where(np.isfinite(codes), np.clip(codes, low, high), fill_value).astype(dtype)
+    attrs = dict(variable.attrs, scale_factor=scale_factor, add_offset=add_offset, _FillValue=fill_value)
+    return decode_cf_variable(name, xr.Variable(variable.dims, codes, attrs=attrs), decode_times=False)
+
+
+# derived or process-local attributes left out of pickles and deep copies
+_TRANSIENT_ATTRS = frozenset((
+    "_view_cache", "_vol_cache", "_pyart_cache", "_xradar_cache", "_native_field_cache",
+    "_sweep_field_cache", "_sorted_sweep_cache", "_ordered_az_cache", "_summary_cache",
+    "_site_projection", "_fixed_angle_sort_index", "_shared_arrays", "_shared_transport",
+))
+
+
+def _restore_prd(state, max_bytes):
+    """Rebuild a PRD from its pickled state with empty caches."""
+    radar = PRD.__new__(PRD)
+    radar.__dict__.update(state)
+    radar._init_view_state(max_bytes=max_bytes)
+    radar._shared_arrays = None
+    radar._shared_transport = False
+    return radar
+
+
+def _loads_shared_prd(payload, max_bytes):
+    """Rebuild a PRD whose large arrays are attached read-only from shared memory."""
+    radar = _restore_prd(pickle.loads(payload), max_bytes)
+    radar._shared_transport = True
+    return radar
+
+
 class PRD(object):
     """
     Polarimetry Radar Data (PRD)
@@ -99,8 +215,36 @@ class PRD(object):
                  longitude, altitude, sweep_start_ray_index, sweep_end_ray_index,
                  fixed_angle, bins_per_sweep, nyquist_velocity, frequency, unambiguous_range,
                  nrays, nsweeps, sitename, pyart_radar=None, effective_earth_radius=None,
-                 extended_fields=None, metadata=None):
+                 extended_fields=None, metadata=None, sweeps=None, max_elevation=None, sweep_geometry=None):
         super(PRD, self).__init__()
+        if sweeps is not None or max_elevation is not None:
+            # Keep only the requested sweeps so geometry is never built for the others.
+            if max_elevation is not None and str(scan_type) == "rhi":
+                raise ValueError("max_elevation is not supported for RHI volumes.")
+            sweep_index = _resolve_sweep_selection(np.asarray(fixed_angle)[:nsweeps], sweeps, max_elevation)
+            rays, sweep_start_ray_index, sweep_end_ray_index = _select_sweep_rays(
+                sweep_start_ray_index, sweep_end_ray_index, sweep_index)
+            fields = {key: np.asarray(value)[rays] for key, value in fields.items()}
+            time = np.asarray(time)[rays]
+            azimuth = np.asarray(azimuth)[rays]
+            elevation = np.asarray(elevation)[rays]
+            fixed_angle = np.asarray(fixed_angle)[sweep_index]
+            bins_per_sweep = np.asarray(bins_per_sweep)[sweep_index]
+            nyquist_velocity = np.asarray(nyquist_velocity)[sweep_index]
+            unambiguous_range = np.asarray(unambiguous_range)[sweep_index]
+            extended_fields = {
+                key: {
+                    new_sweep: sweeps_data[old_sweep]
+                    for new_sweep, old_sweep in enumerate(sweep_index.tolist())
+                    if old_sweep in sweeps_data
+                }
+                for key, sweeps_data in (extended_fields or {}).items()
+            }
+            extended_fields = {key: value for key, value in extended_fields.items() if value}
+            if sweep_geometry is not None:
+                sweep_geometry = [sweep_geometry[old_sweep] for old_sweep in sweep_index.tolist()]
+            nrays = int(rays.size)
+            nsweeps = int(sweep_index.size)
         self.effective_earth_radius = resolve_effective_earth_radius(effective_earth_radius)
         self.extended_fields = extended_fields or {}
         scan_type_value = str(np.asarray(scan_type).item()) if np.asarray(scan_type).shape == () else str(scan_type)
@@ -143,38 +287,10 @@ class PRD(object):
             metadata_defaults.update(metadata)
         self.metadata = metadata_defaults
         keys = fields.keys()
-        self.fields = []
-        for idx, (istart, iend) in enumerate(zip(sweep_start_ray_index, sweep_end_ray_index)):
-            x, y, z = antenna_vectors_to_cartesian_cwr(range[:bins_per_sweep[idx]], azimuth[istart:iend+1],\
-                                                   elevation[istart:iend+1], altitude,
-                                                   effective_earth_radius=self.effective_earth_radius)
-            lon, lat = cartesian_to_geographic_aeqd(x, y, longitude, latitude)
-            isweep_data = xr.Dataset(coords={'azimuth': (['time', ], azimuth[istart:iend+1]),
-                                            'elevation': (['time',], elevation[istart:iend+1]),
-                                             'x':(['time','range'], x),
-                                             'y':(['time', 'range'], y),
-                                             'z':(['time', 'range'], z),
-                                             'lat':(['time','range'], lat),
-                                             'lon':(['time','range'], lon),
-                                            'range': range[:bins_per_sweep[idx]], 'time': time[istart:iend+1]})
-            isweep_data.azimuth.attrs = DEFAULT_METADATA['azimuth']
-            isweep_data.elevation.attrs = DEFAULT_METADATA['elevation']
-            isweep_data.range.attrs = DEFAULT_METADATA['range']
-            isweep_data.time.attrs = DEFAULT_METADATA['time']
-            isweep_data.x.attrs = DEFAULT_METADATA['x']
-            isweep_data.y.attrs = DEFAULT_METADATA['y']
-            isweep_data.z.attrs = DEFAULT_METADATA['z']
-            isweep_data.lon.attrs = DEFAULT_METADATA['lon']
-            isweep_data.lat.attrs = DEFAULT_METADATA['lat']
-            for ikey in keys:
-                isweep_data[ikey] = (['time','range'], fields[ikey][istart:iend+1, :bins_per_sweep[idx]])
-                mapped_name = CINRAD_field_mapping.get(ikey, ikey)
-                isweep_data[ikey].attrs = DEFAULT_METADATA.get(mapped_name, {
-                    'units': 'unknown',
-                    'standard_name': mapped_name,
-                    'long_name': mapped_name,
-                    'coordinates': 'elevation azimuth range'})
-            self.fields.append(isweep_data)
+        # sweeps stay views of the volume arrays until a Dataset is requested
+        self.fields = SweepStore.from_volume(fields, time, range, azimuth, elevation, sweep_start_ray_index,
+                                             sweep_end_ray_index, bins_per_sweep, longitude, latitude, altitude,
+                                             self.effective_earth_radius, sweep_geometry=sweep_geometry)
         self.scan_info = xr.Dataset(data_vars={"latitude":latitude,"longitude":longitude,
                         "altitude":altitude,"scan_type":scan_type,  "frequency":frequency,
                         "start_time":time[0], "end_time":time[-1],
@@ -215,19 +331,40 @@ class PRD(object):
         self.nsweeps = nsweeps
         self.nrays = nrays
         self.sitename = sitename
+        self._init_view_state()
+        self.field_encoding = {}
+        self._shared_arrays = None
+        self._shared_transport = False
+        if "dBZ" in keys:
+            self.get_vol_data()
+        else:
+            self.vol = None
+        self.product = xr.Dataset()
+        self.PyartRadar = pyart_radar
+
+    def _init_view_state(self, max_bytes=None):
+        """Set up the caches of derived views for the current sweeps and scan_info."""
         self._fixed_angle_sort_index = self.scan_info["fixed_angle"].argsort().values
         self._ordered_az_cache = None
-        self._vol_cache = {}
-        self._pyart_cache = {}
-        self._xradar_cache = {}
-        self._native_field_cache = {}
-        self._sweep_field_cache = {}
-        self._sorted_sweep_cache = {}
+        # derived views share one byte budget, see cache_info / clear_caches
+        self._view_cache = ViewCache(max_bytes=max_bytes)
+        self._vol_cache = self._view_cache.view("vol")
+        self._pyart_cache = self._view_cache.view("pyart")
+        self._xradar_cache = self._view_cache.view("xradar")
+        self._native_field_cache = self._view_cache.view("native_field")
+        self._sweep_field_cache = self._view_cache.view("sweep_field")
+        self._sorted_sweep_cache = self._view_cache.view("sorted_sweep")
         self._summary_cache = None
         self._site_projection = None
-        self.get_vol_data()
-        self.product = xr.Dataset()
-        self.PyartRadar = pyart_radar
+
+    @property
+    def fields(self):
+        """List-like ``SweepStore`` of sweep Datasets, each built on first access."""
+        return self._fields
+
+    @fields.setter
+    def fields(self, sweeps):
+        self._fields = sweeps if isinstance(sweeps, SweepStore) else SweepStore(sweeps)
 
     @staticmethod
     def _field_prefers_native_range(field_name):
@@ -287,8 +424,9 @@ class PRD(object):
             use_external,
             bool(strict),
         )
-        if not force_rebuild and cache_key in self._pyart_cache:
-            return self._pyart_cache[cache_key]
+        cached = None if force_rebuild else self._pyart_cache.get(cache_key)
+        if cached is not None:
+            return cached
         radar = export_pyart_radar(
             self,
             existing_radar=self.PyartRadar,
@@ -453,8 +591,9 @@ class PRD(object):
         """Export the PRD volume as sweep-level xarray datasets."""
         range_mode = self._resolve_export_range_mode(field_names=field_names, range_mode=range_mode)
         cache_key = ("datasets", range_mode, None if field_names is None else tuple(field_names))
-        if not force_rebuild and cache_key in self._xradar_cache:
-            return self._xradar_cache[cache_key]
+        cached = None if force_rebuild else self._xradar_cache.get(cache_key)
+        if cached is not None:
+            return cached
         datasets = build_xradar_sweep_datasets(self, range_mode=range_mode, field_names=field_names)
         self._xradar_cache[cache_key] = datasets
         return datasets
@@ -463,8 +602,9 @@ class PRD(object):
         """Export the PRD volume as a DataTree for xradar-style workflows."""
         range_mode = self._resolve_export_range_mode(field_names=field_names, range_mode=range_mode)
         cache_key = ("tree", range_mode, None if field_names is None else tuple(field_names), bool(strict))
-        if not force_rebuild and cache_key in self._xradar_cache:
-            return self._xradar_cache[cache_key]
+        cached = None if force_rebuild else self._xradar_cache.get(cache_key)
+        if cached is not None:
+            return cached
         tree = export_xradar_tree(self, range_mode=range_mode, field_names=field_names, strict=strict)
         self._xradar_cache[cache_key] = tree
         return tree
@@ -486,7 +626,7 @@ class PRD(object):
                         names.append(name)
             return names
         sweep = int(sweep)
-        names = list(self.fields[sweep].data_vars)
+        names = self.fields.field_names(sweep)
         if range_mode == "native":
             for field_name, sweep_map in self.extended_fields.items():
                 if sweep in sweep_map and field_name not in names:
@@ -499,13 +639,13 @@ class PRD(object):
         fixed_angles = np.asarray(self.scan_info["fixed_angle"].values, dtype=np.float64)
         rays_per_sweep = np.asarray(self.scan_info["rays_per_sweep"].values, dtype=np.int32)
         for sweep in range(int(self.nsweeps)):
-            aligned_fields = list(self.fields[sweep].data_vars)
+            aligned_fields = self.fields.field_names(sweep)
             native_fields = [
                 field_name
                 for field_name, sweep_map in self.extended_fields.items()
                 if sweep in sweep_map
             ]
-            range_values = np.asarray(self.fields[sweep]["range"].values, dtype=np.float64)
+            range_values = np.asarray(self.fields.values(sweep, "range"), dtype=np.float64)
             rows.append(
                 {
                     "sweep": sweep,
@@ -571,30 +711,28 @@ class PRD(object):
         changing those existing arrays.
         """
         sweep = int(sweep)
-        sweep_dataset = self.fields[sweep]
-        if field_name not in sweep_dataset:
+        if not self.fields.has_field(sweep, field_name):
             raise KeyError(field_name)
 
         native_field = self.extended_fields.get(field_name, {}).get(sweep)
         if native_field is None:
-            return sweep_dataset[field_name]
+            return self.fields.data_array(sweep, field_name)
         cache_key = (sweep, field_name)
         cached = self._native_field_cache.get(cache_key)
         if cached is not None:
             return cached
 
-        attrs = dict(sweep_dataset[field_name].attrs)
-        radar_altitude = self._site_altitude()
-        radar_lon = self._site_longitude()
-        radar_lat = self._site_latitude()
-        x, y, z = antenna_vectors_to_cartesian_cwr(
+        aligned = self.fields.variable(sweep, field_name)
+        attrs = dict(aligned.attrs)
+        geometry = _SweepGeometry(
             native_field["range"],
             native_field["azimuth"],
             native_field["elevation"],
-            radar_altitude,
-            effective_earth_radius=self.effective_earth_radius,
-        )
-        lon, lat = cartesian_to_geographic_aeqd(x, y, radar_lon, radar_lat)
+            self._site_longitude(),
+            self._site_latitude(),
+            self._site_altitude(),
+            self.effective_earth_radius,
+        ).variables()
         data = xr.DataArray(
             native_field["data"],
             dims=("time", "range"),
@@ -602,26 +740,26 @@ class PRD(object):
                 "time": native_field["time"],
                 "azimuth": ("time", native_field["azimuth"]),
                 "elevation": ("time", native_field["elevation"]),
-                "x": (("time", "range"), x),
-                "y": (("time", "range"), y),
-                "z": (("time", "range"), z),
-                "lon": (("time", "range"), lon),
-                "lat": (("time", "range"), lat),
+                "x": geometry["x"],
+                "y": geometry["y"],
+                "z": geometry["z"],
+                "lon": geometry["lon"],
+                "lat": geometry["lat"],
                 "range": native_field["range"],
             },
             name=field_name,
             attrs=attrs,
         )
-        if "time" in sweep_dataset[field_name].dims:
-            current_time = np.asarray(sweep_dataset["time"].values)
+        if "time" in aligned.dims:
+            current_time = np.asarray(self.fields.values(sweep, "time"))
             if np.array_equal(current_time, native_field["time"]):
                 self._native_field_cache[cache_key] = data
                 return data
             data = data.sel(time=current_time)
             self._native_field_cache[cache_key] = data
             return data
-        if "azimuth" in sweep_dataset[field_name].dims:
-            current_azimuth = np.asarray(sweep_dataset["azimuth"].values)
+        if "azimuth" in aligned.dims:
+            current_azimuth = np.asarray(self.fields.values(sweep, "azimuth"))
             data = data.swap_dims({"time": "azimuth"}).sel(azimuth=current_azimuth)
             self._native_field_cache[cache_key] = data
             return data
@@ -639,7 +777,7 @@ class PRD(object):
         if range_mode == "native":
             field = self.get_native_sweep_field(sweep, field_name)
         else:
-            field = self.fields[sweep][field_name]
+            field = self.fields.data_array(sweep, field_name)
         if sort_by_azimuth:
             field = self._sort_field_by_azimuth(field)
             self._sweep_field_cache[cache_key] = field
@@ -666,8 +804,8 @@ class PRD(object):
         """Return sweep azimuth/range/value arrays for Cartesian gridding."""
         range_mode = self._resolve_field_range_mode(field_name, range_mode=range_mode)
         sweep = int(sweep)
-        sweep_dataset = self.fields[sweep]
-        if field_name not in sweep_dataset:
+        sweeps = self.fields
+        if not sweeps.has_field(sweep, field_name):
             raise KeyError(field_name)
 
         if range_mode == "native":
@@ -681,7 +819,7 @@ class PRD(object):
                 values = values[sort_index, :]
                 ranges, values = self._clip_range_window(ranges, values, max_range_km)
                 return azimuth, ranges, values
-            if field_name == "Zc" and "Zc" in sweep_dataset:
+            if field_name == "Zc":
                 native_ref = self.extended_fields.get("dBZ", {}).get(sweep)
                 if native_ref is not None:
                     azimuth = np.asarray(native_ref["azimuth"], dtype=np.float64)
@@ -690,7 +828,7 @@ class PRD(object):
                     sort_index = np.argsort(azimuth)
                     azimuth = azimuth[sort_index]
                     values = values[sort_index, :]
-                    corrected = np.asarray(sweep_dataset["Zc"].values, dtype=np.float64)[sort_index, :]
+                    corrected = np.asarray(sweeps.values(sweep, "Zc"), dtype=np.float64)[sort_index, :]
                     copy_len = min(corrected.shape[1], values.shape[1])
                     values[:, :copy_len] = np.where(
                         np.isfinite(corrected[:, :copy_len]),
@@ -700,29 +838,223 @@ class PRD(object):
                     ranges, values = self._clip_range_window(ranges, values, max_range_km)
                     return azimuth, ranges, values
 
-        azimuth = np.asarray(sweep_dataset["azimuth"].values, dtype=np.float64)
-        values = np.asarray(sweep_dataset[field_name].values, dtype=np.float64)
+        azimuth = np.asarray(sweeps.values(sweep, "azimuth"), dtype=np.float64)
+        values = np.asarray(sweeps.values(sweep, field_name), dtype=np.float64)
         if values.ndim != 2:
             raise ValueError("Sweep field %s must be 2-D for Cartesian gridding." % field_name)
         sort_index = np.argsort(azimuth)
         azimuth = azimuth[sort_index]
         values = values[sort_index, :]
-        ranges = np.asarray(sweep_dataset["range"].values, dtype=np.float64)
+        ranges = np.asarray(sweeps.values(sweep, "range"), dtype=np.float64)
         ranges, values = self._clip_range_window(ranges, values, max_range_km)
         return azimuth, ranges, values
 
     def _invalidate_cached_views(self):
         """Clear cached derived views after the underlying sweep datasets change."""
         self._ordered_az_cache = None
-        self._vol_cache.clear()
-        self._pyart_cache.clear()
+        self._view_cache.clear()
         self.PyartRadar = None
-        self._xradar_cache.clear()
-        self._native_field_cache.clear()
-        self._sweep_field_cache.clear()
-        self._sorted_sweep_cache.clear()
         self._summary_cache = None
 
+    def cache_info(self):
+        """
+        Report the caches of derived views (gridding volumes, Py-ART/xradar exports, sweep fields).
+        :return: dict with max_bytes, total entries, bytes, hits and misses, and under ``caches`` the
+            same counters for each kind: vol, pyart, xradar, native_field, sweep_field, sorted_sweep
+        """
+        return self._view_cache.info()
+
+    def clear_caches(self, kind=None):
+        """
+        Drop cached derived views; they are rebuilt on the next request.
+        :param kind: one of vol, pyart, xradar, native_field, sweep_field, sorted_sweep; None clears all
+        :return: self
+        """
+        self._view_cache.clear(kind)
+        return self
+
+    def configure_caches(self, max_bytes=None):
+        """
+        Set the byte budget shared by the derived-view caches; least recently used views are evicted
+        beyond it.
+        :param max_bytes: budget in bytes (default 256 MiB or ``PYCWR_PRD_CACHE_MAX_BYTES``); 0 disables caching
+        :return: self
+        """
+        self._view_cache.configure(max_bytes=max_bytes)
+        return self
+
+    def _pickle_state(self):
+        return {name: value for name, value in self.__dict__.items() if name not in _TRANSIENT_ATTRS}
+
+    def __reduce__(self):
+        # caches are rebuilt on demand, so only the data and the cache budget travel
+        max_bytes = self._view_cache.max_bytes
+        if self._shared_transport:
+            return _loads_shared_prd, (_dumps_shared(self._pickle_state()), max_bytes)
+        return _restore_prd, (self._pickle_state(), max_bytes)
+
+    def __deepcopy__(self, memo):
+        # copies are private and writable even when this volume lives in shared memory
+        return _restore_prd(copy.deepcopy(self._pickle_state(), memo), self._view_cache.max_bytes)
+
+    def share_memory(self, min_bytes=DEFAULT_SHARED_MIN_BYTES):
+        """
+        Move the field and coordinate arrays into shared memory so that pickling this PRD, e.g. for
+        ``concurrent.futures.ProcessPoolExecutor`` or ``multiprocessing`` workers, sends block
+        references instead of the data. Workers attach the arrays zero-copy and read-only; this PRD
+        keeps them writable and owns the blocks until ``release_shared_memory`` or garbage collection.
+        Cached derived views are dropped and never pickled.
+        :param min_bytes: arrays smaller than this stay private and are pickled by value
+        :return: self
+        """
+        if self._shared_arrays is None:
+            self._shared_arrays = SharedArrayExporter(min_bytes=min_bytes)
+        else:
+            self._shared_arrays.min_bytes = int(min_bytes)
+        self._invalidate_cached_views()
+        self.__dict__.update(self._shared_arrays.share(self._pickle_state()))
+        self._shared_transport = True
+        return self
+
+    def release_shared_memory(self):
+        """
+        Unlink the shared memory blocks created by ``share_memory``. Arrays already attached by
+        workers stay valid; later pickles carry the data by value again.
+        :return: self
+        """
+        if self._shared_arrays is not None:
+            self._shared_arrays.release()
+            self._shared_arrays = None
+            self._shared_transport = False
+        return self
+
+    def subset(self, sweeps=None, fields=None, max_range_km=None, azimuth_sector=None):
+        """
+        Return a PRD restricted to some sweeps, fields, ranges and azimuths, sharing this volume's arrays.
+        Sweeps, fields, gates and rays are selected as NumPy views; only a sector that wraps past the
+        first ray of a sweep copies those rays. Gate geometry already computed here is carried along
+        as views and the scan_info rows of the kept sweeps are copied. Caches, products and the
+        gridding volume (``vol``) of the subset start empty and are rebuilt on demand.
+        :param sweeps: sweep indices to keep, default all
+        :param fields: field name or names to keep, default all
+        :param max_range_km: keep the gates up to this range //units: km
+        :param azimuth_sector: (start, end) kept clockwise from start to end, may cross north //units: degree
+        :return: PRD
+        """
+        sweep_index = _resolve_sweep_selection(self.scan_info["fixed_angle"].values, sweeps)
+        if fields is not None:
+            fields = [fields] if isinstance(fields, str) else list(fields)
+            known = set(self.extended_fields)
+            for sweep in range(len(self.fields)):
+                known.update(self.fields.field_names(sweep))
+            for name in fields:
+                if name not in known:
+                    raise KeyError(name)
+        if max_range_km is not None and not float(max_range_km) > 0:
+            raise ValueError("max_range_km must be positive.")
+        if azimuth_sector is not None and len(azimuth_sector) != 2:
+            raise ValueError("azimuth_sector must be a (start, end) pair of azimuths.")
+
+        def select(azimuth, ranges):
+            rays = slice(None) if azimuth_sector is None else _select_sector_rays(azimuth, azimuth_sector)
+            gates = slice(None) if max_range_km is None else _select_range_gates(ranges, max_range_km)
+            return rays, gates
+
+        selections = [select(self.fields.values(sweep, "azimuth"), self.fields.values(sweep, "range"))
+                      for sweep in sweep_index]
+        sweep_store = self.fields.subset(sweep_index, fields, rays=[rays for rays, _ in selections],
+                                         gates=[gates for _, gates in selections])
+        extended_fields = {}
+        for name, sweep_map in self.extended_fields.items():
+            if fields is not None and name not in fields:
+                continue
+            for new_sweep, old_sweep in enumerate(sweep_index.tolist()):
+                native_field = sweep_map.get(old_sweep)
+                if native_field is None:
+                    continue
+                rays, gates = select(native_field["azimuth"], native_field["range"])
+                extended_fields.setdefault(name, {})[new_sweep] = dict(
+                    native_field,
+                    data=native_field["data"][rays, gates],
+                    range=native_field["range"][gates],
+                    time=native_field["time"][rays],
+                    azimuth=native_field["azimuth"][rays],
+                    elevation=native_field["elevation"][rays],
+                    aligned_bins=sweep_store.sizes(new_sweep)[1],
+                )
+
+        nsweeps = int(sweep_index.size)
+        rays_per_sweep = np.array([sweep_store.sizes(sweep)[0] for sweep in range(nsweeps)])
+        scan_info = self.scan_info.isel(sweep=sweep_index).assign_coords(sweep=np.arange(nsweeps, dtype=int))
+        for name, values in (
+                ("rays_per_sweep", rays_per_sweep.astype(scan_info["rays_per_sweep"].dtype)),
+                ("sweep_group_name", np.array(["sweep_%d" % i for i in range(nsweeps)], dtype=object)),
+                ("start_time", np.asarray(sweep_store.values(0, "time")[0])),
+                ("end_time", np.asarray(sweep_store.values(nsweeps - 1, "time")[-1]))):
+            scan_info[name] = scan_info[name].copy(data=values)
+
+        radar = PRD.__new__(PRD)
+        radar.effective_earth_radius = self.effective_earth_radius
+        radar.extended_fields = extended_fields
+        radar.metadata = dict(self.metadata)
+        radar.fields = sweep_store
+        radar.scan_info = scan_info
+        radar.nsweeps = nsweeps
+        radar.nrays = int(rays_per_sweep.sum())
+        radar.sitename = self.sitename
+        radar._init_view_state(max_bytes=self._view_cache.max_bytes)
+        radar.field_encoding = {name: dict(packing) for name, packing in self.field_encoding.items()
+                                if fields is None or name in fields}
+        radar._shared_arrays = None
+        # the views still live in this volume's shared memory blocks
+        radar._shared_transport = self._shared_transport
+        radar.vol = None
+        radar.product = xr.Dataset()
+        radar.PyartRadar = None
+        return radar
+
+    def quantize_fields(self, encoding=None):
+        """
+        Store sweep fields as packed integer codes and decode physical values only when read.
+        Codes follow CF packing (``scale_factor``, ``add_offset`` and ``_FillValue`` attrs), so
+        ``.values``, ``get_sweep_field`` and gridding still see float32 physical values, rounded
+        to the packing step, while the resident volume shrinks 2-4x.
+        :param encoding: optional {field name: dict(dtype, scale_factor, add_offset, _FillValue)}
+            overriding ``CINRAD_field_encoding``; fields without an encoding stay unpacked.
+        :return: self
+        """
+        encoding = encoding or {}
+
+        def field_encoding(name):
+            return encoding.get(name, CINRAD_field_encoding.get(CINRAD_field_mapping.get(name, name)))
+
+        sweeps = self.fields
+        for sweep in range(len(sweeps)):
+            for name in sweeps.field_names(sweep):
+                packing = field_encoding(name)
+                variable = sweeps.variable(sweep, name)
+                if packing is None or "scale_factor" in variable.encoding or \
+                        not np.issubdtype(variable.dtype, np.floating):
+                    continue
+                sweeps.set_variable(sweep, name, _pack_variable(name, variable, packing))
+                self.field_encoding[name] = dict(packing)
+        # readers may still reference the sidecar dicts, so rebuild them instead of mutating
+        extended_fields = {}
+        for name, sweep_map in self.extended_fields.items():
+            packing = field_encoding(name)
+            extended_fields[name] = dict(sweep_map)
+            if packing is None:
+                continue
+            for sweep, native_field in sweep_map.items():
+                if not isinstance(native_field["data"], xr.Variable):
+                    extended_fields[name][sweep] = dict(native_field, data=_pack_variable(
+                        name, xr.Variable(("time", "range"), native_field["data"]), packing))
+            self.field_encoding[name] = dict(packing)
+        self.extended_fields = extended_fields
+        self._invalidate_cached_views()
+        self.vol = None
+        return self
+
     @staticmethod
     def _sort_field_by_azimuth(field):
         """Return a field ordered by azimuth using a stable NumPy indexer."""
@@ -1936,8 +2268,9 @@ class PRD(object):
         range_mode = self._resolve_field_range_mode(field_name, range_mode=range_mode)
         max_range_km = None if max_range_km is None else float(max_range_km)
         cache_key = (field_name, float(fillvalue), range_mode, max_range_km)
-        if cache_key in self._vol_cache:
-            self.vol = self._vol_cache[cache_key]
+        cached = self._vol_cache.get(cache_key)
+        if cached is not None:
+            self.vol = cached
             return
         sweep_order = self._fixed_angle_sort_index
         fixed_elevation = self.scan_info["fixed_angle"].values[sweep_order]
@@ -1958,7 +2291,9 @@ class PRD(object):
         radar_lon_0 = float(self.scan_info["longitude"].values)
         radar_lat_0 = float(self.scan_info["latitude"].values)
         self.vol = vol_azimuth, vol_range, fixed_elevation.astype(np.float64), vol_value, radar_height, radar_lon_0, radar_lat_0
-        self._vol_cache[cache_key] = self.vol
+        if not self.field_encoding:
+            # packed volumes are decoded again on demand instead of keeping float64 copies
+            self._vol_cache[cache_key] = self.vol
 
     def get_RHI_data(self, az, field_name="dBZ", range_mode=None):
         """
@@ -44,6 +44,7 @@ def _resolve_blind_flags(blind_method):
 
 
 def _interp_sweep_sample(azimuth, ranges, values, target_az, target_range, fillvalue, use_nearest_gate):
+    """Interpolate one target; scalar reference of ``_interp_sweep_grid``."""
     if azimuth.size < 2 or ranges.size < 2:
         return fillvalue
     if target_range > ranges[-1]:
@@ -96,6 +97,51 @@ def _interp_sweep_sample(azimuth, ranges, values, target_az, target_range, fillv
     )
 
 
+def _interp_pair(x, x_0, x_1, dat_0, dat_1, fillvalue):
+    """Array form of ``interp_azimuth``."""
+    valid_0 = dat_0 != fillvalue
+    valid_1 = dat_1 != fillvalue
+    with np.errstate(divide="ignore", invalid="ignore"):
+        both = ((x_1 - x) * dat_0 + (x - x_0) * dat_1) / (x_1 - x_0)
+    interped = np.where(valid_0, np.where(valid_1, both, dat_0), np.where(valid_1, dat_1, fillvalue))
+    return np.where(x_1 == x_0, fillvalue, interped)
+
+
+def _interp_sweep_grid(azimuth, ranges, values, target_az, target_range, fillvalue, use_nearest_gate):
+    """
+    Interpolate one sweep at many targets at once, with the rules of ``_interp_sweep_sample``.
+    :param azimuth: sorted ray azimuths, np.ndarray (1d), units:degree
+    :param ranges: gate ranges, np.ndarray (1d), units:meters
+    :param values: sweep data, np.ndarray (2d, azimuth x range)
+    :param target_az: target azimuths, np.ndarray (1d), units:degree
+    :param target_range: target slant ranges, np.ndarray (1d), units:meters
+    :return: np.ndarray (1d) of interpolated values, ``fillvalue`` outside the sweep
+    """
+    interped = np.full(target_az.shape, fillvalue, dtype=np.float64)
+    if azimuth.size < 2 or ranges.size < 2:
+        return interped
+    if use_nearest_gate:
+        # blind zone: clamp to the first gate
+        target_range = np.where(target_range < ranges[0], ranges[0], target_range)
+    inside = ~((target_range > ranges[-1]) | (target_range < ranges[0]))
+    target_az = target_az[inside]
+    target_range = target_range[inside]
+
+    iaz = np.searchsorted(azimuth, target_az, side="right")
+    # past the last ray: interpolate between the last and the first ray across north
+    wrapped = iaz >= azimuth.size
+    iaz[wrapped] = 0
+    az_value = np.where(wrapped, target_az - 360.0, target_az)
+    az_last = np.where(iaz == 0, azimuth[-1] - 360.0, azimuth[iaz - 1])
+    az_next = azimuth[iaz]
+    ir = np.clip(np.searchsorted(ranges, target_range, side="right"), 1, ranges.size - 1)
+
+    er0 = _interp_pair(az_value, az_last, az_next, values[iaz - 1, ir - 1], values[iaz, ir - 1], fillvalue)
+    er1 = _interp_pair(az_value, az_last, az_next, values[iaz - 1, ir], values[iaz, ir], fillvalue)
+    interped[inside] = _interp_pair(target_range, ranges[ir - 1], ranges[ir], er0, er1, fillvalue)
+    return interped
+
+
 antenna_to_cartesian = antenna_to_cartesian_cwr
 xye_to_antenna = cartesian_xy_elevation_to_range_z
 cartesian_to_antenna = cartesian_xyz_to_antenna
@@ -190,18 +236,15 @@ def ppi_to_grid(azimuth, ranges, elevation, mat_ppi, radar_height, GridX, GridY,
         radar_height,
         effective_earth_radius=effective_earth_radius,
     )
-    Nx, Ny = GridX.shape
-    for ix in range(Nx):
-        for iy in range(Ny):
-            GridValue[ix, iy] = _interp_sweep_sample(
-                azimuth,
-                ranges,
-                mat_ppi,
-                Grid_az[ix, iy],
-                Grid_range[ix, iy],
-                fillvalue,
-                use_nearest_gate,
-            )
+    GridValue[...] = _interp_sweep_grid(
+        azimuth,
+        ranges,
+        mat_ppi,
+        np.asarray(Grid_az, dtype=np.float64).ravel(),
+        np.asarray(Grid_range, dtype=np.float64).ravel(),
+        fillvalue,
+        use_nearest_gate,
+    ).reshape(GridValue.shape)
     return GridValue
 
 
@@ -239,7 +282,7 @@ def get_CAPPI_xy(vol_azimuth, vol_range, fix_elevation, vol_value, radar_height,
     fix_elevation = np.asarray(fix_elevation, dtype=np.float64)
     GridX = np.asarray(GridX, dtype=np.float64)
     GridY = np.asarray(GridY, dtype=np.float64)
-    GridValue = np.full_like(GridX, fillvalue, dtype=np.float64)
+    GridValue = np.full(GridX.shape, fillvalue, dtype=np.float64)
     if fix_elevation.size == 0:
         return GridValue
     use_nearest_gate, use_lowest_sweep, use_highest_sweep = _resolve_blind_flags(blind_method)
@@ -251,78 +294,60 @@ def get_CAPPI_xy(vol_azimuth, vol_range, fix_elevation, vol_value, radar_height,
         radar_height,
         effective_earth_radius=effective_earth_radius,
     )
-    Nx, Ny = GridX.shape
-    for ix in range(Nx):
-        for iy in range(Ny):
-            current_el = Grid_el[ix, iy]
-            if fix_elevation.size == 1:
-                if np.abs(current_el - fix_elevation[0]) > max(float(beam_width_deg) * 0.5, 0.1):
-                    continue
-                GridValue[ix, iy] = _interp_sweep_sample(
-                    np.asarray(vol_azimuth[0], dtype=np.float64),
-                    np.asarray(vol_range[0], dtype=np.float64),
-                    np.asarray(vol_value[0], dtype=np.float64),
-                    Grid_az[ix, iy],
-                    Grid_range[ix, iy],
-                    fillvalue,
-                    use_nearest_gate,
-                )
-                continue
-            if current_el < fix_elevation[0]:
-                if not use_lowest_sweep:
-                    continue
-                lower_index = 0
-                upper_index = 0
-            elif current_el > fix_elevation[-1]:
-                if not use_highest_sweep:
-                    continue
-                lower_index = fix_elevation.size - 1
-                upper_index = lower_index
-            else:
-                upper_index = _search_right_1d(fix_elevation, current_el)
-                if upper_index >= fix_elevation.size:
-                    upper_index = fix_elevation.size - 1
-                lower_index = upper_index - 1
-
-            current_az = Grid_az[ix, iy]
-            current_range = Grid_range[ix, iy]
-            azimuth_0 = np.asarray(vol_azimuth[lower_index], dtype=np.float64)
-            range_0_view = np.asarray(vol_range[lower_index], dtype=np.float64)
-            value_0 = np.asarray(vol_value[lower_index], dtype=np.float64)
-            IER0 = _interp_sweep_sample(
-                azimuth_0,
-                range_0_view,
-                value_0,
-                current_az,
-                current_range,
-                fillvalue,
-                use_nearest_gate,
-            )
-            if lower_index == upper_index:
-                GridValue[ix, iy] = IER0
-                continue
-
-            azimuth_1 = np.asarray(vol_azimuth[upper_index], dtype=np.float64)
-            range_1_view = np.asarray(vol_range[upper_index], dtype=np.float64)
-            value_1 = np.asarray(vol_value[upper_index], dtype=np.float64)
-            IER1 = _interp_sweep_sample(
-                azimuth_1,
-                range_1_view,
-                value_1,
-                current_az,
-                current_range,
-                fillvalue,
-                use_nearest_gate,
-            )
-            GridValue[ix, iy] = interp_azimuth(
-                current_el,
-                fix_elevation[lower_index],
-                fix_elevation[upper_index],
-                IER0,
-                IER1,
-                fillvalue,
-            )
+    Grid_az = np.asarray(Grid_az, dtype=np.float64).ravel()
+    Grid_range = np.asarray(Grid_range, dtype=np.float64).ravel()
+    Grid_el = np.asarray(Grid_el, dtype=np.float64).ravel()
+    flat_value = GridValue.reshape(-1)
+
+    def sample(index, target):
+        return _interp_sweep_grid(
+            np.asarray(vol_azimuth[index], dtype=np.float64),
+            np.asarray(vol_range[index], dtype=np.float64),
+            np.asarray(vol_value[index], dtype=np.float64),
+            Grid_az[target],
+            Grid_range[target],
+            fillvalue,
+            use_nearest_gate,
+        )
+
+    if fix_elevation.size == 1:
+        target = ~(np.abs(Grid_el - fix_elevation[0]) > max(float(beam_width_deg) * 0.5, 0.1))
+        flat_value[target] = sample(0, target)
+        return GridValue
 
+    # bracketing sweeps of every cell; cells below or above the volume use one sweep or stay empty
+    below = Grid_el < fix_elevation[0]
+    above = Grid_el > fix_elevation[-1]
+    upper_index = np.minimum(np.searchsorted(fix_elevation, Grid_el, side="right"), fix_elevation.size - 1)
+    lower_index = upper_index - 1
+    lower_index[below] = upper_index[below] = 0
+    lower_index[above] = upper_index[above] = fix_elevation.size - 1
+    target = np.ones(Grid_el.shape, dtype=bool)
+    if not use_lowest_sweep:
+        target &= ~below
+    if not use_highest_sweep:
+        target &= ~above
+    Grid_el = Grid_el[target]
+    lower_index = lower_index[target]
+    upper_index = upper_index[target]
+
+    IER0 = np.empty(Grid_el.shape, dtype=np.float64)
+    IER1 = np.empty(Grid_el.shape, dtype=np.float64)
+    target_index = np.flatnonzero(target)
+    for index in range(fix_elevation.size):
+        use_lower = lower_index == index
+        use_upper = upper_index == index
+        needed = use_lower | use_upper
+        if not needed.any():
+            continue
+        sweep_value = sample(index, target_index[needed])
+        IER0[use_lower] = sweep_value[use_lower[needed]]
+        IER1[use_upper] = sweep_value[use_upper[needed]]
+    flat_value[target] = np.where(
+        lower_index == upper_index,
+        IER0,
+        _interp_pair(Grid_el, fix_elevation[lower_index], fix_elevation[upper_index], IER0, IER1, fillvalue),
+    )
     return GridValue
 
 
@@ -2,7 +2,9 @@
 Pure-Python mirror of the ``RadarGridC`` Cython module.
 
 When the compiled extension is unavailable, importing ``pycwr.core.RadarGridC``
-will fall back to this source module and preserve the same public API.
+will fall back to this source module and preserve the same public API. The
+gridding functions are the vectorized NumPy kernels of ``RadarGrid``, which
+interpolate whole grids per sweep instead of looping over cells.
 """
 
 from .RadarGrid import (
@@ -2,7 +2,8 @@ import importlib
 import sys
 import warnings
 
-from . import NRadar, PyartRadar, transforms, RadarGrid, interop, RadarProduct
+from . import NRadar, PyartRadar, transforms, RadarGrid, interop, RadarProduct, geometry_cache, sweep_store, \
+    view_cache, shared_arrays
 
 _RADARGRIDC_ABI_WARNING_FRAGMENT = "numpy.ndarray size changed"
 
@@ -53,4 +54,5 @@ def _load_radargrid_backend(import_module=None):
 
 RadarGridC = _load_radargrid_backend()
 
-__all__ = ["NRadar", "PyartRadar", "transforms", "RadarGrid", "RadarGridC", "RadarProduct", "interop"]
+__all__ = ["NRadar", "PyartRadar", "transforms", "RadarGrid", "RadarGridC", "RadarProduct", "interop",
+           "geometry_cache", "sweep_store", "view_cache", "shared_arrays"]
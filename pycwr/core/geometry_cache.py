@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Process-wide cache of sweep gate geometry.
+
+Consecutive volumes from one station nearly always share their range gates, elevations and
+site location, and their azimuth tables differ only by pointing jitter. ``sweep_geometry``
+therefore keys the x/y/z/lon/lat arrays of a sweep on a hash of the site, the exact range
+vector, the azimuth and elevation vectors quantized to ``angle_resolution`` and the effective
+earth radius. A miss computes the geometry from the sweep's own angles; a hit returns the
+geometry of the volume that filled the entry, whose pointing is within half a resolution step.
+Cached arrays are read-only because they are shared between volumes.
+
+The cache is opt-in: its budget defaults to ``PYCWR_GEOMETRY_CACHE_MAX_BYTES`` (0, so every
+volume gets the exact coordinates of its own angles) and the angle resolution to
+``PYCWR_GEOMETRY_ANGLE_RESOLUTION`` (0.1 degree, the typical pointing jitter of CINRAD
+volumes).
+"""
+import hashlib
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .transforms import antenna_vectors_to_cartesian_cwr, cartesian_to_geographic_aeqd, \
+    resolve_effective_earth_radius
+
+GEOMETRY_PARTS = ("x", "y", "z", "lon", "lat")
+DEFAULT_GEOMETRY_CACHE_MAX_BYTES = int(os.environ.get("PYCWR_GEOMETRY_CACHE_MAX_BYTES", "0"))
+DEFAULT_GEOMETRY_ANGLE_RESOLUTION = float(os.environ.get("PYCWR_GEOMETRY_ANGLE_RESOLUTION", "0.1"))
+
+
+def compute_sweep_geometry(ranges, azimuth, elevation, longitude, latitude, altitude, effective_earth_radius=None):
+    """
+    Compute the gate coordinates of one sweep.
+    :return: tuple (x, y, z, lon, lat) of arrays shaped (azimuth, range) //units: m, m, m, degree, degree
+    """
+    x, y, z = antenna_vectors_to_cartesian_cwr(ranges, azimuth, elevation, altitude,
+                                               effective_earth_radius=effective_earth_radius)
+    lon, lat = cartesian_to_geographic_aeqd(x, y, longitude, latitude)
+    return x, y, z, lon, lat
+
+
+class GeometryCache(object):
+    """Thread-safe LRU cache of sweep geometry bounded by a byte budget."""
+
+    def __init__(self, max_bytes=DEFAULT_GEOMETRY_CACHE_MAX_BYTES, angle_resolution=DEFAULT_GEOMETRY_ANGLE_RESOLUTION):
+        """
+        :param max_bytes: budget of the cached arrays; 0 disables caching
+        :param angle_resolution: quantization step of azimuth and elevation in the key //units: degree
+        """
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.max_bytes = 0
+        self.angle_resolution = None
+        self.configure(max_bytes=max_bytes, angle_resolution=angle_resolution)
+
+    def configure(self, max_bytes=None, angle_resolution=None):
+        """
+        Change the budget or the angle resolution; entries beyond a smaller budget are evicted
+        and a new resolution drops every entry.
+        """
+        with self._lock:
+            if angle_resolution is not None:
+                angle_resolution = float(angle_resolution)
+                if not angle_resolution > 0:
+                    raise ValueError("angle_resolution must be positive.")
+                if angle_resolution != self.angle_resolution:
+                    self._items.clear()
+                    self._bytes = 0
+                self.angle_resolution = angle_resolution
+            if max_bytes is not None:
+                max_bytes = int(max_bytes)
+                if max_bytes < 0:
+                    raise ValueError("max_bytes must not be negative.")
+                self.max_bytes = max_bytes
+                self._evict()
+
+    def _evict(self):
+        while self._items and self._bytes > self.max_bytes:
+            _, arrays = self._items.popitem(last=False)
+            self._bytes -= sum(array.nbytes for array in arrays)
+
+    def _quantize(self, angles):
+        return np.rint(np.asarray(angles, dtype=np.float64) / self.angle_resolution).astype(np.int64)
+
+    def _key(self, ranges, azimuth_steps, elevation_steps, longitude, latitude, altitude, effective_earth_radius):
+        digest = hashlib.sha1(struct.pack("<5d", longitude, latitude, altitude, effective_earth_radius,
+                                          self.angle_resolution))
+        digest.update(ranges.dtype.str.encode("ascii"))
+        digest.update(np.ascontiguousarray(ranges).tobytes())
+        for steps in (azimuth_steps, elevation_steps):
+            digest.update(struct.pack("<q", steps.size))
+            digest.update(steps.tobytes())
+        return digest.hexdigest()
+
+    def sweep_geometry(self, ranges, azimuth, elevation, longitude, latitude, altitude, effective_earth_radius=None):
+        """
+        Return the gate coordinates of one sweep, computing and caching them on a miss.
+        :return: tuple (x, y, z, lon, lat) of read-only arrays shaped (azimuth, range); with the
+            cache disabled, the default, the writable arrays of ``compute_sweep_geometry`` are returned
+        """
+        if self.max_bytes <= 0:
+            return compute_sweep_geometry(ranges, azimuth, elevation, longitude, latitude, altitude,
+                                          effective_earth_radius)
+        ranges = np.asarray(ranges)
+        azimuth = np.asarray(azimuth)
+        elevation = np.asarray(elevation)
+        resolution = self.angle_resolution
+        azimuth_steps = self._quantize(azimuth)
+        elevation_steps = self._quantize(elevation)
+        effective_earth_radius = resolve_effective_earth_radius(effective_earth_radius)
+        key = self._key(ranges, azimuth_steps, elevation_steps, float(longitude), float(latitude), float(altitude),
+                        float(effective_earth_radius))
+        with self._lock:
+            arrays = self._items.get(key)
+            if arrays is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return arrays
+            self.misses += 1
+        # the quantized angles are only the key; the entry holds this sweep's exact geometry
+        arrays = compute_sweep_geometry(ranges, azimuth, elevation, longitude, latitude, altitude,
+                                        effective_earth_radius)
+        for array in arrays:
+            array.setflags(write=False)
+        nbytes = sum(array.nbytes for array in arrays)
+        with self._lock:
+            if resolution == self.angle_resolution and nbytes <= self.max_bytes and key not in self._items:
+                self._items[key] = arrays
+                self._bytes += nbytes
+                self._evict()
+        return arrays
+
+    def info(self):
+        """:return: dict with entries, bytes, max_bytes, hits, misses and angle_resolution"""
+        with self._lock:
+            return {"entries": len(self._items), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses, "angle_resolution": self.angle_resolution}
+
+    def clear(self):
+        """Drop every entry and reset the hit counters."""
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+GEOMETRY_CACHE = GeometryCache()
+
+
+def sweep_geometry(ranges, azimuth, elevation, longitude, latitude, altitude, effective_earth_radius=None):
+    """Return the gate coordinates of one sweep through the process-wide ``GEOMETRY_CACHE``."""
+    return GEOMETRY_CACHE.sweep_geometry(ranges, azimuth, elevation, longitude, latitude, altitude,
+                                         effective_earth_radius)
+
+
+def geometry_cache_info():
+    """Return the statistics of the process-wide geometry cache."""
+    return GEOMETRY_CACHE.info()
+
+
+def clear_geometry_cache():
+    """Empty the process-wide geometry cache."""
+    GEOMETRY_CACHE.clear()
+
+
+def configure_geometry_cache(max_bytes=None, angle_resolution=None):
+    """
+    Resize the process-wide geometry cache or change its angle resolution.
+    :param max_bytes: new budget in bytes; 0 disables the cache
+    :param angle_resolution: new quantization step of the key angles //units: degree
+    """
+    GEOMETRY_CACHE.configure(max_bytes=max_bytes, angle_resolution=angle_resolution)
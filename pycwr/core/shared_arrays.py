@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Shared-memory transport of NumPy arrays for pickled radar volumes.
+
+``SharedArrayExporter.share`` moves the arrays of an object into ``multiprocessing.shared_memory``
+blocks, one block per underlying buffer, so the sweeps sliced from one volume array share a
+block. Afterwards ``dumps`` pickles every array living in such a block as a reference (block
+name, offset, shape, dtype, strides) that ``attach_shared_array`` maps zero-copy in the
+receiving process; other arrays are pickled by value. The exporting process owns the blocks
+and unlinks them in ``release`` or when the exporter is garbage collected. Its own arrays stay
+writable, and writes are seen by every process that attached them; attached arrays are
+read-only.
+"""
+import io
+import pickle
+import sys
+import threading
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+DEFAULT_SHARED_MIN_BYTES = 64 * 1024
+
+
+class SharedBuffer(object):
+    """
+    Array provider keeping a shared memory block mapped while any array built on it is alive.
+    Arrays created with ``np.asarray`` use this object as their base.
+    """
+
+    def __init__(self, block, shape=None, dtype=np.uint8, attachable=True):
+        """
+        :param block: open ``SharedMemory`` block
+        :param shape: shape of the provided array, default the whole block as bytes
+        :param attachable: whether other processes can still attach the block by name
+        """
+        shape = (block.size,) if shape is None else shape
+        self._view = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        self._block = block
+        self.name = block.name if attachable else None
+        self.__array_interface__ = self._view.__array_interface__
+
+    def __del__(self):
+        self._view = None
+        self._block.close()
+
+
+_ATTACHED = weakref.WeakValueDictionary()
+_ATTACH_LOCK = threading.Lock()
+
+
+def _open_block(name):
+    if sys.version_info >= (3, 13):
+        # the exporting process owns the block, so it must not be tracked (and unlinked) here
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def attach_shared_array(name, offset, shape, dtype, strides, writeable=False):
+    """Map an array living in the shared memory block ``name`` without copying it."""
+    with _ATTACH_LOCK:
+        buffer = _ATTACHED.get(name)
+        if buffer is None:
+            buffer = SharedBuffer(_open_block(name))
+            _ATTACHED[name] = buffer
+    array = np.ndarray(tuple(shape), dtype=np.dtype(dtype), buffer=np.asarray(buffer), offset=int(offset),
+                       strides=tuple(strides))
+    array.flags.writeable = bool(writeable)
+    return array
+
+
+def shared_reference(array):
+    """
+    Return the ``attach_shared_array`` arguments of an array living in an attachable shared
+    memory block, or None.
+    """
+    root = _root(array)
+    if not isinstance(root.base, SharedBuffer) or root.base.name is None:
+        return None
+    return root.base.name, _address(array) - _address(root), array.shape, array.dtype.str, array.strides
+
+
+def _root(array):
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+
+def _address(array):
+    return array.__array_interface__["data"][0]
+
+
+def _unlink_blocks(blocks):
+    for block in blocks:
+        with _ATTACH_LOCK:
+            # arrays still mapped from an unlinked block can no longer be sent by reference
+            buffer = _ATTACHED.pop(block.name, None)
+            if buffer is not None:
+                buffer.name = None
+        block.close()
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+    blocks.clear()
+
+
+class SharedArrayExporter(object):
+    """Owner of the shared memory blocks holding the arrays of one object."""
+
+    def __init__(self, min_bytes=DEFAULT_SHARED_MIN_BYTES):
+        """
+        :param min_bytes: arrays smaller than this are left in private memory
+        """
+        self.min_bytes = int(min_bytes)
+        self._lock = threading.Lock()
+        self._blocks = []
+        self._finalizer = weakref.finalize(self, _unlink_blocks, self._blocks)
+
+    @property
+    def nbytes(self):
+        """Bytes held in shared memory blocks."""
+        with self._lock:
+            return sum(block.size for block in self._blocks)
+
+    def _export(self, array, exported):
+        """Copy the buffer behind ``array`` into a new block once per ``share`` call."""
+        reference = shared_reference(array)
+        if reference is not None:
+            return reference + (array.flags.writeable,)
+        if array.dtype.hasobject or array.size == 0:
+            return None
+        root = _root(array)
+        # holding the root in ``exported`` keeps its id unique for the whole call
+        name = exported.get(id(root), (None, None))[1]
+        if name is None:
+            if array.nbytes < self.min_bytes or not root.flags.c_contiguous:
+                return None
+            block = shared_memory.SharedMemory(create=True, size=max(root.nbytes, 1))
+            with self._lock:
+                self._blocks.append(block)
+            np.ndarray(root.shape, dtype=root.dtype, buffer=block.buf)[...] = root
+            name = block.name
+            exported[id(root)] = (root, name)
+        return name, _address(array) - _address(root), array.shape, array.dtype.str, array.strides, True
+
+    def share(self, value):
+        """
+        Return a copy of ``value`` whose arrays of at least ``min_bytes`` live in shared memory.
+        Arrays already in an attachable block are kept as they are.
+        """
+        exported = {}
+        stream = io.BytesIO()
+        _SharedPickler(stream, lambda array: self._export(array, exported)).dump(value)
+        del exported
+        return pickle.loads(stream.getvalue())
+
+    def release(self):
+        """Unlink every block; arrays already mapped, here or elsewhere, stay valid."""
+        with self._lock:
+            _unlink_blocks(self._blocks)
+
+
+def dumps(value):
+    """Pickle ``value`` with the arrays living in shared memory replaced by references."""
+    stream = io.BytesIO()
+    _SharedPickler(stream, shared_reference).dump(value)
+    return stream.getvalue()
+
+
+class _SharedPickler(pickle.Pickler):
+    def __init__(self, stream, reference):
+        super(_SharedPickler, self).__init__(stream, protocol=pickle.HIGHEST_PROTOCOL)
+        self.reference = reference
+
+    def reducer_override(self, obj):
+        if isinstance(obj, np.ndarray):
+            reference = self.reference(obj)
+            if reference is not None:
+                return attach_shared_array, reference
+        return NotImplemented
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""
+Array-backed storage of the sweeps behind ``PRD.fields``.
+
+A ``SweepStore`` keeps every sweep as views into the volume arrays handed to ``PRD`` (one
+contiguous (ray, gate) array per moment plus the ray and gate coordinates) together with a
+shared table of variable attributes. ``store[i]`` builds the sweep ``xarray.Dataset`` the
+first time it is requested and keeps it, so code that edits the Dataset in place (QC, HID,
+user scripts) sees its changes persist; from then on that Dataset is the sweep's source of
+truth. Hot paths use ``field_names``, ``values`` and ``variable`` instead, which read the
+raw arrays of sweeps that were never materialized.
+"""
+from collections.abc import MutableSequence
+
+import numpy as np
+import xarray as xr
+from xarray.backends import BackendArray
+from xarray.core import indexing
+
+from ..configure.default_config import DEFAULT_METADATA, CINRAD_field_mapping
+from .geometry_cache import GEOMETRY_PARTS, compute_sweep_geometry, sweep_geometry
+
+RAY_COORDINATES = ("azimuth", "elevation", "time")
+SWEEP_DIMS = ("time", "range")
+
+_FIELD_ATTRS = {}
+
+
+def field_attrs(name):
+    """Return the shared default attributes of a moment; callers must not modify them."""
+    attrs = _FIELD_ATTRS.get(name)
+    if attrs is None:
+        mapped_name = CINRAD_field_mapping.get(name, name)
+        attrs = DEFAULT_METADATA.get(mapped_name, {
+            'units': 'unknown',
+            'standard_name': mapped_name,
+            'long_name': mapped_name,
+            'coordinates': 'elevation azimuth range'})
+        _FIELD_ATTRS[name] = attrs
+    return attrs
+
+
+class _SweepGeometry(object):
+    """
+    Gate coordinates of one sweep, computed on first use.
+    x, y, z (m) and lon, lat (degree) are fetched together from the process-wide geometry cache
+    the first time any of them is read and kept afterwards, so polar-only consumers never pay
+    for them and volumes sharing a scan pattern share the arrays.
+    """
+
+    def __init__(self, ranges, azimuth, elevation, longitude, latitude, altitude, effective_earth_radius):
+        self.ranges = np.asarray(ranges)
+        self.azimuth = np.asarray(azimuth)
+        self.elevation = np.asarray(elevation)
+        self.longitude = longitude
+        self.latitude = latitude
+        self.altitude = altitude
+        self.effective_earth_radius = effective_earth_radius
+        self.shape = (self.azimuth.shape[0], self.ranges.shape[0])
+        # dtypes follow the inputs (float32 ranges give float32 x/y/z), so probe them on one gate
+        probe = compute_sweep_geometry(self.ranges[:1], self.azimuth[:1], self.elevation[:1], self.longitude,
+                                       self.latitude, self.altitude, self.effective_earth_radius)
+        self.dtypes = {part: np.asarray(value).dtype for part, value in zip(GEOMETRY_PARTS, probe)}
+        self._arrays = None
+
+    @property
+    def computed(self):
+        return self._arrays is not None
+
+    def arrays(self):
+        """:return: dict of the x, y, z, lon and lat arrays, shape (time, range)"""
+        if self._arrays is None:
+            self._arrays = dict(zip(GEOMETRY_PARTS, sweep_geometry(
+                self.ranges, self.azimuth, self.elevation, self.longitude, self.latitude, self.altitude,
+                self.effective_earth_radius)))
+        return self._arrays
+
+    def subset(self, rays, gates):
+        """
+        Geometry of a ray and gate selection.
+        :return: views of the arrays when they are already computed, else a new lazy geometry
+        """
+        if self._arrays is not None:
+            return tuple(self._arrays[part][rays, gates] for part in GEOMETRY_PARTS)
+        return _SweepGeometry(self.ranges[gates], self.azimuth[rays], self.elevation[rays], self.longitude,
+                              self.latitude, self.altitude, self.effective_earth_radius)
+
+    def variables(self, attrs=None):
+        """
+        :param attrs: optional {part: attrs} of the coordinate variables
+        :return: {part: xarray.Variable} over (time, range), computed when first read
+        """
+        attrs = attrs or {}
+        return {part: xr.Variable(SWEEP_DIMS, indexing.LazilyIndexedArray(_GeometryArray(self, part)),
+                                  attrs=attrs.get(part)) for part in GEOMETRY_PARTS}
+
+
+class _GeometryArray(BackendArray):
+    """xarray backend array serving one part of a ``_SweepGeometry``."""
+
+    def __init__(self, geometry, part):
+        self.geometry = geometry
+        self.part = part
+        self.shape = geometry.shape
+        self.dtype = geometry.dtypes[part]
+
+    def __getitem__(self, key):
+        return indexing.explicit_indexing_adapter(key, self.shape, indexing.IndexingSupport.OUTER_1VECTOR,
+                                                  self._getitem)
+
+    def _getitem(self, key):
+        return self.geometry.arrays()[self.part][key]
+
+
+class _SweepArrays(object):
+    """Views of one sweep that has not been materialized as a Dataset."""
+
+    __slots__ = ("coords", "fields", "geometry")
+
+    def __init__(self, coords, fields, geometry):
+        """
+        :param coords: dict with the time, azimuth, elevation and range arrays
+        :param fields: {name: (time, range) ndarray or xarray.Variable}
+        :param geometry: ``_SweepGeometry`` or precomputed (x, y, z, lon, lat) arrays
+        """
+        self.coords = coords
+        self.fields = fields
+        self.geometry = geometry
+
+    def geometry_variables(self):
+        attrs = {part: DEFAULT_METADATA[part] for part in GEOMETRY_PARTS}
+        if isinstance(self.geometry, _SweepGeometry):
+            return self.geometry.variables(attrs)
+        return {part: xr.Variable(SWEEP_DIMS, values, attrs=attrs[part])
+                for part, values in zip(GEOMETRY_PARTS, self.geometry)}
+
+    def coordinate_values(self, name):
+        if name in self.coords:
+            return self.coords[name]
+        if isinstance(self.geometry, _SweepGeometry):
+            return self.geometry.arrays()[name]
+        return self.geometry[GEOMETRY_PARTS.index(name)]
+
+    def variable(self, name):
+        data = self.fields[name]
+        if isinstance(data, xr.Variable):
+            return data
+        return xr.Variable(SWEEP_DIMS, data, attrs=field_attrs(name))
+
+    def coordinate_variables(self):
+        geometry = self.geometry_variables()
+        # same coordinate order as the Datasets PRD has always built
+        return {
+            'azimuth': xr.Variable(('time',), self.coords['azimuth'], attrs=DEFAULT_METADATA['azimuth']),
+            'elevation': xr.Variable(('time',), self.coords['elevation'], attrs=DEFAULT_METADATA['elevation']),
+            'x': geometry['x'],
+            'y': geometry['y'],
+            'z': geometry['z'],
+            'lat': geometry['lat'],
+            'lon': geometry['lon'],
+            'range': xr.Variable(('range',), self.coords['range'], attrs=DEFAULT_METADATA['range']),
+            'time': xr.Variable(('time',), self.coords['time'], attrs=DEFAULT_METADATA['time']),
+        }
+
+    def subset(self, field_names, rays, gates):
+        """Select fields, rays and gates; slices give views of the arrays."""
+        coords = {name: values[rays] for name, values in self.coords.items() if name != "range"}
+        coords["range"] = self.coords["range"][gates]
+        if isinstance(self.geometry, _SweepGeometry):
+            geometry = self.geometry.subset(rays, gates)
+        else:
+            geometry = tuple(values[rays, gates] for values in self.geometry)
+        fields = {name: data[rays, gates] for name, data in self.fields.items()
+                  if field_names is None or name in field_names}
+        return _SweepArrays(coords, fields, geometry)
+
+    def to_dataset(self):
+        return xr.Dataset(data_vars={name: self.variable(name) for name in self.fields},
+                          coords=self.coordinate_variables())
+
+    def to_data_array(self, name):
+        return xr.DataArray(self.variable(name), coords=self.coordinate_variables(), name=name)
+
+
+class SweepStore(MutableSequence):
+    """
+    List of sweeps that builds each sweep ``xarray.Dataset`` on first access.
+    Items can be replaced, inserted or removed like in a list; assigned items are Datasets.
+    """
+
+    def __init__(self, sweeps=()):
+        self._items = list(sweeps)
+
+    @classmethod
+    def from_volume(cls, fields, time, ranges, azimuth, elevation, sweep_start_ray_index, sweep_end_ray_index,
+                    bins_per_sweep, longitude, latitude, altitude, effective_earth_radius, sweep_geometry=None):
+        """
+        Slice volume arrays into sweeps without copying them.
+        :param fields: {name: (nrays, nbins) array}
+        :param sweep_geometry: optional precomputed (x, y, z, lon, lat) arrays per sweep
+        """
+        # decode datetimes once, as xarray would for every sweep Dataset
+        time = xr.Variable(("time",), time).values
+        sweeps = []
+        for idx, (istart, iend) in enumerate(zip(sweep_start_ray_index, sweep_end_ray_index)):
+            rays = slice(int(istart), int(iend) + 1)
+            nbins = int(bins_per_sweep[idx])
+            coords = {"time": time[rays], "azimuth": azimuth[rays], "elevation": elevation[rays],
+                      "range": ranges[:nbins]}
+            if sweep_geometry is not None:
+                # (x, y, z, lon, lat) already computed for this earth radius, e.g. by a worker process
+                geometry = tuple(sweep_geometry[idx])
+            else:
+                geometry = _SweepGeometry(coords["range"], coords["azimuth"], coords["elevation"], longitude,
+                                          latitude, altitude, effective_earth_radius)
+            sweeps.append(_SweepArrays(coords, {name: values[rays, :nbins] for name, values in fields.items()},
+                                       geometry))
+        return cls(sweeps)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _materialize(self, index):
+        item = self._items[index]
+        if isinstance(item, _SweepArrays):
+            item = item.to_dataset()
+            self._items[index] = item
+        return item
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(len(self._items))[index]]
+        return self._materialize(index)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self._items[index] = list(value)
+        else:
+            self._items[index] = value
+
+    def __delitem__(self, index):
+        del self._items[index]
+
+    def insert(self, index, value):
+        self._items.insert(index, value)
+
+    def __repr__(self):
+        materialized = sum(not isinstance(item, _SweepArrays) for item in self._items)
+        return "<SweepStore: %d sweeps, %d materialized>" % (len(self._items), materialized)
+
+    def is_materialized(self, sweep):
+        """Return whether sweep ``sweep`` is held as an xarray Dataset."""
+        return not isinstance(self._items[sweep], _SweepArrays)
+
+    def field_names(self, sweep):
+        """Return the data variable names of one sweep."""
+        item = self._items[sweep]
+        if isinstance(item, _SweepArrays):
+            return list(item.fields)
+        return list(item.data_vars)
+
+    def has_field(self, sweep, name):
+        item = self._items[sweep]
+        if isinstance(item, _SweepArrays):
+            return name in item.fields
+        return name in item.data_vars
+
+    def sizes(self, sweep):
+        """Return (rays, gates) of one sweep."""
+        item = self._items[sweep]
+        if isinstance(item, _SweepArrays):
+            return item.coords["azimuth"].shape[0], item.coords["range"].shape[0]
+        return item.sizes.get("time", item.sizes.get("azimuth")), item.sizes["range"]
+
+    def values(self, sweep, name):
+        """
+        Return the values of a data variable or coordinate of one sweep as a NumPy array,
+        without building the sweep Dataset; packed moments are decoded.
+        """
+        item = self._items[sweep]
+        if isinstance(item, _SweepArrays):
+            if name in item.fields:
+                data = item.fields[name]
+                return data.values if isinstance(data, xr.Variable) else data
+            if name in item.coords or name in GEOMETRY_PARTS:
+                return item.coordinate_values(name)
+            raise KeyError(name)
+        return item[name].values
+
+    def variable(self, sweep, name):
+        """Return a data variable of one sweep as an ``xarray.Variable``."""
+        item = self._items[sweep]
+        if isinstance(item, _SweepArrays):
+            return item.variable(name)
+        return item[name].variable
+
+    def set_variable(self, sweep, name, variable):
+        """Add or replace a data variable of one sweep without building its Dataset."""
+        item = self._items[sweep]
+        if isinstance(item, _SweepArrays):
+            if tuple(variable.dims) != SWEEP_DIMS:
+                raise ValueError("Sweep variables must have dims %s." % (SWEEP_DIMS,))
+            item.fields[name] = variable
+        else:
+            item[name] = variable
+
+    def subset(self, sweep_index, field_names=None, rays=None, gates=None):
+        """
+        Select sweeps, fields, rays and gates without copying the sweep arrays.
+        :param sweep_index: sweeps to keep, in their new order
+        :param field_names: data variables to keep; None keeps all of them
+        :param rays: optional slice or index array of rays for every kept sweep
+        :param gates: optional slice of gates for every kept sweep
+        :return: SweepStore whose sweeps are views when rays and gates are slices
+        """
+        sweeps = []
+        for position, sweep in enumerate(sweep_index):
+            item = self._items[sweep]
+            ray_key = slice(None) if rays is None else rays[position]
+            gate_key = slice(None) if gates is None else gates[position]
+            if isinstance(item, _SweepArrays):
+                sweeps.append(item.subset(field_names, ray_key, gate_key))
+                continue
+            ray_dim = "time" if "time" in item.dims else "azimuth"
+            if field_names is not None:
+                item = item[[name for name in item.data_vars if name in field_names]]
+            sweeps.append(item.isel({ray_dim: ray_key, "range": gate_key}))
+        return SweepStore(sweeps)
+
+    def data_array(self, sweep, name):
+        """Return one data variable of a sweep as a DataArray with the sweep coordinates."""
+        item = self._items[sweep]
+        if isinstance(item, _SweepArrays):
+            if name not in item.fields:
+                raise KeyError(name)
+            return item.to_data_array(name)
+        return item[name]
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Byte-bounded cache of the derived views a ``PRD`` builds on demand.
+
+A PRD caches gridding volumes (``vol``), Py-ART and xradar exports (``pyart``, ``xradar``),
+native-range and aligned sweep fields (``native_field``, ``sweep_field``) and azimuth-sorted
+sweeps (``sorted_sweep``). All of them share one ``ViewCache`` with a single byte budget and
+least-recently-used eviction, so a long-lived PRD that serves many fields, range modes and
+``max_range_km`` values keeps a bounded footprint. Each kind is exposed as a dict-like
+``CacheView``.
+
+Entry sizes count the NumPy arrays owned by the cached object. Views into the volume arrays
+and lazily decoded or lazily computed data are free, because the cache does not keep extra
+memory alive for them. The default budget is ``PYCWR_PRD_CACHE_MAX_BYTES`` (256 MiB per PRD);
+a budget of 0 disables caching.
+"""
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+import numpy as np
+import xarray as xr
+
+CACHE_KINDS = ("vol", "pyart", "xradar", "native_field", "sweep_field", "sorted_sweep")
+DEFAULT_VIEW_CACHE_MAX_BYTES = int(os.environ.get("PYCWR_PRD_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# attribute depth followed into foreign objects such as Py-ART radars
+_MAX_OBJECT_DEPTH = 3
+_MISSING = object()
+
+
+def estimate_nbytes(value):
+    """
+    Estimate the memory a cached object keeps alive.
+    :return: bytes of the distinct NumPy arrays owning their data that ``value`` references
+    """
+    return _nbytes(value, set(), 0)
+
+
+def _nbytes(value, seen, depth):
+    if value is None or isinstance(value, (str, bytes, int, float, bool)) or id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, np.ndarray):
+        return value.nbytes if value.flags.owndata else 0
+    if isinstance(value, xr.Variable):
+        # never touch .values, which would load lazy data
+        return _nbytes(value._data, seen, depth) if isinstance(value._data, np.ndarray) else 0
+    if isinstance(value, (xr.DataArray, xr.Dataset)):
+        variables = [value.variable] + list(value.coords.variables.values()) \
+            if isinstance(value, xr.DataArray) else list(value.variables.values())
+        return sum(_nbytes(variable, seen, depth) for variable in variables)
+    if hasattr(value, "subtree") and hasattr(value, "ds"):
+        # xarray DataTree
+        return sum(_nbytes(node.ds, seen, depth) for node in value.subtree)
+    if isinstance(value, dict):
+        return sum(_nbytes(item, seen, depth) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(item, seen, depth) for item in value)
+    if depth < _MAX_OBJECT_DEPTH and hasattr(value, "__dict__"):
+        return sum(_nbytes(item, seen, depth + 1) for item in vars(value).values())
+    return 0
+
+
+class ViewCache(object):
+    """Thread-safe LRU of derived PRD views bounded by a byte budget."""
+
+    def __init__(self, max_bytes=None):
+        """
+        :param max_bytes: budget of the cached views; 0 disables caching, None uses the default
+        """
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+        self._stats = {kind: {"entries": 0, "bytes": 0, "hits": 0, "misses": 0} for kind in CACHE_KINDS}
+        self._bytes = 0
+        self.max_bytes = DEFAULT_VIEW_CACHE_MAX_BYTES
+        self.configure(max_bytes=max_bytes)
+
+    def __getstate__(self):
+        # cached views are derived data; copies and pickles start empty
+        return {"max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(max_bytes=state["max_bytes"])
+
+    @staticmethod
+    def _check_kind(kind):
+        if kind not in CACHE_KINDS:
+            raise ValueError("kind must be one of %s, got %r." % (", ".join(CACHE_KINDS), kind))
+
+    def configure(self, max_bytes=None):
+        """Change the budget; entries beyond a smaller budget are evicted."""
+        if max_bytes is None:
+            return
+        max_bytes = int(max_bytes)
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative.")
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def _pop(self, item_key):
+        _, nbytes = self._items.pop(item_key)
+        stats = self._stats[item_key[0]]
+        stats["entries"] -= 1
+        stats["bytes"] -= nbytes
+        self._bytes -= nbytes
+
+    def _evict(self):
+        while self._items and self._bytes > self.max_bytes:
+            self._pop(next(iter(self._items)))
+
+    def get(self, kind, key, default=None):
+        """Return a cached view and mark it as recently used, or ``default``."""
+        item_key = (kind, key)
+        with self._lock:
+            item = self._items.get(item_key)
+            if item is None:
+                self._stats[kind]["misses"] += 1
+                return default
+            self._items.move_to_end(item_key)
+            self._stats[kind]["hits"] += 1
+            return item[0]
+
+    def contains(self, kind, key):
+        with self._lock:
+            return (kind, key) in self._items
+
+    def put(self, kind, key, value):
+        """Cache ``value``; views larger than the whole budget are not kept."""
+        self._check_kind(kind)
+        nbytes = estimate_nbytes(value)
+        item_key = (kind, key)
+        with self._lock:
+            if item_key in self._items:
+                self._pop(item_key)
+            if nbytes > self.max_bytes:
+                return
+            self._items[item_key] = (value, nbytes)
+            self._stats[kind]["entries"] += 1
+            self._stats[kind]["bytes"] += nbytes
+            self._bytes += nbytes
+            self._evict()
+
+    def discard(self, kind, key):
+        with self._lock:
+            if (kind, key) in self._items:
+                self._pop((kind, key))
+
+    def keys(self, kind):
+        with self._lock:
+            return [key for item_kind, key in self._items if item_kind == kind]
+
+    def clear(self, kind=None):
+        """Drop every entry, or only the entries of one kind."""
+        if kind is not None:
+            self._check_kind(kind)
+        with self._lock:
+            for item_key in [item_key for item_key in self._items if kind is None or item_key[0] == kind]:
+                self._pop(item_key)
+
+    def info(self):
+        """:return: dict with max_bytes, total entries, bytes, hits and misses, and the same per kind"""
+        with self._lock:
+            caches = {kind: dict(stats) for kind, stats in self._stats.items()}
+        return {
+            "max_bytes": self.max_bytes,
+            "entries": sum(stats["entries"] for stats in caches.values()),
+            "bytes": sum(stats["bytes"] for stats in caches.values()),
+            "hits": sum(stats["hits"] for stats in caches.values()),
+            "misses": sum(stats["misses"] for stats in caches.values()),
+            "caches": caches,
+        }
+
+    def view(self, kind):
+        """Return the dict-like view of one kind."""
+        self._check_kind(kind)
+        return CacheView(self, kind)
+
+
+class CacheView(MutableMapping):
+    """Dict-like access to the entries of one kind of a ``ViewCache``."""
+
+    def __init__(self, cache, kind):
+        self.cache = cache
+        self.kind = kind
+
+    def __getitem__(self, key):
+        value = self.cache.get(self.kind, key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        return self.cache.get(self.kind, key, default)
+
+    def __contains__(self, key):
+        return self.cache.contains(self.kind, key)
+
+    def __setitem__(self, key, value):
+        self.cache.put(self.kind, key, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.cache.discard(self.kind, key)
+
+    def __iter__(self):
+        return iter(self.cache.keys(self.kind))
+
+    def __len__(self):
+        return len(self.cache.keys(self.kind))
+
+    def clear(self):
+        self.cache.clear(self.kind)
+
+    def __repr__(self):
+        return "<CacheView %s: %d entries>" % (self.kind, len(self))
+
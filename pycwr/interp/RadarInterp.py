@@ -32,8 +32,10 @@ from ..core.RadarProduct import (
     derive_et as _derive_et_impl,
     derive_vil as _derive_vil_impl,
 )
+from ..core.NRadar import PRD
 from ..core.transforms import cartesian_xyz_to_antenna
-from ..io import read_auto
+from ..io import read_auto, read_metadata
+from ..io.archive_index import ArchiveIndex
 from ..io.util import get_radar_info
 
 try:
@@ -288,6 +290,21 @@ def _resolve_qc_field_name(field_name, use_qc):
     return corrected.get(field_name, field_name)
 
 
+def _resolve_read_fields(field_names, use_qc, qc_weight_field=None):
+    """Return the moments a worker must decode for the requested fields and QC mode."""
+    requested = ["dBZ"] + list(field_names)
+    if use_qc:
+        requested.extend(["ZDR", "PhiDP", "KDP", "CC", "SNRH"])
+        if qc_weight_field:
+            requested.append(qc_weight_field)
+    read_fields = []
+    for field_name in requested:
+        for candidate in PRD.field_alias_candidates(field_name):
+            if candidate not in read_fields:
+                read_fields.append(candidate)
+    return read_fields
+
+
 def _normalize_blind_method(blind_method):
     blind_method = "mask" if blind_method is None else str(blind_method).lower()
     valid_methods = {"mask", "nearest_gate", "lowest_sweep", "hybrid", "nearest_valid"}
@@ -310,17 +327,13 @@ def _radar_supports_dualpol_qc(prd):
     return True
 
 
-def _get_prd_station_info(prd):
-    """Extract radar site latitude, longitude, and altitude from PRD metadata."""
-    scan_info = getattr(prd, "scan_info", None)
-    if scan_info is None:
-        raise ValueError("Radar object does not provide scan_info.")
-    altitude = float(scan_info["altitude"].values) if "altitude" in scan_info else 0.0
-    return (
-        float(scan_info["latitude"].values),
-        float(scan_info["longitude"].values),
-        altitude,
-    )
+def _get_header_station_info(path):
+    """Read radar site latitude, longitude, and altitude from the file headers."""
+    metadata = read_metadata(path)
+    if metadata["latitude"] is None or metadata["longitude"] is None:
+        raise ValueError("Radar file does not record its site location: %s" % path)
+    altitude = metadata["altitude"] if metadata["altitude"] is not None else 0.0
+    return float(metadata["latitude"]), float(metadata["longitude"]), float(altitude)
 
 
 def parse_radar_time_from_filename(path):
@@ -331,11 +344,72 @@ def parse_radar_time_from_filename(path):
     return datetime.strptime(match.group(1), "%Y%m%d%H%M%S")
 
 
-def discover_radar_files(radar_dirs, pattern="*.bin*"):
-    """Collect candidate radar files under each configured radar directory."""
+def _get_radar_scan_time(path):
+    """Return the scan time from the filename, or from the file headers when the name carries none."""
+    try:
+        return parse_radar_time_from_filename(path)
+    except ValueError:
+        pass
+    try:
+        scan_time = read_metadata(path)["start_time"]
+    except Exception:
+        scan_time = None
+    if scan_time is None:
+        raise ValueError("Unable to determine scan time for radar file: %s" % path)
+    return scan_time
+
+
+def _coerce_archive_index(index):
+    """Return an ``ArchiveIndex`` for an index instance or database path, or None."""
+    if index is None or isinstance(index, ArchiveIndex):
+        return index
+    return ArchiveIndex(index)
+
+
+def _indexed_radar_directories(radar_dirs, index):
+    """Refresh ``index`` for the existing radar directories and return them as absolute paths."""
+    directories = [Path(radar_dir).absolute() for radar_dir in radar_dirs]
+    directories = [directory for directory in directories if directory.is_dir()]
+    if directories:
+        index.update(directories)
+    return directories
+
+
+def _index_query_scope(directory, pattern):
+    """
+    Translate a ``Path.glob`` pattern below ``directory`` into ``ArchiveIndex.query`` keywords.
+    Only file name patterns, optionally prefixed by ``**/`` for the whole subtree, have an index
+    equivalent; other path-style patterns raise ValueError.
+    """
+    parts = str(pattern).replace(os.sep, "/").split("/")
+    recursive = False
+    while len(parts) > 1 and parts[0] == "**":
+        recursive = True
+        parts.pop(0)
+    if len(parts) != 1 or parts[0] in ("", ".", "..", "**"):
+        raise ValueError("pattern %r has no archive index equivalent; use a file name pattern such as "
+                         "'*.bin*', optionally prefixed by '**/'." % pattern)
+    scope = {"root": directory} if recursive else {"directories": [directory]}
+    return dict(scope, pattern=parts[0])
+
+
+def discover_radar_files(radar_dirs, pattern="*.bin*", index=None):
+    """
+    Collect candidate radar files under each configured radar directory.
+    :param index: optional ``ArchiveIndex`` or index database path; the directories are refreshed
+        incrementally and listed from the index instead of being globbed on every call, in which case
+        ``pattern`` must be a file name pattern, optionally prefixed by ``**/``
+    """
     if not radar_dirs:
         raise ValueError("radar_dirs must contain at least one directory.")
+    index = _coerce_archive_index(index)
     radar_files = {}
+    if index is not None:
+        for directory in _indexed_radar_directories(radar_dirs, index):
+            matches = sorted(Path(row["path"]) for row in index.query(**_index_query_scope(directory, pattern)))
+            if matches:
+                radar_files[directory.name] = matches
+        return radar_files
     for radar_dir in radar_dirs:
         directory = Path(radar_dir)
         if not directory.is_dir():
@@ -346,20 +420,45 @@ def discover_radar_files(radar_dirs, pattern="*.bin*"):
     return radar_files
 
 
-def select_radar_files(radar_dirs, target_time, tolerance_minutes=10, pattern="*.bin*"):
-    """Select the nearest-in-time file from each radar directory."""
+def select_radar_files(radar_dirs, target_time, tolerance_minutes=10, pattern="*.bin*", index=None):
+    """
+    Select the nearest-in-time file from each radar directory.
+    :param index: optional ``ArchiveIndex`` or index database path; candidates are then looked up by
+        an indexed scan-time window instead of reading the time of every file in the directories;
+        files the index could not date are dated as without an index, so either way a matching file
+        without a scan time raises ValueError
+    """
     if target_time is None:
         raise ValueError("target_time is required.")
     if isinstance(target_time, str):
         target_time = datetime.fromisoformat(target_time)
     tolerance_seconds = float(tolerance_minutes) * 60.0
+    index = _coerce_archive_index(index)
+    if index is not None:
+        if not radar_dirs:
+            raise ValueError("radar_dirs must contain at least one directory.")
+        window = timedelta(seconds=tolerance_seconds)
+        candidates = []
+        for directory in _indexed_radar_directories(radar_dirs, index):
+            scope = _index_query_scope(directory, pattern)
+            rows = index.query(start=target_time - window, end=target_time + window, **scope)
+            files = [(Path(row["path"]), row["scan_time"]) for row in rows]
+            # e.g. files indexed with detect_format=False whose names carry no time
+            files += [(Path(row["path"]), _get_radar_scan_time(row["path"]))
+                      for row in index.query(undated=True, **scope)]
+            # glob order, so equally distant scans resolve to the same file
+            candidates.append((directory.name, sorted(files, key=lambda item: item[0])))
+    else:
+        candidates = [
+            (radar_id, ((path, _get_radar_scan_time(path)) for path in files))
+            for radar_id, files in discover_radar_files(radar_dirs, pattern=pattern).items()
+        ]
     selected = []
-    for radar_id, files in discover_radar_files(radar_dirs, pattern=pattern).items():
+    for radar_id, files in candidates:
         best_path = None
         best_delta = None
         best_time = None
-        for path in files:
-            scan_time = parse_radar_time_from_filename(path)
+        for path, scan_time in files:
             delta_seconds = abs((scan_time - target_time).total_seconds())
             if (best_delta is None) or (delta_seconds < best_delta):
                 best_delta = delta_seconds
@@ -1109,6 +1208,7 @@ def _prepare_radar_grid_worker(
         station_lat=station_lat,
         station_alt=station_alt,
         effective_earth_radius=effective_earth_radius,
+        fields=_resolve_read_fields(field_names, use_qc, qc_weight_field),
     )
     radar_lon = float(station_lon)
     radar_lat = float(station_lat)
@@ -1662,6 +1762,7 @@ def run_radar_network_3d(
     pattern=None,
     lon_0=None,
     lat_0=None,
+    archive_index=None,
 ):
     """Run the full 3D radar network workflow and optionally write netCDF output."""
     if isinstance(target_time, str):
@@ -1685,6 +1786,7 @@ def run_radar_network_3d(
     effective_earth_radius = _resolve_network_value("effective_earth_radius", effective_earth_radius, network_cfg=network_cfg)
     max_range_km = _resolve_network_value("max_range_km", max_range_km, network_cfg=network_cfg)
     pattern = _resolve_network_value("file_pattern", pattern, network_cfg=network_cfg) or "*.bin*"
+    archive_index = _resolve_network_value("archive_index", archive_index, network_cfg=network_cfg)
     parallel = _resolve_network_value("parallel", parallel, network_cfg=network_cfg)
     max_workers = _resolve_network_value("max_workers", max_workers, network_cfg=network_cfg)
     blind_method = _resolve_network_value("blind_method", blind_method, network_cfg=network_cfg)
@@ -1780,6 +1882,7 @@ def run_radar_network_3d(
         target_time,
         tolerance_minutes=time_tolerance_minutes if time_tolerance_minutes is not None else 10,
         pattern=pattern,
+        index=archive_index,
     )
     station_info = []
     for item in selected_radars:
@@ -1787,11 +1890,7 @@ def run_radar_network_3d(
             station_lat, station_lon, station_alt, _ = get_radar_info(item["path"])
             station_info.append((float(station_lat), float(station_lon), float(station_alt)))
         except Exception:
-            prd = read_auto(
-                item["path"],
-                effective_earth_radius=effective_earth_radius,
-            )
-            station_info.append(_get_prd_station_info(prd))
+            station_info.append(_get_header_station_info(item["path"]))
     radar_lats = np.array([float(info[0]) for info in station_info], dtype=np.float64)
     radar_lons = np.array([float(info[1]) for info in station_info], dtype=np.float64)
     radar_alts = np.array([float(info[2]) for info in station_info], dtype=np.float64)
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 from .BaseDataProtocol.CCProtocol import dtype_cc
-from .util import _prepare_for_read, _read_all, _read_exact, _unpack_from_buf, make_time_unit_str, get_radar_sitename, date2num
+from .util import _decode_header_text, _metadata_cut, _normalize_field_selection, _prepare_for_read, _radar_metadata, \
+    _read_all, _read_exact, _unpack_from_buf, make_time_unit_str, get_radar_sitename, date2num
 import datetime
 import pandas as pd
 from ..core.NRadar import PRD
@@ -12,18 +13,20 @@ from ..core.PyartRadar import Radar
 class CCBaseData(object):
     """Decode CC/CCJ base data."""
 
-    def __init__(self, filename, station_lon=None, station_lat=None, station_alt=None):
+    def __init__(self, filename, station_lon=None, station_lat=None, station_alt=None, fields=None):
         """
                 :param filename:  radar basedata filename
                 :param station_lon:  radar station longitude //units: degree east
                 :param station_lat:  radar station latitude //units:degree north
                 :param station_alt:  radar station altitude //units: meters
+                :param fields:  optional field names to decode, e.g. ["dBZ"]; None decodes dBZ, V and W
         """
         super(CCBaseData, self).__init__()
         self.filename = filename
         self.station_lon = station_lon
         self.station_lat = station_lat
         self.station_alt = station_alt
+        self.selected_fields = _normalize_field_selection(fields)
         self.fid = _prepare_for_read(self.filename)
         buf_header = _read_exact(self.fid, dtype_cc.BaseDataHeaderSize, "CC header")
         self.header = self._parse_BaseDataHeader(buf_header)
@@ -31,6 +34,50 @@ class CCBaseData(object):
         self.radial = self._parse_radial()
         self.fid.close()
 
+    @classmethod
+    def read_metadata(cls, filename):
+        """
+        Summarize a volume from the file header without reading the radial payload.
+        :param filename:  radar basedata filename
+        :return: dict, see ``pycwr.io.read_metadata``
+        """
+        reader = cls.__new__(cls)
+        reader.filename = filename
+        reader.station_lon = reader.station_lat = reader.station_alt = None
+        fid = _prepare_for_read(filename)
+        try:
+            buf_header = _read_exact(fid, dtype_cc.BaseDataHeaderSize, "CC header")
+        finally:
+            fid.close()
+        reader.header = reader._parse_BaseDataHeader(buf_header)
+        lat, lon, alt, frequency = reader.get_latitude_longitude_altitude_frequency()
+        start_time, end_time = reader._scan_start_end()
+        cuts = [
+            _metadata_cut(
+                cut['usAngle'] / 100.,
+                cut['usBindWidth'] * 2,
+                cut['usBindWidth'] * 2,
+                cut['usMaxV'] / 100.,
+                cut['usMaxL'] * 10.,
+            )
+            for cut in reader.header['CutConfig']
+        ]
+        return _radar_metadata(
+            "CC",
+            reader.get_sitename(),
+            lat,
+            lon,
+            alt,
+            frequency,
+            reader.get_scan_type(),
+            start_time,
+            end_time,
+            None,
+            cuts,
+            ("dBZ", "V", "W"),
+            site_code=_decode_header_text(reader.header['ObsParam1']['cStationNumber']),
+        )
+
     def _check_cc_basedata(self):
         """Check that the radial payload length matches the header metadata."""
         buf_radial_data = _read_all(self.fid, "CC radial payload")
@@ -66,17 +113,16 @@ class CCBaseData(object):
         self.sweep_start_ray_index = (self.sweep_end_ray_index_add1 - BaseDataHeader_dict['CutConfig']['usRecordNumber']).astype(int)
         return BaseDataHeader_dict
 
-    def _parse_radial_single(self, buf_radial, radialnumber):
-        """Parse one CC radial."""
+    def _parse_radial_single(self, buf_radial, radialnumber, field_names=None):
+        """Parse one CC radial, decoding only ``field_names`` when given."""
         Radial = {}
         RadialData = np.frombuffer(buf_radial, dtype_cc.RadialData(radialnumber))
         Radial['fields'] = {}
-        Radial['fields']['dBZ'] = np.where(RadialData['dBZ'] != -32768, RadialData['dBZ'] / 10.,
-                                           np.nan).astype(np.float32)
-        Radial['fields']['V'] = np.where(RadialData['V'] != -32768, RadialData['V'] / 10.,
-                                         np.nan).astype(np.float32)
-        Radial['fields']['W'] = np.where(RadialData['W'] != -32768, RadialData['W'] / 10.,
-                                         np.nan).astype(np.float32)
+        for field_name in ('dBZ', 'V', 'W'):
+            if field_names is not None and field_name not in field_names:
+                continue
+            Radial['fields'][field_name] = np.where(RadialData[field_name] != -32768, RadialData[field_name] / 10.,
+                                                    np.nan).astype(np.float32)
         return Radial
 
     def _parse_radial(self):
@@ -88,7 +134,7 @@ class CCBaseData(object):
             for _ in range(self.header['CutConfig']['usRecordNumber'][isweep]):
                 buf_radial = payload[pos:pos + dtype_cc.PerRadialSize]
                 pos += dtype_cc.PerRadialSize
-                radial.append(self._parse_radial_single(buf_radial, radialnumber))
+                radial.append(self._parse_radial_single(buf_radial, radialnumber, self.selected_fields))
         return radial
 
     def get_nyquist_velocity(self):
@@ -104,8 +150,8 @@ class CCBaseData(object):
                                          ] * self.header['CutConfig']['usRecordNumber'][isweep]) for \
                                isweep in range(self.nsweeps)])
 
-    def get_scan_time(self):
-        """Return the acquisition time for each ray."""
+    def _scan_start_end(self):
+        """Return the volume start and end time recorded in the header."""
         params = self.header['ObsParam1']
         start_year = params['ucSYear1'] * 100 + params['ucSYear2']
         end_year = params['ucEYear1'] * 100 + params['ucEYear2']
@@ -115,6 +161,11 @@ class CCBaseData(object):
         end_time = datetime.datetime(year=end_year, month=params['ucEMonth'],
                                      day=params['ucEDay'], hour=params['ucEHour'],
                                      minute=params['ucEMinute'], second=params['ucESecond'])
+        return start_time, end_time
+
+    def get_scan_time(self):
+        """Return the acquisition time for each ray."""
+        start_time, end_time = self._scan_start_end()
         return pd.date_range(start_time, end_time, periods=self.nrays).to_pydatetime()
 
     def get_sweep_end_ray_index(self):
@@ -165,6 +216,12 @@ class CCBaseData(object):
 class CC2NRadar(object):
     """Bridge from raw CC data to an NRadar object."""
 
+    # gate values are int16 codes / 10, so the native codes reproduce them up to float32 rounding
+    field_encoding = {
+        field_name: {"dtype": "int16", "scale_factor": 0.1, "add_offset": 0.0, "_FillValue": -32768}
+        for field_name in ("dBZ", "V", "W")
+    }
+
     def __init__(self, CC):
         self.CC = CC
         self.radial = self.CC.radial
@@ -251,7 +308,7 @@ class CC2NRadar(object):
     def get_fixed_angle(self):
         return self.CC.header['CutConfig']['usAngle'] / 100.
 
-    def to_prd(self, effective_earth_radius=None):
+    def to_prd(self, effective_earth_radius=None, sweeps=None, max_elevation=None):
         """Build an ``NRadar.PRD`` object from the decoded CC volume."""
 
         return PRD(fields=self.fields, scan_type=self.scan_type, time=self.get_scan_time(), \
@@ -263,11 +320,13 @@ class CC2NRadar(object):
                           frequency=self.frequency, unambiguous_range=self.get_nradar_unambiguous_range(), \
                           nrays=self.nrays, nsweeps=self.nsweeps, sitename = self.sitename,
                           pyart_radar=None, effective_earth_radius=effective_earth_radius,
-                          metadata={"original_container": "CINRAD/CC", "radar_name": "CINRAD/CC"})
+                          metadata={"original_container": "CINRAD/CC", "radar_name": "CINRAD/CC"},
+                          sweeps=sweeps, max_elevation=max_elevation)
 
-    def ToPRD(self, effective_earth_radius=None):
+    def ToPRD(self, effective_earth_radius=None, sweeps=None, max_elevation=None):
         """Backward-compatible alias for ``to_prd``."""
-        return self.to_prd(effective_earth_radius=effective_earth_radius)
+        return self.to_prd(effective_earth_radius=effective_earth_radius, sweeps=sweeps,
+                           max_elevation=max_elevation)
 
     def to_pyart_radar(self, effective_earth_radius=None, **kwargs):
         """Export the decoded CC volume through the PRD Py-ART adapter."""
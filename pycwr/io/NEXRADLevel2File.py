@@ -1,16 +1,22 @@
 # -*- coding: utf-8 -*-
-"""Write PRD volumes to NEXRAD Level II archive formats."""
+"""Read and write NEXRAD Level II archives (AR2V MSG31 and legacy ARCHIVE2 MSG1 radials)."""
 
 from __future__ import annotations
 
+import bz2
 import datetime
 import os
 import re
 import struct
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
+from .util import _gather_blocks, _gather_records, _julian_to_datetimes, _normalize_field_selection, \
+    _open_for_replace, _prepare_for_read, _radar_metadata, _metadata_cut, _raise_truncated, _read_all, \
+    _validate_max_read_bytes
+from ..core.NRadar import PRD, _resolve_sweep_selection
 
 RECORD_SIZE = 2432
 MSG_HEADER_SIZE = 16
@@ -28,6 +34,49 @@ MSG1_HEADER_FMT = (
     "32s"
 )
 MSG1_HEADER_SIZE = struct.calcsize(MSG1_HEADER_FMT)
+# Radials per bzip2-compressed LDM record, as in operational AR2V archives.
+LDM_RADIALS_PER_RECORD = 120
+
+# Structured layouts of the per-radial blocks, so a whole sweep is packed in one array.
+MSG_HEADER_DTYPE = np.dtype(
+    [("size", ">u2"), ("channels", "u1"), ("type", "u1"), ("seq_id", ">u2"), ("date", ">u2"),
+     ("ms", ">u4"), ("num_segments", ">u2"), ("segment_num", ">u2")]
+)
+MSG31_HEADER_DTYPE = np.dtype(
+    [("id", "S4"), ("collect_ms", ">u4"), ("collect_date", ">u2"), ("azimuth_number", ">u2"),
+     ("azimuth_angle", ">f4"), ("compress_flag", "u1"), ("spare_0", "u1"), ("radial_length", ">u2"),
+     ("azimuth_resolution", "u1"), ("radial_spacing", "u1"), ("elevation_number", "u1"), ("cut_sector", "u1"),
+     ("elevation_angle", ">f4"), ("radial_blanking", "u1"), ("azimuth_mode", "i1"), ("data_block_count", ">u2"),
+     ("block_pointers", ">u4", (10,))]
+)
+ELV_BLOCK_DTYPE = np.dtype(
+    [("block_type", "S1"), ("data_name", "S3"), ("lrtup", ">u2"), ("atmos", ">i2"), ("calib_const", ">f4")]
+)
+MSG1_HEADER_DTYPE = np.dtype(
+    [("collect_ms", ">u4"), ("collect_date", ">u2"), ("unambig_range", ">i2"), ("azimuth_angle", ">u2"),
+     ("azimuth_number", ">u2"), ("radial_status", ">u2"), ("elevation_angle", ">u2"),
+     ("elevation_number", ">u2"), ("sur_range_first", ">u2"), ("doppler_range_first", ">u2"),
+     ("sur_range_step", ">u2"), ("doppler_range_step", ">u2"), ("sur_nbins", ">u2"), ("doppler_nbins", ">u2"),
+     ("cut_sector_num", ">u2"), ("calib_const", ">f4"), ("sur_pointer", ">u2"), ("vel_pointer", ">u2"),
+     ("width_pointer", ">u2"), ("doppler_resolution", ">u2"), ("vcp", ">u2"), ("spare", "V14"),
+     ("nyquist_vel", ">i2"), ("atmos_attenuation", ">i2"), ("threshold", ">i2"),
+     ("spot_blank_status", ">u2"), ("spare_5", "V32")]
+)
+MOMENT_BLOCK_DTYPE = np.dtype(
+    [("block_type", "S1"), ("data_name", "S3"), ("reserved", ">u4"), ("ngates", ">u2"), ("first_gate", ">i2"),
+     ("gate_spacing", ">i2"), ("thresh", ">i2"), ("snr_thres", ">i2"), ("flags", "u1"), ("word_size", "u1"),
+     ("scale", ">f4"), ("offset", ">f4")]
+)
+VOL_BLOCK_DTYPE = np.dtype(
+    [("block_type", "S1"), ("data_name", "S3"), ("lrtup", ">u2"), ("version_major", "u1"),
+     ("version_minor", "u1"), ("lat", ">f4"), ("lon", ">f4"), ("height", ">i2"), ("feedhorn_height", ">i2"),
+     ("refl_calib", ">f4"), ("power_h", ">f4"), ("power_v", ">f4"), ("diff_refl_calib", ">f4"),
+     ("init_phase", ">f4"), ("vcp", ">u2"), ("spare", "V2")]
+)
+RAD_BLOCK_DTYPE = np.dtype(
+    [("block_type", "S1"), ("data_name", "S3"), ("lrtup", ">u2"), ("unambig_range", ">i2"), ("noise_h", ">f4"),
+     ("noise_v", ">f4"), ("nyquist_vel", ">i2"), ("spare", "V2")]
+)
 
 
 NEXRAD_MSG31_FIELD_SPECS = OrderedDict(
@@ -47,6 +96,18 @@ NEXRAD_MSG1_FIELD_SPECS = OrderedDict(
         ("W", {"scale": 2.0, "offset": 129.0}),
     ]
 )
+# MSG31 moment names and the fields they decode to; other moments (e.g. CFP) are skipped on read.
+NEXRAD_MOMENT_FIELDS = OrderedDict((spec["moment"], name) for name, spec in NEXRAD_MSG31_FIELD_SPECS.items())
+# MSG1 gate blocks: field name, pointer, gate count, first gate and gate spacing keys, scale, offset.
+_MSG1_FIELD_BLOCKS = (
+    ("dBZ", "sur_pointer", "sur_nbins", "sur_range_first", "sur_range_step", 2.0, 66.0),
+    ("V", "vel_pointer", "doppler_nbins", "doppler_range_first", "doppler_range_step", 2.0, 129.0),
+    ("W", "width_pointer", "doppler_nbins", "doppler_range_first", "doppler_range_step", 2.0, 129.0),
+)
+# Aligned range grids follow the Doppler moments, as the CINRAD readers do.
+_RANGE_REFERENCE_FIELDS = ("V", "W")
+# WSR-88D sites transmit at 2.7-3.0 GHz; the site frequency is only kept in MSG18 adaptation data.
+WSR88D_FREQUENCY_GHZ = 2.8
 
 
 def _ensure_ppi_volume(prd):
@@ -136,26 +197,34 @@ def _available_supported_fields(prd, supported_specs, field_names=None, strict=T
     return selected
 
 
-def _sweep_state(isweep, iray, rays_per_sweep, nsweeps):
-    if isweep == 0 and iray == 0:
-        return 3
-    if isweep == nsweeps - 1 and iray == rays_per_sweep - 1:
-        return 4
-    if iray == 0:
-        return 0
-    if iray == rays_per_sweep - 1:
-        return 2
-    return 1
+def _sweep_states(isweep, rays_per_sweep, nsweeps):
+    """Radial status of every ray of one sweep: 3/4 start/end the volume, 0/2 start/end a sweep, 1 otherwise."""
+    states = np.ones(rays_per_sweep, dtype=np.int64)
+    if rays_per_sweep:
+        states[-1] = 2
+        states[0] = 0
+        if isweep == nsweeps - 1:
+            states[-1] = 4
+        if isweep == 0:
+            states[0] = 3
+    return states
+
 
+def _ray_dates(time_values):
+    """Return the (modified julian date, milliseconds of day) of every ray time."""
+    milliseconds = np.asarray(time_values).astype("datetime64[ms]").astype(np.int64)
+    days = np.floor_divide(milliseconds, 86400000)
+    return days + 1, milliseconds - days * 86400000
 
-def _get_prd_ray(prd, sweep, field_name, iray):
+
+def _get_prd_sweep(prd, sweep, field_name):
     source_name = field_name
     if hasattr(prd, "resolve_field_name"):
         source_name = prd.resolve_field_name(field_name, sweep=sweep, range_mode=None, required=False)
     if source_name is None:
         raise KeyError(field_name)
     field = prd.get_sweep_field(sweep, source_name, range_mode=None)
-    values = np.asarray(field.values[iray], dtype=np.float32)
+    values = np.asarray(field.values, dtype=np.float32)
     ranges = np.asarray(field["range"].values, dtype=np.float64)
     return values, ranges
 
@@ -173,119 +242,74 @@ def _range_geometry(range_values):
     return int(round(float(range_values[0]))), int(round(spacing))
 
 
-def _encode_quantized(values, scale, offset, max_code, missing_code=0, word_size=8):
-    codes = np.round(np.asarray(values, dtype=np.float64) * float(scale) + float(offset))
+def _encode_quantized_codes(values, scale, offset, max_code, missing_code=0, word_size=8):
+    """Quantize physical values of any shape to big-endian NEXRAD gate codes."""
+    if word_size not in (8, 16):
+        raise ValueError("Unsupported word size: %s" % word_size)
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.round(values * float(scale) + float(offset))
     codes[~np.isfinite(values)] = missing_code
-    codes = np.clip(codes.astype(np.int64), 0, max_code)
-    if word_size == 8:
-        return codes.astype(np.uint8).tobytes()
-    if word_size == 16:
-        return codes.astype(">u2").tobytes()
-    raise ValueError("Unsupported word size: %s" % word_size)
-
-
-def _pack_msg31_moment_block(moment_name, values, first_gate, gate_spacing, scale, offset, word_size):
-    encoded = _encode_quantized(values, scale, offset, 255 if word_size == 8 else 65535, word_size=word_size)
-    header = struct.pack(
-        ">1s3sI H h h h h B B f f",
-        b"B",
-        moment_name,
-        0,
-        len(values),
-        first_gate,
-        gate_spacing,
-        0,
-        0,
-        0,
-        word_size,
-        float(scale),
-        float(offset),
-    )
-    block = header + encoded
-    if len(block) % 2:
-        block += b"\x00"
-    return block
-
-
-def _pack_msg31_radial(prd, sweep, iray, field_names, seq_id):
-    azimuth = float(prd.fields[sweep].azimuth.values[iray])
-    elevation = float(prd.fields[sweep].elevation.values[iray])
-    dt = _python_datetime(prd.fields[sweep].time.values[iray])
-    mjd = _compute_mjd(dt)
-    milliseconds = _compute_milliseconds(dt)
-    rays_per_sweep = int(prd.scan_info["rays_per_sweep"].values[sweep])
-    radial_state = _sweep_state(sweep, iray, rays_per_sweep, int(prd.nsweeps))
+    np.clip(codes, 0, max_code, out=codes)
+    return codes.astype(np.uint8 if word_size == 8 else ">u2")
+
+
+def _pack_msg31_sweep(prd, sweep, field_names, seq_start):
+    """
+    Pack every MSG31 radial of one sweep with a single structured array.
+    :return: (sweep bytes, bytes per radial)
+    """
+    sweep_dataset = prd.fields[sweep]
+    rays = int(prd.scan_info["rays_per_sweep"].values[sweep])
     nyquist = float(prd.scan_info["nyquist_velocity"].values[sweep]) if "nyquist_velocity" in prd.scan_info else 0.0
     altitude = int(round(float(prd.scan_info["altitude"].values)))
     lat = float(prd.scan_info["latitude"].values)
     lon = float(prd.scan_info["longitude"].values)
     vcp = int(np.asarray(prd.metadata.get("volume_number", 0)))
 
-    moment_blocks = []
+    moments = []
     max_range_m = 0.0
     for field_name in field_names:
         spec = NEXRAD_MSG31_FIELD_SPECS[field_name]
-        values, ranges = _get_prd_ray(prd, sweep, field_name, iray)
+        values, ranges = _get_prd_sweep(prd, sweep, field_name)
         first_gate, gate_spacing = _range_geometry(ranges)
         if ranges.size:
             max_range_m = max(max_range_m, float(ranges[-1]))
-        moment_blocks.append(
-            _pack_msg31_moment_block(
-                spec["moment"],
-                values,
-                first_gate,
-                gate_spacing,
-                spec["scale"],
-                spec["offset"],
-                spec["word_size"],
-            )
+        word_size = spec["word_size"]
+        codes = _encode_quantized_codes(values[:rays], spec["scale"], spec["offset"],
+                                        255 if word_size == 8 else 65535, word_size=word_size)
+        header = struct.pack(
+            ">1s3sI H h h h h B B f f",
+            b"B",
+            spec["moment"],
+            0,
+            codes.shape[1],
+            first_gate,
+            gate_spacing,
+            0,
+            0,
+            0,
+            word_size,
+            float(spec["scale"]),
+            float(spec["offset"]),
         )
+        moments.append((header, codes))
 
-    msg_header = struct.pack(
-        ">HBBHHIHH",
-        0,
-        1,
-        31,
-        seq_id & 0x7FFF,
-        mjd,
-        milliseconds,
-        1,
-        1,
-    )
+    layout = [("message", MSG_HEADER_DTYPE), ("msg31", MSG31_HEADER_DTYPE), ("volume", "V44"),
+              ("elevation", ELV_BLOCK_DTYPE), ("radial", "V20")]
+    for imoment, (header, codes) in enumerate(moments):
+        layout += [("moment_%d" % imoment, "V%d" % len(header)), ("data_%d" % imoment, codes.dtype, codes.shape[1:])]
+        if (len(header) + codes[0].nbytes) % 2:
+            layout.append(("pad_%d" % imoment, "V1"))
+    layout.append(("terminator", ">u4"))
+    record_dtype = np.dtype(layout)
+    records = np.zeros(rays, dtype=record_dtype)
 
-    ptr_vol = MSG31_HEADER_SIZE
-    ptr_elv = ptr_vol + 44
-    ptr_rad = ptr_elv + 12
-    pointers = [ptr_vol, ptr_elv, ptr_rad]
-    next_offset = ptr_rad + 20
-    for block in moment_blocks:
-        pointers.append(next_offset)
-        next_offset += len(block)
-    full_pointers = pointers[:10] + [0] * max(0, 10 - len(pointers))
-
-    radial_length = 44 + 12 + 20 + sum(len(block) for block in moment_blocks)
-    msg31_header = struct.pack(
-        ">4s I H H f B B H B B B B f B b H " + "I" * 10,
-        b"RAD1",
-        milliseconds,
-        mjd,
-        iray + 1,
-        azimuth,
-        0,
-        0,
-        radial_length,
-        0,
-        0,
-        sweep + 1,
-        radial_state,
-        elevation,
-        0,
-        0,
-        3 + len(moment_blocks),
-        *full_pointers[:10],
-    )
-
-    vol_block = struct.pack(
+    pointers = [MSG31_HEADER_SIZE, MSG31_HEADER_SIZE + 44, MSG31_HEADER_SIZE + 56]
+    for imoment, (header, codes) in enumerate(moments):
+        records["moment_%d" % imoment] = np.void(header)
+        records["data_%d" % imoment] = codes
+        pointers.append(record_dtype.fields["moment_%d" % imoment][1] - MSG_HEADER_SIZE)
+    records["volume"] = np.void(struct.pack(
         ">1s3sHBBffhhfffffH2s",
         b"V",
         b"VOL",
@@ -303,9 +327,8 @@ def _pack_msg31_radial(prd, sweep, iray, field_names, seq_id):
         0.0,
         max(0, min(65535, vcp)),
         b"\x00\x00",
-    )
-    elv_block = struct.pack(">1s3sHhf", b"E", b"ELV", 12, 0, elevation)
-    radial_block = struct.pack(
+    ))
+    records["radial"] = np.void(struct.pack(
         ">1s3sHhffh2s",
         b"R",
         b"RAD",
@@ -315,20 +338,39 @@ def _pack_msg31_radial(prd, sweep, iray, field_names, seq_id):
         0.0,
         int(round(nyquist * 100.0)),
         b"\x00\x00",
-    )
+    ))
+    records["terminator"] = 0xFFFFFFFF
 
-    radial = bytearray()
-    radial += msg_header
-    radial += msg31_header
-    radial += vol_block
-    radial += elv_block
-    radial += radial_block
-    for block in moment_blocks:
-        radial += block
-    radial += struct.pack(">I", 0xFFFFFFFF)
-    radial_size_halfwords = (len(radial) - MSG_HEADER_SIZE + 4) // 2
-    radial[0:2] = struct.pack(">H", radial_size_halfwords)
-    return bytes(radial), (seq_id + 1) & 0x7FFF
+    mjd, milliseconds = _ray_dates(sweep_dataset["time"].values[:rays])
+    elevation = sweep_dataset["elevation"].values[:rays]
+    message = records["message"]
+    message["size"] = (record_dtype.itemsize - MSG_HEADER_SIZE + 4) // 2
+    message["channels"] = 1
+    message["type"] = 31
+    message["seq_id"] = np.arange(seq_start, seq_start + rays) & 0x7FFF
+    message["date"] = mjd
+    message["ms"] = milliseconds
+    message["num_segments"] = 1
+    message["segment_num"] = 1
+    msg31 = records["msg31"]
+    msg31["id"] = b"RAD1"
+    msg31["collect_ms"] = milliseconds
+    msg31["collect_date"] = mjd
+    msg31["azimuth_number"] = np.arange(1, rays + 1)
+    msg31["azimuth_angle"] = sweep_dataset["azimuth"].values[:rays]
+    msg31["radial_length"] = 44 + 12 + 20 + sum(len(header) + codes[0].nbytes + (len(header) + codes[0].nbytes) % 2
+                                                for header, codes in moments)
+    msg31["elevation_number"] = sweep + 1
+    msg31["cut_sector"] = _sweep_states(sweep, rays, int(prd.nsweeps))
+    msg31["elevation_angle"] = elevation
+    msg31["data_block_count"] = 3 + len(moments)
+    msg31["block_pointers"] = (pointers + [0] * 10)[:10]
+    elv = records["elevation"]
+    elv["block_type"] = b"E"
+    elv["data_name"] = b"ELV"
+    elv["lrtup"] = 12
+    elv["calib_const"] = elevation
+    return records.tobytes(), record_dtype.itemsize
 
 
 def _pack_msg5(prd, icao):
@@ -399,7 +441,13 @@ def _pack_msg5(prd, icao):
     return bytes(msg5)
 
 
-def write_nexrad_level2_msg31(prd, filename, field_names=None, strict=True, overwrite=False, icao=None):
+def write_nexrad_level2_msg31(prd, filename, field_names=None, strict=True, overwrite=False, icao=None,
+                              compress=False, workers=None):
+    """
+    Write a PRD volume as a NEXRAD Level II AR2V0006 archive of MSG31 radials.
+    :param compress: write bzip2-compressed LDM records instead of one uncompressed stream
+    :param workers: threads compressing LDM records; None lets the executor choose
+    """
     _ensure_ppi_volume(prd)
     path = _ensure_output_path(filename, overwrite=overwrite)
     selected_fields = _available_supported_fields(prd, NEXRAD_MSG31_FIELD_SPECS, field_names=field_names, strict=strict)
@@ -412,99 +460,117 @@ def write_nexrad_level2_msg31(prd, filename, field_names=None, strict=True, over
         _compute_milliseconds(start_time),
         _normalize_icao(icao),
     )
+    sweeps = []
     seq_id = 0
-    with open(path, "wb") as handle:
-        handle.write(volume_header)
-        handle.write(b"\x00" * COMPRESSION_RECORD_SIZE)
-        handle.write(_pack_msg5(prd, icao))
-        for sweep in range(int(prd.nsweeps)):
-            rays_per_sweep = int(prd.scan_info["rays_per_sweep"].values[sweep])
-            for iray in range(rays_per_sweep):
-                radial, seq_id = _pack_msg31_radial(prd, sweep, iray, selected_fields, seq_id)
-                handle.write(radial)
-    return path
+    for sweep in range(int(prd.nsweeps)):
+        sweeps.append(_pack_msg31_sweep(prd, sweep, selected_fields, seq_id))
+        seq_id += int(prd.scan_info["rays_per_sweep"].values[sweep])
+    metadata_record = b"\x00" * COMPRESSION_RECORD_SIZE + _pack_msg5(prd, icao)
+    return _write_archive(path, volume_header, metadata_record, sweeps, compress=compress, workers=workers)
 
 
-def _pack_msg1_radial(prd, sweep, iray, seq_id):
-    rays_per_sweep = int(prd.scan_info["rays_per_sweep"].values[sweep])
-    radial_state = _sweep_state(sweep, iray, rays_per_sweep, int(prd.nsweeps))
-    dt = _python_datetime(prd.fields[sweep].time.values[iray])
-    mjd = _compute_mjd(dt)
-    milliseconds = _compute_milliseconds(dt)
+def _pack_msg1_sweep(prd, sweep, seq_start):
+    """
+    Pack every fixed-size MSG1 radial of one sweep with a single structured array.
+    :return: (sweep bytes, bytes per radial)
+    """
+    sweep_dataset = prd.fields[sweep]
+    rays = int(prd.scan_info["rays_per_sweep"].values[sweep])
     nyquist = float(prd.scan_info["nyquist_velocity"].values[sweep]) if "nyquist_velocity" in prd.scan_info else 0.0
     unambiguous_range = float(prd.scan_info["unambiguous_range"].values[sweep]) if "unambiguous_range" in prd.scan_info else 0.0
-    azimuth = float(prd.fields[sweep].azimuth.values[iray])
-    elevation = float(prd.fields[sweep].elevation.values[iray])
 
-    ref_values, ref_ranges = _get_prd_ray(prd, sweep, "dBZ", iray)
-    vel_values, vel_ranges = _get_prd_ray(prd, sweep, "V", iray)
-    sw_values, sw_ranges = _get_prd_ray(prd, sweep, "W", iray)
+    ref_values, ref_ranges = _get_prd_sweep(prd, sweep, "dBZ")
+    vel_values, _ = _get_prd_sweep(prd, sweep, "V")
+    sw_values, _ = _get_prd_sweep(prd, sweep, "W")
     first_gate, gate_spacing = _range_geometry(ref_ranges)
     max_gates = (RECORD_SIZE - MSG_HEADER_SIZE - MSG1_HEADER_SIZE - 4) // 3
-    ngates = min(len(ref_values), len(vel_values), len(sw_values), max_gates)
-    ref_values = ref_values[:ngates]
-    vel_values = vel_values[:ngates]
-    sw_values = sw_values[:ngates]
+    ngates = min(ref_values.shape[1], vel_values.shape[1], sw_values.shape[1], max_gates)
+
+    layout = [("message", MSG_HEADER_DTYPE), ("msg1", MSG1_HEADER_DTYPE), ("REF", "u1", (ngates,)),
+              ("VEL", "u1", (ngates,)), ("SW", "u1", (ngates,)), ("terminator", ">u4")]
+    padding = RECORD_SIZE - np.dtype(layout).itemsize
+    if padding:
+        layout.append(("padding", "V%d" % padding))
+    records = np.zeros(rays, dtype=np.dtype(layout))
+    records["REF"] = _encode_quantized_codes(ref_values[:rays, :ngates], 2.0, 66.0, 255, word_size=8)
+    records["VEL"] = _encode_quantized_codes(vel_values[:rays, :ngates], 2.0, 129.0, 255, word_size=8)
+    records["SW"] = _encode_quantized_codes(sw_values[:rays, :ngates], 2.0, 129.0, 255, word_size=8)
+    records["terminator"] = 0xFFFFFFFF
 
-    msg_header = struct.pack(
-        ">HBBHHIHH",
-        1214,
-        1,
-        1,
-        seq_id & 0x7FFF,
-        mjd,
-        milliseconds,
-        1,
-        1,
-    )
     angle_scale = 180.0 / (4096.0 * 8.0)
-    msg1_header = struct.pack(
-        MSG1_HEADER_FMT,
-        milliseconds,
-        mjd,
-        int(round(unambiguous_range / 100.0)),
-        max(0, min(0xFFFF, int(round(azimuth / angle_scale)))),
-        iray + 1,
-        radial_state,
-        max(0, min(0xFFFF, int(round(elevation / angle_scale)))),
-        sweep + 1,
-        first_gate,
-        first_gate,
-        gate_spacing,
-        gate_spacing,
-        ngates,
-        ngates,
-        0,
-        0.0,
-        MSG1_HEADER_SIZE,
-        MSG1_HEADER_SIZE + ngates,
-        MSG1_HEADER_SIZE + 2 * ngates,
-        2,
-        0,
-        b"\x00" * 8,
-        b"\x00" * 2,
-        b"\x00" * 2,
-        b"\x00" * 2,
-        int(round(nyquist * 100.0)),
-        0,
-        0,
-        0,
-        b"\x00" * 32,
-    )
-    radial = bytearray()
-    radial += msg_header
-    radial += msg1_header
-    radial += _encode_quantized(ref_values, 2.0, 66.0, 255, word_size=8)
-    radial += _encode_quantized(vel_values, 2.0, 129.0, 255, word_size=8)
-    radial += _encode_quantized(sw_values, 2.0, 129.0, 255, word_size=8)
-    radial += struct.pack(">I", 0xFFFFFFFF)
-    if len(radial) > RECORD_SIZE:
-        raise ValueError("MSG1 radial exceeds fixed record size.")
-    radial += b"\x00" * (RECORD_SIZE - len(radial))
-    return bytes(radial), (seq_id + 1) & 0x7FFF
-
-
-def write_nexrad_level2_msg1(prd, filename, field_names=None, strict=True, overwrite=False, icao=None):
+    mjd, milliseconds = _ray_dates(sweep_dataset["time"].values[:rays])
+    azimuth = np.asarray(sweep_dataset["azimuth"].values[:rays], dtype=np.float64)
+    elevation = np.asarray(sweep_dataset["elevation"].values[:rays], dtype=np.float64)
+    message = records["message"]
+    message["size"] = 1214
+    message["channels"] = 1
+    message["type"] = 1
+    message["seq_id"] = np.arange(seq_start, seq_start + rays) & 0x7FFF
+    message["date"] = mjd
+    message["ms"] = milliseconds
+    message["num_segments"] = 1
+    message["segment_num"] = 1
+    msg1 = records["msg1"]
+    msg1["collect_ms"] = milliseconds
+    msg1["collect_date"] = mjd
+    msg1["unambig_range"] = int(round(unambiguous_range / 100.0))
+    msg1["azimuth_angle"] = np.clip(np.round(azimuth / angle_scale), 0, 0xFFFF)
+    msg1["azimuth_number"] = np.arange(1, rays + 1)
+    msg1["radial_status"] = _sweep_states(sweep, rays, int(prd.nsweeps))
+    msg1["elevation_angle"] = np.clip(np.round(elevation / angle_scale), 0, 0xFFFF)
+    msg1["elevation_number"] = sweep + 1
+    msg1["sur_range_first"] = first_gate
+    msg1["doppler_range_first"] = first_gate
+    msg1["sur_range_step"] = gate_spacing
+    msg1["doppler_range_step"] = gate_spacing
+    msg1["sur_nbins"] = ngates
+    msg1["doppler_nbins"] = ngates
+    msg1["sur_pointer"] = MSG1_HEADER_SIZE
+    msg1["vel_pointer"] = MSG1_HEADER_SIZE + ngates
+    msg1["width_pointer"] = MSG1_HEADER_SIZE + 2 * ngates
+    msg1["doppler_resolution"] = 2
+    msg1["nyquist_vel"] = int(round(nyquist * 100.0))
+    return records.tobytes(), RECORD_SIZE
+
+
+def _ldm_records(metadata_record, sweeps, radials_per_record=LDM_RADIALS_PER_RECORD):
+    """Split packed sweeps into LDM records of at most ``radials_per_record`` radials each."""
+    records = [metadata_record]
+    for data, radial_size in sweeps:
+        step = radials_per_record * radial_size
+        view = memoryview(data)
+        records.extend(view[start:start + step] for start in range(0, len(data), step))
+    return records
+
+
+def _write_archive(path, volume_header, metadata_record, sweeps, compress=False, workers=None):
+    """
+    Write a Level II archive, either as one uncompressed stream or as bzip2-compressed LDM
+    records, each prefixed by its big-endian compressed size and compressed in a thread pool.
+    """
+    if not compress:
+        with _open_for_replace(path) as handle:
+            handle.writelines([volume_header, metadata_record] + [data for data, _ in sweeps])
+        return path
+    records = _ldm_records(metadata_record, sweeps)
+    # bz2 releases the GIL while compressing, so records compress in parallel threads
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        compressed = list(executor.map(bz2.compress, records))
+    with _open_for_replace(path) as handle:
+        handle.write(volume_header)
+        for block in compressed:
+            handle.write(struct.pack(">i", len(block)))
+            handle.write(block)
+    return path
+
+
+def write_nexrad_level2_msg1(prd, filename, field_names=None, strict=True, overwrite=False, icao=None,
+                             compress=False, workers=None):
+    """
+    Write a PRD volume as a legacy ARCHIVE2 file of fixed-size MSG1 radials.
+    :param compress: write bzip2-compressed LDM records instead of one uncompressed stream
+    :param workers: threads compressing LDM records; None lets the executor choose
+    """
     _ensure_ppi_volume(prd)
     _available_supported_fields(
         prd,
@@ -524,13 +590,651 @@ def write_nexrad_level2_msg1(prd, filename, field_names=None, strict=True, overw
         _normalize_icao(icao),
     )
     compression_record = struct.pack(">I", 0) + struct.pack(">H", RECORD_SIZE) + (b"\x00" * 6)
+    sweeps = []
     seq_id = 0
-    with open(path, "wb") as handle:
-        handle.write(volume_header)
-        handle.write(compression_record)
-        for sweep in range(int(prd.nsweeps)):
-            rays_per_sweep = int(prd.scan_info["rays_per_sweep"].values[sweep])
-            for iray in range(rays_per_sweep):
-                radial, seq_id = _pack_msg1_radial(prd, sweep, iray, seq_id)
-                handle.write(radial)
-    return path
+    for sweep in range(int(prd.nsweeps)):
+        sweeps.append(_pack_msg1_sweep(prd, sweep, seq_id))
+        seq_id += int(prd.scan_info["rays_per_sweep"].values[sweep])
+    return _write_archive(path, volume_header, compression_record, sweeps, compress=compress, workers=workers)
+
+
+def _split_ldm_records(data, start):
+    """Return the bzip2 payload of every LDM record; each record follows its big-endian byte count."""
+    view = memoryview(data)
+    records = []
+    pos = start
+    while pos < len(view):
+        if pos + 4 > len(view):
+            _raise_truncated("NEXRAD LDM control word", expected=4, actual=len(view) - pos)
+        # the last record of a volume carries a negative count
+        size = abs(struct.unpack_from(">i", view, pos)[0])
+        pos += 4
+        if size == 0:
+            break
+        if pos + size > len(view):
+            _raise_truncated("NEXRAD LDM record", expected=size, actual=len(view) - pos)
+        if bytes(view[pos:pos + 3]) != b"BZh":
+            raise ValueError("NEXRAD LDM record is not bzip2 compressed.")
+        records.append(view[pos:pos + size])
+        pos += size
+    return records
+
+
+def _decompress_ldm_record(block, max_bytes):
+    decompressor = bz2.BZ2Decompressor()
+    try:
+        data = decompressor.decompress(block, max_bytes + 1)
+    except (OSError, EOFError):
+        raise ValueError("NEXRAD LDM record is not a valid bzip2 stream.")
+    if len(data) > max_bytes:
+        raise ValueError("NEXRAD LDM record exceeds the maximum allowed decoded size of %s bytes." % max_bytes)
+    if not decompressor.eof:
+        _raise_truncated("NEXRAD LDM record")
+    return data
+
+
+def _archive_messages(data, workers=None, max_bytes=None):
+    """
+    Split a Level II archive into its volume header and message stream.
+    bzip2 LDM records are decompressed in a thread pool; the message stream of an uncompressed
+    archive is a view of ``data``.
+    :return: (volume header fields, message stream)
+    """
+    if len(data) < VOLUME_HEADER_SIZE + COMPRESSION_RECORD_SIZE:
+        _raise_truncated("NEXRAD Level II volume header", expected=VOLUME_HEADER_SIZE + COMPRESSION_RECORD_SIZE,
+                         actual=len(data))
+    volume_header = struct.unpack_from(VOLUME_HEADER_FMT, data, 0)
+    if not volume_header[0].startswith((b"AR2V", b"ARCHIVE2")):
+        raise ValueError("File is not a NEXRAD Level II archive.")
+    if bytes(data[VOLUME_HEADER_SIZE + 4:VOLUME_HEADER_SIZE + 6]) != b"BZ":
+        return volume_header, memoryview(data)[VOLUME_HEADER_SIZE + COMPRESSION_RECORD_SIZE:]
+    max_bytes = _validate_max_read_bytes(max_bytes)
+    blocks = _split_ldm_records(data, VOLUME_HEADER_SIZE)
+    if len(blocks) > 1:
+        # bz2 releases the GIL while decompressing, so records decompress in parallel threads
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_decompress_ldm_record, blocks, [max_bytes] * len(blocks)))
+    else:
+        parts = [_decompress_ldm_record(block, max_bytes) for block in blocks]
+    if sum(len(part) for part in parts) > max_bytes:
+        raise ValueError("NEXRAD LDM records exceed the maximum allowed decoded size of %s bytes." % max_bytes)
+    # the stream starts with the 12-byte header of the metadata record, as in uncompressed archives
+    return volume_header, memoryview(b"".join(parts))[COMPRESSION_RECORD_SIZE:]
+
+
+def _index_messages(buf):
+    """
+    Walk the message stream: MSG31 records carry their own size, every other message
+    occupies one fixed-size record.
+    :return: (MSG31 offsets, MSG1 offsets, offset of the first MSG5 or None)
+    """
+    offsets = {31: [], 1: []}
+    msg5 = None
+    pos = 0
+    end = len(buf)
+    while pos + MSG_HEADER_SIZE <= end:
+        size, _, msg_type = struct.unpack_from(">HBB", buf, pos)
+        if msg_type == 31:
+            next_pos = pos + MSG_HEADER_SIZE + size * 2 - 4
+            if next_pos < pos + MSG_HEADER_SIZE + MSG31_HEADER_SIZE or next_pos > end:
+                _raise_truncated("NEXRAD MSG31 record")
+        else:
+            next_pos = pos + RECORD_SIZE
+            if msg_type == 5 and msg5 is None:
+                msg5 = pos
+        if msg_type in offsets:
+            offsets[msg_type].append(pos)
+        pos = next_pos
+    return np.asarray(offsets[31], dtype=np.int64), np.asarray(offsets[1], dtype=np.int64), msg5
+
+
+def _msg5_elevations(buf, offset):
+    """Return the elevation angle of every cut of the MSG5 volume coverage pattern, or None without one."""
+    if offset is None:
+        return None
+    base = offset + MSG_HEADER_SIZE
+    if base + 22 > len(buf):
+        _raise_truncated("NEXRAD MSG5 record")
+    num_cuts = struct.unpack_from(">H", buf, base + 6)[0]
+    if not num_cuts:
+        return None
+    codes = _gather_blocks(buf, base + 22 + 46 * np.arange(num_cuts), 2).view(">u2").reshape(-1)
+    angles = codes * (360.0 / 65536.0)
+    angles[angles > 180.0] -= 360.0
+    return angles
+
+
+def _index_msg31_radials(buf, offsets):
+    """
+    Gather the MSG31 headers and the data block table of every radial.
+    :return: (radial headers, block table holding the ray, absolute offset and name of every data block)
+    """
+    base = offsets + MSG_HEADER_SIZE
+    headers = _gather_records(buf, base, MSG31_HEADER_DTYPE)
+    nslots = MSG31_HEADER_DTYPE["block_pointers"].shape[0]
+    count = headers["data_block_count"].astype(np.int64)
+    if np.any(count > nslots):
+        raise ValueError("NEXRAD MSG31 data_block_count exceeds the maximum allowed value of %s." % nslots)
+    pointers = headers["block_pointers"].astype(np.int64)
+    ray, slot = np.nonzero((np.arange(nslots) < count[:, None]) & (pointers > 0))
+    blocks = np.zeros(ray.size, dtype=[("ray", np.int64), ("offset", np.int64), ("name", "S3")])
+    blocks["ray"] = ray
+    blocks["offset"] = base[ray] + pointers[ray, slot]
+    blocks["name"] = _gather_blocks(buf, blocks["offset"], 4)[:, 1:].copy().view("S3").reshape(-1)
+    return headers, blocks
+
+
+def _first_blocks(buf, blocks, name, dtype):
+    """
+    Locate the first ``name`` data block of every radial.
+    :return: (rays carrying the block, absolute block offsets, block headers as ``dtype`` records)
+    """
+    rows = np.flatnonzero(blocks["name"] == name)
+    rays, first = np.unique(blocks["ray"][rows], return_index=True)
+    offsets = blocks["offset"][rows[first]]
+    return rays, offsets, _gather_records(buf, offsets, dtype)
+
+
+def _decode_gate_blocks(buf, nrays, ray, data_offset, moment):
+    """
+    Decode one moment of many radials in bulk; radials sharing a gate count and word size are gathered together.
+    :param ray: radial index of every block
+    :param data_offset: absolute offset of the gate codes of every block
+    :param moment: MOMENT_BLOCK_DTYPE headers of the blocks
+    :return: (nrays, max gates) float32 array, NaN where a gate is missing
+    """
+    ngates = moment["ngates"].astype(np.int64)
+    word_size = moment["word_size"].astype(np.int64)
+    if np.any((word_size != 8) & (word_size != 16)):
+        raise ValueError("Unsupported NEXRAD moment word size: %s" % word_size[(word_size != 8) & (word_size != 16)][0])
+    # a zero scale marks moments stored as raw codes
+    scale = np.where(moment["scale"] == 0, 1.0, moment["scale"]).astype(np.float32)
+    offset = moment["offset"].astype(np.float32)
+    out = np.full((nrays, int(ngates.max(initial=0))), np.nan, dtype=np.float32)
+    layouts, inverse = np.unique(np.stack([ngates, word_size], axis=1), axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    for ilayout, (gates, bits) in enumerate(layouts):
+        if not gates:
+            continue
+        rows = np.flatnonzero(inverse == ilayout)
+        codes = _gather_blocks(buf, data_offset[rows], gates * bits // 8)
+        if bits == 16:
+            codes = codes.view(">u2")
+        values = (codes - offset[rows, None]) / scale[rows, None]
+        # codes 0 and 1 flag gates below threshold and range-folded gates
+        values[codes < 2] = np.nan
+        out[ray[rows], :gates] = values
+    return out
+
+
+class NEXRADLevel2BaseData(object):
+    """Decode NEXRAD Level II archives of MSG31 or legacy MSG1 radials into per-field arrays."""
+
+    def __init__(self, filename, station_lon=None, station_lat=None, station_alt=None, fields=None,
+                 sweeps=None, max_elevation=None, workers=None):
+        """
+        :param filename:  radar basedata filename
+        :param station_lon:  radar station longitude //units: degree east
+        :param station_lat:  radar station latitude //units:degree north
+        :param station_alt:  radar station altitude //units: meters
+        :param fields:  optional field names to decode, e.g. ["dBZ", "ZDR"]; None decodes every moment
+        :param sweeps:  optional sweep indices to decode; radials of other sweeps are dropped before decoding
+        :param max_elevation:  optional highest fixed angle to decode //units: degree
+        :param workers:  threads decompressing bzip2 LDM records; None lets the executor choose
+        """
+        super(NEXRADLevel2BaseData, self).__init__()
+        self.filename = filename
+        self.station_lon = station_lon
+        self.station_lat = station_lat
+        self.station_alt = station_alt
+        self.selected_fields = _normalize_field_selection(fields)
+        self._load_archive(workers)
+        if sweeps is not None or max_elevation is not None:
+            self._select_sweeps(sweeps, max_elevation)
+        self._field_data, self._field_gates, self._field_geometry = self._decode_moments()
+        self._buf = None
+        self._blocks = None
+
+    @classmethod
+    def read_metadata(cls, filename):
+        """
+        Summarize a volume from its message headers without decoding any moment.
+        Compressed archives are still decompressed in full, since LDM records carry no index.
+        :param filename:  radar basedata filename
+        :return: dict, see ``pycwr.io.read_metadata``
+        """
+        reader = cls.__new__(cls)
+        reader.filename = filename
+        reader.station_lon = reader.station_lat = reader.station_alt = None
+        reader.selected_fields = None
+        reader._load_archive()
+        layouts = dict((name, (ray, moment)) for name, ray, _, moment in reader._moment_blocks())
+        starts = reader.sweep_start_ray_index
+
+        def gate_spacing(field_name):
+            spacing = np.full(reader.nrays, np.nan)
+            if field_name in layouts:
+                ray, moment = layouts[field_name]
+                spacing[ray] = moment["gate_spacing"]
+            return spacing[starts]
+
+        fixed_angle = reader.get_fixed_angle()
+        log_resolution = gate_spacing("dBZ")
+        doppler_resolution = gate_spacing("V")
+        cuts = [
+            _metadata_cut(fixed_angle[isweep], log_resolution[isweep], doppler_resolution[isweep],
+                          reader._nyquist[start], reader._unambiguous_range[start])
+            for isweep, start in enumerate(starts)
+        ]
+        first_sweep = slice(starts[0], reader.sweep_end_ray_index[0] + 1)
+        fields = [name for name, (ray, _) in layouts.items()
+                  if np.any((ray >= first_sweep.start) & (ray < first_sweep.stop))]
+        lat, lon, alt, _ = reader.get_latitude_longitude_altitude_frequency()
+        _, _, date, milliseconds, _ = reader.volume_header
+        scan_time = reader.get_scan_time()
+        return _radar_metadata(
+            "NEXRAD_LEVEL2",
+            reader.get_sitename(),
+            lat,
+            lon,
+            alt,
+            None,
+            reader.get_scan_type(),
+            _julian_to_datetimes([date], [milliseconds])[0],
+            scan_time[-1],
+            None if reader.vcp is None else "VCP%d" % reader.vcp,
+            cuts,
+            fields,
+            site_code=reader.get_sitename(),
+        )
+
+    def _load_archive(self, workers=None):
+        """Index the radials of the archive and read their headers, leaving the gate data undecoded."""
+        fid = _prepare_for_read(self.filename)
+        try:
+            data = _read_all(fid, "NEXRAD Level II archive")
+        finally:
+            fid.close()
+        self.volume_header, self._buf = _archive_messages(data, workers=workers)
+        msg31, msg1, msg5 = _index_messages(self._buf)
+        self._cut_elevations = _msg5_elevations(self._buf, msg5)
+        self.latitude = self.longitude = self.altitude = self.vcp = None
+        if msg31.size:
+            self.message_type = 31
+            self._offsets = msg31
+            self.radial_header, self._blocks = _index_msg31_radials(self._buf, msg31)
+            header = self.radial_header
+            self._azimuth = header["azimuth_angle"].astype(np.float64)
+            self._elevation = header["elevation_angle"].astype(np.float64)
+            self._nyquist = np.full(msg31.size, np.nan)
+            self._unambiguous_range = np.full(msg31.size, np.nan)
+            rays, _, radial = _first_blocks(self._buf, self._blocks, b"RAD", RAD_BLOCK_DTYPE)
+            self._nyquist[rays] = radial["nyquist_vel"] / 100.
+            self._unambiguous_range[rays] = radial["unambig_range"] * 100.
+            rays, _, volume = _first_blocks(self._buf, self._blocks, b"VOL", VOL_BLOCK_DTYPE)
+            if rays.size:
+                self.latitude = float(volume["lat"][0])
+                self.longitude = float(volume["lon"][0])
+                self.altitude = float(volume["height"][0]) + float(volume["feedhorn_height"][0])
+                self.vcp = int(volume["vcp"][0])
+        elif msg1.size:
+            self.message_type = 1
+            self._offsets = msg1
+            self._blocks = None
+            self.radial_header = header = _gather_records(self._buf, msg1 + MSG_HEADER_SIZE, MSG1_HEADER_DTYPE)
+            self._azimuth = header["azimuth_angle"] * (180.0 / (4096.0 * 8.0))
+            self._elevation = header["elevation_angle"] * (180.0 / (4096.0 * 8.0))
+            self._nyquist = header["nyquist_vel"] / 100.
+            self._unambiguous_range = header["unambig_range"] * 100.
+            self.vcp = int(header["vcp"][0])
+        else:
+            raise ValueError("NEXRAD Level II archive holds no MSG31 or MSG1 radials.")
+        self._julian_date = header["collect_date"].astype(np.int64)
+        self._msends = header["collect_ms"].astype(np.int64)
+        self._elevation_number = header["elevation_number"].astype(np.int64)
+        # sweeps are the runs of radials sharing an elevation number
+        self._ray_sweep = np.concatenate([[0], np.cumsum(np.diff(self._elevation_number) != 0)])
+        self._scan_time = None
+        self._set_sweeps()
+
+    def _set_sweeps(self):
+        self.nrays = self._ray_sweep.size
+        change = np.flatnonzero(np.diff(self._ray_sweep) != 0) + 1
+        self.sweep_start_ray_index = np.concatenate([[0], change]).astype(np.int64)
+        self.sweep_end_ray_index = np.concatenate([change - 1, [self.nrays - 1]]).astype(np.int64)
+        self.nsweeps = self.sweep_start_ray_index.size
+
+    def _select_sweeps(self, sweeps=None, max_elevation=None):
+        """Drop the radials of unselected sweeps before any moment is decoded."""
+        selected = _resolve_sweep_selection(self.get_fixed_angle(), sweeps, max_elevation)
+        keep = np.zeros(self.nrays, dtype=bool)
+        for sweep in selected.tolist():
+            keep[self.sweep_start_ray_index[sweep]:self.sweep_end_ray_index[sweep] + 1] = True
+        for name in ("_offsets", "radial_header", "_azimuth", "_elevation", "_nyquist", "_unambiguous_range",
+                     "_julian_date", "_msends", "_elevation_number", "_ray_sweep"):
+            setattr(self, name, getattr(self, name)[keep])
+        if self._blocks is not None:
+            ray_number = np.cumsum(keep) - 1
+            self._blocks = self._blocks[keep[self._blocks["ray"]]]
+            self._blocks["ray"] = ray_number[self._blocks["ray"]]
+        self._set_sweeps()
+
+    def _moment_blocks(self):
+        """
+        Yield (field name, rays, absolute gate data offsets, MOMENT_BLOCK_DTYPE headers) for every
+        selected moment present in the volume.
+        """
+        if self.message_type == 31:
+            for moment_name, field_name in NEXRAD_MOMENT_FIELDS.items():
+                if self.selected_fields is not None and field_name not in self.selected_fields:
+                    continue
+                rays, offsets, moment = _first_blocks(self._buf, self._blocks, moment_name, MOMENT_BLOCK_DTYPE)
+                if rays.size:
+                    yield field_name, rays, offsets + MOMENT_BLOCK_DTYPE.itemsize, moment
+            return
+        header = self.radial_header
+        base = self._offsets + MSG_HEADER_SIZE
+        for field_name, pointer_key, count_key, first_key, step_key, scale, offset in _MSG1_FIELD_BLOCKS:
+            if self.selected_fields is not None and field_name not in self.selected_fields:
+                continue
+            rays = np.flatnonzero(header[pointer_key] > 0)
+            if not rays.size:
+                continue
+            moment = np.zeros(rays.size, dtype=MOMENT_BLOCK_DTYPE)
+            moment["ngates"] = header[count_key][rays]
+            # Doppler ranges may start before the radar and are stored as unsigned words
+            moment["first_gate"] = header[first_key][rays].astype(np.int64) - \
+                np.where(header[first_key][rays] > 32767, 65536, 0)
+            moment["gate_spacing"] = header[step_key][rays]
+            moment["word_size"] = 8
+            moment["scale"] = scale
+            moment["offset"] = offset
+            if field_name == "V":
+                # doppler resolution 4 codes velocity in 1 m/s steps
+                moment["scale"][header["doppler_resolution"][rays] == 4] = 1.0
+            yield field_name, rays, base[rays] + header[pointer_key][rays].astype(np.int64), moment
+
+    def _decode_moments(self):
+        """
+        Decode the selected moments of the retained radials.
+        :return: per-field (nrays, max gates) float32 arrays, per-ray gate counts and
+            per-ray (first gate, gate spacing) in meters
+        """
+        field_data, field_gates, field_geometry = {}, {}, {}
+        for field_name, rays, data_offset, moment in self._moment_blocks():
+            field_data[field_name] = _decode_gate_blocks(self._buf, self.nrays, rays, data_offset, moment)
+            field_gates[field_name] = np.zeros(self.nrays, dtype=np.int64)
+            field_gates[field_name][rays] = moment["ngates"]
+            field_geometry[field_name] = np.zeros((self.nrays, 2), dtype=np.int64)
+            field_geometry[field_name][rays, 0] = moment["first_gate"]
+            field_geometry[field_name][rays, 1] = moment["gate_spacing"]
+        return field_data, field_gates, field_geometry
+
+    def get_nyquist_velocity(self):
+        """Return the per-ray Nyquist velocity."""
+        return self._nyquist
+
+    def get_unambiguous_range(self):
+        """Return the per-ray unambiguous range in meters."""
+        return self._unambiguous_range
+
+    def get_scan_time(self):
+        """Return the acquisition time for each ray."""
+        if self._scan_time is None:
+            self._scan_time = _julian_to_datetimes(self._julian_date, self._msends)
+        return self._scan_time
+
+    def get_sweep_end_ray_index(self):
+        """Return the inclusive end index of each sweep."""
+        return self.sweep_end_ray_index
+
+    def get_sweep_start_ray_index(self):
+        """Return the start index of each sweep."""
+        return self.sweep_start_ray_index
+
+    def get_rays_per_sweep(self):
+        """Return the number of rays in each sweep."""
+        return self.sweep_end_ray_index - self.sweep_start_ray_index + 1
+
+    def get_azimuth(self):
+        """Return the azimuth angle for each ray."""
+        return self._azimuth
+
+    def get_elevation(self):
+        """Return the elevation angle for each ray."""
+        return self._elevation
+
+    def get_fixed_angle(self):
+        """Return the MSG5 cut elevation of each sweep, or its mean ray elevation without a matching cut."""
+        fixed_angle = np.add.reduceat(self._elevation, self.sweep_start_ray_index) / self.get_rays_per_sweep()
+        if self._cut_elevations is not None:
+            cut = self._elevation_number[self.sweep_start_ray_index] - 1
+            known = (cut >= 0) & (cut < self._cut_elevations.size)
+            fixed_angle[known] = self._cut_elevations[cut[known]]
+        return fixed_angle
+
+    def get_latitude_longitude_altitude_frequency(self):
+        """Return latitude, longitude, altitude, and radar frequency; MSG1 archives carry no location."""
+        lat, lon, alt = self.latitude, self.longitude, self.altitude
+        if self.station_lon is not None:
+            lon = self.station_lon
+        if self.station_lat is not None:
+            lat = self.station_lat
+        if self.station_alt is not None:
+            alt = self.station_alt
+        return lat, lon, alt, WSR88D_FREQUENCY_GHZ
+
+    def get_scan_type(self):
+        """Return the scan type string."""
+        return "ppi"
+
+    def get_sitename(self):
+        """Return the ICAO identifier of the volume header."""
+        return self.volume_header[4].decode("ascii", "ignore").strip() or "Unknown"
+
+
+class NEXRAD2NRadar(object):
+    """Bridge from decoded NEXRAD Level II radials to an NRadar object."""
+
+    # REF, VEL and SW use fixed one-byte codes in the ICD, so the codes pack them losslessly
+    field_encoding = {
+        field_name: {"dtype": "uint8", "scale_factor": 1.0 / scale, "add_offset": -offset / scale, "_FillValue": 0}
+        for field_name, _, _, _, _, scale, offset in _MSG1_FIELD_BLOCKS
+    }
+
+    def __init__(self, NEXRAD):
+        self.NEXRAD = NEXRAD
+        self._resample_cache = {}
+        self.nrays = self.NEXRAD.nrays
+        self.nsweeps = self.NEXRAD.nsweeps
+        self.sweep_start_ray_index = self.NEXRAD.get_sweep_start_ray_index()
+        self.sweep_end_ray_index = self.NEXRAD.get_sweep_end_ray_index()
+        self.scan_type = self.NEXRAD.get_scan_type()
+        self.latitude, self.longitude, self.altitude, self.frequency = \
+            self.NEXRAD.get_latitude_longitude_altitude_frequency()
+        if self.latitude is None or self.longitude is None or self.altitude is None:
+            raise ValueError("NEXRAD archive carries no site location; pass station_lon, station_lat and station_alt.")
+        self.first_gate, self.gate_spacing = self._reference_geometry()
+        self._aligned_extent = dict((name, self._get_aligned_extent(name)) for name in self.NEXRAD._field_data)
+        self.bins_per_sweep = self.get_nbins_per_sweep()
+        self.max_bins = int(self.bins_per_sweep.max())
+        self.range = self.get_range_per_radial(self.max_bins)
+        self.azimuth = self.NEXRAD.get_azimuth()
+        self.elevation = self.NEXRAD.get_elevation()
+        self.fields = self._get_fields()
+        self.extended_fields = self._build_extended_fields()
+        self.sitename = self.NEXRAD.get_sitename()
+
+    def _reference_geometry(self):
+        """Return the (first gate, gate spacing) of the aligned range grid, preferring the Doppler moments."""
+        names = [name for name in _RANGE_REFERENCE_FIELDS if name in self.NEXRAD._field_gates]
+        for name in names + list(self.NEXRAD._field_gates):
+            geometry = self.NEXRAD._field_geometry[name][self.NEXRAD._field_gates[name] > 0]
+            geometry = geometry[geometry[:, 1] > 0]
+            if geometry.size:
+                return int(geometry[0, 0]), int(geometry[0, 1])
+        raise ValueError("NEXRAD archive holds none of the requested moments.")
+
+    def _get_aligned_extent(self, field_name):
+        """Return the number of aligned range bins each ray of ``field_name`` reaches."""
+        gates = self.NEXRAD._field_gates[field_name]
+        first_gate, gate_spacing = self.NEXRAD._field_geometry[field_name].T
+        last_gate = first_gate + (gates - 1) * gate_spacing
+        extent = np.floor((last_gate - self.first_gate) / float(self.gate_spacing) + 0.5).astype(np.int64) + 1
+        return np.where(gates > 0, np.maximum(extent, 0), 0)
+
+    def get_azimuth(self):
+        """Return the azimuth angle for each ray."""
+        return self.azimuth
+
+    def get_elevation(self):
+        """Return the elevation angle for each ray."""
+        return self.elevation
+
+    def get_rays_per_sweep(self):
+        """Return the number of rays in each sweep."""
+        return self.sweep_end_ray_index - self.sweep_start_ray_index + 1
+
+    def get_scan_time(self):
+        """Return the acquisition time for each ray."""
+        return self.NEXRAD.get_scan_time()
+
+    def get_sweep_end_ray_index(self):
+        """Return the inclusive end index of each sweep."""
+        return self.sweep_end_ray_index
+
+    def get_sweep_start_ray_index(self):
+        """Return the start index of each sweep."""
+        return self.sweep_start_ray_index
+
+    def get_nbins_per_sweep(self):
+        """Return the aligned bin count of each sweep: the Doppler extent, or the longest moment without one."""
+        starts = self.sweep_start_ray_index
+        doppler = np.zeros(self.nsweeps, dtype=np.int64)
+        longest = np.zeros(self.nsweeps, dtype=np.int64)
+        for name, extent in self._aligned_extent.items():
+            sweep_extent = np.maximum.reduceat(extent, starts)
+            longest = np.maximum(longest, sweep_extent)
+            if name in _RANGE_REFERENCE_FIELDS:
+                doppler = np.maximum(doppler, sweep_extent)
+        return np.where(doppler > 0, doppler, longest)
+
+    def get_range_per_radial(self, length):
+        """Return gate-center ranges of the aligned grid for a radial of ``length`` bins."""
+        return self.first_gate + self.gate_spacing * np.arange(length, dtype=np.float64)
+
+    def _get_fields(self):
+        """Assemble every field on the aligned range grid; radials with another gate geometry take the nearest gate."""
+        fields = {}
+        for field_name, data in self.NEXRAD._field_data.items():
+            out = np.full((self.nrays, self.max_bins), np.nan, dtype=np.float32)
+            layout = np.column_stack([self.NEXRAD._field_gates[field_name], self.NEXRAD._field_geometry[field_name]])
+            layouts, inverse = np.unique(layout, axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            for ilayout, (ngates, first_gate, gate_spacing) in enumerate(layouts.tolist()):
+                if ngates == 0:
+                    continue
+                rows = np.flatnonzero(inverse == ilayout)
+                if (first_gate, gate_spacing) == (self.first_gate, self.gate_spacing):
+                    ncopy = min(ngates, self.max_bins)
+                    out[rows, :ncopy] = data[rows, :ncopy]
+                else:
+                    valid, nearest = self._get_resample_index(ngates, first_gate, gate_spacing)
+                    out[np.ix_(rows, np.flatnonzero(valid))] = data[np.ix_(rows, nearest[valid])]
+            fields[field_name] = out
+        return fields
+
+    def _get_resample_index(self, ngates, first_gate, gate_spacing):
+        key = (ngates, first_gate, gate_spacing)
+        cached = self._resample_cache.get(key)
+        if cached is not None:
+            return cached
+
+        source = first_gate + gate_spacing * np.arange(ngates, dtype=np.float64)
+        target = self.range
+        right = np.searchsorted(source, target, side="left")
+        left = np.clip(right - 1, 0, ngates - 1)
+        right = np.clip(right, 0, ngates - 1)
+        choose_right = np.abs(source[right] - target) < np.abs(target - source[left])
+        nearest = np.where(choose_right, right, left)
+        valid = (target >= source[0]) & (target <= source[-1])
+        self._resample_cache[key] = (valid, nearest)
+        return valid, nearest
+
+    def _build_extended_fields(self):
+        """Collect native-range data of sweeps where a moment reaches past the aligned grid."""
+        extended_fields = {}
+        scan_time = self.get_scan_time()
+        for field_name, data in self.NEXRAD._field_data.items():
+            gates = self.NEXRAD._field_gates[field_name]
+            geometry = self.NEXRAD._field_geometry[field_name]
+            extended_sweeps = {}
+            for sweep_idx, (start, end, aligned_bins) in enumerate(
+                zip(self.sweep_start_ray_index, self.sweep_end_ray_index, self.bins_per_sweep)
+            ):
+                rays = slice(start, end + 1)
+                if self._aligned_extent[field_name][rays].max(initial=0) <= aligned_bins:
+                    continue
+                sweep_geometry = geometry[rays][gates[rays] > 0]
+                if np.any(sweep_geometry != sweep_geometry[0]):
+                    # radials of mixed gate geometry share no native range vector
+                    continue
+                native_bins = int(gates[rays].max())
+                first_gate, gate_spacing = sweep_geometry[0]
+                extended_sweeps[sweep_idx] = {
+                    "data": data[rays, :native_bins],
+                    "range": (first_gate + gate_spacing * np.arange(native_bins)).astype(np.float32),
+                    "time": np.asarray(scan_time[rays]),
+                    "azimuth": np.asarray(self.azimuth[rays], dtype=np.float32),
+                    "elevation": np.asarray(self.elevation[rays], dtype=np.float32),
+                    "aligned_bins": int(aligned_bins),
+                }
+            if extended_sweeps:
+                extended_fields[field_name] = extended_sweeps
+        return extended_fields
+
+    def get_nradar_nyquist_speed(self):
+        """array shape (nsweeps)"""
+        return self.NEXRAD.get_nyquist_velocity()[self.sweep_start_ray_index]
+
+    def get_nradar_unambiguous_range(self):
+        """array shape (nsweeps)"""
+        return self.NEXRAD.get_unambiguous_range()[self.sweep_start_ray_index]
+
+    def get_fixed_angle(self):
+        """Return the fixed angle of each sweep."""
+        return self.NEXRAD.get_fixed_angle()
+
+    def _get_metadata(self):
+        metadata = {"original_container": "NEXRAD_LEVEL2", "radar_name": "WSR-88D"}
+        if self.NEXRAD.vcp is not None:
+            metadata["scan_name"] = "VCP%d" % self.NEXRAD.vcp
+        return metadata
+
+    def to_prd(self, effective_earth_radius=None, sweeps=None, max_elevation=None):
+        """Build an ``NRadar.PRD`` object from the decoded NEXRAD Level II volume."""
+        return PRD(fields=self.fields, scan_type=self.scan_type, time=self.get_scan_time(),
+                   range=self.range, azimuth=self.azimuth, elevation=self.elevation, latitude=self.latitude,
+                   longitude=self.longitude, altitude=self.altitude,
+                   sweep_start_ray_index=self.sweep_start_ray_index,
+                   sweep_end_ray_index=self.sweep_end_ray_index, fixed_angle=self.get_fixed_angle(),
+                   bins_per_sweep=self.bins_per_sweep, nyquist_velocity=self.get_nradar_nyquist_speed(),
+                   frequency=self.frequency, unambiguous_range=self.get_nradar_unambiguous_range(),
+                   nrays=self.nrays, nsweeps=self.nsweeps, sitename=self.sitename,
+                   pyart_radar=None, effective_earth_radius=effective_earth_radius,
+                   extended_fields=self.extended_fields,
+                   metadata=self._get_metadata(),
+                   sweeps=sweeps, max_elevation=max_elevation)
+
+    def ToPRD(self, effective_earth_radius=None, sweeps=None, max_elevation=None):
+        """Backward-compatible alias for ``to_prd``."""
+        return self.to_prd(effective_earth_radius=effective_earth_radius, sweeps=sweeps,
+                           max_elevation=max_elevation)
+
+    def to_pyart_radar(self, effective_earth_radius=None, **kwargs):
+        """Export the decoded NEXRAD volume through the PRD Py-ART adapter."""
+        return self.to_prd(effective_earth_radius=effective_earth_radius).to_pyart_radar(**kwargs)
+
+    def ToPyartRadar(self, effective_earth_radius=None, **kwargs):
+        """Backward-compatible alias for ``to_pyart_radar``."""
+        return self.to_pyart_radar(effective_earth_radius=effective_earth_radius, **kwargs)
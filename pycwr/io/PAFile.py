@@ -1,10 +1,21 @@
 # -*- coding: utf-8 -*-
+import struct
+
 import numpy as np
 from .BaseDataProtocol.PAProtocol import dtype_PA
 from .util import (
+    _decode_header_text,
+    _epoch_to_datetimes,
+    _gather_blocks,
+    _gather_records,
+    _metadata_cut,
+    _normalize_field_selection,
     _prepare_for_read,
+    _probe_lowest_sweep_fields,
+    _radar_metadata,
     _read_all,
     _read_exact,
+    _structure_dtype,
     _unpack_from_buf,
     _validate_count,
     julian2date_SEC,
@@ -21,9 +32,152 @@ MAX_PA_BEAMS = 4096
 MAX_PA_SWEEPS = 512
 MAX_PA_MOMENTS_PER_RADIAL = 64
 MAX_PA_MOMENT_DATA_BYTES = 32 * 1024 * 1024
+PA_MAX_DECODED_PAYLOAD_BYTES = 1024 * 1024 * 1024
 PA_VALID_CODE_MIN = 5
 PA_REFLECTIVITY_FIELDS = ("dBT", "dBZ", "Zc")
 PA_MOMENT_BIN_DTYPES = {1: "u1", 2: "u2"}
+_PA_RADIAL_HEADER_DTYPE = _structure_dtype(dtype_PA.RadialHeader())
+_PA_MOMENT_HEADER_DTYPE = _structure_dtype(dtype_PA.RadialData())
+_PA_MOMENT_NUMBER_POS = _PA_RADIAL_HEADER_DTYPE.fields["MomentNumber"][1]
+_PA_MOMENT_LENGTH_POS = _PA_MOMENT_HEADER_DTYPE.fields["Length"][1]
+_INT32 = struct.Struct("<i")
+
+# 产品名称表，以及 DataType 到产品序号的查找表（-1 表示未命名的数据类型）
+PA_PRODUCTS = tuple(dict.fromkeys(dtype_PA.flag2Product[code] for code in sorted(dtype_PA.flag2Product)))
+_PA_PRODUCT_LOOKUP = np.array(
+    [PA_PRODUCTS.index(dtype_PA.flag2Product[code]) if code in dtype_PA.flag2Product else -1
+     for code in range(max(dtype_PA.flag2Product) + 1)],
+    dtype=np.int16,
+)
+
+PA_MOMENT_INDEX_DTYPE = np.dtype(
+    [
+        ("ray", "<i4"),
+        ("product", "<i2"),
+        ("DataType", "<i4"),
+        ("Scale", "<i4"),
+        ("Offset", "<i4"),
+        ("BinLength", "<i2"),
+        ("Length", "<i4"),
+        ("position", "<i8"),
+    ]
+)
+
+
+def _index_pa_radials(buf):
+    """
+    第一遍：只遍历径向头和数据头，建立径向和数据块的偏移索引，不读取数据本身
+    :param buf: 扫描配置块之后的径向数据
+    :return: (径向头记录, 数据块索引记录)；没有任何命名数据的径向被舍弃
+    """
+    size = len(buf)
+    header_size = _PA_RADIAL_HEADER_DTYPE.itemsize
+    moment_header_size = _PA_MOMENT_HEADER_DTYPE.itemsize
+    read_int = _INT32.unpack_from
+    radial_offsets = []
+    moment_offsets = []
+    moment_rays = []
+    pos = 0
+    while pos + header_size <= size:
+        moment_num = _validate_count(
+            "PA MomentNumber",
+            read_int(buf, pos + _PA_MOMENT_NUMBER_POS)[0],
+            minimum=0,
+            maximum=MAX_PA_MOMENTS_PER_RADIAL,
+        )
+        iray = len(radial_offsets)
+        radial_offsets.append(pos)
+        pos += header_size
+        for _ in range(moment_num):
+            if pos + moment_header_size > size:
+                raise ValueError("PA moment header is truncated.")
+            data_len = _validate_count(
+                "PA moment length",
+                read_int(buf, pos + _PA_MOMENT_LENGTH_POS)[0],
+                minimum=0,
+                maximum=MAX_PA_MOMENT_DATA_BYTES,
+            )
+            moment_offsets.append(pos)
+            moment_rays.append(iray)
+            pos += moment_header_size
+            if pos + data_len > size:
+                raise ValueError("PA moment payload is truncated.")
+            pos += data_len
+    if pos != size:
+        raise ValueError("PA radial header is truncated.")
+
+    radial_header = _gather_records(buf, radial_offsets, _PA_RADIAL_HEADER_DTYPE)
+    moment_header = _gather_records(buf, moment_offsets, _PA_MOMENT_HEADER_DTYPE)
+    moment_index = np.zeros(moment_header.size, dtype=PA_MOMENT_INDEX_DTYPE)
+    moment_index["ray"] = moment_rays
+    for key in ("DataType", "Scale", "Offset", "BinLength", "Length"):
+        moment_index[key] = moment_header[key]
+    moment_index["position"] = np.asarray(moment_offsets, dtype=np.int64) + moment_header_size
+    data_type = moment_header["DataType"]
+    named = (data_type >= 0) & (data_type < _PA_PRODUCT_LOOKUP.size)
+    moment_index["product"] = -1
+    moment_index["product"][named] = _PA_PRODUCT_LOOKUP[data_type[named]]
+    # 未命名的数据类型直接跳过，命名数据的库长必须是 1 或 2 字节
+    moment_index = moment_index[moment_index["product"] >= 0]
+    bin_length = moment_index["BinLength"]
+    if np.any((bin_length != 1) & (bin_length != 2)):
+        raise ValueError("PA moment bin length must be 1 or 2 bytes.")
+
+    keep = np.zeros(radial_header.size, dtype=bool)
+    keep[moment_index["ray"]] = True
+    ray_number = np.cumsum(keep) - 1
+    moment_index["ray"] = ray_number[moment_index["ray"]]
+    return radial_header[keep], moment_index
+
+
+def _decode_pa_moments(buf, nrays, moment_index, field_names=None):
+    """
+    第二遍：把每个命名产品整体解码到预先分配的 ``(nrays, nbins)`` float32 数组
+
+    库长和数据长度相同的数据块一次性取出并定标；没有该产品的径向保持 NaN，
+    库数记为 -1；同一径向重复出现的产品以最后一个为准。
+    :param field_names: 可选的待解码产品名称集合；库数对所有产品都给出，其余数据不做转换
+    :return: (产品数组字典, 每根径向的库数字典)
+    """
+    field_data = {}
+    field_bins = {}
+    products = moment_index["product"]
+    for product in np.unique(products):
+        rows = np.flatnonzero(products == product)
+        _, last = np.unique(moment_index["ray"][rows][::-1], return_index=True)
+        entries = moment_index[rows[::-1][last]]
+        nbins = entries["Length"] // entries["BinLength"]
+        bins = np.full(nrays, -1, dtype=np.int32)
+        bins[entries["ray"]] = nbins
+        name = PA_PRODUCTS[int(product)]
+        field_bins[name] = bins
+        if field_names is not None and name not in field_names:
+            continue
+        if np.any(entries["Length"] % entries["BinLength"] != 0):
+            raise ValueError("PA moment payload length does not match the bin length.")
+        if np.any(entries["Scale"] == 0):
+            raise ValueError("PA moment scale cannot be zero.")
+        data = np.full((nrays, int(nbins.max())), np.nan, dtype=np.float32)
+        group_key = entries["BinLength"].astype(np.int64) * (MAX_PA_MOMENT_DATA_BYTES + 1) + entries["Length"]
+        for key in np.unique(group_key):
+            group = entries[group_key == key]
+            bin_length, length = int(group["BinLength"][0]), int(group["Length"][0])
+            if length == 0:
+                continue
+            codes = _gather_blocks(buf, group["position"], length)
+            if bin_length == 2:
+                codes = codes.view("<u2")
+            # PA 标准中小于 5 的编码为特殊值：0 低于阈值，1 距离折叠，2 未扫描，3 未知，4 保留，解码后保持缺测
+            for scale, offset in np.unique(np.stack([group["Scale"], group["Offset"]], axis=1), axis=0).tolist():
+                members = np.flatnonzero((group["Scale"] == scale) & (group["Offset"] == offset))
+                table = ((np.arange(256 if bin_length == 1 else 65536) - offset) / scale).astype(np.float32)
+                table[:PA_VALID_CODE_MIN] = np.nan
+                if members.size == nrays and codes.shape[1] == data.shape[1]:
+                    np.take(table, codes, out=data, mode="clip")
+                    continue
+                data[group["ray"][members], :codes.shape[1]] = np.take(table, codes[members], mode="clip")
+        field_data[name] = data
+    return field_data, field_bins
 
 
 class PABaseData(object):
@@ -31,28 +185,110 @@ class PABaseData(object):
     解码新一代双偏振的数据格式
     """
 
-    def __init__(self, filename, station_lon=None, station_lat=None, station_alt=None):
+    def __init__(self, filename, station_lon=None, station_lat=None, station_alt=None, fields=None):
         """
         :param filename:  radar basedata filename
         :param station_lon:  radar station longitude //units: degree east
         :param station_lat:  radar station latitude //units:degree north
         :param station_alt:  radar station altitude //units: meters
+        :param fields:  optional field names to decode, e.g. ["dBZ", "ZDR"]; None decodes every moment
         """
         super(PABaseData, self).__init__()
         self.filename = filename
         self.station_lon = station_lon
         self.station_lat = station_lat
         self.station_alt = station_alt
+        self.selected_fields = _normalize_field_selection(fields)
         self.fid = _prepare_for_read(self.filename)  ##对压缩的文件进行解码
-        self._check_standard_basedata()  ##确定文件是standard文件
-        self.header = self._parse_BaseDataHeader()
-        self.radial = self._parse_radial()
-        self.nrays = len(self.radial)
+        try:
+            self._check_standard_basedata()  ##确定文件是standard文件
+            self.header = self._parse_BaseDataHeader()
+            self._load_radials(*self._parse_radial(self.selected_fields))
+        finally:
+            self.fid.close()
+
+    @classmethod
+    def _from_radial_payload(cls, header, buf, station_lon=None, station_lat=None, station_alt=None, fields=None):
+        """
+        由已解析的文件头和只包含完整扫描的径向数据构造读取器，例如仍在写入中的体扫
+        :param header: 文件头字典，``CutConfig`` 与 ``TaskConfig['CutNumber']`` 须与 ``buf`` 中的扫描一致
+        """
+        reader = cls.__new__(cls)
+        reader.filename = None
+        reader.station_lon = station_lon
+        reader.station_lat = station_lat
+        reader.station_alt = station_alt
+        reader.selected_fields = _normalize_field_selection(fields)
+        reader.header = header
+        radial_header, moment_index = _index_pa_radials(buf)
+        field_data, field_bins = _decode_pa_moments(buf, radial_header.size, moment_index,
+                                                    field_names=reader.selected_fields)
+        reader._load_radials(radial_header, moment_index, field_data, field_bins)
+        return reader
+
+    def _load_radials(self, radial_header, moment_index, field_data, field_bins):
+        """挂接解码后的径向数据，并建立 sweep 起止索引"""
+        self.radial_header, self.moment_index = radial_header, moment_index
+        self._field_data, self._field_bins = field_data, field_bins
+        self._radial = None
+        self.nrays = self.radial_header.size
         self.nsweeps = _validate_count("CutNumber", self.header['TaskConfig']['CutNumber'], minimum=1, maximum=MAX_PA_SWEEPS)
         if self.nrays < self.nsweeps:
             raise ValueError("PA radial count is smaller than the declared sweep count.")
         self.sweep_start_ray_index, self.sweep_end_ray_index = self._build_sweep_indices()
-        self.fid.close()
+
+    @classmethod
+    def read_metadata(cls, filename):
+        """
+        只读取文件头和最低仰角的径向头，不解码径向数据
+        :param filename:  radar basedata filename
+        :return: dict, see ``pycwr.io.read_metadata``
+        """
+        reader = cls.__new__(cls)
+        reader.filename = filename
+        reader.station_lon = reader.station_lat = reader.station_alt = None
+        reader.fid = _prepare_for_read(filename)
+        try:
+            reader._check_standard_basedata()
+            reader.header = reader._parse_BaseDataHeader()
+            cut_config = reader.header['CutConfig']
+            fields = _probe_lowest_sweep_fields(
+                reader.fid,
+                _PA_RADIAL_HEADER_DTYPE,
+                _PA_MOMENT_HEADER_DTYPE,
+                dtype_PA.flag2Product,
+                cut_config['Elevation'],
+                max_moments=MAX_PA_MOMENTS_PER_RADIAL,
+                context="PA",
+            )
+        finally:
+            reader.fid.close()
+        lat, lon, alt, frequency = reader.get_latitude_longitude_altitude_frequency()
+        cuts = [
+            _metadata_cut(
+                cut['Elevation'],
+                cut['LogResolution'],
+                cut['DopplerResolution'],
+                cut['NyquistSpeed'],
+                cut['MaximumRange'],
+            )
+            for cut in cut_config
+        ]
+        return _radar_metadata(
+            "PA",
+            reader.get_sitename(),
+            lat,
+            lon,
+            alt,
+            frequency,
+            reader.get_scan_type(),
+            julian2date_SEC(int(reader.header['TaskConfig']['VolumeStartTime']), 0),
+            None,
+            _decode_header_text(reader.header['TaskConfig']['TaskName']),
+            cuts,
+            fields,
+            site_code=_decode_header_text(reader.header['SiteConfig']['SiteCode']),
+        )
 
     def _check_standard_basedata(self):
         """
@@ -94,70 +330,52 @@ class PABaseData(object):
         BaseDataHeader['CutConfig'] = np.frombuffer(cut_buf, dtype_PA.BaseDataHeader['CutConfigurationBlock'])
         return BaseDataHeader
 
-    @staticmethod
-    def _decode_moment_payload(moment_header, data_buf):
-        bin_length = int(moment_header["BinLength"])
-        if bin_length not in PA_MOMENT_BIN_DTYPES:
-            raise ValueError("PA moment bin length must be 1 or 2 bytes.")
-
-        data_len = _validate_count(
-            "PA moment length",
-            moment_header["Length"],
-            minimum=0,
-            maximum=MAX_PA_MOMENT_DATA_BYTES,
-        )
-        if data_len % bin_length != 0:
-            raise ValueError("PA moment payload length does not match the bin length.")
-
-        scale = int(moment_header["Scale"])
-        if scale == 0:
-            raise ValueError("PA moment scale cannot be zero.")
-
-        raw = np.frombuffer(data_buf, dtype=PA_MOMENT_BIN_DTYPES[bin_length]).astype(np.int32, copy=False)
-        decoded = np.where(
-            raw >= PA_VALID_CODE_MIN,
-            (raw - moment_header["Offset"]) / moment_header["Scale"],
-            np.nan,
-        )
-        return decoded.astype(np.float32, copy=False)
-
-    def _parse_radial(self):
-        radial = []
-        buf = self.fid.read(dtype_PA.RadialHeaderBlockSize)
-        while len(buf) == dtype_PA.RadialHeaderBlockSize:  ##read until EOF
-            RadialDict, _ = _unpack_from_buf(buf, 0, dtype_PA.RadialHeader())
-            self.MomentNum = _validate_count(
-                "PA MomentNumber",
-                RadialDict['MomentNumber'],
-                minimum=0,
-                maximum=MAX_PA_MOMENTS_PER_RADIAL,
-            )
-            self.LengthOfData = RadialDict['LengthOfData']
-            RadialDict['fields'] = self._parse_radial_single()
-            if RadialDict["fields"]:
-                radial.append(RadialDict)
-            buf = self.fid.read(dtype_PA.RadialHeaderBlockSize)
-        if buf:
-            raise ValueError("PA radial header is truncated.")
-        return radial
+    def _parse_radial(self, field_names=None):
+        """
+        一次读入全部径向数据，建立偏移索引后整体解码（选中的）数据
+        :param field_names: optional set of field names to decode.
+        :return: (径向头记录, 数据块索引, 产品数组字典, 每根径向的库数字典)
+        """
+        buf = _read_all(self.fid, "PA radial payload", max_bytes=PA_MAX_DECODED_PAYLOAD_BYTES)
+        radial_header, moment_index = _index_pa_radials(buf)
+        field_data, field_bins = _decode_pa_moments(buf, radial_header.size, moment_index, field_names=field_names)
+        return radial_header, moment_index, field_data, field_bins
+
+    def get_ray_field_names(self, iray):
+        """Return the ordered field names carried by radial ``iray``."""
+        lo, hi = np.searchsorted(self.moment_index["ray"], [iray, iray + 1])
+        return tuple(dict.fromkeys(PA_PRODUCTS[product] for product in self.moment_index["product"][lo:hi]))
+
+    @property
+    def radial(self):
+        """按原有格式组织的逐径向字典，首次访问时生成"""
+        if self._radial is None:
+            radial = []
+            for iray, record in enumerate(self.radial_header.tolist()):
+                radial_dict = dict(zip(_PA_RADIAL_HEADER_DTYPE.names, record))
+                names = self.get_ray_field_names(iray)
+                radial_dict['fields'] = {
+                    name: self._field_data[name][iray, :self._field_bins[name][iray]]
+                    for name in names if name in self._field_data
+                }
+                radial_dict['field_bins'] = {name: int(self._field_bins[name][iray]) for name in names}
+                radial.append(radial_dict)
+            self._radial = radial
+        return self._radial
 
     def _build_sweep_indices(self):
         """Build sweep start/end indices from explicit PA radial metadata."""
-        if not self.radial:
+        if not self.nrays:
             return np.array([], dtype=np.int32), np.array([], dtype=np.int32)
 
-        elevation_starts = [0]
-        state_starts = [0]
-        for idx in range(1, self.nrays):
-            prev = self.radial[idx - 1]
-            curr = self.radial[idx]
-            if int(curr["ElevationNumber"]) != int(prev["ElevationNumber"]):
-                elevation_starts.append(idx)
-            if int(curr["RadialNumber"]) == 1 or int(curr["RadialState"]) in (0, 3):
-                state_starts.append(idx)
-
-        elevation_starts = np.asarray(sorted(set(elevation_starts)), dtype=np.int32)
-        state_starts = np.asarray(sorted(set(state_starts)), dtype=np.int32)
+        elevation_number = self.radial_header["ElevationNumber"]
+        radial_state = self.radial_header["RadialState"]
+        elevation_start = np.ones(self.nrays, dtype=bool)
+        elevation_start[1:] = elevation_number[1:] != elevation_number[:-1]
+        state_start = (self.radial_header["RadialNumber"] == 1) | (radial_state == 0) | (radial_state == 3)
+        state_start[0] = True
+        elevation_starts = np.flatnonzero(elevation_start).astype(np.int32)
+        state_starts = np.flatnonzero(state_start).astype(np.int32)
 
         if state_starts.size == self.nsweeps:
             starts = state_starts
@@ -181,35 +399,21 @@ class PABaseData(object):
             raise ValueError("PA sweep count does not match CutNumber.")
         if int(starts[0]) != 0 or int(ends[-1]) != self.nrays - 1:
             raise ValueError("PA sweep boundaries do not cover the full radial sequence.")
-
-        for start, end in zip(starts, ends):
-            if int(end) < int(start):
-                raise ValueError("PA sweep contains a negative-length radial segment.")
-            segment = self.radial[int(start): int(end) + 1]
-            elevation_numbers = {int(radial["ElevationNumber"]) for radial in segment}
-            if len(elevation_numbers) != 1:
-                raise ValueError("PA sweep contains multiple elevation numbers.")
-            radial_numbers = np.array([int(radial["RadialNumber"]) for radial in segment], dtype=np.int32)
-            if radial_numbers[0] != 1:
-                raise ValueError("PA sweep does not start at radial number 1.")
-            if np.any(np.diff(radial_numbers) <= 0):
-                raise ValueError("PA radial numbers are not strictly increasing within a sweep.")
-
-    def _parse_radial_single(self):
-        radial_var = {}
-        for _ in range(self.MomentNum):
-            Mom_buf = _read_exact(self.fid, dtype_PA.MomentHeaderBlockSize, "PA moment header")
-            Momheader, _ = _unpack_from_buf(Mom_buf, 0, dtype_PA.RadialData())
-            data_len = _validate_count("PA moment length", Momheader['Length'], minimum=0, maximum=MAX_PA_MOMENT_DATA_BYTES)
-            Data_buf = _read_exact(self.fid, data_len, "PA moment payload")
-            field_name = dtype_PA.flag2Product.get(int(Momheader['DataType']))
-            if field_name is None:
-                continue
-            # The PA standard marks codes below 5 as special values:
-            # 0 below threshold, 1 range-folded, 2 not scanned, 3 unknown,
-            # 4 reserved. These values must stay missing after decode.
-            radial_var[field_name] = self._decode_moment_payload(Momheader, Data_buf)
-        return radial_var
+        if np.any(ends < starts):
+            raise ValueError("PA sweep contains a negative-length radial segment.")
+
+        # 只比较同一 sweep 内相邻的两根径向
+        within = np.ones(self.nrays, dtype=bool)
+        within[starts] = False
+        within = within[1:]
+        elevation_number = self.radial_header["ElevationNumber"]
+        radial_number = self.radial_header["RadialNumber"].astype(np.int64)
+        if np.any((elevation_number[1:] != elevation_number[:-1]) & within):
+            raise ValueError("PA sweep contains multiple elevation numbers.")
+        if np.any(radial_number[starts] != 1):
+            raise ValueError("PA sweep does not start at radial number 1.")
+        if np.any((np.diff(radial_number) <= 0) & within):
+            raise ValueError("PA radial numbers are not strictly increasing within a sweep.")
 
     def get_nyquist_velocity(self):
         """get nyquist vel per ray
@@ -232,9 +436,7 @@ class PABaseData(object):
         获取每根径向的扫描时间
         :return:(nRays)
         """
-        return np.array(
-            [julian2date_SEC(int(radial["Seconds"]), int(radial["MicroSeconds"])) for radial in self.radial]
-        )
+        return _epoch_to_datetimes(self.radial_header["Seconds"], self.radial_header["MicroSeconds"])
 
     def get_sweep_end_ray_index(self):
         """
@@ -262,14 +464,14 @@ class PABaseData(object):
         获取每根径向的方位角
         :return:(nRays)
         """
-        return np.array([self.radial[iray]['Azimuth'] for iray in range(self.nrays)])
+        return self.radial_header['Azimuth'].astype(np.float64)
 
     def get_elevation(self):
         """
         获取每根径向的仰角
         :return: (nRays)
         """
-        return np.array([self.radial[iray]['Elevation'] for iray in range(self.nrays)])
+        return self.radial_header['Elevation'].astype(np.float64)
 
     def get_latitude_longitude_altitude_frequency(self):
         """
@@ -305,8 +507,10 @@ class PA2NRadar(object):
     def __init__(self, pa_reader):
         super(PA2NRadar, self).__init__()
         self.pa_reader = pa_reader
-        self.radial = list(self.pa_reader.radial)
-        self.nrays = len(self.radial)
+        self.radial_header = self.pa_reader.radial_header
+        self._field_data = self.pa_reader._field_data
+        self._field_bins = self.pa_reader._field_bins
+        self.nrays = self.pa_reader.nrays
         self.nsweeps = int(self.pa_reader.header['TaskConfig']['CutNumber'])
         self.scan_type = self.pa_reader.get_scan_type()
         self.latitude, self.longitude, self.altitude, self.frequency = \
@@ -329,44 +533,25 @@ class PA2NRadar(object):
             return np.linspace(30, 30 * length, length)
         return np.linspace(resolution, resolution * length, length)
 
-    @staticmethod
-    def _pad_field_array(values, length):
-        if values.ndim != 1:
-            raise ValueError("PA radial field arrays must be one-dimensional.")
-        if values.size >= length:
-            return values[:length]
-        out = np.full((length,), np.nan, dtype=np.float32)
-        out[:values.size] = values
-        return out
-
+    @property
+    def radial(self):
+        """按原有格式组织的逐径向字典"""
+        return self.pa_reader.radial
 
     def get_nbins_per_sweep(self):
         """
-        确定每个 sweep 的 aligned 距离库长度。
+        确定每个 sweep 的 aligned 距离库长度：优先取非反射率类变量的最大库数，
+        没有时取反射率类变量的最大库数。
         :return:
         """
-        return np.array(
-            [
-                self._aligned_bins_for_sweep(int(start), int(end))
-                for start, end in zip(self.sweep_start_ray_index, self.sweep_end_ray_index)
-            ],
-            dtype=np.int32,
-        )
-
-    def _aligned_bins_for_sweep(self, start, end):
-        preferred_lengths = []
-        reflectivity_lengths = []
-        for iray in range(start, end + 1):
-            for field_name, values in self.radial[iray]["fields"].items():
-                if field_name in PA_REFLECTIVITY_FIELDS:
-                    reflectivity_lengths.append(values.size)
-                else:
-                    preferred_lengths.append(values.size)
-        if preferred_lengths:
-            return int(max(preferred_lengths))
-        if reflectivity_lengths:
-            return int(max(reflectivity_lengths))
-        return 0
+        preferred = np.full(self.sweep_start_ray_index.size, -1, dtype=np.int32)
+        reflectivity = np.full(self.sweep_start_ray_index.size, -1, dtype=np.int32)
+        for field_name, bins in self._field_bins.items():
+            # 没有该变量的径向库数为 -1
+            sweep_max = np.maximum.reduceat(bins, self.sweep_start_ray_index)
+            target = reflectivity if field_name in PA_REFLECTIVITY_FIELDS else preferred
+            np.maximum(target, sweep_max, out=target)
+        return np.where(preferred >= 0, preferred, np.maximum(reflectivity, 0)).astype(np.int32)
 
     def get_rays_per_sweep(self):
         return self.sweep_end_ray_index - self.sweep_start_ray_index + 1
@@ -376,14 +561,14 @@ class PA2NRadar(object):
         获取每根径向的方位角
         :return:(nRays)
         """
-        return np.array([self.radial[iray]['Azimuth'] for iray in range(self.nrays)])
+        return self.radial_header['Azimuth'].astype(np.float64)
 
     def get_elevation(self):
         """
         获取每根径向的仰角
         :return: (nRays)
         """
-        elevation = np.array([self.radial[iray]['Elevation'] for iray in range(self.nrays)])
+        elevation = self.radial_header['Elevation'].astype(np.float64)
         return np.where(elevation>180, elevation-360, elevation)
 
     def get_scan_time(self):
@@ -391,29 +576,21 @@ class PA2NRadar(object):
         获取每根径向的扫描时间
         :return:(nRays)
         """
-        return np.array(
-            [julian2date_SEC(int(radial["Seconds"]), int(radial["MicroSeconds"])) for radial in self.radial]
-        )
+        return _epoch_to_datetimes(self.radial_header["Seconds"], self.radial_header["MicroSeconds"])
 
     def get_nyquist_velocity(self):
         """get nyquist vel per ray
         获取每根径向的不模糊速度
         :return:(nRays)
         """
-        return np.concatenate(
-            [[nyquist] * int(ray_count) for nyquist, ray_count in zip(self.header['CutConfig']['NyquistSpeed'], self.rays_per_sweep)],
-            axis=0,
-        )
+        return np.repeat(self.header['CutConfig']['NyquistSpeed'], self.rays_per_sweep)
 
     def get_unambiguous_range(self):
         """
         获取每根径向的不模糊距离
         :return:(nRays)
         """
-        return np.concatenate(
-            [[nyquist] * int(ray_count) for nyquist, ray_count in zip(self.header['CutConfig']['MaximumRange'], self.rays_per_sweep)],
-            axis=0,
-        )
+        return np.repeat(self.header['CutConfig']['MaximumRange'], self.rays_per_sweep)
 
     def get_range_per_radial(self, length):
         """
@@ -432,44 +609,35 @@ class PA2NRadar(object):
         return self._range_axis(self.header['CutConfig']['LogResolution'][0], length)
 
     def _get_fields(self):
-        """将所有的field的数据提取出来"""
+        """将所有的field的数据提取出来，截断或补齐到 aligned 距离库长度"""
         max_bins = int(self.bins_per_sweep.max())
         fields = {}
-        field_keys = sorted({key for radial in self.radial for key in radial['fields'].keys()})
-        for ikey in field_keys:
-            fields[ikey] = np.array(
-                [self._field_row(radial["fields"], ikey, max_bins) for radial in self.radial],
-                dtype=np.float32,
-            )
+        for ikey in sorted(self._field_data):
+            data = self._field_data[ikey]
+            if data.shape[1] >= max_bins:
+                fields[ikey] = np.ascontiguousarray(data[:, :max_bins])
+            else:
+                fields[ikey] = np.full((self.nrays, max_bins), np.nan, dtype=np.float32)
+                fields[ikey][:, :data.shape[1]] = data
         return fields
 
     def _build_extended_fields(self):
         """Collect native-range reflectivity for sweeps longer than the aligned grid."""
+        if "dBZ" not in self._field_data:
+            return {}
+        dbz = self._field_data["dBZ"]
+        dbz_bins = self._field_bins["dBZ"]
         extended_sweeps = {}
         scan_time = self.get_scan_time()
         for sweep_idx, (start, end, aligned_bins) in enumerate(
             zip(self.sweep_start_ray_index, self.sweep_end_ray_index, self.bins_per_sweep)
         ):
-            native_bins = max(
-                (
-                    self.radial[iray]["fields"].get("dBZ", np.empty((0,), dtype=np.float32)).size
-                    for iray in range(start, end + 1)
-                ),
-                default=0,
-            )
+            native_bins = int(dbz_bins[start:end + 1].max(initial=0))
             if native_bins <= int(aligned_bins):
                 continue
 
-            data = np.full((end - start + 1, native_bins), np.nan, dtype=np.float32)
-            for out_idx, iray in enumerate(range(start, end + 1)):
-                dat_ray = self.radial[iray]["fields"].get("dBZ")
-                if dat_ray is None or dat_ray.size == 0:
-                    continue
-                copy_len = min(dat_ray.size, native_bins)
-                data[out_idx, :copy_len] = dat_ray[:copy_len].astype(np.float32, copy=False)
-
             extended_sweeps[sweep_idx] = {
-                "data": data,
+                "data": dbz[start:end + 1, :native_bins].copy(),
                 "range": self.get_dbz_range_per_radial(native_bins).astype(np.float32, copy=False),
                 "time": np.asarray(scan_time[start:end + 1]),
                 "azimuth": np.asarray(self.azimuth[start:end + 1], dtype=np.float32),
@@ -479,19 +647,6 @@ class PA2NRadar(object):
 
         return {"dBZ": extended_sweeps} if extended_sweeps else {}
 
-    def _field_row(self, dat_fields, key, length):
-        """
-        根据fields的key提取数据
-        :param dat_fields: fields的数据
-        :param key: key words
-        :param flag_match: dop和dbz分辨率是否匹配, 匹配则为True，不匹配为False
-        :return:
-        """
-        dat_ray = dat_fields.get(key)
-        if dat_ray is None:
-            return np.full((length,), np.nan, dtype=np.float32)
-        return self._pad_field_array(np.asarray(dat_ray, dtype=np.float32), length)
-
     def get_NRadar_nyquist_speed(self):
         """array shape (nsweeps)"""
         return self.header['CutConfig']['NyquistSpeed']
@@ -506,7 +661,7 @@ class PA2NRadar(object):
         else:
             return self.header['CutConfig']['Elevation']
 
-    def ToPRD(self, effective_earth_radius=None):
+    def ToPRD(self, effective_earth_radius=None, sweeps=None, max_elevation=None):
         """将WSR98D数据转为PRD的数据格式"""
         return PRD(fields=self.fields, scan_type=self.scan_type, time=self.get_scan_time(), \
                           range=self.range, azimuth=self.azimuth, elevation=self.elevation, latitude=self.latitude, \
@@ -518,7 +673,8 @@ class PA2NRadar(object):
                           nrays=self.nrays, nsweeps=self.nsweeps, sitename = self.sitename,
                           pyart_radar=None, effective_earth_radius=effective_earth_radius,
                           extended_fields=self.extended_fields,
-                          metadata={"original_container": "PA", "radar_name": "PA"})
+                          metadata={"original_container": "PA", "radar_name": "PA"},
+                          sweeps=sweeps, max_elevation=max_elevation)
 
     def to_pyart_radar(self, effective_earth_radius=None, **kwargs):
         """Export the decoded PA volume through the PRD Py-ART adapter."""
@@ -1,41 +1,110 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 from .BaseDataProtocol.SABProtocol import dtype_sab
-from .util import _prepare_for_read, _read_all, _unpack_from_buf, _validate_offset_length, julian2date, \
-    get_radar_info, make_time_unit_str, get_radar_sitename, date2num
+from .util import _julian_to_datetimes, _metadata_cut, _normalize_field_selection, _prepare_for_read, \
+    _radar_metadata, _read_all, _read_exact, _structure_dtype, _unpack_from_buf, julian2date, get_radar_info, \
+    make_time_unit_str, get_radar_sitename, date2num
 from ..core.NRadar import PRD
 from ..configure.pyart_config import get_metadata, get_fillvalue
 from ..configure.default_config import CINRAD_field_mapping, _LIGHT_SPEED
 from ..core.PyartRadar import Radar
 
+_SAB_RADIAL_HEADER_DTYPE = _structure_dtype(dtype_sab.RadialHeader())
+# Gate blocks of a radial record: field name, pointer and gate-count header keys, context, scale base.
+_SAB_FIELD_BLOCKS = (
+    ("dBZ", "PtrOfReflectivity", "GatesNumberOfReflectivity", "SAB reflectivity block", -32.0),
+    ("V", "PtrOfVelocity", "GatesNumberOfDoppler", "SAB velocity block", -63.5),
+    ("W", "PtrOfSpectrumWidth", "GatesNumberOfDoppler", "SAB spectrum-width block", -63.5),
+)
+
+
+def _sab_code_table(base):
+    """Return the lookup table from raw gate code to value; codes 0 and 1 mark missing gates."""
+    table = (np.arange(256, dtype=np.float32) - 2.0) / 2.0 + np.float32(base)
+    table[:2] = np.nan
+    return table
+
 
 class SABBaseData(object):
     """Decode SA/SB/CB/SC2.0 base data into a lightweight radial structure."""
 
-    def __init__(self, filename, station_lon=None, station_lat=None, station_alt=None):
+    def __init__(self, filename, station_lon=None, station_lat=None, station_alt=None, fields=None):
         """
         :param filename:  radar basedata filename
         :param station_lon:  radar station longitude //units: degree east
         :param station_lat:  radar station latitude //units:degree north
         :param station_alt:  radar station altitude //units: meters
+        :param fields:  optional field names to decode, e.g. ["dBZ"]; None decodes dBZ, V and W
         """
         super(SABBaseData, self).__init__()
         self.filename = filename
         self.station_lon = station_lon
         self.station_lat = station_lat
         self.station_alt = station_alt
+        self.selected_fields = _normalize_field_selection(fields)
         self.fid = _prepare_for_read(self.filename)
         self._raw_buf = _read_all(self.fid, "SAB radial payload")
         self.fid.close()
         self.RadialNum, self.nrays = self._determine_radial_record_layout()
-        self.radial, self._status, self._azimuth, self._elevation, self._julian_date, self._msends, \
-            self._nyquist, self._unambiguous_range = self._parse_radial()
+        self.radial_header, self._field_data, self._field_gates = self._parse_radial()
+        self._radial = None
+        self._status = self.radial_header['RadialStatus'].astype(np.int64)
+        self._azimuth = self.radial_header['AZ'] / 8. * 180. / 4096.
+        self._elevation = self.radial_header['El'] / 8. * 180. / 4096.
+        self._julian_date = self.radial_header['JulianDate'].astype(np.int64)
+        self._msends = self.radial_header['mSends'].astype(np.int64)
+        self._nyquist = self.radial_header['Nyquist'] / 100.
+        self._unambiguous_range = self.radial_header['URange'] / 10.
         self._scan_time = None
         self.sweep_start_ray_index = np.where((self._status == 0) | (self._status == 3))[0]
         self.sweep_end_ray_index = np.where((self._status == 2) | (self._status == 4))[0]
         self.nsweeps = len(self.sweep_start_ray_index)
         self._raw_buf = None
 
+    @classmethod
+    def read_metadata(cls, filename):
+        """
+        Summarize a volume from the header of its first radial record.
+
+        SA/SB/CB files carry no volume header, so the cut table only describes the
+        lowest cut and the end time is unknown without reading the whole file.
+        :param filename:  radar basedata filename
+        :return: dict, see ``pycwr.io.read_metadata``
+        """
+        reader = cls.__new__(cls)
+        reader.filename = filename
+        reader.station_lon = reader.station_lat = reader.station_alt = None
+        fid = _prepare_for_read(filename)
+        try:
+            buf = _read_exact(fid, dtype_sab.RadialHeaderSize, "SAB radial header")
+        finally:
+            fid.close()
+        if buf[14:16] != b'\x01\x00':
+            raise ValueError("File is not a valid SA/SB/CB file.")
+        header, _ = _unpack_from_buf(buf, 0, dtype_sab.RadialHeader())
+        lat, lon, alt, frequency = reader.get_latitude_longitude_altitude_frequency()
+        cut = _metadata_cut(
+            header['El'] / 8. * 180. / 4096.,
+            header['GateSizeOfReflectivity'],
+            header['GateSizeOfDoppler'],
+            header['Nyquist'] / 100.,
+            header['URange'] / 10. * 1000.,
+        )
+        return _radar_metadata(
+            "SAB",
+            reader.get_sitename(),
+            lat,
+            lon,
+            alt,
+            frequency,
+            reader.get_scan_type(),
+            julian2date(header['JulianDate'], header['mSends']),
+            None,
+            "VCP%d" % header['VcpNumber'],
+            [cut],
+            ("dBZ", "V", "W"),
+        )
+
     def _determine_radial_record_layout(self):
         """Determine the radial record size and radar family from the raw buffer."""
         if len(self._raw_buf) < 16:
@@ -62,83 +131,67 @@ class SABBaseData(object):
         return self._determine_radial_record_layout()
 
     def _parse_radial(self):
-        """Parse all radial records from the in-memory SAB buffer."""
-        radial = []
-        status = []
-        azimuth = []
-        elevation = []
-        julian_date = []
-        msends = []
-        nyquist = []
-        unambiguous_range = []
-        buf = self._raw_buf
-        for pos in range(0, len(buf), self.RadialNum):
-            iray = self._parse_radial_single(buf[pos:pos + self.RadialNum])
-            radial.append(iray)
-            status.append(iray['RadialStatus'])
-            azimuth.append(iray['AZ'] / 8. * 180. / 4096.)
-            elevation.append(iray['El'] / 8. * 180. / 4096.)
-            julian_date.append(iray['JulianDate'])
-            msends.append(iray['mSends'])
-            nyquist.append(iray['Nyquist'] / 100.)
-            unambiguous_range.append(iray['URange'] / 10.)
-        return radial, np.asarray(status), np.asarray(azimuth), np.asarray(elevation), \
-            np.asarray(julian_date), np.asarray(msends), np.asarray(nyquist), np.asarray(unambiguous_range)
-
-    def _parse_radial_single(self, radial_buf):
-        Radial = {}
-        RadialHeader, size_tmp = _unpack_from_buf(radial_buf, 0, dtype_sab.RadialHeader())
-        Radial.update(RadialHeader)
-        ref_offset, ref_count = _validate_offset_length(
-            len(radial_buf),
-            int(RadialHeader['PtrOfReflectivity']) + dtype_sab.InfSize,
-            int(RadialHeader['GatesNumberOfReflectivity']),
-            "SAB reflectivity block",
-        )
-        dop_offset, dop_count = _validate_offset_length(
-            len(radial_buf),
-            int(RadialHeader['PtrOfVelocity']) + dtype_sab.InfSize,
-            int(RadialHeader['GatesNumberOfDoppler']),
-            "SAB velocity block",
-        )
-        sw_offset, sw_count = _validate_offset_length(
-            len(radial_buf),
-            int(RadialHeader['PtrOfSpectrumWidth']) + dtype_sab.InfSize,
-            int(RadialHeader['GatesNumberOfDoppler']),
-            "SAB spectrum-width block",
-        )
-        dBZ = np.frombuffer(
-            radial_buf,
-            dtype=np.uint8,
-            count=ref_count,
-            offset=ref_offset,
-        )
-        V = np.frombuffer(
-            radial_buf,
-            dtype=np.uint8,
-            count=dop_count,
-            offset=dop_offset,
-        )
-        W = np.frombuffer(
-            radial_buf,
-            dtype=np.uint8,
-            count=sw_count,
-            offset=sw_offset,
-        )
-        Radial['fields'] = {}
-        Radial['fields']['dBZ'] = self._decode_field(dBZ, -32.0)
-        Radial['fields']['V'] = self._decode_field(V, -63.5)
-        Radial['fields']['W'] = self._decode_field(W, -63.5)
-        return Radial
+        """
+        Reinterpret the buffer as an array of fixed-length radial records and decode all gate blocks in bulk.
+        :return: structured radial headers, per-field (nrays, ngates) float32 arrays padded with NaN,
+            and the per-ray gate count of each field
+        """
+        record_dtype = np.dtype([
+            ('header', _SAB_RADIAL_HEADER_DTYPE),
+            ('payload', np.uint8, (self.RadialNum - _SAB_RADIAL_HEADER_DTYPE.itemsize,)),
+        ])
+        records = np.frombuffer(self._raw_buf, dtype=record_dtype, count=self.nrays)
+        headers = records['header'].copy()
+        raw = records.view(np.uint8).reshape(self.nrays, self.RadialNum)
+        field_data = {}
+        field_gates = {}
+        for field_name, pointer_key, count_key, context, base in _SAB_FIELD_BLOCKS:
+            offset = headers[pointer_key].astype(np.int64) + dtype_sab.InfSize
+            count = headers[count_key].astype(np.int64)
+            if np.any(offset + count > self.RadialNum):
+                raise ValueError("%s points outside the available buffer." % context)
+            if self.selected_fields is not None and field_name not in self.selected_fields:
+                continue
+            field_data[field_name] = self._decode_blocks(raw, offset, count, _sab_code_table(base))
+            field_gates[field_name] = count
+        return headers, field_data, field_gates
 
     @staticmethod
-    def _decode_field(raw, base):
-        out = np.full(raw.shape, np.nan, dtype=np.float32)
-        valid = raw > 1
-        if np.any(valid):
-            out[valid] = (raw[valid].astype(np.float32) - 2.0) / 2.0 + base
+    def _decode_blocks(raw, offset, count, table):
+        """
+        Decode one gate block per record; records sharing a block layout are sliced and decoded together.
+        :param raw: (nrays, record size) uint8 view of the records
+        :param offset: per-ray block offset from the record start
+        :param count: per-ray gate count
+        :param table: lookup table from raw code to value
+        """
+        out = np.full((raw.shape[0], int(count.max(initial=0))), np.nan, dtype=np.float32)
+        layouts, inverse = np.unique(np.stack([offset, count], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        for ilayout, (start, ngates) in enumerate(layouts):
+            if ngates:
+                rows = np.flatnonzero(inverse == ilayout)
+                out[rows, :ngates] = table[raw[rows, start:start + ngates]]
         return out
 
+    def _radial_record(self, iray, fields):
+        record = dict(zip(_SAB_RADIAL_HEADER_DTYPE.names, self.radial_header[iray].tolist()))
+        record['fields'] = fields
+        return record
+
+    @property
+    def radial(self):
+        """Per-radial dictionaries in the historical layout, built on first access."""
+        if self._radial is None:
+            self._radial = [
+                self._radial_record(
+                    iray,
+                    {name: data[iray, :self._field_gates[name][iray]] for name, data in self._field_data.items()},
+                )
+                for iray in range(self.nrays)
+            ]
+        return self._radial
+
     def get_nyquist_velocity(self):
         """Return the per-ray Nyquist velocity."""
         return self._nyquist
@@ -150,9 +203,7 @@ class SABBaseData(object):
     def get_scan_time(self):
         """Return the acquisition time for each ray."""
         if self._scan_time is None:
-            self._scan_time = np.array(
-                [julian2date(julian, ms) for julian, ms in zip(self._julian_date, self._msends)]
-            )
+            self._scan_time = _julian_to_datetimes(self._julian_date, self._msends)
         return self._scan_time
 
     def get_sweep_end_ray_index(self):
@@ -197,19 +248,27 @@ class SABBaseData(object):
 class SAB2NRadar(object):
     """Bridge from raw SAB data to an NRadar object."""
 
+    # gate values are (code - 2) / 2 + base, so the native one-byte codes pack them losslessly
+    field_encoding = {
+        field_name: {"dtype": "uint8", "scale_factor": 0.5, "add_offset": base - 1.0, "_FillValue": 0}
+        for field_name, _, _, _, base in _SAB_FIELD_BLOCKS
+    }
+
     def __init__(self, SAB):
         self.SAB = SAB
         self._dbz_index_cache = {}
+        self._radial = None
         self.v_index_alone = self.get_v_idx()
         self.dBZ_index_alone = self.get_dbz_idx()
-        self.dBZ_Res = self.SAB.radial[0]["GateSizeOfReflectivity"]
+        self.dBZ_Res = int(self.SAB.radial_header["GateSizeOfReflectivity"][0])
         sab_elevation = self.SAB.get_elevation()
         for index_with_dbz, index_with_v in zip(self.dBZ_index_alone, self.v_index_alone):
             assert abs(sab_elevation[index_with_v] - sab_elevation[index_with_dbz]) < 0.5, "warning! maybe it is a problem."
             self.interp_dBZ(index_with_dbz, index_with_v)
         keep_mask = np.ones(self.SAB.nrays, dtype=bool)
         keep_mask[self.get_remove_radial_indices()] = False
-        self.radial = [iray for iray, keep in zip(self.SAB.radial, keep_mask) if keep]
+        self._ray_index = np.flatnonzero(keep_mask)
+        self.radial_header = self.SAB.radial_header[keep_mask]
         self._azimuth = self.SAB.get_azimuth()[keep_mask]
         self._elevation = self.SAB.get_elevation()[keep_mask]
         self._julian_date = self.SAB._julian_date[keep_mask]
@@ -217,7 +276,7 @@ class SAB2NRadar(object):
         self._nyquist = self.SAB.get_nyquist_velocity()[keep_mask]
         self._unambiguous_range = self.SAB.get_unambiguous_range()[keep_mask]
         self._scan_time = None
-        self.nrays = len(self.radial)
+        self.nrays = self._ray_index.size
         self.nsweeps = self.SAB.nsweeps - self.dBZ_index_alone.size
         status = self.SAB._status[keep_mask]
         self.sweep_start_ray_index = np.where((status == 0) | (status == 3))[0]
@@ -234,6 +293,14 @@ class SAB2NRadar(object):
         self.fields = self._get_fields()
         self.sitename = self.SAB.get_sitename()
 
+    @property
+    def radial(self):
+        """Retained radials in the historical per-radial dictionary layout."""
+        if self._radial is None:
+            radial = self.SAB.radial
+            self._radial = [radial[iray] for iray in self._ray_index]
+        return self._radial
+
     def get_remove_radial_indices(self):
         """Return the radial indices removed after sweep alignment."""
         index_romove = []
@@ -246,19 +313,20 @@ class SAB2NRadar(object):
         """Backward-compatible alias for ``get_remove_radial_indices``."""
         return self.get_remove_radial_indices()
 
+    def _sweep_start_gates(self):
+        """Return reflectivity and Doppler gate counts of the first ray of every sweep."""
+        header = self.SAB.radial_header[self.SAB.sweep_start_ray_index]
+        return header["GatesNumberOfReflectivity"], header["GatesNumberOfDoppler"]
+
     def get_v_idx(self):
         """Return sweep indices that contain Doppler moments without reflectivity."""
-        flag = np.array([((self.SAB.radial[idx]['fields']["V"].size != 0) and
-                          (self.SAB.radial[idx]['fields']["dBZ"].size == 0)) \
-                         for idx in self.SAB.sweep_start_ray_index])
-        return np.where(flag == 1)[0]
+        reflectivity, doppler = self._sweep_start_gates()
+        return np.flatnonzero((doppler != 0) & (reflectivity == 0))
 
     def get_dbz_idx(self):
         """Return sweep indices that contain reflectivity without Doppler moments."""
-        flag = np.array([((self.SAB.radial[idx]['fields']["V"].size == 0) and
-                          (self.SAB.radial[idx]['fields']["dBZ"].size != 0)) \
-                         for idx in self.SAB.sweep_start_ray_index])
-        return np.where(flag == 1)[0]
+        reflectivity, doppler = self._sweep_start_gates()
+        return np.flatnonzero((doppler == 0) & (reflectivity != 0))
 
     def interp_dBZ(self, field_with_dBZ_num, field_without_dBZ_num):
         """
@@ -276,8 +344,11 @@ class SAB2NRadar(object):
                   self.SAB.sweep_start_ray_index[field_with_dBZ_num]
         v_idx = np.arange(self.SAB.sweep_start_ray_index[field_without_dBZ_num], \
                           self.SAB.sweep_end_ray_index[field_without_dBZ_num] + 1)
-        for ind_dbz, ind_v in zip(dbz_idx, v_idx):
-            self.SAB.radial[ind_v]["fields"]['dBZ'] = self.SAB.radial[ind_dbz]["fields"]['dBZ']
+        if "dBZ" not in self.SAB._field_data:
+            return
+        self.SAB._field_data["dBZ"][v_idx] = self.SAB._field_data["dBZ"][dbz_idx]
+        self.SAB._field_gates["dBZ"][v_idx] = self.SAB._field_gates["dBZ"][dbz_idx]
+        self.SAB._radial = None
 
     def get_azimuth(self):
         """Return the azimuth angle for each retained ray."""
@@ -294,9 +365,7 @@ class SAB2NRadar(object):
     def get_scan_time(self):
         """Return the acquisition time for each retained ray."""
         if self._scan_time is None:
-            self._scan_time = np.array(
-                [julian2date(julian, ms) for julian, ms in zip(self._julian_date, self._msends)]
-            )
+            self._scan_time = _julian_to_datetimes(self._julian_date, self._msends)
         return self._scan_time
 
     def get_nyquist_velocity(self):
@@ -317,56 +386,57 @@ class SAB2NRadar(object):
 
     def get_nbins_per_sweep(self):
         """Return the Doppler gate count for each retained sweep."""
-        return np.array([self.radial[idx]['fields']['V'].size for idx in self.sweep_start_ray_index])
+        return self.radial_header["GatesNumberOfDoppler"][self.sweep_start_ray_index].astype(np.int64)
 
     def get_range_per_radial(self, length):
         """Return Doppler gate-center ranges for a radial of ``length`` bins."""
-        Resolution = self.radial[0]["GateSizeOfDoppler"]
+        Resolution = int(self.radial_header["GateSizeOfDoppler"][0])
         return np.linspace(Resolution, Resolution * length, length)
 
     def get_dbz_range_per_radial(self, length):
         """Return reflectivity gate-center ranges for a radial of ``length`` bins."""
         Resolution = self.dBZ_Res
-        start_range = self.radial[0]["GateSizeOfDoppler"]
+        start_range = int(self.radial_header["GateSizeOfDoppler"][0])
         return np.linspace(start_range, start_range + Resolution * (length - 1), length)
 
     def _get_fields(self):
-        """Assemble the retained fields into dense 2-D arrays."""
-        field_keys = tuple(self.radial[0]['fields'].keys())
-        fields = {ikey: np.full((self.nrays, self.max_bins), np.nan, dtype=np.float64) for ikey in field_keys}
-        for iray, radial in enumerate(self.radial):
-            radial_fields = radial['fields']
-            for ikey in field_keys:
-                fields[ikey][iray, :] = self._add_or_del_field(radial_fields.get(ikey), ikey)
+        """Assemble the retained fields into dense 2-D arrays on the Doppler-aligned range grid."""
+        fields = {}
+        for ikey, data in self.SAB._field_data.items():
+            out = np.full((self.nrays, self.max_bins), np.nan, dtype=np.float64)
+            data = data[self._ray_index]
+            if ikey == "dBZ":
+                gates = self.SAB._field_gates[ikey][self._ray_index]
+                for ngates in np.unique(gates):
+                    if ngates == 0:
+                        continue
+                    rows = np.flatnonzero(gates == ngates)
+                    valid, nearest = self._get_dbz_resample_index(int(ngates))
+                    out[np.ix_(rows, np.flatnonzero(valid))] = data[np.ix_(rows, nearest[valid])]
+            else:
+                ncopy = min(data.shape[1], self.max_bins)
+                out[:, :ncopy] = data[:, :ncopy]
+            fields[ikey] = out
         return fields
 
     def _build_extended_fields(self):
         """Collect native-range reflectivity for sweeps longer than the aligned grid."""
+        if "dBZ" not in self.SAB._field_data:
+            return {}
+        dbz = self.SAB._field_data["dBZ"]
+        dbz_gates = self.SAB._field_gates["dBZ"]
         extended_sweeps = {}
         scan_time = self.get_scan_time()
         for sweep_idx, (start, end, aligned_bins) in enumerate(
             zip(self.sweep_start_ray_index, self.sweep_end_ray_index, self.bins_per_sweep)
         ):
-            native_bins = max(
-                (
-                    self.radial[iray]["fields"].get("dBZ", np.empty((0,), dtype=np.float32)).size
-                    for iray in range(start, end + 1)
-                ),
-                default=0,
-            )
+            rays = self._ray_index[start:end + 1]
+            native_bins = int(dbz_gates[rays].max(initial=0))
             if native_bins <= int(aligned_bins):
                 continue
 
-            data = np.full((end - start + 1, native_bins), np.nan, dtype=np.float32)
-            for out_idx, iray in enumerate(range(start, end + 1)):
-                dat_ray = self.radial[iray]["fields"].get("dBZ")
-                if dat_ray is None or dat_ray.size == 0:
-                    continue
-                copy_len = min(dat_ray.size, native_bins)
-                data[out_idx, :copy_len] = dat_ray[:copy_len].astype(np.float32, copy=False)
-
             extended_sweeps[sweep_idx] = {
-                "data": data,
+                "data": dbz[rays, :native_bins],
                 "range": self.get_dbz_range_per_radial(native_bins).astype(np.float32, copy=False),
                 "time": np.asarray(scan_time[start:end + 1]),
                 "azimuth": np.asarray(self._azimuth[start:end + 1], dtype=np.float32),
@@ -392,28 +462,9 @@ class SAB2NRadar(object):
         self._dbz_index_cache[source_length] = (valid, nearest)
         return valid, nearest
 
-    def _add_or_del_field(self, dat_ray, key):
-        """
-        Normalize a radial field to the common Doppler-aligned range grid.
-        :param dat_ray: radial field data.
-        :param key: field name.
-        """
-        length = self.max_bins
-        if key == "dBZ":
-            valid, nearest = self._get_dbz_resample_index(dat_ray.size)
-            out = np.full((length,), np.nan)
-            out[valid] = dat_ray[nearest[valid]]
-            return out
-        if dat_ray.size >= length:
-            return (dat_ray[:length]).ravel()
-        else:
-            out = np.full((length,), np.nan)
-            out[:dat_ray.size] = dat_ray
-            return out.ravel()
-
     def get_nradar_nyquist_speed(self):
         """array shape (nsweeps)"""
-        return np.array([self.radial[idx]['Nyquist'] / 100. for idx in self.sweep_start_ray_index])
+        return self.radial_header['Nyquist'][self.sweep_start_ray_index] / 100.
 
     def get_NRadar_nyquist_speed(self):
         """Backward-compatible alias for ``get_nradar_nyquist_speed``."""
@@ -421,7 +472,7 @@ class SAB2NRadar(object):
 
     def get_nradar_unambiguous_range(self):
         """array shape (nsweeps)"""
-        return np.array([self.radial[idx]['URange'] / 10. for idx in self.sweep_start_ray_index])
+        return self.radial_header['URange'][self.sweep_start_ray_index] / 10.
 
     def get_NRadar_unambiguous_range(self):
         """Backward-compatible alias for ``get_nradar_unambiguous_range``."""
@@ -437,10 +488,10 @@ class SAB2NRadar(object):
         elif self.nsweeps == 4:
             fixed_angle = np.array([0.50, 2.50, 3.50, 4.50])
         else:
-            fixed_angle = np.array([self.radial[idx]['El'] / 8. * 180. / 4096. for idx in self.sweep_start_ray_index])
+            fixed_angle = self.radial_header['El'][self.sweep_start_ray_index] / 8. * 180. / 4096.
         return fixed_angle
 
-    def to_prd(self, effective_earth_radius=None):
+    def to_prd(self, effective_earth_radius=None, sweeps=None, max_elevation=None):
         """Build an ``NRadar.PRD`` object from the decoded SAB volume."""
         return PRD(fields=self.fields, scan_type=self.scan_type, time=self.get_scan_time(), \
                           range=self.range, azimuth=self.azimuth, elevation=self.elevation, latitude=self.latitude, \
@@ -452,11 +503,13 @@ class SAB2NRadar(object):
                           nrays=self.nrays, nsweeps=self.nsweeps, sitename = self.sitename,
                           pyart_radar=None, effective_earth_radius=effective_earth_radius,
                           extended_fields=self.extended_fields,
-                          metadata={"original_container": "CINRAD/SAB", "radar_name": "CINRAD/SA/SB/CB/SC"})
+                          metadata={"original_container": "CINRAD/SAB", "radar_name": "CINRAD/SA/SB/CB/SC"},
+                          sweeps=sweeps, max_elevation=max_elevation)
 
-    def ToPRD(self, effective_earth_radius=None):
+    def ToPRD(self, effective_earth_radius=None, sweeps=None, max_elevation=None):
         """Backward-compatible alias for ``to_prd``."""
-        return self.to_prd(effective_earth_radius=effective_earth_radius)
+        return self.to_prd(effective_earth_radius=effective_earth_radius, sweeps=sweeps,
+                           max_elevation=max_elevation)
 
     def to_pyart_radar(self, effective_earth_radius=None, **kwargs):
         """Export the decoded SAB volume through the PRD Py-ART adapter."""
@@ -471,7 +524,7 @@ class SAB2NRadar(object):
 
         # pulse width
         pulse_width = get_metadata('pulse_width')
-        pulse_width['data'] = np.array([self.radial[0]["GateSizeOfDoppler"] / _LIGHT_SPEED,], dtype='float32')  # m->sec
+        pulse_width['data'] = np.array([self.radial_header[0]["GateSizeOfDoppler"] / _LIGHT_SPEED,], dtype='float32')  # m->sec
 
         # assume that the parameters in the first ray represent the beam widths,
         # bandwidth and frequency in the entire volume
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 from .BaseDataProtocol.SCProtocol import dtype_sc
-from .util import _prepare_for_read, _read_all, _read_exact, _unpack_from_buf, make_time_unit_str, get_radar_sitename, date2num
+from .util import _decode_header_text, _metadata_cut, _normalize_field_selection, _prepare_for_read, _radar_metadata, \
+    _read_all, _read_exact, _unpack_from_buf, make_time_unit_str, get_radar_sitename, date2num
 import pandas as pd
 import datetime
 from ..core.NRadar import PRD
@@ -9,20 +10,25 @@ from ..configure.pyart_config import get_metadata, get_fillvalue
 from ..configure.default_config import CINRAD_field_mapping, _LIGHT_SPEED
 from ..core.PyartRadar import Radar
 
+SC_BINS_PER_RADIAL = 500
+
+
 class SCBaseData(object):
     """Decode SC/CD 1.0 base data."""
-    def __init__(self, filename, station_lon=None, station_lat=None, station_alt=None):
+    def __init__(self, filename, station_lon=None, station_lat=None, station_alt=None, fields=None):
         """
         :param filename:  radar basedata filename
         :param station_lon:  radar station longitude //units: degree east
         :param station_lat:  radar station latitude //units:degree north
         :param station_alt:  radar station altitude //units: meters
+        :param fields:  optional field names to decode, e.g. ["dBZ"]; None decodes dBZ, dBT, V and W
         """
         super(SCBaseData, self).__init__()
         self.filename = filename
         self.station_lon = station_lon
         self.station_lat = station_lat
         self.station_alt = station_alt
+        self.selected_fields = _normalize_field_selection(fields)
         self.fid = _prepare_for_read(self.filename)
         buf_header = _read_exact(self.fid, dtype_sc.BaseDataHeaderSize, "SC header")
         self.header = self._parse_BaseDataHeader(buf_header)
@@ -31,6 +37,50 @@ class SCBaseData(object):
         self.radial = self._parse_radial()
         self.fid.close()
 
+    @classmethod
+    def read_metadata(cls, filename):
+        """
+        Summarize a volume from the file header without reading the radial payload.
+        :param filename:  radar basedata filename
+        :return: dict, see ``pycwr.io.read_metadata``
+        """
+        reader = cls.__new__(cls)
+        reader.filename = filename
+        reader.station_lon = reader.station_lat = reader.station_alt = None
+        fid = _prepare_for_read(filename)
+        try:
+            buf_header = _read_exact(fid, dtype_sc.BaseDataHeaderSize, "SC header")
+        finally:
+            fid.close()
+        reader.header = reader._parse_BaseDataHeader(buf_header)
+        lat, lon, alt, frequency = reader.get_latitude_longitude_altitude_frequency()
+        start_time, end_time = reader._scan_start_end()
+        cuts = [
+            _metadata_cut(
+                layer['Swangles'] / 100.,
+                bin_width / 10.,
+                bin_width / 10.,
+                layer['MaxV'] / 100.,
+                layer['MaxL'] * 10.,
+            )
+            for layer, bin_width in zip(reader.header['LayerParam'], reader.header['binWidth'])
+        ]
+        return _radar_metadata(
+            "SC",
+            reader.get_sitename(),
+            lat,
+            lon,
+            alt,
+            frequency,
+            reader.get_scan_type(),
+            start_time,
+            end_time,
+            None,
+            cuts,
+            ("dBZ", "dBT", "V", "W"),
+            site_code=_decode_header_text(reader.header['RadarSite']['stationnumber']),
+        )
+
     def _check_sc_basedata(self):
         """Check that the radial payload length matches the header metadata."""
         buf_radial_data = _read_all(self.fid, "SC radial payload")
@@ -81,14 +131,15 @@ class SCBaseData(object):
             for _ in range(self.header['LayerParam']['recordnumber'][isweep]):
                 buf_radial = payload[pos:pos + dtype_sc.PerRadialSize]
                 pos += dtype_sc.PerRadialSize
-                radial.append(self._parse_radial_single(buf_radial, 0, MaxV, -1))
+                radial.append(self._parse_radial_single(buf_radial, 0, MaxV, -1, self.selected_fields))
         return radial
 
-    def _parse_radial_single(self, buf_radial, start_pos, MaxV, num_bins=-1):
+    def _parse_radial_single(self, buf_radial, start_pos, MaxV, num_bins=-1, field_names=None):
         """
         :param buf_radial:
         :param start_pos: starting byte offset.
         :param num_bins: number of bins.
+        :param field_names: optional set of field names to decode.
         :return:
         """
         radial_dict = {}
@@ -99,15 +150,21 @@ class SCBaseData(object):
         #RadialData = np.frombuffer(buf_radial, dtype_sc.RadialData(),\
         #                                 count=num_bins, offset=start_pos+size_tmp)
         RadialData = np.frombuffer(buf_radial, dtype_sc.RadialData(),\
-                                         count=500, offset=start_pos+size_tmp)
-        radial_dict['fields']['dBZ'] = np.where(RadialData['dBZ'] != 0,\
-                            (RadialData['dBZ'].astype(int) - 64)/2., np.nan).astype(np.float32)
-        radial_dict['fields']['dBT'] = np.where(RadialData['dBT'] != 0, \
-                        (RadialData['dBT'].astype(int) - 64) / 2., np.nan).astype(np.float32)
-        radial_dict['fields']['V'] = np.where(RadialData['V'] != 0, \
-                       MaxV * (RadialData['V'].astype(int) - 128) / 128., np.nan).astype(np.float32)
-        radial_dict['fields']['W'] = np.where(RadialData['W'] != 0, \
-                        MaxV * RadialData['W'].astype(int) /256., np.nan).astype(np.float32)
+                                         count=SC_BINS_PER_RADIAL, offset=start_pos+size_tmp)
+        if field_names is None:
+            field_names = ('dBZ', 'dBT', 'V', 'W')
+        if 'dBZ' in field_names:
+            radial_dict['fields']['dBZ'] = np.where(RadialData['dBZ'] != 0,\
+                                (RadialData['dBZ'].astype(int) - 64)/2., np.nan).astype(np.float32)
+        if 'dBT' in field_names:
+            radial_dict['fields']['dBT'] = np.where(RadialData['dBT'] != 0, \
+                            (RadialData['dBT'].astype(int) - 64) / 2., np.nan).astype(np.float32)
+        if 'V' in field_names:
+            radial_dict['fields']['V'] = np.where(RadialData['V'] != 0, \
+                           MaxV * (RadialData['V'].astype(int) - 128) / 128., np.nan).astype(np.float32)
+        if 'W' in field_names:
+            radial_dict['fields']['W'] = np.where(RadialData['W'] != 0, \
+                            MaxV * RadialData['W'].astype(int) /256., np.nan).astype(np.float32)
         return radial_dict
 
     def get_nyquist_velocity(self):
@@ -122,8 +179,8 @@ class SCBaseData(object):
                             ] * self.header['LayerParam']['recordnumber'][isweep]) for \
                             isweep in range(self.nsweeps)])
 
-    def get_scan_time(self):
-        """Return the acquisition time for each ray."""
+    def _scan_start_end(self):
+        """Return the volume start and end time (UTC) recorded in the header."""
         Start_params = self.header['RadarObserationParam_1']
         End_params = self.header['RadarObserationParam_2']
         start_time = datetime.datetime(year=Start_params['syear'], month=Start_params['smonth'],
@@ -132,7 +189,12 @@ class SCBaseData(object):
         end_time = datetime.datetime(year=End_params['Eyear'], month=End_params['Emonth'],
                                        day=End_params['Eday'], hour=End_params['Ehour'],
                                        minute=End_params['Eminute'], second=End_params['Esecond'])
-        return pd.date_range(start_time, end_time, periods=self.nrays).to_pydatetime() - datetime.timedelta(hours=8)
+        return start_time - datetime.timedelta(hours=8), end_time - datetime.timedelta(hours=8)
+
+    def get_scan_time(self):
+        """Return the acquisition time for each ray."""
+        start_time, end_time = self._scan_start_end()
+        return pd.date_range(start_time, end_time, periods=self.nrays).to_pydatetime()
 
     def get_sweep_end_ray_index(self):
         """Return the inclusive end index of each sweep."""
@@ -180,6 +242,7 @@ class SC2NRadar(object):
 
     def __init__(self, SC):
         self.SC = SC
+        self.field_encoding = self.get_field_encoding()
         self.radial = self.SC.radial
         self.azimuth = self.get_azimuth()
         self.elevation = self.get_elevation()
@@ -196,6 +259,21 @@ class SC2NRadar(object):
         self.fields = self._get_fields()
         self.sitename = self.SC.get_sitename()
 
+    def get_field_encoding(self):
+        """
+        Return the native one-byte packing of the SC moments used by ``read_auto(..., quantized=True)``.
+        V and W scale with the Nyquist velocity of each layer, so they are included only when every
+        layer shares it; the codes then reproduce the decoded values up to float32 rounding.
+        """
+        encoding = {field_name: {"dtype": "uint8", "scale_factor": 0.5, "add_offset": -32.0, "_FillValue": 0}
+                    for field_name in ("dBZ", "dBT")}
+        max_v = np.unique(self.SC.header['LayerParam']['MaxV'][:self.SC.nsweeps])
+        if max_v.size == 1:
+            max_v = max_v[0] / 100.
+            encoding["V"] = {"dtype": "uint8", "scale_factor": max_v / 128., "add_offset": -max_v, "_FillValue": 0}
+            encoding["W"] = {"dtype": "uint8", "scale_factor": max_v / 256., "add_offset": 0.0, "_FillValue": 0}
+        return encoding
+
     def get_azimuth(self):
         """Return the azimuth angle for each ray."""
         return self.SC.get_azimuth()
@@ -230,7 +308,7 @@ class SC2NRadar(object):
 
     def get_nbins_per_sweep(self):
         """Return the gate count for each sweep."""
-        return np.array([self.radial[idx]['fields']['dBZ'].size for idx in self.sweep_start_ray_index])
+        return np.full(len(self.sweep_start_ray_index), SC_BINS_PER_RADIAL, dtype=np.int64)
 
     def get_range_per_radial(self, length):
         """Return gate-center ranges for a radial of ``length`` bins."""
@@ -264,7 +342,7 @@ class SC2NRadar(object):
     def get_fixed_angle(self):
         return self.SC.header['LayerParam']['Swangles'] / 100.
 
-    def to_prd(self, effective_earth_radius=None):
+    def to_prd(self, effective_earth_radius=None, sweeps=None, max_elevation=None):
         """Build an ``NRadar.PRD`` object from the decoded SC volume."""
 
         return PRD(fields=self.fields, scan_type=self.scan_type, time=self.get_scan_time(), \
@@ -276,11 +354,13 @@ class SC2NRadar(object):
                           frequency=self.frequency, unambiguous_range=self.get_nradar_unambiguous_range(), \
                           nrays=self.nrays, nsweeps=self.nsweeps, sitename = self.sitename,
                           pyart_radar=None, effective_earth_radius=effective_earth_radius,
-                          metadata={"original_container": "CINRAD/SC", "radar_name": "CINRAD/SC"})
+                          metadata={"original_container": "CINRAD/SC", "radar_name": "CINRAD/SC"},
+                          sweeps=sweeps, max_elevation=max_elevation)
 
-    def ToPRD(self, effective_earth_radius=None):
+    def ToPRD(self, effective_earth_radius=None, sweeps=None, max_elevation=None):
         """Backward-compatible alias for ``to_prd``."""
-        return self.to_prd(effective_earth_radius=effective_earth_radius)
+        return self.to_prd(effective_earth_radius=effective_earth_radius, sweeps=sweeps,
+                           max_elevation=max_elevation)
 
     def to_pyart_radar(self, effective_earth_radius=None, **kwargs):
         """Export the decoded SC volume through the PRD Py-ART adapter."""
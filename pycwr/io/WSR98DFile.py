@@ -7,16 +7,26 @@ from collections import OrderedDict
 import numpy as np
 from .BaseDataProtocol.WSR98DProtocol import dtype_98D
 from .util import (
+    _decode_header_text,
+    _epoch_to_datetimes,
+    _gather_blocks,
+    _gather_records,
+    _metadata_cut,
+    _normalize_field_selection,
+    _open_for_replace,
     _prepare_for_read,
+    _probe_lowest_sweep_fields,
+    _radar_metadata,
     _read_all,
     _read_exact,
+    _structure_dtype,
     _unpack_from_buf,
     _validate_count,
     julian2date_SEC,
     make_time_unit_str,
     date2num,
 )
-from ..core.NRadar import PRD
+from ..core.NRadar import PRD, _resolve_sweep_selection
 from ..configure.pyart_config import get_metadata, get_fillvalue
 from ..configure.default_config import CINRAD_field_mapping
 from ..core.PyartRadar import Radar
@@ -52,12 +62,43 @@ WSR98D_WRITE_FIELD_SPECS = OrderedDict(
     ]
 )
 
-_WSR98D_RADIAL_HEADER = dtype_98D.RadialHeader()
-_WSR98D_RADIAL_HEADER_KEYS = tuple(field_name for field_name, _ in _WSR98D_RADIAL_HEADER)
-_WSR98D_RADIAL_HEADER_STRUCT = struct.Struct("<" + "".join(field_type for _, field_type in _WSR98D_RADIAL_HEADER))
-_WSR98D_MOMENT_HEADER = dtype_98D.RadialData()
-_WSR98D_MOMENT_HEADER_KEYS = tuple(field_name for field_name, _ in _WSR98D_MOMENT_HEADER)
-_WSR98D_MOMENT_HEADER_STRUCT = struct.Struct("<" + "".join(field_type for _, field_type in _WSR98D_MOMENT_HEADER))
+_WSR98D_RADIAL_HEADER_DTYPE = _structure_dtype(dtype_98D.RadialHeader())
+_WSR98D_MOMENT_HEADER_DTYPE = _structure_dtype(dtype_98D.RadialData())
+_WSR98D_RADIAL_STATE_POS = _WSR98D_RADIAL_HEADER_DTYPE.fields["RadialState"][1]
+_WSR98D_MOMENT_NUMBER_POS = _WSR98D_RADIAL_HEADER_DTYPE.fields["MomentNumber"][1]
+_WSR98D_MOMENT_LENGTH_POS = _WSR98D_MOMENT_HEADER_DTYPE.fields["Length"][1]
+_INT32 = struct.Struct("<i")
+
+# Product names decoded from moments with DataType <= 35, and a lookup table from
+# DataType to the position of its product name (-1 for unnamed data types).
+WSR98D_PRODUCTS = tuple(
+    OrderedDict.fromkeys(dtype_98D.flag2Product[code] for code in sorted(dtype_98D.flag2Product) if 0 <= code <= 35)
+)
+_WSR98D_PRODUCT_LOOKUP = np.array(
+    [WSR98D_PRODUCTS.index(dtype_98D.flag2Product[code]) if code in dtype_98D.flag2Product else -1
+     for code in range(36)],
+    dtype=np.int16,
+)
+
+_WSR98D_NAMED_PRODUCTS = {code: name for code, name in dtype_98D.flag2Product.items() if 0 <= code <= 35}
+
+_REFLECTIVITY_LIKE_FIELDS = ("dBZ", "Zc", "dBT")
+_VELOCITY_LIKE_FIELDS = ("V", "Vc", "W", "Wc")
+# Reflectivity-only and Doppler-only cuts within this elevation distance form one split sweep.
+SPLIT_CUT_ELEVATION_TOLERANCE = 0.5
+
+WSR98D_MOMENT_INDEX_DTYPE = np.dtype(
+    [
+        ("ray", "<i4"),
+        ("product", "<i2"),
+        ("DataType", "<i4"),
+        ("Scale", "<i4"),
+        ("Offset", "<i4"),
+        ("BinLength", "<i2"),
+        ("Length", "<i4"),
+        ("position", "<i8"),
+    ]
+)
 
 
 def _decode_wsr98d_resolution(raw_value):
@@ -102,14 +143,6 @@ def _python_datetime(value):
     raise TypeError("Unable to convert %r to datetime." % (value,))
 
 
-def _epoch_parts(dt):
-    epoch = datetime.datetime(1970, 1, 1, tzinfo=dt.tzinfo)
-    delta = dt - epoch
-    total_seconds = int(delta.total_seconds())
-    microseconds = int(delta.microseconds)
-    return total_seconds, microseconds
-
-
 def _normalize_ascii_bytes(value, length, fallback):
     text = (str(value).strip() if value is not None else "") or fallback
     return text[:length].ljust(length).encode("ascii", "ignore")
@@ -160,46 +193,379 @@ def _select_resolution_range(prd, sweep, candidates):
     return np.asarray(prd.fields[sweep]["range"].values, dtype=np.float64)
 
 
-def _encode_quantized(values, scale, offset, bin_length, missing_code=3):
-    max_code = 255 if bin_length == 1 else 65535
-    codes = np.round(np.asarray(values, dtype=np.float64) * float(scale) + float(offset))
+def _encode_quantized_codes(values, scale, offset, bin_length, missing_code=3):
+    """Quantize physical values of any shape to little-endian WSR98D moment codes."""
+    if bin_length not in (1, 2):
+        raise ValueError("WSR98D bin length must be 1 or 2.")
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.round(values * float(scale) + float(offset))
     codes[~np.isfinite(values)] = missing_code
-    codes = np.clip(codes.astype(np.int64), 0, max_code)
-    if bin_length == 1:
-        return codes.astype(np.uint8).tobytes()
-    if bin_length == 2:
-        return codes.astype("<u2").tobytes()
-    raise ValueError("WSR98D bin length must be 1 or 2.")
+    np.clip(codes, 0, 255 if bin_length == 1 else 65535, out=codes)
+    return codes.astype(np.uint8 if bin_length == 1 else "<u2")
+
+
+def _encode_quantized(values, scale, offset, bin_length, missing_code=3):
+    return _encode_quantized_codes(values, scale, offset, bin_length, missing_code=missing_code).tobytes()
+
+
+def _index_wsr98d_radials(buf, max_cuts=None):
+    """
+    First decoding pass: walk the radial and moment headers once without touching
+    the moment payloads.
+    :param buf: radial payload following the cut configuration block.
+    :param max_cuts: optional number of leading cuts to index; the walk stops at the
+        radial that ends the last of them (radial state 2 or 4).
+    :return: (radial header records, radial byte offsets, moment index records)
+    """
+    size = len(buf)
+    header_size = _WSR98D_RADIAL_HEADER_DTYPE.itemsize
+    moment_header_size = _WSR98D_MOMENT_HEADER_DTYPE.itemsize
+    read_int = _INT32.unpack_from
+    radial_offsets = []
+    moment_offsets = []
+    moment_rays = []
+    cuts_ended = 0
+    pos = 0
+    while pos + header_size <= size:
+        if max_cuts is not None and cuts_ended >= max_cuts:
+            break
+        if read_int(buf, pos + _WSR98D_RADIAL_STATE_POS)[0] in (2, 4):
+            cuts_ended += 1
+        moment_num = _validate_count(
+            "WSR98D MomentNumber",
+            read_int(buf, pos + _WSR98D_MOMENT_NUMBER_POS)[0],
+            minimum=0,
+            maximum=MAX_WSR98D_MOMENTS_PER_RADIAL,
+        )
+        iray = len(radial_offsets)
+        radial_offsets.append(pos)
+        pos += header_size
+        for _ in range(moment_num):
+            if pos + moment_header_size > size:
+                raise ValueError("WSR98D moment header is truncated or malformed.")
+            data_len = _validate_count(
+                "WSR98D moment length",
+                read_int(buf, pos + _WSR98D_MOMENT_LENGTH_POS)[0],
+                minimum=0,
+                maximum=MAX_WSR98D_MOMENT_DATA_BYTES,
+            )
+            moment_offsets.append(pos)
+            moment_rays.append(iray)
+            pos += moment_header_size
+            if pos + data_len > size:
+                raise ValueError("WSR98D moment payload extends beyond the available buffer.")
+            pos += data_len
+    if pos != size and (max_cuts is None or cuts_ended < max_cuts):
+        raise ValueError("WSR98D radial payload contains trailing truncated data.")
+
+    radial_header = _gather_records(buf, radial_offsets, _WSR98D_RADIAL_HEADER_DTYPE)
+    moment_header = _gather_records(buf, moment_offsets, _WSR98D_MOMENT_HEADER_DTYPE)
+    bin_length = moment_header["BinLength"]
+    if np.any((bin_length != 1) & (bin_length != 2)):
+        raise ValueError("WSR98D moment bin length must be 1 or 2 bytes.")
+    if np.any(moment_header["Length"] % bin_length != 0):
+        raise ValueError("WSR98D moment payload length does not match the bin length.")
+    if np.any(moment_header["Scale"] == 0):
+        raise ValueError("WSR98D moment scale cannot be zero.")
+
+    moment_index = np.zeros(moment_header.size, dtype=WSR98D_MOMENT_INDEX_DTYPE)
+    moment_index["ray"] = moment_rays
+    for key in ("DataType", "Scale", "Offset", "BinLength", "Length"):
+        moment_index[key] = moment_header[key]
+    moment_index["position"] = np.asarray(moment_offsets, dtype=np.int64) + moment_header_size
+    data_type = moment_header["DataType"]
+    named = (data_type >= 0) & (data_type <= 35)
+    moment_index["product"] = -1
+    moment_index["product"][named] = _WSR98D_PRODUCT_LOOKUP[data_type[named]]
+    return radial_header, np.asarray(radial_offsets, dtype=np.int64), moment_index
+
+
+def _decode_wsr98d_moments(buf, nrays, moment_index, field_names=None):
+    """
+    Second decoding pass: bulk-decode every named product into a preallocated
+    ``(nrays, nbins)`` float32 array.
+
+    Moments sharing a bin length and payload length are gathered and scaled in
+    one vectorized step. Rays without a product stay NaN and report ``-1`` in
+    the per-ray bin counts; when a radial repeats a product name the last
+    moment wins, as it did for the per-radial dictionaries.
+    :param field_names: optional set of product names to decode. Bin counts are
+        reported for every product, but other payloads are never converted.
+    :return: (dict of field arrays, dict of per-ray bin counts)
+    """
+    field_data = {}
+    field_bins = {}
+    products = moment_index["product"]
+    for product in np.unique(products[products >= 0]):
+        rows = np.flatnonzero(products == product)
+        _, last = np.unique(moment_index["ray"][rows][::-1], return_index=True)
+        entries = moment_index[rows[::-1][last]]
+        nbins = entries["Length"] // entries["BinLength"]
+        bins = np.full(nrays, -1, dtype=np.int32)
+        bins[entries["ray"]] = nbins
+        name = WSR98D_PRODUCTS[int(product)]
+        field_bins[name] = bins
+        if field_names is not None and name not in field_names:
+            continue
+        data = np.full((nrays, int(nbins.max())), np.nan, dtype=np.float32)
+        group_key = entries["BinLength"].astype(np.int64) * (MAX_WSR98D_MOMENT_DATA_BYTES + 1) + entries["Length"]
+        for key in np.unique(group_key):
+            group = entries[group_key == key]
+            bin_length, length = int(group["BinLength"][0]), int(group["Length"][0])
+            if length == 0:
+                continue
+            codes = _gather_blocks(buf, group["position"], length)
+            if bin_length == 2:
+                codes = codes.view("<u2")
+            scale = group["Scale"].astype(np.float32)
+            offset = group["Offset"].astype(np.float32)
+            if np.all(scale == scale[0]) and np.all(offset == offset[0]):
+                # one scale/offset pair for the whole group: decode through a code lookup table
+                table = (np.arange(256 if bin_length == 1 else 65536, dtype=np.float32) - offset[0]) / scale[0]
+                table[:5] = np.nan
+                if group.size == nrays and codes.shape[1] == data.shape[1]:
+                    np.take(table, codes, out=data, mode="clip")
+                    continue
+                values = np.take(table, codes, mode="clip")
+            else:
+                values = (codes.astype(np.float32) - offset[:, np.newaxis]) / scale[:, np.newaxis]
+                values[codes < 5] = np.nan
+            data[group["ray"], :codes.shape[1]] = values
+        field_data[name] = data
+    return field_data, field_bins
+
+
+def _wsr98d_ray_signatures(nrays, moment_index):
+    """
+    Group rays by the ordered product names they carry.
+    :return: (list of name tuples, signature index per ray)
+    """
+    named = moment_index[moment_index["product"] >= 0]
+    counts = np.bincount(named["ray"], minlength=nrays)
+    width = int(counts.max()) if counts.size else 0
+    if nrays == 0 or width == 0:
+        return [()], np.zeros(nrays, dtype=np.intp)
+    slot = np.arange(named.size) - np.repeat(np.cumsum(counts) - counts, counts)
+    table = np.full((nrays, width), -1, dtype=np.int16)
+    table[named["ray"], slot] = named["product"]
+    unique_rows, inverse = np.unique(table, axis=0, return_inverse=True)
+    signatures = [
+        tuple(OrderedDict.fromkeys(WSR98D_PRODUCTS[code] for code in row if code >= 0))
+        for row in unique_rows.tolist()
+    ]
+    return signatures, np.asarray(inverse, dtype=np.intp).reshape(-1)
+
+
+def _describe_wsr98d_cuts(cut_fields, cut_elevations):
+    """
+    Classify raw cuts as reflectivity-only, Doppler-only, or combined.
+    :param cut_fields: field names carried by the first radial of every cut.
+    :param cut_elevations: configured elevation of every cut //units: degree
+    """
+    descriptors = []
+    for sweep_index, (fields, elevation) in enumerate(zip(cut_fields, cut_elevations)):
+        field_names = set(fields)
+        has_reflectivity = any(name in field_names for name in _REFLECTIVITY_LIKE_FIELDS)
+        has_doppler = any(name in field_names for name in _VELOCITY_LIKE_FIELDS)
+        descriptors.append(
+            {
+                "index": sweep_index,
+                "fields": fields,
+                "elevation": float(elevation),
+                "reflectivity_only": has_reflectivity and not has_doppler,
+                "doppler_only": has_doppler and not has_reflectivity,
+                "combined": has_reflectivity and has_doppler,
+            }
+        )
+    return descriptors
+
+
+def _pair_wsr98d_split_cuts(descriptors, elevation_tolerance=SPLIT_CUT_ELEVATION_TOLERANCE):
+    """Pair reflectivity-only cuts with the closest compatible Doppler-only cuts."""
+    pending_reflectivity = []
+    paired = []
+    for descriptor in descriptors:
+        sweep_index = descriptor["index"]
+        if descriptor["reflectivity_only"]:
+            pending_reflectivity.append(sweep_index)
+            continue
+        if not descriptor["doppler_only"]:
+            continue
+        match = None
+        for candidate in reversed(pending_reflectivity):
+            if abs(descriptors[candidate]["elevation"] - descriptor["elevation"]) <= float(elevation_tolerance):
+                match = candidate
+                break
+        if match is None:
+            continue
+        pending_reflectivity.remove(match)
+        paired.append((match, sweep_index))
+    return paired
+
+
+def _wsr98d_cut_limit(cut_elevations, max_elevation):
+    """
+    Number of leading cuts that can contribute to sweeps at or below ``max_elevation``.
+    Cuts after the last one within the split-cut pairing tolerance are never needed.
+    """
+    reachable = np.flatnonzero(
+        np.asarray(cut_elevations, dtype=np.float64) <= float(max_elevation) + SPLIT_CUT_ELEVATION_TOLERANCE
+    )
+    return int(reachable[-1]) + 1 if reachable.size else 0
+
+
+def _select_wsr98d_cuts(radial_header, moment_index, cut_elevations, sweeps=None, max_elevation=None):
+    """
+    Resolve a sweep selection to the raw cuts it needs.
+
+    Sweep indices and ``max_elevation`` refer to the sweeps of the assembled
+    volume, where a reflectivity-only cut and its paired Doppler-only cut form
+    one sweep; both cuts of a selected pair are kept.
+    :return: (boolean mask of retained raw radials, indices of retained raw cuts)
+    """
+    status = radial_header["RadialState"]
+    starts = np.flatnonzero((status == 0) | (status == 3))
+    ends = np.flatnonzero((status == 2) | (status == 4))
+    ncuts = min(starts.size, ends.size, len(cut_elevations))
+    signatures, ray_signature = _wsr98d_ray_signatures(radial_header.size, moment_index)
+    descriptors = _describe_wsr98d_cuts(
+        [signatures[ray_signature[start]] for start in starts[:ncuts]],
+        cut_elevations[:ncuts],
+    )
+    paired = _pair_wsr98d_split_cuts(descriptors)
+    sources = dict((target, source) for source, target in paired)
+    output_cuts = np.setdiff1d(np.arange(ncuts), np.fromiter(sources.values(), dtype=np.int64))
+    selected = output_cuts[_resolve_sweep_selection(
+        np.asarray(cut_elevations, dtype=np.float64)[output_cuts], sweeps, max_elevation)]
+    keep_cuts = np.union1d(selected, np.array([sources[cut] for cut in selected.tolist() if cut in sources],
+                                              dtype=np.int64))
+    ray_mask = np.zeros(radial_header.size, dtype=bool)
+    for cut in keep_cuts.tolist():
+        ray_mask[starts[cut]:ends[cut] + 1] = True
+    return ray_mask, keep_cuts
 
 
 class WSR98DBaseData(object):
     """Decode standard WSR-98D dual-polarization base data."""
 
-    def __init__(self, filename, station_lon=None, station_lat=None, station_alt=None):
+    def __init__(self, filename, station_lon=None, station_lat=None, station_alt=None, fields=None,
+                 sweeps=None, max_elevation=None):
         """
         :param filename:  radar basedata filename
         :param station_lon:  radar station longitude //units: degree east
         :param station_lat:  radar station latitude //units:degree north
         :param station_alt:  radar station altitude //units: meters
+        :param fields:  optional field names to decode, e.g. ["dBZ", "ZDR"]; None decodes every moment
+        :param sweeps:  optional indices of the assembled sweeps to decode; other cuts are dropped
+        :param max_elevation:  optional highest sweep elevation to decode //units: degree
         """
         super(WSR98DBaseData, self).__init__()
         self.filename = filename
         self.station_lon = station_lon
         self.station_lat = station_lat
         self.station_alt = station_alt
+        self.selected_fields = _normalize_field_selection(fields)
         self.fid = _prepare_for_read(self.filename)
-        self._check_standard_basedata()
-        self.header = self._parse_BaseDataHeader()
-        self.radial, self._status, self._azimuth, self._elevation, self._seconds, self._microseconds = \
-            self._parse_radial()
+        try:
+            self._check_standard_basedata()
+            self.header = self._parse_BaseDataHeader()
+            self._load_radials(*self._parse_radial(self.selected_fields, sweeps=sweeps, max_elevation=max_elevation))
+        finally:
+            self.fid.close()
+
+    @classmethod
+    def _from_radial_payload(cls, header, buf, station_lon=None, station_lat=None, station_alt=None, fields=None):
+        """
+        Build a reader from a parsed file header and a radial payload that holds complete cuts,
+        e.g. the cuts of a volume that is still being written.
+        :param header: file header dict whose ``CutConfig`` lists exactly the cuts in ``buf``
+        """
+        reader = cls.__new__(cls)
+        reader.filename = None
+        reader.station_lon = station_lon
+        reader.station_lat = station_lat
+        reader.station_alt = station_alt
+        reader.selected_fields = _normalize_field_selection(fields)
+        reader.header = header
+        radial_header, radial_offset, moment_index = _index_wsr98d_radials(buf)
+        field_data, field_bins = _decode_wsr98d_moments(buf, radial_header.size, moment_index,
+                                                        field_names=reader.selected_fields)
+        reader._load_radials(radial_header, radial_offset, moment_index, field_data, field_bins)
+        return reader
+
+    def _load_radials(self, radial_header, radial_offset, moment_index, field_data, field_bins):
+        """Attach decoded radials and derive the sweep layout from the radial states."""
+        self.radial_header, self.radial_offset, self.moment_index = radial_header, radial_offset, moment_index
+        self._field_data, self._field_bins = field_data, field_bins
+        self._status = self.radial_header["RadialState"].astype(np.int64)
+        self._azimuth = self.radial_header["Azimuth"].astype(np.float64)
+        self._elevation = self.radial_header["Elevation"].astype(np.float64)
+        self._seconds = self.radial_header["Seconds"].astype(np.int64)
+        self._microseconds = self.radial_header["MicroSeconds"].astype(np.int64)
+        self._radial = None
+        self._signatures = None
         self._scan_time = None
         self._nyquist_velocity = None
         self._unambiguous_range = None
-        self.nrays = len(self.radial)
+        self.nrays = self.radial_header.size
         self.sweep_start_ray_index = np.where((self._status == 0) | (self._status == 3))[0]
         self.sweep_end_ray_index = np.where((self._status == 2) | (self._status == 4))[0]
         self.nsweeps = len(self.sweep_start_ray_index)
-        self.fid.close()
+
+    @classmethod
+    def read_metadata(cls, filename):
+        """
+        Summarize a volume from its file header and the radial headers of the lowest
+        sweep, without decoding any moment payload.
+        :param filename:  radar basedata filename
+        :return: dict, see ``pycwr.io.read_metadata``
+        """
+        reader = cls.__new__(cls)
+        reader.filename = filename
+        reader.station_lon = reader.station_lat = reader.station_alt = None
+        reader.fid = _prepare_for_read(filename)
+        try:
+            reader._check_standard_basedata()
+            reader.header = reader._parse_BaseDataHeader()
+            cut_config = reader.header['CutConfig']
+            fields = _probe_lowest_sweep_fields(
+                reader.fid,
+                _WSR98D_RADIAL_HEADER_DTYPE,
+                _WSR98D_MOMENT_HEADER_DTYPE,
+                _WSR98D_NAMED_PRODUCTS,
+                cut_config['Elevation'],
+                split_tolerance=SPLIT_CUT_ELEVATION_TOLERANCE,
+                max_moments=MAX_WSR98D_MOMENTS_PER_RADIAL,
+                context="WSR98D",
+            )
+        finally:
+            reader.fid.close()
+        lat, lon, alt, frequency = reader.get_latitude_longitude_altitude_frequency()
+        cuts = [
+            _metadata_cut(
+                cut['Elevation'],
+                _decode_wsr98d_resolution(cut['LogResolution']),
+                _decode_wsr98d_resolution(cut['DopplerResolution']),
+                cut['NyquistSpeed'],
+                cut['MaximumRange'],
+            )
+            for cut in cut_config
+        ]
+        return _radar_metadata(
+            "WSR98D",
+            reader.get_sitename(),
+            lat,
+            lon,
+            alt,
+            frequency,
+            reader.get_scan_type(),
+            julian2date_SEC(int(reader.header['TaskConfig']['VolumeStartTime']), 0),
+            None,
+            _decode_header_text(reader.header['TaskConfig']['TaskName']),
+            cuts,
+            fields,
+            site_code=_decode_header_text(reader.header['SiteConfig']['SiteCode']),
+        )
 
     def _check_standard_basedata(self):
         """
@@ -238,88 +604,86 @@ class WSR98DBaseData(object):
         BaseDataHeader['CutConfig'] = np.frombuffer(cut_buf, dtype_98D.BaseDataHeader['CutConfigurationBlock'])
         return BaseDataHeader
 
-    def _parse_radial(self):
-        radial = []
-        azimuth = []
-        elevation = []
-        status = []
-        seconds = []
-        microseconds = []
+    def _parse_radial(self, field_names=None, sweeps=None, max_elevation=None):
+        """
+        Index the radial payload, then decode the (selected) moments in bulk.
+        :param field_names: optional set of field names to decode.
+        :param sweeps: optional indices of the assembled sweeps to keep.
+        :param max_elevation: optional highest sweep elevation to keep //units: degree
+        :return: (radial headers, radial offsets, moment index, field arrays, per-ray bin counts)
+        """
         buf = _read_all(
             self.fid,
             "WSR98D radial payload",
             max_bytes=WSR98D_MAX_DECODED_PAYLOAD_BYTES,
         )
-        buffer_view = memoryview(buf)
-        pos = 0
-        size = len(buf)
-        header_size = _WSR98D_RADIAL_HEADER_STRUCT.size
-        radial_keys = _WSR98D_RADIAL_HEADER_KEYS
-        radial_struct = _WSR98D_RADIAL_HEADER_STRUCT
-        while pos + header_size <= size:
-            radial_values = radial_struct.unpack_from(buf, pos)
-            pos += header_size
-            RadialDict = dict(zip(radial_keys, radial_values))
-            moment_num = _validate_count(
-                "WSR98D MomentNumber",
-                RadialDict['MomentNumber'],
-                minimum=0,
-                maximum=MAX_WSR98D_MOMENTS_PER_RADIAL,
+        max_cuts = None
+        if max_elevation is not None:
+            if self.get_scan_type() == "rhi":
+                raise ValueError("max_elevation is not supported for RHI volumes.")
+            if sweeps is None:
+                max_cuts = _wsr98d_cut_limit(self.header['CutConfig']['Elevation'], max_elevation)
+        radial_header, radial_offset, moment_index = _index_wsr98d_radials(buf, max_cuts=max_cuts)
+        if sweeps is not None or max_elevation is not None:
+            ray_mask, keep_cuts = _select_wsr98d_cuts(
+                radial_header,
+                moment_index,
+                self.header['CutConfig']['Elevation'],
+                sweeps=sweeps,
+                max_elevation=max_elevation,
             )
-            RadialDict['fields'], pos = self._parse_radial_single(buffer_view, pos, moment_num)
-            radial.append(RadialDict)
-            azimuth.append(RadialDict['Azimuth'])
-            elevation.append(RadialDict['Elevation'])
-            status.append(RadialDict['RadialState'])
-            seconds.append(RadialDict['Seconds'])
-            microseconds.append(RadialDict['MicroSeconds'])
-        if pos != size:
-            raise ValueError("WSR98D radial payload contains trailing truncated data.")
-        return radial, np.asarray(status), np.asarray(azimuth), np.asarray(elevation), \
-            np.asarray(seconds), np.asarray(microseconds)
-
-    def _parse_radial_single(self, buf, pos, moment_num):
-        radial_var = {}
-        moment_header_size = _WSR98D_MOMENT_HEADER_STRUCT.size
-        moment_header_struct = _WSR98D_MOMENT_HEADER_STRUCT
-        moment_header_keys = _WSR98D_MOMENT_HEADER_KEYS
-        flag_to_product = dtype_98D.flag2Product
-        buffer_size = len(buf)
-        for _ in range(moment_num):
-            if pos + moment_header_size > buffer_size:
-                raise ValueError("WSR98D moment header is truncated or malformed.")
-            moment_header_values = moment_header_struct.unpack_from(buf, pos)
-            Momheader = dict(zip(moment_header_keys, moment_header_values))
-            pos += moment_header_size
-            data_len = _validate_count(
-                "WSR98D moment length",
-                Momheader['Length'],
-                minimum=0,
-                maximum=MAX_WSR98D_MOMENT_DATA_BYTES,
-            )
-            if pos + data_len > buffer_size:
-                raise ValueError("WSR98D moment payload extends beyond the available buffer.")
-            Data_buf = buf[pos:pos + data_len]
-            pos += data_len
-            if Momheader['BinLength'] not in (1, 2):
-                raise ValueError("WSR98D moment bin length must be 1 or 2 bytes.")
-            if data_len % int(Momheader['BinLength']) != 0:
-                raise ValueError("WSR98D moment payload length does not match the bin length.")
-            if int(Momheader['Scale']) == 0:
-                raise ValueError("WSR98D moment scale cannot be zero.")
-            if Momheader['BinLength'] == 1:
-                dat_tmp = np.frombuffer(Data_buf, dtype=np.uint8, count=data_len)
-            else:
-                dat_tmp = np.frombuffer(Data_buf, dtype=np.uint16, count=data_len // 2)
-            if Momheader['DataType'] <= 35:
-                dat = np.full(dat_tmp.shape, np.nan, dtype=np.float32)
-                valid = dat_tmp >= 5
-                if np.any(valid):
-                    dat[valid] = (dat_tmp[valid].astype(np.float32) - Momheader['Offset']) / Momheader['Scale']
-                field_name = flag_to_product.get(int(Momheader['DataType']))
-                if field_name is not None:
-                    radial_var[field_name] = dat
-        return radial_var, pos
+            ray_number = np.cumsum(ray_mask) - 1
+            moment_index = moment_index[ray_mask[moment_index["ray"]]]
+            moment_index["ray"] = ray_number[moment_index["ray"]]
+            radial_header = radial_header[ray_mask]
+            radial_offset = radial_offset[ray_mask]
+            self.header['CutConfig'] = self.header['CutConfig'][keep_cuts]
+        field_data, field_bins = _decode_wsr98d_moments(
+            buf,
+            radial_header.size,
+            moment_index,
+            field_names=field_names,
+        )
+        return radial_header, radial_offset, moment_index, field_data, field_bins
+
+    def _ray_signatures(self):
+        if self._signatures is None:
+            self._signatures = _wsr98d_ray_signatures(self.nrays, self.moment_index)
+        return self._signatures
+
+    def get_ray_field_names(self, iray):
+        """Return the ordered field names carried by raw radial ``iray``."""
+        signatures, ray_signature = self._ray_signatures()
+        return signatures[ray_signature[iray]]
+
+    def get_ray_field(self, field_name, iray):
+        """Return the native-length decoded values of one field on one raw radial."""
+        nbins = int(self._field_bins[field_name][iray])
+        if nbins < 0 or field_name not in self._field_data:
+            return None
+        return self._field_data[field_name][iray, :nbins]
+
+    def _radial_record(self, iray, fields):
+        record = dict(zip(_WSR98D_RADIAL_HEADER_DTYPE.names, self.radial_header[iray].tolist()))
+        record["fields"] = fields
+        return record
+
+    @property
+    def radial(self):
+        """Per-radial dictionaries in the historical layout, built on first access."""
+        if self._radial is None:
+            self._radial = [
+                self._radial_record(
+                    iray,
+                    {
+                        name: self.get_ray_field(name, iray)
+                        for name in self.get_ray_field_names(iray)
+                        if name in self._field_data
+                    },
+                )
+                for iray in range(self.nrays)
+            ]
+        return self._radial
 
     def get_nyquist_velocity(self):
         """Return the per-ray Nyquist velocity."""
@@ -336,9 +700,7 @@ class WSR98DBaseData(object):
     def get_scan_time(self):
         """Return the acquisition time for each ray."""
         if self._scan_time is None:
-            self._scan_time = np.array(
-                [julian2date_SEC(sec, usec) for sec, usec in zip(self._seconds, self._microseconds)]
-            )
+            self._scan_time = _epoch_to_datetimes(self._seconds, self._microseconds)
         return self._scan_time
 
     def get_sweep_end_ray_index(self):
@@ -389,8 +751,8 @@ class WSR98DBaseData(object):
 class WSR98D2NRadar(object):
     """Bridge from raw WSR98D data to an NRadar object."""
 
-    _REFLECTIVITY_LIKE_FIELDS = ("dBZ", "Zc", "dBT")
-    _VELOCITY_LIKE_FIELDS = ("V", "Vc", "W", "Wc")
+    _REFLECTIVITY_LIKE_FIELDS = _REFLECTIVITY_LIKE_FIELDS
+    _VELOCITY_LIKE_FIELDS = _VELOCITY_LIKE_FIELDS
     _RANGE_REFERENCE_FIELDS = ("V", "Vc", "W", "Wc", "dBZ", "Zc", "dBT")
 
     def __init__(self, WSR98D):
@@ -398,6 +760,9 @@ class WSR98D2NRadar(object):
         self.flag_match = np.all(self.WSR98D.header['CutConfig']['LogResolution'] == \
                        self.WSR98D.header['CutConfig']['DopplerResolution'])
         self._dbz_index_cache = {}
+        self._source_rays = {}
+        self._copied_fields = {}
+        self._radial = None
         self._sweep_descriptors = self._describe_raw_sweeps()
         self._paired_sweeps = self._pair_split_sweeps()
         self.dBZ_index_alone = np.array([source for source, _ in self._paired_sweeps], dtype=np.int32)
@@ -408,7 +773,7 @@ class WSR98D2NRadar(object):
 
         keep_mask = np.ones(self.WSR98D.nrays, dtype=bool)
         keep_mask[self.get_remove_radial_indices()] = False
-        self.radial = [iray for iray, keep in zip(self.WSR98D.radial, keep_mask) if keep]
+        self._ray_index = np.flatnonzero(keep_mask)
         self._azimuth = self.WSR98D.get_azimuth()[keep_mask]
         self._elevation = self.WSR98D.get_elevation()[keep_mask]
         self._seconds = self.WSR98D._seconds[keep_mask]
@@ -421,7 +786,7 @@ class WSR98D2NRadar(object):
         self.sweep_start_ray_index = np.where((status == 0) | (status == 3))[0]
         self.sweep_end_ray_index = np.where((status == 2) | (status == 4))[0]
         self.nsweeps = len(self.sweep_start_ray_index)
-        self.nrays = len(self.radial)
+        self.nrays = int(self._ray_index.size)
         self.scan_type = self.WSR98D.get_scan_type()
         self.latitude, self.longitude, self.altitude, self.frequency = \
             self.WSR98D.get_latitude_longitude_altitude_frequency()
@@ -438,46 +803,14 @@ class WSR98D2NRadar(object):
 
     def _describe_raw_sweeps(self):
         """Classify raw sweeps as reflectivity-only, Doppler-only, or combined."""
-        descriptors = []
-        for sweep_index, start_idx in enumerate(self.WSR98D.sweep_start_ray_index):
-            fields = tuple(self.WSR98D.radial[start_idx]["fields"].keys())
-            field_names = set(fields)
-            has_reflectivity = any(name in field_names for name in self._REFLECTIVITY_LIKE_FIELDS)
-            has_doppler = any(name in field_names for name in self._VELOCITY_LIKE_FIELDS)
-            descriptors.append(
-                {
-                    "index": sweep_index,
-                    "fields": fields,
-                    "elevation": float(self.WSR98D.header["CutConfig"]["Elevation"][sweep_index]),
-                    "reflectivity_only": has_reflectivity and not has_doppler,
-                    "doppler_only": has_doppler and not has_reflectivity,
-                    "combined": has_reflectivity and has_doppler,
-                }
-            )
-        return descriptors
+        return _describe_wsr98d_cuts(
+            [self.WSR98D.get_ray_field_names(start_idx) for start_idx in self.WSR98D.sweep_start_ray_index],
+            self.WSR98D.header["CutConfig"]["Elevation"],
+        )
 
-    def _pair_split_sweeps(self, elevation_tolerance=0.5):
+    def _pair_split_sweeps(self, elevation_tolerance=SPLIT_CUT_ELEVATION_TOLERANCE):
         """Pair reflectivity-only sweeps with the closest compatible Doppler-only sweeps."""
-        pending_reflectivity = []
-        paired = []
-        for descriptor in self._sweep_descriptors:
-            sweep_index = descriptor["index"]
-            if descriptor["reflectivity_only"]:
-                pending_reflectivity.append(sweep_index)
-                continue
-            if not descriptor["doppler_only"]:
-                continue
-            match = None
-            for candidate in reversed(pending_reflectivity):
-                candidate_descriptor = self._sweep_descriptors[candidate]
-                if abs(candidate_descriptor["elevation"] - descriptor["elevation"]) <= float(elevation_tolerance):
-                    match = candidate
-                    break
-            if match is None:
-                continue
-            pending_reflectivity.remove(match)
-            paired.append((match, sweep_index))
-        return paired
+        return _pair_wsr98d_split_cuts(self._sweep_descriptors, elevation_tolerance=elevation_tolerance)
 
     def get_remove_radial_indices(self):
         """Return the radial indices removed after sweep alignment."""
@@ -532,10 +865,49 @@ class WSR98D2NRadar(object):
 
         v_idx = np.arange(self.WSR98D.sweep_start_ray_index[field_without_dBZ_num], \
                           self.WSR98D.sweep_end_ray_index[field_without_dBZ_num] + 1)
-        keys = self.WSR98D.radial[self.WSR98D.sweep_start_ray_index[field_with_dBZ_num]]['fields'].keys()
-        for ind_dbz, ind_v in zip(dbz_idx, v_idx):
-            for ikey in keys:
-                self.WSR98D.radial[ind_v]["fields"][ikey] = self.WSR98D.radial[ind_dbz]["fields"][ikey]
+        keys = self.get_ray_field_names(self.WSR98D.sweep_start_ray_index[field_with_dBZ_num])
+        for ikey in keys:
+            source = self._source_rays.get(ikey)
+            if source is None:
+                source = self._source_rays[ikey] = np.arange(self.WSR98D.nrays)
+            source[v_idx] = source[dbz_idx]
+        copied = self._copied_fields.setdefault(int(field_without_dBZ_num), [])
+        copied.extend(ikey for ikey in keys if ikey not in copied)
+
+    def get_ray_field_names(self, iray):
+        """Return the ordered field names of raw radial ``iray`` after sweep pairing."""
+        names = self.WSR98D.get_ray_field_names(iray)
+        sweep = int(np.searchsorted(self.WSR98D.sweep_start_ray_index, iray, side="right")) - 1
+        copied = self._copied_fields.get(sweep)
+        if copied:
+            names = tuple(OrderedDict.fromkeys(names + tuple(copied)))
+        return names
+
+    def _source_ray(self, field_name, rays):
+        """Map raw radial indices to the raw radials that hold ``field_name`` for them."""
+        source = self._source_rays.get(field_name)
+        return rays if source is None else source[rays]
+
+    def _field_bins(self, field_name, rays):
+        bins = self.WSR98D._field_bins.get(field_name)
+        if bins is None:
+            return np.full(np.shape(rays), -1, dtype=np.int32)
+        return bins[self._source_ray(field_name, rays)]
+
+    @property
+    def radial(self):
+        """Retained radials in the historical per-radial dictionary layout."""
+        if self._radial is None:
+            radial = []
+            for iray in self._ray_index:
+                fields = {}
+                for name in self.get_ray_field_names(iray):
+                    value = self.WSR98D.get_ray_field(name, self._source_ray(name, iray))
+                    if value is not None:
+                        fields[name] = value
+                radial.append(self.WSR98D._radial_record(iray, fields))
+            self._radial = radial
+        return self._radial
 
     def get_azimuth(self):
         """Return the azimuth angle for each retained ray."""
@@ -552,9 +924,7 @@ class WSR98D2NRadar(object):
     def get_scan_time(self):
         """Return the acquisition time for each retained ray."""
         if self._scan_time is None:
-            self._scan_time = np.array(
-                [julian2date_SEC(sec, usec) for sec, usec in zip(self._seconds, self._microseconds)]
-            )
+            self._scan_time = _epoch_to_datetimes(self._seconds, self._microseconds)
         return self._scan_time
 
     def get_nyquist_velocity(self):
@@ -581,15 +951,17 @@ class WSR98D2NRadar(object):
         """Return the Doppler gate count for each retained sweep."""
         bins = []
         for idx in self.sweep_start_ray_index:
-            radial_fields = self.radial[idx]["fields"]
-            selected = None
+            iray = self._ray_index[idx]
+            sizes = OrderedDict(
+                (name, int(self._field_bins(name, iray)))
+                for name in self.get_ray_field_names(iray)
+            )
             for field_name in self._RANGE_REFERENCE_FIELDS:
-                selected = radial_fields.get(field_name)
-                if selected is not None and selected.size:
-                    bins.append(int(selected.size))
+                if sizes.get(field_name, 0) > 0:
+                    bins.append(sizes[field_name])
                     break
             else:
-                sizes = [int(values.size) for values in radial_fields.values() if getattr(values, "size", 0)]
+                sizes = [size for size in sizes.values() if size > 0]
                 bins.append(max(sizes) if sizes else 0)
         return np.asarray(bins, dtype=np.int32)
 
@@ -603,56 +975,56 @@ class WSR98D2NRadar(object):
         Resolution = _decode_wsr98d_resolution(self.header['CutConfig']['LogResolution'][int(sweep)])
         return np.linspace(Resolution, Resolution * length, length)
 
+    def _get_field_keys(self):
+        """Return retained field names in order of first appearance."""
+        field_keys = OrderedDict()
+        _, ray_signature = self.WSR98D._ray_signatures()
+        for start, end in zip(self.sweep_start_ray_index, self.sweep_end_ray_index):
+            rays = self._ray_index[start:end + 1]
+            _, first = np.unique(ray_signature[rays], return_index=True)
+            for iray in rays[np.sort(first)]:
+                field_keys.update((key, None) for key in self.get_ray_field_names(iray))
+        return tuple(key for key in field_keys if key in self.WSR98D._field_data)
+
     def _get_fields(self):
         """Assemble the retained fields into dense 2-D arrays."""
-        field_keys = []
-        seen = set()
-        for radial in self.radial:
-            for key in radial["fields"].keys():
-                if key not in seen:
-                    seen.add(key)
-                    field_keys.append(key)
-        field_keys = tuple(field_keys)
-        fields = {ikey: np.full((self.nrays, self.max_bins), np.nan, dtype=np.float64) for ikey in field_keys}
-        for sweep_idx, (start, end) in enumerate(zip(self.sweep_start_ray_index, self.sweep_end_ray_index)):
-            for iray in range(start, end + 1):
-                radial_fields = self.radial[iray]['fields']
-                for ikey in field_keys:
-                    fields[ikey][iray, :] = self._add_or_del_field(
-                        radial_fields.get(ikey),
-                        ikey,
-                        self.flag_match,
-                        sweep_idx=sweep_idx,
-                    )
+        fields = {}
+        for ikey in self._get_field_keys():
+            source = self._source_ray(ikey, self._ray_index)
+            data = self.WSR98D._field_data[ikey]
+            out = np.full((self.nrays, self.max_bins), np.nan, dtype=np.float64)
+            if not self.flag_match and ikey == "dBZ":
+                source_bins = self.WSR98D._field_bins[ikey][source]
+                for sweep_idx, (start, end) in enumerate(zip(self.sweep_start_ray_index, self.sweep_end_ray_index)):
+                    sweep_bins = source_bins[start:end + 1]
+                    for length in np.unique(sweep_bins[sweep_bins > 0]):
+                        rows = start + np.flatnonzero(sweep_bins == length)
+                        valid, nearest = self._get_dbz_resample_index(length, sweep_idx=sweep_idx)
+                        out[np.ix_(rows, np.flatnonzero(valid))] = data[np.ix_(source[rows], nearest[valid])]
+            else:
+                ncopy = min(self.max_bins, data.shape[1])
+                out[:, :ncopy] = data[source, :ncopy]
+            fields[ikey] = out
         return fields
 
     def _build_extended_fields(self):
         """Collect native-range reflectivity for sweeps longer than the aligned grid."""
         extended_sweeps = {}
         scan_time = self.get_scan_time()
+        data = self.WSR98D._field_data.get("dBZ")
+        if data is None:
+            return {}
+        source = self._source_ray("dBZ", self._ray_index)
+        source_bins = self.WSR98D._field_bins["dBZ"][source]
         for sweep_idx, (start, end, aligned_bins) in enumerate(
             zip(self.sweep_start_ray_index, self.sweep_end_ray_index, self.bins_per_sweep)
         ):
-            native_bins = max(
-                (
-                    self.radial[iray]["fields"].get("dBZ", np.empty((0,), dtype=np.float32)).size
-                    for iray in range(start, end + 1)
-                ),
-                default=0,
-            )
+            native_bins = max(int(source_bins[start:end + 1].max(initial=0)), 0)
             if native_bins <= int(aligned_bins):
                 continue
 
-            data = np.full((end - start + 1, native_bins), np.nan, dtype=np.float32)
-            for out_idx, iray in enumerate(range(start, end + 1)):
-                dat_ray = self.radial[iray]["fields"].get("dBZ")
-                if dat_ray is None or dat_ray.size == 0:
-                    continue
-                copy_len = min(dat_ray.size, native_bins)
-                data[out_idx, :copy_len] = dat_ray[:copy_len].astype(np.float32, copy=False)
-
             extended_sweeps[sweep_idx] = {
-                "data": data,
+                "data": data[source[start:end + 1], :native_bins],
                 "range": self.get_dbz_range_per_radial(native_bins, sweep=sweep_idx).astype(np.float32, copy=False),
                 "time": np.asarray(scan_time[start:end + 1]),
                 "azimuth": np.asarray(self._azimuth[start:end + 1], dtype=np.float32),
@@ -726,7 +1098,7 @@ class WSR98D2NRadar(object):
         else:
             return self.header['CutConfig']['Elevation']
 
-    def to_prd(self, effective_earth_radius=None):
+    def to_prd(self, effective_earth_radius=None, sweeps=None, max_elevation=None):
         """Build an ``NRadar.PRD`` object from the decoded WSR-98D volume."""
         return PRD(fields=self.fields, scan_type=self.scan_type, time=self.get_scan_time(), \
                           range=self.range, azimuth=self.azimuth, elevation=self.elevation, latitude=self.latitude, \
@@ -738,11 +1110,13 @@ class WSR98D2NRadar(object):
                           nrays=self.nrays, nsweeps=self.nsweeps, sitename = self.sitename,
                           pyart_radar=None, effective_earth_radius=effective_earth_radius,
                           extended_fields=self.extended_fields,
-                          metadata={"original_container": "WSR98D", "radar_name": "WSR98D"})
+                          metadata={"original_container": "WSR98D", "radar_name": "WSR98D"},
+                          sweeps=sweeps, max_elevation=max_elevation)
 
-    def ToPRD(self, effective_earth_radius=None):
+    def ToPRD(self, effective_earth_radius=None, sweeps=None, max_elevation=None):
         """Backward-compatible alias for ``to_prd``."""
-        return self.to_prd(effective_earth_radius=effective_earth_radius)
+        return self.to_prd(effective_earth_radius=effective_earth_radius, sweeps=sweeps,
+                           max_elevation=max_elevation)
 
     def to_pyart_radar(self, effective_earth_radius=None, **kwargs):
         """Export the decoded WSR-98D volume through the PRD Py-ART adapter."""
@@ -783,6 +1157,62 @@ class WSR98D2NRadar(object):
         return instrument_parameters
 
 
+def _pack_wsr98d_sweep(prd, sweep, rays, selected_fields, sequence_start):
+    """
+    Pack every radial of one sweep with a single structured array whose records are the radial
+    header followed by the moment header and codes of each exported field.
+    """
+    sweep_dataset = prd.fields[sweep]
+    available = prd.available_fields(sweep=sweep, range_mode=None)
+    moments = []
+    for field_name in selected_fields:
+        if field_name not in available:
+            continue
+        spec = WSR98D_WRITE_FIELD_SPECS[field_name]
+        field = prd.get_sweep_field(sweep, field_name, range_mode=None)
+        values = np.asarray(field.values[:rays], dtype=np.float32)
+        codes = _encode_quantized_codes(values, spec["scale"], spec["offset"], spec["bin_length"])
+        moments.append((spec, codes))
+    record_dtype = np.dtype(
+        [("radial", _WSR98D_RADIAL_HEADER_DTYPE)]
+        + [item for imoment, (_, codes) in enumerate(moments)
+           for item in (("moment_%d" % imoment, _WSR98D_MOMENT_HEADER_DTYPE),
+                        ("data_%d" % imoment, codes.dtype, codes.shape[1:]))]
+    )
+    records = np.zeros(rays, dtype=record_dtype)
+    for imoment, (spec, codes) in enumerate(moments):
+        moment_header = records["moment_%d" % imoment]
+        moment_header["DataType"] = spec["data_type"]
+        moment_header["Scale"] = spec["scale"]
+        moment_header["Offset"] = spec["offset"]
+        moment_header["BinLength"] = spec["bin_length"]
+        moment_header["Length"] = codes[0].nbytes if rays else 0
+        records["data_%d" % imoment] = codes
+
+    radial_state = np.ones(rays, dtype=np.int32)
+    if rays:
+        radial_state[-1] = 2
+        radial_state[0] = 0
+        if sweep == int(prd.nsweeps) - 1:
+            radial_state[-1] = 4
+        if sweep == 0:
+            radial_state[0] = 3
+    # datetime64 counts from the unix epoch, as the WSR98D Seconds/MicroSeconds pair does
+    microseconds = np.asarray(sweep_dataset["time"].values[:rays]).astype("datetime64[us]").astype(np.int64)
+    radial = records["radial"]
+    radial["RadialState"] = radial_state
+    radial["SequenceNumber"] = np.arange(sequence_start, sequence_start + rays)
+    radial["RadialNumber"] = np.arange(1, rays + 1)
+    radial["ElevationNumber"] = sweep + 1
+    radial["Azimuth"] = sweep_dataset["azimuth"].values[:rays]
+    radial["Elevation"] = sweep_dataset["elevation"].values[:rays]
+    radial["Seconds"] = np.floor_divide(microseconds, 1000000)
+    radial["MicroSeconds"] = np.remainder(microseconds, 1000000)
+    radial["LengthOfData"] = record_dtype.itemsize - _WSR98D_RADIAL_HEADER_DTYPE.itemsize
+    radial["MomentNumber"] = len(moments)
+    return records.tobytes()
+
+
 def write_wsr98d(
     prd,
     filename,
@@ -819,8 +1249,6 @@ def write_wsr98d(
     fmt_generic_header = "<" + "".join(item[1] for item in dtype_98D.BaseDataHeader["GenericHeaderBlock"])
     fmt_site_configuration = "<" + "".join(item[1] for item in dtype_98D.BaseDataHeader["SiteConfigurationBlock"])
     fmt_task_configuration = "<" + "".join(item[1] for item in dtype_98D.BaseDataHeader["TaskConfigurationBlock"])
-    fmt_radial_header = "<" + "".join(item[1] for item in dtype_98D.RadialHeader())
-    fmt_moment_header = "<" + "".join(item[1] for item in dtype_98D.RadialData())
 
     generic_header = struct.pack(fmt_generic_header, 1297371986, -1, -1, 1, -1, b"")
     site_configuration = struct.pack(
@@ -889,70 +1317,11 @@ def write_wsr98d(
         cut_config["MomentsMask"][sweep] = 0
         cut_config["MomentsSizeMask"][sweep] = 0
 
-    with open(path, "wb") as handle:
-        handle.write(generic_header)
-        handle.write(site_configuration)
-        handle.write(task_configuration)
-        handle.write(cut_config.tobytes())
-
-        sequence_number = 1
-        for sweep in range(int(prd.nsweeps)):
-            sweep_dataset = prd.fields[sweep]
-            rays = int(rays_per_sweep[sweep])
-            for iray in range(rays):
-                azimuth = float(sweep_dataset["azimuth"].values[iray])
-                elevation = float(sweep_dataset["elevation"].values[iray])
-                dt = _python_datetime(sweep_dataset["time"].values[iray])
-                seconds, microseconds = _epoch_parts(dt)
-                radial_state = 3 if (sweep == 0 and iray == 0) else 4 if (sweep == int(prd.nsweeps) - 1 and iray == rays - 1) else 0 if iray == 0 else 2 if iray == rays - 1 else 1
-
-                moment_headers = []
-                moment_payloads = []
-                for field_name in selected_fields:
-                    if field_name not in prd.available_fields(sweep=sweep, range_mode=None):
-                        continue
-                    spec = WSR98D_WRITE_FIELD_SPECS[field_name]
-                    field = prd.get_sweep_field(sweep, field_name, range_mode=None)
-                    values = np.asarray(field.values[iray], dtype=np.float32)
-                    data_bytes = _encode_quantized(
-                        values,
-                        spec["scale"],
-                        spec["offset"],
-                        spec["bin_length"],
-                    )
-                    moment_headers.append(
-                        struct.pack(
-                            fmt_moment_header,
-                            spec["data_type"],
-                            spec["scale"],
-                            spec["offset"],
-                            spec["bin_length"],
-                            0,
-                            len(data_bytes),
-                            b"",
-                        )
-                    )
-                    moment_payloads.append(data_bytes)
-
-                length_of_data = sum(len(header) + len(payload) for header, payload in zip(moment_headers, moment_payloads))
-                radial_header = struct.pack(
-                    fmt_radial_header,
-                    radial_state,
-                    0,
-                    sequence_number,
-                    iray + 1,
-                    sweep + 1,
-                    azimuth,
-                    elevation,
-                    seconds,
-                    microseconds,
-                    length_of_data,
-                    len(moment_headers),
-                    b"",
-                )
-                handle.write(radial_header)
-                for header, payload in zip(moment_headers, moment_payloads):
-                    handle.write(header)
-                    handle.write(payload)
-                sequence_number += 1
+    chunks = [generic_header, site_configuration, task_configuration, cut_config.tobytes()]
+    sequence_start = 1
+    for sweep in range(int(prd.nsweeps)):
+        chunks.append(_pack_wsr98d_sweep(prd, sweep, int(rays_per_sweep[sweep]), selected_fields, sequence_start))
+        sequence_start += int(rays_per_sweep[sweep])
+    with _open_for_replace(path) as handle:
+        handle.writelines(chunks)
     return path
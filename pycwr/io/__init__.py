@@ -1,15 +1,21 @@
 from importlib import import_module
-from .util import radar_format
+from .util import _normalize_field_selection, _shared_decoding, radar_format
 
 _READER_MODULES = {"CCFile", "SCFile", "WSR98DFile", "SABFile", "PAFile", "NEXRADLevel2File"}
 
 __all__ = [
     "read_auto",
+    "read_metadata",
+    "iter_sweeps",
+    "read_many",
+    "aread_auto",
+    "aread_metadata",
     "read_CC",
     "read_SC",
     "read_WSR98D",
     "read_SAB",
     "read_PA",
+    "read_NEXRAD",
     "write_wsr98d",
     "write_nexrad_level2_msg31",
     "write_nexrad_level2_msg1",
@@ -23,102 +29,304 @@ def __getattr__(name):
         return module
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def read_auto(filename, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None):
+def read_auto(filename, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+              fields=None, sweeps=None, max_elevation=None, cache_dir=None, cache_max_bytes=None,
+              quantized=False):
     """
     :param filename:  radar basedata filename
     :param station_lon:  radar station longitude //units: degree east
     :param station_lat:  radar station latitude //units:degree north
     :param station_alt:  radar station altitude //units: meters
+    :param effective_earth_radius:  optional effective earth radius used for beam geometry //units: meters
+    :param fields:  optional field names to decode, e.g. ["dBZ", "ZDR"]; moments that are not
+        requested are skipped before scaling. None decodes every moment.
+    :param sweeps:  optional sweep indices to keep, numbered as in the full volume
+    :param max_elevation:  optional highest fixed angle to keep //units: degree
+    :param cache_dir:  optional directory of the on-disk decoded-volume cache; a volume is decoded
+        once and later reads memory-map the cached arrays. None disables the cache.
+    :param cache_max_bytes:  size budget of ``cache_dir``; least recently used volumes are evicted
+        beyond it //units: bytes
+    :param quantized:  keep the sweep fields as packed uint8/uint16 codes with CF scale_factor/add_offset
+        attrs and decode physical values only when they are read; see ``PRD.quantize_fields``
+
+    Uncompressed files not modified for ``util.MMAP_SETTLE_SECONDS`` are memory-mapped. A file
+    truncated in place by another program while it is decoded then kills the process with SIGBUS
+    instead of raising ValueError; set PYCWR_MMAP_READS=0 for directories rewritten in place.
+    """
+    if cache_dir is not None:
+        volume_cache = import_module(".volume_cache", __name__)
+        options = {
+            "station": [station_lon, station_lat, station_alt],
+            "fields": None if fields is None else sorted(_normalize_field_selection(fields)),
+            "sweeps": None if sweeps is None else [int(sweep) for sweep in sweeps],
+            "max_elevation": None if max_elevation is None else float(max_elevation),
+        }
+
+
+        def read():
+            with _shared_decoding(filename):
+                return _read_detected(filename, station_lon, station_lat, station_alt, effective_earth_radius,
+                                      fields, sweeps, max_elevation)
+
+        # the entry keeps float fields plus the reader's native encoding, so cached and uncached
+        # quantized reads pack alike
+        return volume_cache.cached_read(
+            filename,
+            cache_dir,
+            read,
+            options=options,
+            effective_earth_radius=effective_earth_radius,
+            max_bytes=cache_max_bytes,
+            quantized=quantized,
+        )
+    # detection and decoding share one decompressed copy of gzip/bz2/zip archives
+    with _shared_decoding(filename):
+        return _read_detected(filename, station_lon, station_lat, station_alt, effective_earth_radius,
+                              fields, sweeps, max_elevation, quantized)[0]
+
+def _bridge_to_prd(bridge, quantized, **kwargs):
     """
+    Build the PRD of a reader bridge, packing its fields with the bridge's native encoding if asked.
+    :return: (PRD, the bridge's native field encoding or None)
+    """
+    prd = bridge.ToPRD(**kwargs)
+    encoding = getattr(bridge, "field_encoding", None)
+    if quantized:
+        prd.quantize_fields(encoding)
+    return prd, encoding
+
+def _read_detected(filename, station_lon, station_lat, station_alt, effective_earth_radius, fields, sweeps,
+                   max_elevation, quantized=False):
     radar_type = radar_format(filename)
     if radar_type == "WSR98D":
         WSR98DFile = __getattr__("WSR98DFile")
-        return WSR98DFile.WSR98D2NRadar(
-            WSR98DFile.WSR98DBaseData(filename, station_lon, station_lat, station_alt)
-        ).ToPRD(effective_earth_radius=effective_earth_radius)
+        return _bridge_to_prd(WSR98DFile.WSR98D2NRadar(
+            WSR98DFile.WSR98DBaseData(filename, station_lon, station_lat, station_alt, fields=fields,
+                                      sweeps=sweeps, max_elevation=max_elevation)
+        ), quantized, effective_earth_radius=effective_earth_radius)
     elif radar_type == "NEXRAD_LEVEL2":
-        raise TypeError("unsupported radar type: NEXRAD Level II archive import is not implemented.")
+        NEXRADLevel2File = __getattr__("NEXRADLevel2File")
+        return _bridge_to_prd(NEXRADLevel2File.NEXRAD2NRadar(
+            NEXRADLevel2File.NEXRADLevel2BaseData(filename, station_lon, station_lat, station_alt, fields=fields,
+                                                  sweeps=sweeps, max_elevation=max_elevation)
+        ), quantized, effective_earth_radius=effective_earth_radius)
     elif radar_type == "SAB":
         SABFile = __getattr__("SABFile")
-        return SABFile.SAB2NRadar(
-            SABFile.SABBaseData(filename, station_lon, station_lat, station_alt)
-        ).ToPRD(effective_earth_radius=effective_earth_radius)
+        return _bridge_to_prd(SABFile.SAB2NRadar(
+            SABFile.SABBaseData(filename, station_lon, station_lat, station_alt, fields=fields)
+        ), quantized, effective_earth_radius=effective_earth_radius, sweeps=sweeps, max_elevation=max_elevation)
     elif radar_type == "CC":
         CCFile = __getattr__("CCFile")
-        return CCFile.CC2NRadar(
-            CCFile.CCBaseData(filename, station_lon, station_lat, station_alt)
-        ).ToPRD(effective_earth_radius=effective_earth_radius)
+        return _bridge_to_prd(CCFile.CC2NRadar(
+            CCFile.CCBaseData(filename, station_lon, station_lat, station_alt, fields=fields)
+        ), quantized, effective_earth_radius=effective_earth_radius, sweeps=sweeps, max_elevation=max_elevation)
     elif radar_type == "SC":
         SCFile = __getattr__("SCFile")
-        return SCFile.SC2NRadar(
-            SCFile.SCBaseData(filename, station_lon, station_lat, station_alt)
-        ).ToPRD(effective_earth_radius=effective_earth_radius)
+        return _bridge_to_prd(SCFile.SC2NRadar(
+            SCFile.SCBaseData(filename, station_lon, station_lat, station_alt, fields=fields)
+        ), quantized, effective_earth_radius=effective_earth_radius, sweeps=sweeps, max_elevation=max_elevation)
     elif radar_type == "PA":
         PAFile = __getattr__("PAFile")
-        return PAFile.PA2NRadar(
-            PAFile.PABaseData(filename, station_lon, station_lat, station_alt)
-        ).ToPRD(effective_earth_radius=effective_earth_radius)
+        return _bridge_to_prd(PAFile.PA2NRadar(
+            PAFile.PABaseData(filename, station_lon, station_lat, station_alt, fields=fields)
+        ), quantized, effective_earth_radius=effective_earth_radius, sweeps=sweeps, max_elevation=max_elevation)
     else:
         raise TypeError("unsupported radar type!")
 
-def read_SAB(filename, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None):
+_METADATA_READERS = {
+    "WSR98D": ("WSR98DFile", "WSR98DBaseData"),
+    "SAB": ("SABFile", "SABBaseData"),
+    "CC": ("CCFile", "CCBaseData"),
+    "SC": ("SCFile", "SCBaseData"),
+    "PA": ("PAFile", "PABaseData"),
+    "NEXRAD_LEVEL2": ("NEXRADLevel2File", "NEXRADLevel2BaseData"),
+}
+
+def read_metadata(filename):
     """
+    Summarize a radar volume from its headers without decoding the radial payload.
     :param filename:  radar basedata filename
+    :return: dict with the keys format, site_name, site_code, latitude, longitude, altitude,
+        frequency (GHz), scan_type, start_time, end_time, task_name, cuts and fields.
+        ``cuts`` lists one dict per cut with elevation (degree), log_resolution and
+        doppler_resolution (meters), nyquist_velocity (m/s) and unambiguous_range (meters);
+        ``fields`` lists the moments present in the lowest sweep. Values a format does not
+        record in its headers are None.
+    """
+    with _shared_decoding(filename):
+        radar_type = radar_format(filename)
+        if radar_type not in _METADATA_READERS:
+            raise TypeError("unsupported radar type!")
+        module_name, reader_name = _METADATA_READERS[radar_type]
+        return getattr(__getattr__(module_name), reader_name).read_metadata(filename)
+
+def iter_sweeps(source, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+                fields=None, timeout=None, poll_interval=1.0):
+    """
+    Decode a WSR98D or PA volume sweep by sweep, yielding each sweep as soon as its last radial is read.
+    :param source:  radar basedata filename, possibly still being written, or a binary file-like stream
     :param station_lon:  radar station longitude //units: degree east
     :param station_lat:  radar station latitude //units:degree north
     :param station_alt:  radar station altitude //units: meters
+    :param effective_earth_radius:  optional effective earth radius used for beam geometry //units: meters
+    :param fields:  optional field names to decode, e.g. ["dBZ", "ZDR"]; None decodes every moment
+    :param timeout:  seconds to wait for a growing file to receive more bytes before the volume is
+        treated as ended; None reads the input as it is now //units: s
+    :param poll_interval:  delay between checks for new bytes while waiting //units: s
+    :return: generator of (sweep index, single-sweep PRD), numbered as ``read_auto`` numbers the sweeps
+    """
+    streaming = import_module(".streaming", __name__)
+    return streaming.iter_sweeps(source, station_lon, station_lat, station_alt, effective_earth_radius,
+                                 fields=fields, timeout=timeout, poll_interval=poll_interval)
+
+def read_many(paths, workers=None, fields=None, sweeps=None, max_elevation=None, effective_earth_radius=None):
+    """
+    Decode many radar volumes across a process pool; workers hand their arrays back through shared memory.
+    :param paths:  radar basedata filenames
+    :param workers:  number of worker processes; None uses every CPU, 1 reads in this process
+    :param fields:  optional field names to decode, e.g. ["dBZ", "ZDR"]; None decodes every moment
+    :param sweeps:  optional sweep indices to keep, numbered as in the full volume
+    :param max_elevation:  optional highest fixed angle to keep //units: degree
+    :param effective_earth_radius:  optional effective earth radius used for beam geometry //units: meters
+    :return: list of PRD in the order of ``paths``
+    """
+    batch = import_module(".batch", __name__)
+    return batch.read_many(paths, workers=workers, fields=fields, sweeps=sweeps, max_elevation=max_elevation,
+                           effective_earth_radius=effective_earth_radius)
+
+async def aread_auto(filename, *args, executor=None, semaphore=None, **kwargs):
+    """
+    Coroutine form of ``read_auto`` that decodes in a bounded executor without blocking the event loop.
+    :param filename:  radar basedata filename
+    :param executor:  concurrent.futures executor running the read; None uses a shared thread pool of
+        ``PYCWR_ASYNC_WORKERS`` threads
+    :param semaphore:  asyncio.Semaphore limiting concurrent reads; None uses one semaphore per event
+        loop with ``PYCWR_ASYNC_WORKERS`` slots. A slot is released only when the read really ends.
+    :return: PRD, as ``read_auto(filename, *args, **kwargs)``; cancelling the task drops a read that
+        has not started yet
+    """
+    aio = import_module(".aio", __name__)
+    return await aio.run_read(read_auto, filename, *args, executor=executor, semaphore=semaphore, **kwargs)
+
+async def aread_metadata(filename, executor=None, semaphore=None):
+    """
+    Coroutine form of ``read_metadata``; ``executor`` and ``semaphore`` are as in ``aread_auto``.
+    :param filename:  radar basedata filename
+    :return: dict, as ``read_metadata(filename)``
+    """
+    aio = import_module(".aio", __name__)
+    return await aio.run_read(read_metadata, filename, executor=executor, semaphore=semaphore)
+
+def read_SAB(filename, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+             fields=None, sweeps=None, max_elevation=None):
+    """
+    :param filename:  radar basedata filename
+    :param station_lon:  radar station longitude //units: degree east
+    :param station_lat:  radar station latitude //units:degree north
+    :param station_alt:  radar station altitude //units: meters
+    :param effective_earth_radius:  optional effective earth radius used for beam geometry //units: meters
+    :param fields:  optional field names to decode, e.g. ["dBZ", "ZDR"]; moments that are not
+        requested are skipped before scaling. None decodes every moment.
+    :param sweeps:  optional sweep indices to keep, numbered as in the full volume
+    :param max_elevation:  optional highest fixed angle to keep //units: degree
     """
     SABFile = __getattr__("SABFile")
     return SABFile.SAB2NRadar(
-        SABFile.SABBaseData(filename, station_lon, station_lat, station_alt)
-    ).ToPRD(effective_earth_radius=effective_earth_radius)
+        SABFile.SABBaseData(filename, station_lon, station_lat, station_alt, fields=fields)
+    ).ToPRD(effective_earth_radius=effective_earth_radius, sweeps=sweeps, max_elevation=max_elevation)
 
-def read_CC(filename, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None):
+def read_CC(filename, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+            fields=None, sweeps=None, max_elevation=None):
     """
     :param filename:  radar basedata filename
     :param station_lon:  radar station longitude //units: degree east
     :param station_lat:  radar station latitude //units:degree north
     :param station_alt:  radar station altitude //units: meters
+    :param effective_earth_radius:  optional effective earth radius used for beam geometry //units: meters
+    :param fields:  optional field names to decode, e.g. ["dBZ", "ZDR"]; moments that are not
+        requested are skipped before scaling. None decodes every moment.
+    :param sweeps:  optional sweep indices to keep, numbered as in the full volume
+    :param max_elevation:  optional highest fixed angle to keep //units: degree
     """
     CCFile = __getattr__("CCFile")
     return CCFile.CC2NRadar(
-        CCFile.CCBaseData(filename, station_lon, station_lat, station_alt)
-    ).ToPRD(effective_earth_radius=effective_earth_radius)
+        CCFile.CCBaseData(filename, station_lon, station_lat, station_alt, fields=fields)
+    ).ToPRD(effective_earth_radius=effective_earth_radius, sweeps=sweeps, max_elevation=max_elevation)
 
-def read_SC(filename, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None):
+def read_SC(filename, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+            fields=None, sweeps=None, max_elevation=None):
     """
     :param filename:  radar basedata filename
     :param station_lon:  radar station longitude //units: degree east
     :param station_lat:  radar station latitude //units:degree north
     :param station_alt:  radar station altitude //units: meters
+    :param effective_earth_radius:  optional effective earth radius used for beam geometry //units: meters
+    :param fields:  optional field names to decode, e.g. ["dBZ", "ZDR"]; moments that are not
+        requested are skipped before scaling. None decodes every moment.
+    :param sweeps:  optional sweep indices to keep, numbered as in the full volume
+    :param max_elevation:  optional highest fixed angle to keep //units: degree
     """
     SCFile = __getattr__("SCFile")
     return SCFile.SC2NRadar(
-        SCFile.SCBaseData(filename, station_lon, station_lat, station_alt)
-    ).ToPRD(effective_earth_radius=effective_earth_radius)
+        SCFile.SCBaseData(filename, station_lon, station_lat, station_alt, fields=fields)
+    ).ToPRD(effective_earth_radius=effective_earth_radius, sweeps=sweeps, max_elevation=max_elevation)
 
-def read_WSR98D(filename, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None):
+def read_WSR98D(filename, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+                fields=None, sweeps=None, max_elevation=None):
     """
     :param filename:  radar basedata filename
     :param station_lon:  radar station longitude //units: degree east
     :param station_lat:  radar station latitude //units:degree north
     :param station_alt:  radar station altitude //units: meters
+    :param effective_earth_radius:  optional effective earth radius used for beam geometry //units: meters
+    :param fields:  optional field names to decode, e.g. ["dBZ", "ZDR"]; moments that are not
+        requested are skipped before scaling. None decodes every moment.
+    :param sweeps:  optional sweep indices to keep, numbered as in the full volume
+    :param max_elevation:  optional highest fixed angle to keep //units: degree
     """
     WSR98DFile = __getattr__("WSR98DFile")
     return WSR98DFile.WSR98D2NRadar(
-        WSR98DFile.WSR98DBaseData(filename, station_lon, station_lat, station_alt)
+        WSR98DFile.WSR98DBaseData(filename, station_lon, station_lat, station_alt, fields=fields,
+                                  sweeps=sweeps, max_elevation=max_elevation)
     ).ToPRD(effective_earth_radius=effective_earth_radius)
 
-def read_PA(filename, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None):
+def read_PA(filename, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+            fields=None, sweeps=None, max_elevation=None):
     """
     :param filename:  radar basedata filename
     :param station_lon:  radar station longitude //units: degree east
     :param station_lat:  radar station latitude //units:degree north
     :param station_alt:  radar station altitude //units: meters
+    :param effective_earth_radius:  optional effective earth radius used for beam geometry //units: meters
+    :param fields:  optional field names to decode, e.g. ["dBZ", "ZDR"]; moments that are not
+        requested are skipped before scaling. None decodes every moment.
+    :param sweeps:  optional sweep indices to keep, numbered as in the full volume
+    :param max_elevation:  optional highest fixed angle to keep //units: degree
     """
     PAFile = __getattr__("PAFile")
     return PAFile.PA2NRadar(
-        PAFile.PABaseData(filename, station_lon, station_lat, station_alt)
+        PAFile.PABaseData(filename, station_lon, station_lat, station_alt, fields=fields)
+    ).ToPRD(effective_earth_radius=effective_earth_radius, sweeps=sweeps, max_elevation=max_elevation)
+
+
+def read_NEXRAD(filename, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+                fields=None, sweeps=None, max_elevation=None, workers=None):
+    """
+    :param filename:  NEXRAD Level II archive filename (AR2V MSG31 or legacy ARCHIVE2 MSG1)
+    :param station_lon:  radar station longitude //units: degree east
+    :param station_lat:  radar station latitude //units:degree north
+    :param station_alt:  radar station altitude //units: meters
+    :param effective_earth_radius:  optional effective earth radius used for beam geometry //units: meters
+    :param fields:  optional field names to decode, e.g. ["dBZ", "ZDR"]; moments that are not
+        requested are skipped before scaling. None decodes every moment.
+    :param sweeps:  optional sweep indices to keep, numbered as in the full volume
+    :param max_elevation:  optional highest fixed angle to keep //units: degree
+    :param workers:  threads decompressing bzip2 LDM records; None lets the executor choose
+    """
+    NEXRADLevel2File = __getattr__("NEXRADLevel2File")
+    return NEXRADLevel2File.NEXRAD2NRadar(
+        NEXRADLevel2File.NEXRADLevel2BaseData(filename, station_lon, station_lat, station_alt, fields=fields,
+                                              sweeps=sweeps, max_elevation=max_elevation, workers=workers)
     ).ToPRD(effective_earth_radius=effective_earth_radius)
 
 
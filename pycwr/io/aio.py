@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+asyncio front end of the radar readers used by ``aread_auto`` and ``aread_metadata``.
+
+Reads run in a bounded thread pool (file I/O, zlib/bz2 and the numpy decoding release the GIL)
+and every event loop admits at most ``PYCWR_ASYNC_WORKERS`` reads at once (or the limit of a
+semaphore passed by the caller), so an ingest service gets back-pressure instead of an
+ever-growing executor queue. A concurrency slot is only given back once the worker thread has
+really finished: cancelling the awaiting task drops a queued read at once, while a read that
+already started completes in the background and its result is discarded.
+"""
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_ASYNC_WORKERS = int(os.environ.get("PYCWR_ASYNC_WORKERS", str(min(8, os.cpu_count() or 1))))
+
+_executor = None
+_executor_lock = threading.Lock()
+_loop_semaphores = weakref.WeakKeyDictionary()
+
+
+def _default_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_ASYNC_WORKERS, thread_name_prefix="pycwr-read")
+        return _executor
+
+
+def _loop_semaphore(loop):
+    semaphore = _loop_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _loop_semaphores[loop] = asyncio.Semaphore(DEFAULT_ASYNC_WORKERS)
+    return semaphore
+
+
+def _release_threadsafe(loop, semaphore):
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:
+        # the loop was closed while the read was still running
+        pass
+
+
+async def run_read(function, *args, executor=None, semaphore=None, **kwargs):
+    """
+    Run a blocking reader call in an executor under a concurrency limit.
+    :param function: blocking callable, e.g. ``read_auto``
+    :param executor: concurrent.futures executor; None uses the shared pycwr read thread pool
+    :param semaphore: asyncio.Semaphore shared by the reads that should be limited together;
+        None uses one semaphore per event loop sized by ``PYCWR_ASYNC_WORKERS``
+    :return: the result of ``function(*args, **kwargs)``
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _loop_semaphore(loop) if semaphore is None else semaphore
+    executor = _default_executor() if executor is None else executor
+    await semaphore.acquire()
+    try:
+        future = executor.submit(function, *args, **kwargs)
+    except BaseException:
+        semaphore.release()
+        raise
+    future.add_done_callback(lambda _: _release_threadsafe(loop, semaphore))
+    # cancelling the wrapper cancels the executor future while it is still queued
+    return await asyncio.wrap_future(future, loop=loop)
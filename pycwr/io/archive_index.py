@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent SQLite catalog of radar archive trees.
+
+``ArchiveIndex`` records the path, station, scan time, size, mtime and detected format of
+every file below the indexed roots. ``update`` is incremental: a directory is only listed
+again when its own mtime changed (files were added, removed or renamed in it); unchanged
+directories contribute their known subdirectories from the catalog, so a rescan of a large
+archive costs one ``stat`` per directory instead of one per file. Files rewritten in place
+keep their directory mtime and are therefore not noticed, which suits write-once archives.
+Queries by time window, station and directory use the SQLite indexes.
+"""
+import contextlib
+import datetime
+import fnmatch
+import os
+import re
+import sqlite3
+import time
+
+INDEX_FORMAT_VERSION = 1
+# Directories modified this recently are rescanned on the next update, since files may
+# still be arriving within the same mtime tick.
+DIRECTORY_SETTLE_SECONDS = 2.0
+
+_FILENAME_TIME_RE = re.compile(r"(\d{14})")
+_STATION_CODE_RE = re.compile(r"(Z[A-Z]?\d{3,4})", re.IGNORECASE)
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)",
+    "CREATE TABLE IF NOT EXISTS directories (path TEXT PRIMARY KEY, parent TEXT, mtime_ns INTEGER)",
+    "CREATE INDEX IF NOT EXISTS directories_parent ON directories (parent)",
+    "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, directory TEXT NOT NULL, name TEXT NOT NULL, "
+    "station TEXT, scan_time REAL, size INTEGER, mtime_ns INTEGER, format TEXT)",
+    "CREATE INDEX IF NOT EXISTS files_time ON files (scan_time)",
+    "CREATE INDEX IF NOT EXISTS files_station_time ON files (station, scan_time)",
+    "CREATE INDEX IF NOT EXISTS files_directory_time ON files (directory, scan_time)",
+)
+
+
+def _to_epoch(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH).total_seconds()
+
+
+def _from_epoch(value):
+    return None if value is None else _EPOCH + datetime.timedelta(seconds=value)
+
+
+def _subtree_bounds(directory):
+    """Key range holding every path strictly below ``directory``."""
+    prefix = directory.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+def _describe_file(path, name, detect_format):
+    """Return (station, scan time, format) of one file from its name and, when needed, its headers."""
+    match = _STATION_CODE_RE.search(name)
+    station = match.group(1).upper() if match is not None else None
+    scan_time = None
+    match = _FILENAME_TIME_RE.search(name)
+    if match is not None:
+        try:
+            scan_time = datetime.datetime.strptime(match.group(1), "%Y%m%d%H%M%S")
+        except ValueError:
+            scan_time = None
+    file_format = None
+    if not detect_format:
+        return station, scan_time, file_format
+    from . import read_metadata
+    from .util import radar_format
+
+    try:
+        file_format = radar_format(path)
+    except Exception:
+        file_format = None
+    # only files recognised as radar data have headers worth probing
+    if file_format is not None and (station is None or scan_time is None):
+        try:
+            metadata = read_metadata(path)
+        except Exception:
+            metadata = {}
+        if station is None and metadata.get("site_code"):
+            station = str(metadata["site_code"]).strip().upper() or None
+        if scan_time is None:
+            scan_time = metadata.get("start_time")
+    return station, scan_time, file_format
+
+
+class ArchiveIndex(object):
+    """Incrementally updated SQLite catalog of the radar files below a set of directories."""
+
+    def __init__(self, path):
+        """
+        :param path: SQLite database file; created on first use
+        """
+        self.path = os.path.abspath(os.fspath(path))
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with self._connect() as db:
+            for statement in _SCHEMA:
+                db.execute(statement)
+            row = db.execute("SELECT value FROM info WHERE key = 'format'").fetchone()
+            if row is None:
+                db.execute("INSERT INTO info (key, value) VALUES ('format', ?)", (str(INDEX_FORMAT_VERSION),))
+            elif int(row[0]) != INDEX_FORMAT_VERSION:
+                raise ValueError("Archive index %s uses an unsupported format version %s." % (self.path, row[0]))
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # one connection per call, so the index can be shared by threads and processes
+        db = sqlite3.connect(self.path, timeout=60.0)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def update(self, roots, detect_format=True):
+        """
+        Bring the catalog of ``roots`` up to date, listing only directories whose mtime changed.
+        :param roots: directories to index, recursively; hidden entries are skipped and
+            directory symlinks are not followed
+        :param detect_format: probe new files with ``radar_format`` (and ``read_metadata`` for radar
+            files whose names carry no station or scan time); False indexes names and stats only
+        :return: dict with the counts directories_scanned, files_added, files_updated and files_removed
+        """
+        if isinstance(roots, (str, bytes, os.PathLike)):
+            roots = [roots]
+        stats = {"directories_scanned": 0, "files_added": 0, "files_updated": 0, "files_removed": 0}
+        with self._connect() as db:
+            for root in roots:
+                root = os.path.abspath(os.fspath(root))
+                if not os.path.isdir(root):
+                    self._forget_directory(db, root, stats)
+                    continue
+                pending = [root]
+                while pending:
+                    directory = pending.pop()
+                    try:
+                        mtime_ns = os.stat(directory).st_mtime_ns
+                    except OSError:
+                        self._forget_directory(db, directory, stats)
+                        continue
+                    row = db.execute("SELECT mtime_ns FROM directories WHERE path = ?", (directory,)).fetchone()
+                    if row is not None and row[0] == mtime_ns:
+                        pending.extend(path for path, in db.execute(
+                            "SELECT path FROM directories WHERE parent = ?", (directory,)))
+                        continue
+                    pending.extend(self._scan_directory(db, directory, mtime_ns, detect_format, stats))
+                    # commit per directory so an interrupted scan of a huge tree keeps its progress
+                    db.commit()
+        return stats
+
+    def _scan_directory(self, db, directory, mtime_ns, detect_format, stats):
+        """List one directory, sync its files and child directories, and return the child directories."""
+        subdirectories = []
+        files = {}
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            self._forget_directory(db, directory, stats)
+            return []
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    files[entry.path] = (entry.name, stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                continue
+        known = dict((path, (size, file_mtime)) for path, size, file_mtime in db.execute(
+            "SELECT path, size, mtime_ns FROM files WHERE directory = ?", (directory,)))
+        removed = [(path,) for path in known if path not in files]
+        db.executemany("DELETE FROM files WHERE path = ?", removed)
+        stats["files_removed"] += len(removed)
+        rows = []
+        for path, (name, size, file_mtime) in files.items():
+            if known.get(path) == (size, file_mtime):
+                continue
+            station, scan_time, file_format = _describe_file(path, name, detect_format)
+            rows.append((path, directory, name, station, _to_epoch(scan_time), size, file_mtime, file_format))
+            stats["files_updated" if path in known else "files_added"] += 1
+        db.executemany("INSERT OR REPLACE INTO files (path, directory, name, station, scan_time, size, mtime_ns, "
+                       "format) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        current = set(subdirectories)
+        for path, in db.execute("SELECT path FROM directories WHERE parent = ?", (directory,)).fetchall():
+            if path not in current:
+                self._forget_directory(db, path, stats)
+        settled = time.time() - mtime_ns / 1e9 > DIRECTORY_SETTLE_SECONDS
+        parent = os.path.dirname(directory)
+        db.execute("INSERT OR REPLACE INTO directories (path, parent, mtime_ns) VALUES (?, ?, ?)",
+                   (directory, parent if parent != directory else None, mtime_ns if settled else None))
+        stats["directories_scanned"] += 1
+        return subdirectories
+
+    @staticmethod
+    def _forget_directory(db, directory, stats):
+        """Drop a directory and everything catalogued below it."""
+        low, high = _subtree_bounds(directory)
+        removed = db.execute("DELETE FROM files WHERE directory = ? OR (directory >= ? AND directory < ?)",
+                             (directory, low, high)).rowcount
+        stats["files_removed"] += max(removed, 0)
+        db.execute("DELETE FROM directories WHERE path = ? OR (path >= ? AND path < ?)", (directory, low, high))
+
+    def query(self, start=None, end=None, stations=None, directories=None, root=None, pattern=None,
+              undated=False):
+        """
+        Select catalogued files.
+        :param start: optional earliest scan time, inclusive (naive UTC datetime or ISO string)
+        :param end: optional latest scan time, inclusive
+        :param stations: optional station codes, e.g. ["Z9250"]
+        :param directories: optional directories whose own files are returned (not their subdirectories)
+        :param root: optional directory whose whole subtree is returned
+        :param pattern: optional shell pattern matched against file names, e.g. "*.bin*"
+        :param undated: True returns only the files without a scan time
+        :return: list of dicts with path, directory, name, station, scan_time (datetime or None),
+            size, mtime (epoch seconds) and format, ordered by scan time then path; files without a
+            scan time come first and are left out whenever a time window is given
+        """
+        clauses = []
+        params = []
+        if start is not None:
+            clauses.append("scan_time >= ?")
+            params.append(_to_epoch(start))
+        if end is not None:
+            clauses.append("scan_time <= ?")
+            params.append(_to_epoch(end))
+        if undated:
+            clauses.append("scan_time IS NULL")
+        if stations is not None:
+            stations = [str(station).upper() for station in stations]
+            clauses.append("station IN (%s)" % ",".join("?" * len(stations)))
+            params.extend(stations)
+        if directories is not None:
+            directories = [os.path.abspath(os.fspath(directory)) for directory in directories]
+            clauses.append("directory IN (%s)" % ",".join("?" * len(directories)))
+            params.extend(directories)
+        if root is not None:
+            root = os.path.abspath(os.fspath(root))
+            low, high = _subtree_bounds(root)
+            clauses.append("(directory = ? OR (directory >= ? AND directory < ?))")
+            params.extend([root, low, high])
+        sql = "SELECT path, directory, name, station, scan_time, size, mtime_ns, format FROM files"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY scan_time, path"
+        with self._connect() as db:
+            rows = db.execute(sql, params).fetchall()
+        return [
+            {
+                "path": path,
+                "directory": directory,
+                "name": name,
+                "station": station,
+                "scan_time": _from_epoch(scan_time),
+                "size": size,
+                "mtime": mtime_ns / 1e9,
+                "format": file_format,
+            }
+            for path, directory, name, station, scan_time, size, mtime_ns, file_format in rows
+            if pattern is None or fnmatch.fnmatchcase(name, pattern)
+        ]
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Parallel decoding of many radar volumes used by ``read_many``.
+
+Each worker process decodes one volume with ``read_auto`` and copies its flattened arrays
+and gate geometry (see ``volume_cache._volume_arrays``) into ``multiprocessing.shared_memory`` blocks. Only the
+block names and a small JSON-like header travel back through the pool; the parent maps the
+blocks and rebuilds the ``PRD`` around them without copying the field data.
+"""
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from ..core.shared_arrays import SharedBuffer
+from .volume_cache import _rebuild_prd, _volume_arrays
+
+# Windows frees a block as soon as the worker closes its handle, before the parent can map it.
+SHARED_MEMORY_RESULTS = os.name == "posix"
+
+
+def _export_arrays(arrays):
+    """Copy arrays into new shared memory blocks and return {name: (block name, shape, dtype)}."""
+    exported = {}
+    blocks = []
+    try:
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+            view[...] = array
+            del view
+            exported[name] = (block.name, array.shape, array.dtype.str)
+    except BaseException:
+        for block in blocks:
+            block.close()
+            block.unlink()
+        raise
+    for block in blocks:
+        # the parent unlinks the blocks once it has mapped them
+        block.close()
+    return exported
+
+
+def _import_arrays(exported):
+    """Map exported blocks into this process and unlink their names; returns {name: ndarray}."""
+    arrays = {}
+    try:
+        for name, (block_name, shape, dtype) in exported.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            # the mapping stays valid after unlink and is released with the last array using it
+            block.unlink()
+            arrays[name] = np.asarray(SharedBuffer(block, tuple(shape), np.dtype(dtype), attachable=False))
+    except BaseException:
+        _discard_arrays({name: item for name, item in exported.items() if name not in arrays})
+        raise
+    return arrays
+
+
+def _discard_arrays(exported):
+    for block_name, _, _ in exported.values():
+        try:
+            block = shared_memory.SharedMemory(name=block_name)
+        except FileNotFoundError:
+            continue
+        block.close()
+        block.unlink()
+
+
+def _read_worker(filename, options):
+    from . import read_auto
+
+    prd = read_auto(filename, **options)
+    if not SHARED_MEMORY_RESULTS:
+        return None, prd
+    header, arrays = _volume_arrays(prd, geometry=True)
+    return header, _export_arrays(arrays)
+
+
+def read_many(paths, workers=None, fields=None, sweeps=None, max_elevation=None, effective_earth_radius=None):
+    """
+    Decode many radar volumes across a process pool.
+    :param paths: radar basedata filenames
+    :param workers: number of worker processes; None uses every CPU, 1 reads in this process
+    :param fields: optional field names to decode, e.g. ["dBZ", "ZDR"]; None decodes every moment
+    :param sweeps: optional sweep indices to keep, numbered as in the full volume
+    :param max_elevation: optional highest fixed angle to keep //units: degree
+    :param effective_earth_radius: optional effective earth radius used for beam geometry //units: meters
+    :return: list of PRD in the order of ``paths``; field arrays of volumes decoded by workers live
+        in shared memory blocks that are released with the last array using them
+    """
+    paths = [os.fspath(path) for path in paths]
+    options = {"fields": fields, "sweeps": sweeps, "max_elevation": max_elevation,
+               "effective_earth_radius": effective_earth_radius}
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(int(workers), len(paths))
+    if workers < 1 and paths:
+        raise ValueError("workers must be a positive integer.")
+    if workers <= 1:
+        from . import read_auto
+        return [read_auto(path, **options) for path in paths]
+    if SHARED_MEMORY_RESULTS:
+        # workers register their blocks with the parent's tracker, which removes any block
+        # left behind if this process dies before mapping it
+        resource_tracker.ensure_running()
+    executor_kwargs = {"max_workers": workers}
+    if os.name == "posix":
+        executor_kwargs["mp_context"] = mp.get_context("fork")
+    with ProcessPoolExecutor(**executor_kwargs) as executor:
+        futures = [executor.submit(_read_worker, path, options) for path in paths]
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append((future.result(), None))
+            except Exception as exc:
+                outcomes.append((None, exc))
+    error = next((exc for _, exc in outcomes if exc is not None), None)
+    if error is not None:
+        for result, _ in outcomes:
+            if result is not None and result[0] is not None:
+                _discard_arrays(result[1])
+        raise error
+    results = [result for result, _ in outcomes]
+    volumes = []
+    try:
+        for header, payload in results:
+            if header is None:
+                volumes.append(payload)
+            else:
+                volumes.append(_rebuild_prd(header, _import_arrays(payload).__getitem__,
+                                            effective_earth_radius=effective_earth_radius))
+    except BaseException:
+        # blocks of the volumes not imported yet would otherwise stay in shared memory
+        for header, payload in results[len(volumes) + 1:]:
+            if header is not None:
+                _discard_arrays(payload)
+        raise
+    return volumes
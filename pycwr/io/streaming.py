@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Sweep-by-sweep decoding of WSR98D and PA volumes, including files that are still being written.
+
+``iter_sweeps`` walks the radial and moment headers as the bytes arrive and hands each cut to the
+regular reader as soon as its last radial (radial state 2 or 4) has been read, so the lowest tilt
+reaches downstream processing long before the volume file is complete.
+"""
+import time
+from importlib import import_module
+
+import numpy as np
+
+from .util import _open_for_read, _raise_truncated, _read_exact, _validate_count
+
+# Reader module, base-data class and bridge class of every streamable format.
+STREAM_FORMATS = {
+    "WSR98D": ("WSR98DFile", "WSR98DBaseData", "WSR98D2NRadar"),
+    "PA": ("PAFile", "PABaseData", "PA2NRadar"),
+}
+_COMPRESSED_MAGIC = (b"\x1f\x8b", b"BZh", b"PK\x03\x04")
+
+
+class _FollowFile(object):
+    """
+    File-like reader over a file or stream that may still grow.
+    ``read`` returns fewer bytes than requested only once no new data arrived for ``timeout``
+    seconds (immediately when ``timeout`` is None).
+    """
+
+    def __init__(self, fh, timeout=None, poll_interval=1.0):
+        self.fh = fh
+        self.timeout = timeout
+        self.poll_interval = float(poll_interval)
+        self._pushback = b""
+
+    def unread(self, data):
+        self._pushback = bytes(data) + self._pushback
+
+    def read(self, size):
+        chunks = [self._pushback[:size]]
+        self._pushback = self._pushback[size:]
+        remaining = size - len(chunks[0])
+        idle_since = None
+        while remaining > 0:
+            data = self.fh.read(remaining)
+            if data:
+                chunks.append(data)
+                remaining -= len(data)
+                idle_since = None
+                continue
+            if self.timeout is None:
+                break
+            now = time.monotonic()
+            if idle_since is None:
+                idle_since = now
+            elif now - idle_since >= self.timeout:
+                break
+            time.sleep(self.poll_interval)
+        return b"".join(chunks)
+
+
+def _open_source(source, timeout, poll_interval):
+    """Return (follow reader, whether the underlying file must be closed here)."""
+    if hasattr(source, "read"):
+        return _FollowFile(source, timeout, poll_interval), False
+    with open(source, "rb") as fh:
+        magic = fh.read(4)
+    if magic.startswith(_COMPRESSED_MAGIC):
+        # compressed archives are only written once complete, so they are never followed
+        return _FollowFile(_open_for_read(source), None, poll_interval), True
+    return _FollowFile(open(source, "rb"), timeout, poll_interval), True
+
+
+def _detect_stream_format(fid):
+    prefix = fid.read(12)
+    fid.unread(prefix)
+    # PA files share the RSTM prefix with WSR98D, as in ``radar_format``
+    if prefix[8:12] == b"\x10\x00\x00\x00":
+        return "PA"
+    if prefix[:4] == b"RSTM":
+        return "WSR98D"
+    raise TypeError("iter_sweeps supports WSR98D and PA base data only.")
+
+
+def _read_radials(fid, radial_dtype, moment_dtype, max_moments, max_moment_bytes, context):
+    """Yield (radial header record, raw radial bytes) for each complete radial until the input ends."""
+    radial_size = radial_dtype.itemsize
+    moment_size = moment_dtype.itemsize
+    while True:
+        head = fid.read(radial_size)
+        if not head:
+            return
+        if len(head) != radial_size:
+            _raise_truncated("%s radial header" % context, expected=radial_size, actual=len(head))
+        header = np.frombuffer(head, dtype=radial_dtype)[0]
+        parts = [head]
+        moment_num = _validate_count("%s MomentNumber" % context, int(header["MomentNumber"]),
+                                     minimum=0, maximum=max_moments)
+        for _ in range(moment_num):
+            moment_head = _read_exact(fid, moment_size, "%s moment header" % context)
+            length = _validate_count("%s moment length" % context,
+                                     int(np.frombuffer(moment_head, dtype=moment_dtype)["Length"][0]),
+                                     minimum=0, maximum=max_moment_bytes)
+            parts.append(moment_head)
+            parts.append(_read_exact(fid, length, "%s moment payload" % context))
+        yield header, b"".join(parts)
+
+
+class _SweepAssembler(object):
+    """
+    Turn completed raw cuts into sweeps in volume order.
+
+    WSR98D reflectivity-only cuts are held until the Doppler-only cut they pair with (see
+    ``_pair_wsr98d_split_cuts``) arrives, or until no later cut of the task is close enough in
+    elevation to pair with them; sweeps are released once no held cut can precede them.
+    """
+
+    def __init__(self, cut_elevations, describe=None, elevation_tolerance=0.0):
+        self.cut_elevations = np.asarray(cut_elevations, dtype=np.float64)
+        self.describe = describe
+        self.elevation_tolerance = float(elevation_tolerance)
+        self.pending = {}
+        self.ready = []
+
+    def _pairable_later(self, cut, last_seen):
+        later = self.cut_elevations[last_seen + 1:]
+        return bool(np.any(np.abs(later - self.cut_elevations[cut]) <= self.elevation_tolerance))
+
+    def add(self, cut, payload):
+        """Register a completed cut and return the (cuts, payload) groups that can be released."""
+        descriptor = self.describe(payload, cut) if self.describe is not None else None
+        if descriptor is not None and descriptor["reflectivity_only"]:
+            self.pending[cut] = payload
+        elif descriptor is not None and descriptor["doppler_only"]:
+            match = None
+            for candidate in sorted(self.pending, reverse=True):
+                if abs(self.cut_elevations[candidate] - self.cut_elevations[cut]) <= self.elevation_tolerance:
+                    match = candidate
+                    break
+            if match is None:
+                self.ready.append((cut, (cut,), payload))
+            else:
+                self.ready.append((cut, (match, cut), self.pending.pop(match) + payload))
+        else:
+            self.ready.append((cut, (cut,), payload))
+        for held in sorted(self.pending):
+            if not self._pairable_later(held, cut):
+                self.ready.append((held, (held,), self.pending.pop(held)))
+        return self._release()
+
+    def flush(self):
+        """Release every remaining cut once the input has ended."""
+        for held in sorted(self.pending):
+            self.ready.append((held, (held,), self.pending.pop(held)))
+        return self._release()
+
+    def _release(self):
+        self.ready.sort(key=lambda item: item[0])
+        first_held = min(self.pending) if self.pending else np.inf
+        released = []
+        while self.ready and self.ready[0][0] < first_held:
+            released.append(self.ready.pop(0)[1:])
+        return released
+
+
+def _wsr98d_describer(module):
+    def describe(payload, cut):
+        radial_header, _, moment_index = module._index_wsr98d_radials(payload)
+        signatures, ray_signature = module._wsr98d_ray_signatures(radial_header.size, moment_index)
+        descriptor = module._describe_wsr98d_cuts([signatures[ray_signature[0]]], [0.0])[0]
+        descriptor["index"] = cut
+        return descriptor
+    return describe
+
+
+def iter_sweeps(source, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+                fields=None, timeout=None, poll_interval=1.0):
+    """
+    Decode a WSR98D or PA volume sweep by sweep while its radials arrive.
+    If radials mark their cut ends and the input stops (or times out) before the volume-end radial,
+    the completed sweeps are yielded and then ValueError reports the truncated cut.
+    :param source: radar basedata filename or a binary file-like stream (e.g. a socket file)
+    :param station_lon:  radar station longitude //units: degree east
+    :param station_lat:  radar station latitude //units:degree north
+    :param station_alt:  radar station altitude //units: meters
+    :param effective_earth_radius:  optional effective earth radius used for beam geometry //units: meters
+    :param fields:  optional field names to decode, e.g. ["dBZ", "ZDR"]; None decodes every moment
+    :param timeout: seconds to wait for a growing file to receive more bytes before the volume is
+        treated as ended; None reads the input as it is now //units: s
+    :param poll_interval: delay between checks for new bytes while waiting //units: s
+    :return: generator of (sweep index, single-sweep PRD) in volume order; sweep indices match
+        ``read_auto`` on the complete file
+    """
+    fid, owned = _open_source(source, timeout, poll_interval)
+    try:
+        radar_type = _detect_stream_format(fid)
+        module_name, reader_name, bridge_name = STREAM_FORMATS[radar_type]
+        module = import_module(".%s" % module_name, __package__)
+        reader_cls = getattr(module, reader_name)
+        bridge_cls = getattr(module, bridge_name)
+        reader = reader_cls.__new__(reader_cls)
+        reader.fid = fid
+        header = reader._parse_BaseDataHeader()
+        cut_config = header["CutConfig"]
+        if radar_type == "WSR98D":
+            assembler = _SweepAssembler(cut_config["Elevation"], _wsr98d_describer(module),
+                                        module.SPLIT_CUT_ELEVATION_TOLERANCE)
+            radials = _read_radials(fid, module._WSR98D_RADIAL_HEADER_DTYPE, module._WSR98D_MOMENT_HEADER_DTYPE,
+                                    module.MAX_WSR98D_MOMENTS_PER_RADIAL, module.MAX_WSR98D_MOMENT_DATA_BYTES,
+                                    "WSR98D")
+        else:
+            assembler = _SweepAssembler(cut_config["Elevation"])
+            radials = _read_radials(fid, module._PA_RADIAL_HEADER_DTYPE, module._PA_MOMENT_HEADER_DTYPE,
+                                    module.MAX_PA_MOMENTS_PER_RADIAL, module.MAX_PA_MOMENT_DATA_BYTES, "PA")
+
+        def build(cuts, payload):
+            cut_header = dict(header, CutConfig=cut_config[list(cuts)],
+                              TaskConfig=dict(header["TaskConfig"], CutNumber=len(cuts)))
+            cut_reader = reader_cls._from_radial_payload(cut_header, payload, station_lon, station_lat,
+                                                         station_alt, fields=fields)
+            return bridge_cls(cut_reader).ToPRD(effective_earth_radius=effective_earth_radius)
+
+        sweep = 0
+        cut = 0
+        parts = []
+        elevation_number = None
+        marks_cut_end = False
+        ended = False
+        for radial_header, raw in radials:
+            state = int(radial_header["RadialState"])
+            released = []
+            # writers that never mark cut ends still restart radial numbering for every cut
+            starts_cut = state in (0, 3) or int(radial_header["RadialNumber"]) == 1 or \
+                int(radial_header["ElevationNumber"]) != elevation_number
+            if parts and starts_cut:
+                released += assembler.add(cut, b"".join(parts))
+                parts, cut = [], cut + 1
+            if cut >= len(cut_config):
+                raise ValueError("%s volume holds more cuts than its CutNumber." % radar_type)
+            parts.append(raw)
+            elevation_number = int(radial_header["ElevationNumber"])
+            if state in (2, 4):
+                marks_cut_end = True
+                released += assembler.add(cut, b"".join(parts))
+                parts, cut = [], cut + 1
+            for cuts, payload in released:
+                yield sweep, build(cuts, payload)
+                sweep += 1
+            if state == 4 or cut >= len(cut_config):
+                ended = True
+                break
+        released = assembler.add(cut, b"".join(parts)) if parts and not marks_cut_end else []
+        for cuts, payload in released + assembler.flush():
+            yield sweep, build(cuts, payload)
+            sweep += 1
+        if marks_cut_end and not ended:
+            # the input stopped before the volume-end radial, so the current cut is missing radials
+            _raise_truncated("%s cut %d" % (radar_type, cut + 1))
+    finally:
+        if owned:
+            fid.fh.close()
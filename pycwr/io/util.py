@@ -1,15 +1,26 @@
 import struct
 import bz2
+import contextlib
+import contextvars
 import gzip
+import io
+import mmap
 import zipfile
 import datetime
 import os
+import time
+import uuid
 import numpy as np
 from ..configure.location_config import radar_info
 
 
 DEFAULT_MAX_READ_BYTES = int(os.environ.get("PYCWR_MAX_READ_BYTES", str(256 * 1024 * 1024)))
 DEFAULT_CHUNK_SIZE = 1024 * 1024
+# Set PYCWR_MMAP_READS=0 to copy uncompressed files into memory instead of mapping them.
+MMAP_READS = os.environ.get("PYCWR_MMAP_READS", "1") != "0"
+# Files modified this recently may still be receiving writes, so they are copied instead of
+# mapped: truncating a mapped file turns the next access into SIGBUS rather than a ValueError.
+MMAP_SETTLE_SECONDS = 2.0
 
 
 def _validate_max_read_bytes(max_bytes=None):
@@ -48,6 +59,43 @@ def _unpack_structure(string, structure):
     return dict(zip([i[0] for i in structure], lst))
 
 
+_STRUCT_NUMPY_CODES = {
+    'b': 'i1', 'B': 'u1', 'h': '<i2', 'H': '<u2',
+    'i': '<i4', 'I': '<u4', 'q': '<i8', 'Q': '<u8', 'f': '<f4', 'd': '<f8',
+}
+
+
+def _structure_dtype(structure):
+    """Return the packed little-endian NumPy dtype matching a struct-style layout."""
+    fields = []
+    for name, code in structure:
+        if code.endswith('s'):
+            fields.append((name, 'V%d' % int(code[:-1])))
+        else:
+            fields.append((name, _STRUCT_NUMPY_CODES[code]))
+    return np.dtype(fields)
+
+
+def _gather_blocks(buf, offsets, length):
+    """Copy equally sized byte blocks at arbitrary offsets into a ``(n, length)`` uint8 array."""
+    offsets = np.asarray(offsets, dtype=np.int64).reshape(-1)
+    length = int(length)
+    if offsets.size == 0 or length == 0:
+        return np.zeros((offsets.size, length), dtype=np.uint8)
+    raw = np.frombuffer(buf, dtype=np.uint8)
+    if offsets.min() < 0 or offsets.max() + length > raw.size:
+        raise ValueError("Record offsets point outside the available buffer.")
+    windows = np.lib.stride_tricks.sliding_window_view(raw, length)
+    return windows[offsets]
+
+
+def _gather_records(buf, offsets, dtype):
+    """Copy fixed-size records found at arbitrary byte offsets into one structured array."""
+    dtype = np.dtype(dtype)
+    blocks = _gather_blocks(buf, offsets, dtype.itemsize)
+    return blocks.view(dtype).reshape(-1)
+
+
 class _ArchiveMemberFile:
     """Wrap an archive member stream and keep the parent archive open."""
 
@@ -99,7 +147,171 @@ def _open_single_member_zip(filename):
         archive.close()
         raise
 
-def _prepare_for_read(filename):
+class _DecodedSource(object):
+    """
+    Decompressed bytes of one file, pulled from the stream on demand and shared by every open.
+
+    Only bytes some caller actually read are kept. Seeking to the end, as format detection
+    does to learn the size, counts the remaining bytes without storing them; a later read past
+    the kept prefix reopens the file and decompresses again from there.
+    """
+
+    def __init__(self, stream, opener):
+        """
+        :param stream: open decompressing stream of the file
+        :param opener: callable returning a fresh such stream
+        """
+        self._opener = opener
+        self._stream = stream
+        self._data = bytearray()
+        self._size = None
+
+    def fill(self, size):
+        """Decompress until ``size`` bytes are kept or the data ends; return the kept size."""
+        if self._stream is None and len(self._data) < size and len(self._data) != self._size:
+            # the stream was drained by ``size_only``: skip the kept prefix of a fresh one
+            self._stream = self._opener()
+            skip = len(self._data)
+            while skip:
+                chunk = self._stream.read(min(skip, DEFAULT_CHUNK_SIZE))
+                if not chunk:
+                    break
+                skip -= len(chunk)
+        while self._stream is not None and len(self._data) < size:
+            chunk = self._stream.read(DEFAULT_CHUNK_SIZE)
+            if not chunk:
+                self._size = len(self._data)
+                self._close_stream()
+                break
+            self._data += chunk
+        return len(self._data)
+
+    def size_only(self):
+        """Return the decompressed size, counting unread bytes without keeping them."""
+        if self._size is None:
+            total = len(self._data)
+            while True:
+                chunk = self._stream.read(DEFAULT_CHUNK_SIZE)
+                if not chunk:
+                    break
+                total += len(chunk)
+            self._size = total
+            self._close_stream()
+        return self._size
+
+    def slice(self, start, end):
+        return bytes(self._data[start:end])
+
+    def view(self, start, end):
+        return memoryview(self._data).toreadonly()[start:end]
+
+    def _close_stream(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def close(self):
+        self._close_stream()
+
+
+class _DecodedSourceFile(object):
+    """Independent read cursor over a shared ``_DecodedSource``."""
+
+    def __init__(self, source, max_bytes=None):
+        self._source = source
+        self._max_bytes = _validate_max_read_bytes(max_bytes)
+        self._pos = 0
+        self.closed = False
+
+    def _bounded_end(self, max_bytes, context):
+        """Fill at most one byte past ``max_bytes`` from the cursor and raise beyond it."""
+        end = self._source.fill(self._pos + max_bytes + 1)
+        if end - self._pos > max_bytes:
+            raise ValueError(
+                "%s exceeds the maximum allowed decoded size of %s bytes." % (context, max_bytes)
+            )
+        return max(end, self._pos)
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            end = self._bounded_end(self._max_bytes, "Decompressed radar file")
+        else:
+            end = min(self._source.fill(self._pos + size), self._pos + size)
+        data = self._source.slice(self._pos, end)
+        self._pos += len(data)
+        return data
+
+    def remaining_view(self, max_bytes, context):
+        """
+        Return the unread bytes as a read-only memoryview without copying them.
+        :param max_bytes: raise ValueError, after keeping at most ``max_bytes + 1`` bytes, when more remain
+        """
+        end = self._bounded_end(max_bytes, context)
+        view = self._source.view(self._pos, end)
+        self._pos = end
+        return view
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_SET:
+            pos = offset
+        elif whence == os.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == os.SEEK_END:
+            pos = self._source.size_only() + offset
+        else:
+            raise ValueError("Invalid whence value: %s" % whence)
+        if pos < 0:
+            raise ValueError("Negative seek position %s" % pos)
+        self._pos = pos
+        return pos
+
+    def tell(self):
+        return self._pos
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+_SHARED_DECODING = contextvars.ContextVar("pycwr_shared_decoding", default=None)
+
+
+@contextlib.contextmanager
+def _shared_decoding(filename):
+    """
+    Decompress ``filename`` at most once while the block is active.
+
+    Every ``_prepare_for_read(filename)`` inside the block returns a cursor over the same
+    decompressed buffer, filled only as far as the callers actually read and never past
+    their ``max_bytes``, so format detection followed by decoding pays for gzip/bz2/zip
+    decompression once. Detection that only needs the decompressed size does not keep the bytes.
+    Uncompressed files are unaffected and keep their memory-mapped reads.
+    """
+    if hasattr(filename, 'read'):
+        yield
+        return
+    state = {"filename": os.path.abspath(os.fspath(filename)), "source": None}
+    token = _SHARED_DECODING.set(state)
+    try:
+        yield
+    finally:
+        _SHARED_DECODING.reset(token)
+        if isinstance(state["source"], _DecodedSource):
+            state["source"].close()
+
+
+def _prepare_for_read(filename, max_bytes=None):
     """
     Return a file like object read for reading.
     Open a file for reading in binary mode with transparent decompression of
@@ -110,6 +322,9 @@ def _prepare_for_read(filename):
     filename : str or file-like object
         Filename or file-like object which will be opened.  File-like objects
         will not be examined for compressed data.
+    max_bytes : int, optional
+        Limit of one unbounded ``read()`` on a shared decompressed buffer,
+        default ``PYCWR_MAX_READ_BYTES``.
     Returns
     -------
     file_like : file-like object
@@ -118,6 +333,21 @@ def _prepare_for_read(filename):
     # if a file-like object was provided, return
     if hasattr(filename, 'read'):  # file-like object
         return filename
+    state = _SHARED_DECODING.get()
+    if state is not None and state["filename"] == os.path.abspath(os.fspath(filename)):
+        if state["source"] is None:
+            f = _open_for_read(filename)
+            if isinstance(f, io.BufferedReader):
+                state["source"] = False
+                return f
+            state["source"] = _DecodedSource(f, lambda: _open_for_read(filename))
+        if state["source"]:
+            return _DecodedSourceFile(state["source"], max_bytes)
+    return _open_for_read(filename)
+
+
+def _open_for_read(filename):
+    """Open ``filename``, transparently decompressing Gzip, BZip2 and single-file Zip archives."""
     # look for compressed data by examining the first few bytes
     fh = open(filename, 'rb')
     magic = fh.read(4)
@@ -136,6 +366,27 @@ def _prepare_for_read(filename):
     return f
 
 
+@contextlib.contextmanager
+def _open_for_replace(path):
+    """
+    Open a temporary file next to ``path`` for binary writing and move it over ``path`` once the
+    block succeeds, so readers that mapped the previous file never see it truncated.
+    """
+    path = os.path.abspath(os.fspath(path))
+    # a plain exclusive open keeps the umask-derived permissions a direct write would get
+    staging = os.path.join(os.path.dirname(path), ".%s.%s.tmp" % (os.path.basename(path), uuid.uuid4().hex))
+    try:
+        with open(staging, "xb") as handle:
+            yield handle
+        os.replace(staging, path)
+    except BaseException:
+        try:
+            os.remove(staging)
+        except OSError:
+            pass
+        raise
+
+
 def _read_exact(file_obj, size, context):
     size = int(size)
     if size < 0:
@@ -146,8 +397,57 @@ def _read_exact(file_obj, size, context):
     return data
 
 
+def _map_remaining(file_obj, context, max_bytes):
+    """
+    Memory-map the unread part of an uncompressed file on disk.
+    :return: read-only memoryview over the page cache, or None when ``file_obj`` is
+        not a plain file (compressed streams, archive members, in-memory buffers)
+    """
+    if not isinstance(file_obj, (io.BufferedReader, io.FileIO)) or not MMAP_READS:
+        return None
+    try:
+        fileno = file_obj.fileno()
+        start = file_obj.tell()
+        stat = os.fstat(fileno)
+    except (OSError, ValueError):
+        return None
+    size = stat.st_size
+    if size - start > max_bytes:
+        raise ValueError(
+            "%s exceeds the maximum allowed decoded size of %s bytes." % (context, max_bytes)
+        )
+    if size <= start:
+        return memoryview(b"")
+    # only map files that are not being written: recently modified ones are copied instead
+    if time.time() - stat.st_mtime < MMAP_SETTLE_SECONDS:
+        return None
+    try:
+        mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        current = os.fstat(fileno)
+    except (OSError, ValueError):
+        return None
+    if (current.st_size, current.st_mtime_ns) != (size, stat.st_mtime_ns):
+        mapped.close()
+        return None
+    file_obj.seek(size)
+    return memoryview(mapped)[start:]
+
+
 def _read_all(file_obj, context, max_bytes=None):
+    """
+    Read the rest of ``file_obj``.
+
+    Uncompressed files on disk are memory-mapped instead of copied, so the returned
+    read-only memoryview lets ``np.frombuffer`` view moment payloads straight from
+    the page cache. Inside ``_shared_decoding`` a compressed file yields a view of
+    the shared decompressed buffer. Everything else is read in chunks into a bytes object.
+    """
     max_bytes = _validate_max_read_bytes(max_bytes)
+    if isinstance(file_obj, _DecodedSourceFile):
+        return file_obj.remaining_view(max_bytes, context)
+    mapped = _map_remaining(file_obj, context, max_bytes)
+    if mapped is not None:
+        return mapped
     chunks = []
     total = 0
     while True:
@@ -172,6 +472,94 @@ def _validate_count(name, value, minimum=0, maximum=None):
     return value
 
 
+def _normalize_field_selection(fields):
+    """Return ``None`` (decode every moment) or the frozenset of requested field names."""
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = (fields,)
+    return frozenset(str(name) for name in fields)
+
+
+def _decode_header_text(value):
+    """Decode a fixed-width, NUL padded header string."""
+    return bytes(value).decode('UTF-8', 'ignore').strip().strip('\x00').strip()
+
+
+def _metadata_cut(elevation, log_resolution, doppler_resolution, nyquist_velocity, unambiguous_range):
+    """One row of the cut table returned by ``read_metadata``."""
+    return {
+        "elevation": float(elevation),
+        "log_resolution": float(log_resolution),
+        "doppler_resolution": float(doppler_resolution),
+        "nyquist_velocity": float(nyquist_velocity),
+        "unambiguous_range": float(unambiguous_range),
+    }
+
+
+def _probe_lowest_sweep_fields(file_obj, radial_header_dtype, moment_header_dtype, flag2product,
+                               cut_elevations, split_tolerance=None, max_moments=64, context="radar"):
+    """
+    Walk the radial and moment headers of the lowest sweep and seek past the payloads.
+    :param cut_elevations: elevations of the cut table; with ``split_tolerance`` the walk
+        continues into following cuts within that distance of the first one (split sweeps)
+    :return: moment names present in the lowest sweep, in order of first appearance
+    """
+    header_size = radial_header_dtype.itemsize
+    moment_size = moment_header_dtype.itemsize
+    cuts_to_walk = 1
+    if split_tolerance is not None:
+        elevations = np.asarray(cut_elevations, dtype=np.float64)
+        while cuts_to_walk < elevations.size and \
+                abs(elevations[cuts_to_walk] - elevations[0]) <= split_tolerance:
+            cuts_to_walk += 1
+    names = {}
+    cuts_ended = 0
+    while cuts_ended < cuts_to_walk:
+        buf = file_obj.read(header_size)
+        if len(buf) < header_size:
+            break
+        radial_header = np.frombuffer(buf, dtype=radial_header_dtype)[0]
+        moment_num = _validate_count("%s MomentNumber" % context, radial_header["MomentNumber"],
+                                     minimum=0, maximum=max_moments)
+        for _ in range(moment_num):
+            moment_header = np.frombuffer(
+                _read_exact(file_obj, moment_size, "%s moment header" % context), dtype=moment_header_dtype
+            )[0]
+            name = flag2product.get(int(moment_header["DataType"]))
+            if name is not None:
+                names[name] = None
+            file_obj.seek(_validate_count("%s moment length" % context, moment_header["Length"], minimum=0), 1)
+        if int(radial_header["RadialState"]) in (2, 4):
+            cuts_ended += 1
+    return list(names)
+
+
+def _radar_metadata(radar_format, site_name, latitude, longitude, altitude, frequency, scan_type,
+                    start_time, end_time, task_name, cuts, fields, site_code=None):
+    """
+    Assemble the header-only summary returned by ``pycwr.io.read_metadata``.
+    :param cuts: list of dicts built by ``_metadata_cut``, ordered as stored in the file
+    :param fields: moment names present in the lowest sweep
+    :return: dict
+    """
+    return {
+        "format": radar_format,
+        "site_name": site_name,
+        "site_code": site_code,
+        "latitude": None if latitude is None else float(latitude),
+        "longitude": None if longitude is None else float(longitude),
+        "altitude": None if altitude is None else float(altitude),
+        "frequency": None if frequency is None else float(frequency),
+        "scan_type": scan_type,
+        "start_time": start_time,
+        "end_time": end_time,
+        "task_name": task_name,
+        "cuts": list(cuts),
+        "fields": list(fields),
+    }
+
+
 def _validate_offset_length(buffer_size, offset, length, context):
     offset = int(offset)
     length = int(length)
@@ -205,6 +593,20 @@ def julian2date_SEC(Sec, Msec):
     scantime = datetime.datetime(1970, 1, 1) + deltSec + deltMSec
     return scantime
 
+def _epoch_to_datetimes(seconds, microseconds):
+    """Vectorized ``julian2date_SEC`` returning an object array of datetimes."""
+    stamps = np.datetime64("1970-01-01T00:00:00", "us") + \
+        np.asarray(seconds, dtype=np.int64).astype("timedelta64[s]") + \
+        np.asarray(microseconds, dtype=np.int64).astype("timedelta64[us]")
+    return stamps.astype(object)
+
+def _julian_to_datetimes(julian_date, msec):
+    """Vectorized ``julian2date`` returning an object array of datetimes."""
+    stamps = np.datetime64("1969-12-31T00:00:00", "ms") + \
+        np.asarray(julian_date, dtype=np.int64).astype("timedelta64[D]") + \
+        np.asarray(msec, dtype=np.int64).astype("timedelta64[ms]")
+    return stamps.astype(object)
+
 def get_radar_info(filename):
     """
     Look up radar site metadata from the station identifier embedded in the filename.
@@ -258,7 +660,7 @@ def radar_format(filename):
     fh = _prepare_for_read(filename)
     try:
         flag = fh.read(28)
-        if flag[:4] == b'AR2V':
+        if flag[:4] == b'AR2V' or flag[:8] == b'ARCHIVE2':
             return "NEXRAD_LEVEL2"
         # PA files share the RSTM prefix with WSR98D, but carry a distinct
         # generic type marker at bytes 8:12.
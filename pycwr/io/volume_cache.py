@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in on-disk cache of decoded radar volumes used by ``read_auto(..., cache_dir=...)``.
+
+Every entry is one directory holding a ``.npy`` file per array and a ``header.json``
+that describes how to rebuild the ``PRD``. Arrays are memory-mapped (copy-on-write)
+when an entry is reloaded, and the least recently used entries are evicted once the
+cache grows past its byte budget.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from .. import __version__
+from ..core.NRadar import PRD
+
+CACHE_FORMAT_VERSION = 2
+DEFAULT_CACHE_MAX_BYTES = int(os.environ.get("PYCWR_CACHE_MAX_BYTES", str(4 * 1024 * 1024 * 1024)))
+HEADER_NAME = "header.json"
+GEOMETRY_PARTS = ("x", "y", "z", "lon", "lat")
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def cache_key(filename, options=None):
+    """
+    Return the cache key of a radar file.
+    :param filename: radar basedata filename
+    :param options: read options that change the decoded volume (field/sweep selection, site overrides)
+    :return: hex digest built from the absolute path, size, mtime and pycwr version
+    """
+    stat = os.stat(filename)
+    identity = {
+        "path": os.path.abspath(os.fspath(filename)),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "version": __version__,
+        "cache_format": CACHE_FORMAT_VERSION,
+        "options": options or {},
+    }
+    return hashlib.sha1(json.dumps(identity, sort_keys=True, default=_json_default).encode("utf-8")).hexdigest()
+
+
+def _volume_arrays(prd, geometry=False):
+    """
+    Flatten a PRD into the constructor arrays plus a JSON-serializable header.
+    :param geometry: also store the per-sweep x/y/z/lon/lat gate coordinates
+    """
+    # read through the sweep store so sweeps that were never materialized stay raw arrays
+    sweeps = prd.fields
+    nsweeps = len(sweeps)
+    sizes = np.array([sweeps.sizes(isweep) for isweep in range(nsweeps)], dtype=np.int64).reshape(nsweeps, 2)
+    rays_per_sweep = sizes[:, 0]
+    bins_per_sweep = sizes[:, 1]
+    nrays = int(rays_per_sweep.sum())
+    max_bins = int(bins_per_sweep.max())
+    ray_end = np.cumsum(rays_per_sweep)
+    ray_start = ray_end - rays_per_sweep
+    scan_info = prd.scan_info
+    arrays = {
+        "range": sweeps.values(int(np.argmax(bins_per_sweep)), "range"),
+        "time": np.concatenate([sweeps.values(isweep, "time") for isweep in range(nsweeps)]),
+        "azimuth": np.concatenate([sweeps.values(isweep, "azimuth") for isweep in range(nsweeps)]),
+        "elevation": np.concatenate([sweeps.values(isweep, "elevation") for isweep in range(nsweeps)]),
+        "fixed_angle": scan_info["fixed_angle"].values,
+        "nyquist_velocity": scan_info["nyquist_velocity"].values,
+        "unambiguous_range": scan_info["unambiguous_range"].values,
+    }
+    field_files = []
+    field_names = list(dict.fromkeys(name for isweep in range(nsweeps) for name in sweeps.field_names(isweep)))
+    for ifield, name in enumerate(field_names):
+        present = [isweep for isweep in range(nsweeps) if sweeps.has_field(isweep, name)]
+        values = {isweep: sweeps.values(isweep, name) for isweep in present}
+        dtype = np.result_type(*[value.dtype for value in values.values()], np.float32)
+        data = np.full((nrays, max_bins), np.nan, dtype=dtype)
+        for isweep, value in values.items():
+            data[ray_start[isweep]:ray_end[isweep], :bins_per_sweep[isweep]] = value
+        key = "field_%d" % ifield
+        arrays[key] = data
+        field_files.append([name, key])
+    extended = {}
+    for ifield, (name, sweep_map) in enumerate(prd.extended_fields.items()):
+        for sweep, entry in sweep_map.items():
+            prefix = "extended_%d_%d" % (ifield, int(sweep))
+            extended.setdefault(name, {})[str(int(sweep))] = {
+                "aligned_bins": int(entry["aligned_bins"]),
+                "prefix": prefix,
+            }
+            for part in ("data", "range", "azimuth", "elevation"):
+                arrays["%s_%s" % (prefix, part)] = np.asarray(entry[part])
+            # native ray times may be python datetimes, which np.save cannot store without pickling
+            arrays["%s_time" % prefix] = np.asarray(entry["time"], dtype="datetime64[ns]")
+    if geometry:
+        for isweep in range(nsweeps):
+            for part in GEOMETRY_PARTS:
+                arrays["geometry_%d_%s" % (isweep, part)] = sweeps.values(isweep, part)
+    header = {
+        "cache_format": CACHE_FORMAT_VERSION,
+        "version": __version__,
+        "scan_type": str(scan_info["scan_type"].values),
+        "latitude": float(scan_info["latitude"].values),
+        "longitude": float(scan_info["longitude"].values),
+        "altitude": float(scan_info["altitude"].values),
+        "frequency": float(scan_info["frequency"].values),
+        "sitename": prd.sitename,
+        "metadata": prd.metadata,
+        "nrays": nrays,
+        "nsweeps": nsweeps,
+        "rays_per_sweep": rays_per_sweep.tolist(),
+        "bins_per_sweep": bins_per_sweep.tolist(),
+        "fields": field_files,
+        "extended_fields": extended,
+        "geometry": bool(geometry),
+    }
+    return header, arrays
+
+
+def store(cache_dir, key, prd, max_bytes=None, field_encoding=None):
+    """
+    Write ``prd`` under ``key`` and evict least recently used entries beyond ``max_bytes``.
+    Entries are staged in a temporary directory and renamed into place, so concurrent
+    writers of the same key never expose a partial entry.
+    :param field_encoding: optional native field encoding of the reader, applied by quantized loads
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    header, arrays = _volume_arrays(prd)
+    header["field_encoding"] = field_encoding or {}
+    staging = tempfile.mkdtemp(prefix=".%s." % key, dir=cache_dir)
+    try:
+        nbytes = 0
+        for name, array in arrays.items():
+            path = os.path.join(staging, name + ".npy")
+            np.save(path, np.ascontiguousarray(array), allow_pickle=False)
+            nbytes += os.path.getsize(path)
+        header["nbytes"] = nbytes
+        with open(os.path.join(staging, HEADER_NAME), "w", encoding="utf-8") as fh:
+            json.dump(header, fh, default=_json_default)
+        try:
+            os.replace(staging, os.path.join(cache_dir, key))
+        except OSError:
+            # another process stored the same volume first
+            shutil.rmtree(staging, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    evict(cache_dir, max_bytes)
+
+
+def _rebuild_prd(header, array, effective_earth_radius=None):
+    """
+    Build a ``PRD`` from a ``_volume_arrays`` header.
+    :param array: callable returning the stored array of a given name
+    """
+    rays_per_sweep = np.asarray(header["rays_per_sweep"], dtype=np.int64)
+    sweep_end_ray_index = np.cumsum(rays_per_sweep) - 1
+    sweep_start_ray_index = sweep_end_ray_index - rays_per_sweep + 1
+    fields = {name: array(stored) for name, stored in header["fields"]}
+    extended_fields = {
+        name: {
+            int(sweep): dict(
+                {part: array("%s_%s" % (item["prefix"], part))
+                 for part in ("data", "range", "time", "azimuth", "elevation")},
+                aligned_bins=item["aligned_bins"],
+            )
+            for sweep, item in sweep_map.items()
+        }
+        for name, sweep_map in header["extended_fields"].items()
+    }
+    sweep_geometry = None
+    if header.get("geometry"):
+        sweep_geometry = [tuple(array("geometry_%d_%s" % (isweep, part)) for part in GEOMETRY_PARTS)
+                          for isweep in range(header["nsweeps"])]
+    return PRD(fields=fields, scan_type=header["scan_type"], time=array("time"), range=array("range"),
+               azimuth=array("azimuth"), elevation=array("elevation"), latitude=header["latitude"],
+               longitude=header["longitude"], altitude=header["altitude"],
+               sweep_start_ray_index=sweep_start_ray_index, sweep_end_ray_index=sweep_end_ray_index,
+               fixed_angle=array("fixed_angle"), bins_per_sweep=np.asarray(header["bins_per_sweep"], dtype=np.int64),
+               nyquist_velocity=array("nyquist_velocity"), frequency=header["frequency"],
+               unambiguous_range=array("unambiguous_range"), nrays=header["nrays"], nsweeps=header["nsweeps"],
+               sitename=header["sitename"], effective_earth_radius=effective_earth_radius,
+               extended_fields=extended_fields, metadata=header["metadata"], sweep_geometry=sweep_geometry)
+
+
+def load(cache_dir, key, effective_earth_radius=None, quantized=False):
+    """
+    Rebuild the cached ``PRD`` stored under ``key``.
+    :param quantized: pack the fields with the stored native encoding (see ``PRD.quantize_fields``)
+    :return: PRD, or None when the entry is missing or unreadable
+    """
+    entry = os.path.join(cache_dir, key)
+    header_path = os.path.join(entry, HEADER_NAME)
+    try:
+        with open(header_path, "r", encoding="utf-8") as fh:
+            header = json.load(fh)
+        if header.get("cache_format") != CACHE_FORMAT_VERSION:
+            raise ValueError("Unsupported radar cache entry format.")
+        arrays = {name[:-len(".npy")]: np.load(os.path.join(entry, name), mmap_mode="c", allow_pickle=False)
+                  for name in os.listdir(entry) if name.endswith(".npy")}
+        prd = _rebuild_prd(header, arrays.__getitem__, effective_earth_radius=effective_earth_radius)
+        if quantized:
+            prd.quantize_fields(header["field_encoding"])
+    except (OSError, ValueError, KeyError, TypeError):
+        shutil.rmtree(entry, ignore_errors=True)
+        return None
+    try:
+        os.utime(header_path)
+    except OSError:
+        pass
+    return prd
+
+
+def _entry_usage(entry):
+    """Return (last use time, size in bytes) of one cache entry."""
+    header_path = os.path.join(entry, HEADER_NAME)
+    try:
+        with open(header_path, "r", encoding="utf-8") as fh:
+            nbytes = int(json.load(fh).get("nbytes", 0))
+        return os.path.getmtime(header_path), nbytes
+    except (OSError, ValueError):
+        return 0.0, sum(
+            os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry)
+            if os.path.isfile(os.path.join(entry, name))
+        )
+
+
+def evict(cache_dir, max_bytes=None):
+    """Delete least recently used entries until the cache holds at most ``max_bytes``."""
+    max_bytes = DEFAULT_CACHE_MAX_BYTES if max_bytes is None else int(max_bytes)
+    entries = []
+    for name in os.listdir(cache_dir):
+        entry = os.path.join(cache_dir, name)
+        if name.startswith(".") or not os.path.isdir(entry):
+            continue
+        try:
+            last_used, nbytes = _entry_usage(entry)
+        except OSError:
+            continue
+        entries.append((last_used, nbytes, entry))
+    total = sum(item[1] for item in entries)
+    for _, nbytes, entry in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= nbytes
+
+
+def cached_read(filename, cache_dir, read, options=None, effective_earth_radius=None, max_bytes=None,
+                quantized=False):
+    """
+    Return the cached volume of ``filename`` or decode it with ``read()`` and store it.
+    :param read: zero-argument callable returning the decoded ``PRD`` and the reader's native
+        field encoding (or None)
+    :param options: read options folded into the cache key
+    :param quantized: return the volume packed with the reader's native encoding
+    """
+    if hasattr(filename, "read"):
+        raise TypeError("cache_dir requires a radar file path, not a file-like object.")
+    cache_dir = os.fspath(cache_dir)
+    key = cache_key(filename, options)
+    prd = load(cache_dir, key, effective_earth_radius=effective_earth_radius, quantized=quantized) \
+        if os.path.isdir(os.path.join(cache_dir, key)) else None
+    if prd is not None:
+        return prd
+    prd, field_encoding = read()
+    store(cache_dir, key, prd, max_bytes=max_bytes, field_encoding=field_encoding)
+    if quantized:
+        prd.quantize_fields(field_encoding)
+    return prd
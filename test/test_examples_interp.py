@@ -45,6 +45,88 @@ class RadarInterpWorkflowTests(unittest.TestCase):
             {"A_20260317070100_test.bin", "B_20260317070030_test.bin"},
         )
 
+    def test_archive_index_rescans_only_changed_directories(self):
+        import os
+        import shutil
+        from pycwr.interp.RadarInterp import discover_radar_files, select_radar_files
+        from pycwr.io.archive_index import ArchiveIndex
+
+        def settle(path, age):
+            stamp = os.stat(path).st_mtime - age
+            os.utime(path, (stamp, stamp))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir) / "network"
+            radar_a = root / "Z9001"
+            radar_b = root / "Z9002"
+            radar_a.mkdir(parents=True)
+            radar_b.mkdir()
+            (radar_a / "Z_RADR_I_Z9001_20260317065800_O_DOR.bin").write_text("", encoding="ascii")
+            (radar_a / "Z_RADR_I_Z9001_20260317070100_O_DOR.bin").write_text("", encoding="ascii")
+            (radar_a / "notes.txt").write_text("", encoding="ascii")
+            (radar_b / "Z_RADR_I_Z9002_20260317070030_O_DOR.bin").write_text("", encoding="ascii")
+            for path in (root, radar_a, radar_b):
+                settle(path, 60)
+            index = ArchiveIndex(Path(tmpdir) / "index.sqlite")
+
+            stats = index.update([root], detect_format=False)
+            self.assertEqual((stats["directories_scanned"], stats["files_added"]), (3, 4))
+            self.assertEqual(index.update([root])["directories_scanned"], 0)
+
+            (radar_b / "Z_RADR_I_Z9002_20260317073000_O_DOR.bin").write_text("", encoding="ascii")
+            settle(radar_b, 30)
+            stats = index.update([root], detect_format=False)
+            self.assertEqual((stats["directories_scanned"], stats["files_added"]), (1, 1))
+
+            rows = index.query(start="2026-03-17T06:59:00", end="2026-03-17T07:05:00", stations=["z9001"])
+            self.assertEqual([row["name"] for row in rows], ["Z_RADR_I_Z9001_20260317070100_O_DOR.bin"])
+            self.assertEqual(len(index.query(root=root, pattern="*.bin")), 4)
+            self.assertEqual(discover_radar_files([radar_a, radar_b], pattern="*.bin", index=index),
+                             discover_radar_files([radar_a, radar_b], pattern="*.bin"))
+            selected = select_radar_files([radar_a, radar_b], "2026-03-17T07:00:00", tolerance_minutes=5,
+                                          index=index.path)
+            self.assertEqual(selected, select_radar_files([radar_a, radar_b], "2026-03-17T07:00:00",
+                                                          tolerance_minutes=5))
+
+            shutil.rmtree(radar_a)
+            stats = index.update([root], detect_format=False)
+            self.assertEqual(stats["files_removed"], 3)
+            self.assertEqual({row["station"] for row in index.query()}, {"Z9002"})
+
+    def test_indexed_and_globbed_selection_agree_on_the_same_tree(self):
+        from pycwr.interp.RadarInterp import discover_radar_files, select_radar_files
+        from pycwr.io.archive_index import ArchiveIndex
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            radar_a = Path(tmpdir) / "Z9001"
+            radar_b = Path(tmpdir) / "Z9002"
+            (radar_a / "late").mkdir(parents=True)
+            radar_b.mkdir()
+            (radar_a / "A_20260317065000_test.bin").write_text("", encoding="ascii")
+            (radar_a / "late" / "A_20260317070100_test.bin.bz2").write_text("", encoding="ascii")
+            # equally distant scans: both paths must pick the same one
+            (radar_b / "B1_20260317070200_test.bin").write_text("", encoding="ascii")
+            (radar_b / "B2_20260317065800_test.bin").write_text("", encoding="ascii")
+            radar_dirs = [radar_a, radar_b]
+            index = ArchiveIndex(Path(tmpdir) / "index.sqlite")
+
+            for pattern in ("*.bin*", "**/*.bin*"):
+                self.assertEqual(discover_radar_files(radar_dirs, pattern=pattern, index=index),
+                                 discover_radar_files(radar_dirs, pattern=pattern))
+                indexed = select_radar_files(radar_dirs, "2026-03-17T07:00:00", tolerance_minutes=5,
+                                             pattern=pattern, index=index)
+                self.assertEqual(indexed, select_radar_files(radar_dirs, "2026-03-17T07:00:00",
+                                                             tolerance_minutes=5, pattern=pattern))
+                self.assertEqual(len(indexed), 2 if pattern.startswith("**") else 1)
+            with self.assertRaisesRegex(ValueError, "archive index"):
+                discover_radar_files(radar_dirs, pattern="late/*.bin*", index=index)
+
+            # a matching file without a scan time is an error on both paths, even outside the window
+            (radar_b / "B_undated.bin").write_text("", encoding="ascii")
+            for kwargs in ({}, {"index": index}):
+                with self.assertRaisesRegex(ValueError, "Unable to determine scan time"):
+                    select_radar_files(radar_dirs, "2026-03-17T07:00:00", tolerance_minutes=5, **kwargs)
+
     def test_build_latlon_grid_returns_lat_lon_mesh(self):
         from pycwr.interp.RadarInterp import build_latlon_grid
 
@@ -181,7 +263,8 @@ class RadarInterpWorkflowTests(unittest.TestCase):
             ("Z9002", "ZDR"): 3.0,
         }
 
-        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None):
+        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+                           fields=None):
             return FakePRD(Path(path).parent.name)
 
         def fake_get_radar_info(path):
@@ -278,7 +361,8 @@ class RadarInterpWorkflowTests(unittest.TestCase):
                     30.0,
                 )
 
-        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None):
+        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+                           fields=None):
             return FakePRD(Path(path).parent.name)
 
         def fake_get_radar_info(path):
@@ -356,7 +440,8 @@ class RadarInterpWorkflowTests(unittest.TestCase):
 
         read_calls = []
 
-        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None):
+        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+                           fields=None):
             radar_id = Path(path).parent.name
             read_calls.append((radar_id, station_lon, station_lat, station_alt))
             if radar_id == "Z9001":
@@ -485,7 +570,8 @@ class RadarInterpWorkflowTests(unittest.TestCase):
                     30.0,
                 )
 
-        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None):
+        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+                           fields=None):
             return FakePRD(Path(path).parent.name)
 
         def fake_get_radar_info(path):
@@ -639,7 +725,8 @@ class RadarInterpWorkflowTests(unittest.TestCase):
 
         observed_blind_methods = []
 
-        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None):
+        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+                           fields=None):
             return FakePRD(Path(path).parent.name)
 
         def fake_get_radar_info(path):
@@ -834,7 +921,8 @@ class RadarInterpWorkflowTests(unittest.TestCase):
                     30.0,
                 )
 
-        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None):
+        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+                           fields=None):
             return FakePRD(Path(path).parent.name)
 
         def fake_get_radar_info(path):
@@ -899,7 +987,8 @@ class RadarInterpWorkflowTests(unittest.TestCase):
                     30.0,
                 )
 
-        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None):
+        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+                           fields=None):
             return FakePRD(Path(path).parent.name)
 
         def fake_get_radar_info(path):
@@ -986,7 +1075,8 @@ class RadarInterpWorkflowTests(unittest.TestCase):
                     30.0,
                 )
 
-        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None):
+        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+                           fields=None):
             return FakePRD(Path(path).parent.name)
 
         def fake_get_radar_info(path):
@@ -1069,7 +1159,8 @@ class RadarInterpWorkflowTests(unittest.TestCase):
                     30.0,
                 )
 
-        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None):
+        def fake_read_auto(path, station_lon=None, station_lat=None, station_alt=None, effective_earth_radius=None,
+                           fields=None):
             return FakePRD(Path(path).parent.name)
 
         def fake_get_radar_info(path):
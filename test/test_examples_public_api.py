@@ -16,6 +16,10 @@ import numpy as np
 matplotlib.use("Agg")
 
 
+def _read_shared_sweep(prd):
+    values = prd.fields.values(1, "dBZ")
+    return values.copy(), values.flags.writeable
+
 class PublicApiSampleTests(unittest.TestCase):
     @staticmethod
     def _repo_root():
@@ -192,6 +196,109 @@ class PublicApiSampleTests(unittest.TestCase):
         self.assertEqual(first.dims[0], "azimuth")
         self.assertTrue((first.azimuth.values[:-1] <= first.azimuth.values[1:]).all())
 
+    def test_prd_caches_are_bounded_and_inspectable(self):
+        import copy
+
+        from test_examples_sections import SectionExtractionTests
+
+        prd = SectionExtractionTests()._build_ppi_prd()
+        for max_range_km in (3.0, 5.0, 7.0):
+            prd.get_vol_data(max_range_km=max_range_km)
+        sorted_field = prd.get_sweep_field(0, "ZDR", range_mode="aligned", sort_by_azimuth=True)
+        self.assertIs(prd.get_sweep_field(0, "ZDR", range_mode="aligned", sort_by_azimuth=True), sorted_field)
+
+        info = prd.cache_info()
+        vol = info["caches"]["vol"]
+        self.assertEqual(vol["entries"], 4)
+        self.assertGreater(vol["bytes"], 0)
+        self.assertEqual(info["caches"]["sweep_field"]["hits"], 1)
+        self.assertEqual(info["bytes"], sum(item["bytes"] for item in info["caches"].values()))
+
+        # shrinking the budget keeps the most recently used views
+        prd.configure_caches(max_bytes=info["bytes"] - 1)
+        info = prd.cache_info()
+        self.assertEqual(info["caches"]["vol"]["entries"], 3)
+        self.assertEqual(info["caches"]["sweep_field"]["entries"], 1)
+        self.assertLessEqual(info["bytes"], info["max_bytes"])
+
+        prd.clear_caches(kind="vol")
+        self.assertEqual(prd.cache_info()["caches"]["vol"]["entries"], 0)
+        self.assertEqual(prd.cache_info()["caches"]["sweep_field"]["entries"], 1)
+        with self.assertRaises(ValueError):
+            prd.clear_caches(kind="grid")
+
+        clone = copy.deepcopy(prd)
+        self.assertEqual(clone.cache_info()["entries"], 0)
+        self.assertEqual(clone.cache_info()["max_bytes"], info["max_bytes"])
+        prd.configure_caches(max_bytes=0)
+        prd.get_vol_data()
+        self.assertEqual(prd.cache_info()["entries"], 0)
+        self.assertIsNotNone(prd.vol)
+
+    def test_prd_subset_shares_arrays_with_the_source_volume(self):
+        from test_examples_sections import SectionExtractionTests
+
+        prd = SectionExtractionTests()._build_ppi_prd()
+        x = prd.fields[1]["x"].values
+        sub = prd.subset(sweeps=[1], fields="dBZ", max_range_km=4.5, azimuth_sector=(40.0, 140.0))
+
+        self.assertEqual((sub.nsweeps, sub.nrays), (1, 3))
+        self.assertEqual(sub.available_fields(sweep=0), ["dBZ"])
+        self.assertTrue(np.shares_memory(sub.fields.values(0, "dBZ"), prd.fields.values(1, "dBZ")))
+        self.assertTrue(np.shares_memory(sub.fields.values(0, "x"), x))
+        np.testing.assert_array_equal(sub.fields[0]["dBZ"].values, prd.fields[1]["dBZ"].values[1:4, :4])
+        np.testing.assert_array_equal(sub.fields[0]["azimuth"].values, [45.0, 90.0, 135.0])
+        np.testing.assert_array_equal(sub.scan_info["fixed_angle"].values, [3.0])
+        np.testing.assert_array_equal(sub.scan_info["rays_per_sweep"].values, [3])
+        self.assertEqual(sub.scan_info["sweep_group_name"].values.tolist(), ["sweep_0"])
+        self.assertIsNone(sub.vol)
+        sub.get_vol_data()
+        self.assertEqual(sub.vol[3][0].shape, (3, 4))
+
+        # a sector crossing the first ray of the sweep selects the rays on both sides of north
+        wrapped = prd.subset(azimuth_sector=(300.0, 60.0))
+        np.testing.assert_array_equal(wrapped.fields[0]["azimuth"].values, [0.0, 45.0, 315.0])
+        self.assertEqual(wrapped.nrays, 6)
+        self.assertEqual(wrapped.available_fields(sweep=0), ["dBZ", "ZDR"])
+        with self.assertRaises(KeyError):
+            prd.subset(fields=["KDP"])
+        with self.assertRaises(ValueError):
+            prd.subset(azimuth_sector=(10.0, 20.0))
+
+    def test_prd_share_memory_pickles_block_references(self):
+        import copy
+        import multiprocessing
+        import pickle
+        from concurrent.futures import ProcessPoolExecutor
+        from test_examples_sections import SectionExtractionTests
+
+        prd = SectionExtractionTests()._build_ppi_prd()
+        expected = prd.fields[1]["dBZ"].values.copy()
+        prd.get_vol_data()
+        plain = pickle.dumps(prd)
+        restored = pickle.loads(plain)
+        self.assertEqual(restored.cache_info()["entries"], 0)
+        self.assertTrue(restored.fields.values(1, "dBZ").flags.writeable)
+
+        prd.share_memory(min_bytes=0)
+        try:
+            self.assertLess(len(pickle.dumps(prd)), len(plain))
+            self.assertTrue(prd.fields.values(1, "dBZ").flags.writeable)
+            with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                values, writeable = pool.submit(_read_shared_sweep, prd).result()
+            np.testing.assert_array_equal(values, expected)
+            self.assertFalse(writeable)
+
+            attached = pickle.loads(pickle.dumps(prd))
+            self.assertFalse(attached.fields.values(1, "dBZ").flags.writeable)
+            self.assertTrue(np.shares_memory(pickle.loads(pickle.dumps(attached)).fields.values(1, "dBZ"),
+                                             attached.fields.values(1, "dBZ")))
+            self.assertTrue(copy.deepcopy(attached).fields.values(1, "dBZ").flags.writeable)
+        finally:
+            prd.release_shared_memory()
+        np.testing.assert_array_equal(attached.fields[1]["dBZ"].values, expected)
+        self.assertGreaterEqual(len(pickle.dumps(prd)), len(plain) - 1024)
+
     def test_real_sample_regression_fingerprint(self):
         from pycwr.io import read_auto
 
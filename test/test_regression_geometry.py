@@ -380,6 +380,221 @@ class GeometryRoundTripTests(unittest.TestCase):
         self.assertTrue(np.allclose(prd.fields[0]["y"].values, y))
         self.assertTrue(np.allclose(prd.fields[0]["z"].values, z))
 
+    def test_prd_gate_geometry_is_computed_on_first_access(self):
+        import pickle
+
+        from pycwr.core.NRadar import PRD
+        from pycwr.core.transforms import antenna_vectors_to_cartesian_cwr, cartesian_to_geographic_aeqd
+
+        ranges = np.array([1000.0, 2000.0, 3000.0], dtype=np.float32)
+        azimuth = np.array([0.0, 90.0, 180.0, 270.0])
+        elevation = np.array([0.5, 0.5, 1.5, 1.5])
+        prd = PRD(
+            fields={"V": np.arange(12, dtype=np.float32).reshape(4, 3)},
+            scan_type="ppi",
+            time=np.arange(4).astype("datetime64[s]").astype("datetime64[ns]"),
+            range=ranges,
+            azimuth=azimuth,
+            elevation=elevation,
+            latitude=31.0,
+            longitude=118.0,
+            altitude=100.0,
+            sweep_start_ray_index=np.array([0, 2]),
+            sweep_end_ray_index=np.array([1, 3]),
+            fixed_angle=np.array([0.5, 1.5]),
+            bins_per_sweep=np.array([3, 2]),
+            nyquist_velocity=np.array([10.0, 10.0]),
+            frequency=5.6,
+            unambiguous_range=np.array([100000.0, 100000.0]),
+            nrays=4,
+            nsweeps=2,
+            sitename="TEST",
+        )
+
+        def geometry(sweep):
+            return prd.fields[sweep]["x"].variable._data.array.geometry
+
+        self.assertFalse(geometry(0).computed or geometry(1).computed)
+        np.testing.assert_array_equal(prd.fields[1]["V"].values, [[6.0, 7.0], [9.0, 10.0]])
+        restored = pickle.loads(pickle.dumps(prd))
+        subset = prd.fields[1].isel(time=[1])
+        self.assertFalse(geometry(1).computed)
+
+        x, y, z = antenna_vectors_to_cartesian_cwr(ranges[:2], azimuth[2:], elevation[2:], 100.0)
+        lon, lat = cartesian_to_geographic_aeqd(x, y, 118.0, 31.0)
+        for name, expected in zip(("x", "y", "z", "lon", "lat"), (x, y, z, lon, lat)):
+            self.assertEqual(prd.fields[1][name].dtype, expected.dtype)
+            np.testing.assert_array_equal(prd.fields[1][name].values, expected)
+            np.testing.assert_array_equal(subset[name].values, expected[1:])
+            np.testing.assert_array_equal(restored.fields[1][name].values, expected)
+        self.assertEqual(prd.fields[1]["x"].attrs["units"], "meters")
+        self.assertTrue(geometry(1).computed)
+        self.assertFalse(geometry(0).computed)
+
+    def test_geometry_cache_shares_sweep_geometry_between_volumes_with_jittered_azimuths(self):
+        from pycwr.core.NRadar import PRD
+        from pycwr.core.geometry_cache import GEOMETRY_CACHE, compute_sweep_geometry
+
+        ranges = np.array([1000.0, 2000.0, 3000.0])
+
+        def volume(azimuth, altitude=100.0):
+            return PRD(
+                fields={"dBZ": np.zeros((3, 3), dtype=np.float32)},
+                scan_type="ppi",
+                time=np.arange(3).astype("datetime64[s]").astype("datetime64[ns]"),
+                range=ranges,
+                azimuth=np.asarray(azimuth),
+                elevation=np.full(3, 0.5),
+                latitude=31.0,
+                longitude=118.0,
+                altitude=altitude,
+                sweep_start_ray_index=np.array([0]),
+                sweep_end_ray_index=np.array([2]),
+                fixed_angle=np.array([0.5]),
+                bins_per_sweep=np.array([3]),
+                nyquist_velocity=np.array([10.0]),
+                frequency=5.6,
+                unambiguous_range=np.array([100000.0]),
+                nrays=3,
+                nsweeps=1,
+                sitename="TEST",
+            )
+
+        state = GEOMETRY_CACHE.info()
+        try:
+            GEOMETRY_CACHE.configure(max_bytes=1024 * 1024)
+            GEOMETRY_CACHE.clear()
+            first = volume([0.0, 120.0, 240.0])
+            second = volume([0.02, 119.97, 240.04])
+            other_site = volume([0.0, 120.0, 240.0], altitude=200.0)
+            x = first.fields[0]["x"].values
+            self.assertIs(second.fields[0]["x"].values.base, x.base)
+            self.assertFalse(x.flags.writeable)
+            self.assertFalse(np.array_equal(other_site.fields[0]["z"].values, first.fields[0]["z"].values))
+            info = GEOMETRY_CACHE.info()
+            self.assertEqual((info["entries"], info["hits"], info["misses"]), (2, 1, 2))
+            self.assertEqual(info["bytes"], 2 * 5 * 9 * 8)
+
+            expected = compute_sweep_geometry(ranges, [0.0, 120.0, 240.0], np.full(3, 0.5), 118.0, 31.0, 100.0)
+            np.testing.assert_array_equal(second.fields[0]["lat"].values, expected[4])
+
+            GEOMETRY_CACHE.configure(max_bytes=5 * 9 * 8)
+            self.assertEqual(GEOMETRY_CACHE.info()["entries"], 1)
+            GEOMETRY_CACHE.configure(max_bytes=0)
+            exact = volume([0.02, 119.97, 240.04]).fields[0]["x"].values
+            self.assertTrue(exact.flags.writeable)
+            np.testing.assert_array_equal(exact, compute_sweep_geometry(
+                ranges, [0.02, 119.97, 240.04], np.full(3, 0.5), 118.0, 31.0, 100.0)[0])
+        finally:
+            GEOMETRY_CACHE.configure(max_bytes=state["max_bytes"], angle_resolution=state["angle_resolution"])
+            GEOMETRY_CACHE.clear()
+
+    def test_default_geometry_uses_the_exact_angles_of_each_volume(self):
+        from pycwr.core.NRadar import PRD
+        from pycwr.core.geometry_cache import GEOMETRY_CACHE, compute_sweep_geometry
+
+        ranges = np.array([1000.0, 50000.0, 230000.0])
+        azimuth = np.array([0.013, 119.987, 240.046])
+        elevation = np.array([0.483, 0.517, 0.506])
+
+        def geometry():
+            prd = PRD(
+                fields={"dBZ": np.zeros((3, 3), dtype=np.float32)},
+                scan_type="ppi",
+                time=np.arange(3).astype("datetime64[s]").astype("datetime64[ns]"),
+                range=ranges,
+                azimuth=azimuth,
+                elevation=elevation,
+                latitude=31.0,
+                longitude=118.0,
+                altitude=100.0,
+                sweep_start_ray_index=np.array([0]),
+                sweep_end_ray_index=np.array([2]),
+                fixed_angle=np.array([0.5]),
+                bins_per_sweep=np.array([3]),
+                nyquist_velocity=np.array([10.0]),
+                frequency=5.6,
+                unambiguous_range=np.array([100000.0]),
+                nrays=3,
+                nsweeps=1,
+                sitename="TEST",
+            )
+            return [prd.fields[0][name].values for name in ("x", "y", "z", "lon", "lat")]
+
+        expected = compute_sweep_geometry(ranges, azimuth, elevation, 118.0, 31.0, 100.0)
+        self.assertEqual(GEOMETRY_CACHE.info()["max_bytes"], 0)
+        for actual, exact in zip(geometry(), expected):
+            np.testing.assert_array_equal(actual, exact)
+
+        # an enabled cache only keys on the quantized angles; a miss still stores exact geometry
+        state = GEOMETRY_CACHE.info()
+        try:
+            GEOMETRY_CACHE.configure(max_bytes=1024 * 1024)
+            GEOMETRY_CACHE.clear()
+            for actual, exact in zip(geometry(), expected):
+                np.testing.assert_array_equal(actual, exact)
+            self.assertEqual(GEOMETRY_CACHE.info()["misses"], 1)
+        finally:
+            GEOMETRY_CACHE.configure(max_bytes=state["max_bytes"], angle_resolution=state["angle_resolution"])
+            GEOMETRY_CACHE.clear()
+
+    def test_prd_sweeps_are_built_as_datasets_only_when_requested(self):
+        import xarray as xr
+
+        from pycwr.core.NRadar import PRD
+        from pycwr.core.sweep_store import SweepStore
+
+        reflectivity = np.arange(12, dtype=np.float32).reshape(4, 3)
+        velocity = -reflectivity
+        prd = PRD(
+            fields={"dBZ": reflectivity, "V": velocity},
+            scan_type="ppi",
+            time=np.arange(4).astype("datetime64[s]").astype("datetime64[ns]"),
+            range=np.array([1000.0, 2000.0, 3000.0]),
+            azimuth=np.array([90.0, 0.0, 180.0, 270.0]),
+            elevation=np.array([0.5, 0.5, 1.5, 1.5]),
+            latitude=31.0,
+            longitude=118.0,
+            altitude=100.0,
+            sweep_start_ray_index=np.array([0, 2]),
+            sweep_end_ray_index=np.array([1, 3]),
+            fixed_angle=np.array([0.5, 1.5]),
+            bins_per_sweep=np.array([3, 2]),
+            nyquist_velocity=np.array([10.0, 10.0]),
+            frequency=5.6,
+            unambiguous_range=np.array([100000.0, 100000.0]),
+            nrays=4,
+            nsweeps=2,
+            sitename="TEST",
+        )
+        sweeps = prd.fields
+        self.assertIsInstance(sweeps, SweepStore)
+        self.assertEqual(prd.available_fields(sweep=1), ["dBZ", "V"])
+        self.assertEqual(prd.sweep_summary()[1]["aligned_max_range_m"], 2000.0)
+        field = prd.get_sweep_field(0, "dBZ", range_mode="aligned", sort_by_azimuth=True)
+        np.testing.assert_array_equal(field.values, reflectivity[[1, 0]])
+        self.assertEqual(field.attrs["units"], "dBZ")
+        self.assertTrue(np.shares_memory(sweeps.values(1, "V"), velocity))
+        prd.quantize_fields()
+        self.assertFalse(sweeps.is_materialized(0) or sweeps.is_materialized(1))
+        self.assertIn("scale_factor", sweeps.variable(0, "dBZ").encoding)
+
+        # a materialized sweep keeps in-place edits and matches the Dataset PRD used to build
+        prd.fields[1]["QC"] = prd.fields[1]["dBZ"] * 0
+        self.assertTrue(sweeps.is_materialized(1))
+        self.assertFalse(sweeps.is_materialized(0))
+        self.assertIn("QC", prd.available_fields(sweep=1))
+        self.assertEqual(list(prd.fields[1].coords), ["azimuth", "elevation", "x", "y", "z", "lat", "lon",
+                                                     "range", "time"])
+        np.testing.assert_allclose(prd.fields[1]["dBZ"].values, [[6.0, 7.0], [9.0, 10.0]], atol=0.01)
+        self.assertEqual(prd.fields[1]["time"].dtype, np.dtype("datetime64[ns]"))
+        with self.assertRaises(ValueError):
+            sweeps.set_variable(0, "bad", xr.Variable(("range",), np.zeros(3)))
+
+        prd.fields = [prd.fields[0]]
+        self.assertIsInstance(prd.fields, SweepStore)
+        self.assertEqual(len(prd.fields), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -159,6 +159,41 @@ class RadarGridConsistencyTests(unittest.TestCase):
         self.assertTrue(np.allclose(py_value, cy_value, rtol=1e-10, atol=1e-6))
         self.assertTrue(np.isclose(py_value[0, 0], 10.0, rtol=0.0, atol=1e-6))
 
+    def test_ppi_to_grid_matches_the_scalar_sweep_sampler(self):
+        from pycwr.core import RadarGrid
+
+        rng = np.random.default_rng(0)
+        azimuth = np.sort(rng.uniform(0.0, 360.0, 72))
+        ranges = 500.0 + 250.0 * np.arange(40)
+        values = rng.normal(20.0, 10.0, (azimuth.size, ranges.size))
+        values[rng.random(values.shape) < 0.3] = -999.0
+        # the grid covers the blind zone, the gap across north and cells beyond the last gate
+        grid_x, grid_y = np.meshgrid(np.linspace(-11000.0, 11000.0, 23), np.linspace(-11000.0, 11000.0, 23),
+                                     indexing="ij")
+
+        for blind_method in ("mask", "nearest_gate"):
+            value = RadarGrid.ppi_to_grid(azimuth, ranges, 1.5, values, 100.0, grid_x, grid_y,
+                                          blind_method=blind_method)
+            grid_az, grid_range, _ = RadarGrid.xye_to_antenna(grid_x, grid_y, 1.5, 100.0)
+            expected = np.array([
+                RadarGrid._interp_sweep_sample(azimuth, ranges, values, target_az, target_range, -999.0,
+                                               blind_method == "nearest_gate")
+                for target_az, target_range in zip(grid_az.ravel(), grid_range.ravel())
+            ]).reshape(grid_x.shape)
+            np.testing.assert_array_equal(value, expected)
+        self.assertTrue(np.any(value == -999.0) and np.any(value != -999.0))
+
+        vol_azimuth, vol_range, fix_elevation, vol_value = self._synthetic_volume((10.0, 20.0))
+        x = np.linspace(-1800.0, 1800.0, 7)
+        cappi_x, cappi_y = np.meshgrid(x, x, indexing="ij")
+        cappi = RadarGrid.get_CAPPI_xy(vol_azimuth, vol_range, fix_elevation, vol_value, 100.0, cappi_x, cappi_y,
+                                       120.0, blind_method="hybrid")
+        # beyond the last gate, below the lowest sweep, between both sweeps, above the highest sweep
+        self.assertEqual(cappi[0, 0], -999.0)
+        self.assertEqual(cappi[0, 3], 10.0)
+        self.assertTrue(10.0 < cappi[2, 2] < 20.0)
+        self.assertEqual(cappi[3, 3], -999.0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,119 @@
+import datetime
+import gc
+import struct
+import tempfile
 import unittest
+import warnings
 from pathlib import Path
 
 import numpy as np
 
 
+def _build_wsr98d_volume(cuts):
+    """Assemble a minimal WSR98D file; each cut lists (data_type, scale, offset, codes_per_ray)."""
+    from pycwr.io.BaseDataProtocol.WSR98DProtocol import dtype_98D
+
+    def fmt(structure):
+        return "<" + "".join(item[1] for item in structure)
+
+    header = dtype_98D.BaseDataHeader
+    blocks = [
+        struct.pack(fmt(header["GenericHeaderBlock"]), 1297371986, 1, 0, 1, 0, b""),
+        struct.pack(fmt(header["SiteConfigurationBlock"]), b"Z9999", b"SYNTH", 30.0, 120.0, 50, 40,
+                    5600.0, 1.0, 1.0, 1, 1, b""),
+        struct.pack(fmt(header["TaskConfigurationBlock"]), b"VCP21D", b"", 3, 0, 1, 1700000000, len(cuts),
+                    0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, b""),
+    ]
+    cut_config = np.zeros(len(cuts), dtype=header["CutConfigurationBlock"])
+    cut_config["Elevation"] = [cut["elevation"] for cut in cuts]
+    cut_config["LogResolution"] = 250
+    cut_config["DopplerResolution"] = 250
+    blocks.append(cut_config.tobytes())
+    sequence = 0
+    for icut, cut in enumerate(cuts):
+        nrays = len(cut["azimuth"])
+        for iray, azimuth in enumerate(cut["azimuth"]):
+            state = 1
+            if iray == 0:
+                state = 3 if icut == 0 else 0
+            elif iray == nrays - 1:
+                state = 4 if icut == len(cuts) - 1 else 2
+            payload = b""
+            for data_type, scale, offset, codes in cut["moments"]:
+                data = np.asarray(codes[iray], dtype=np.uint8).tobytes()
+                payload += struct.pack(fmt(dtype_98D.RadialData()), data_type, scale, offset, 1, 0, len(data), b"")
+                payload += data
+            sequence += 1
+            blocks.append(struct.pack(fmt(dtype_98D.RadialHeader()), state, 0, sequence, iray + 1, icut + 1,
+                                      azimuth, cut["elevation"], 1700000000 + sequence, 0, len(payload),
+                                      len(cut["moments"]), b""))
+            blocks.append(payload)
+    return b"".join(blocks)
+
+
+# (data_type, scale, offset) of the WSR98D moments used by the synthetic volumes
+_DBZ, _V, _W, _ZDR = (2, 2, 66), (3, 2, 129), (4, 2, 129), (7, 16, 130)
+# two rays of four gates; codes below 5 are no-data
+_SAMPLE_CODES = np.arange(4, 12, dtype=np.uint8).reshape(2, 4)
+_SAMPLE_CODES.setflags(write=False)
+_WSR98D_NAME = "Z_RADR_I_Z9999_20231114221320_O_DOR_SAD_CAP_FMT.bin"
+
+
+def _wsr98d_cut(elevation=0.5, azimuth=(0.0, 180.0), moments=(_DBZ,)):
+    """Return one ``_build_wsr98d_volume`` cut; moments given as (data_type, scale, offset) carry ``_SAMPLE_CODES``."""
+    return {"elevation": elevation, "azimuth": list(azimuth),
+            "moments": [tuple(moment) + (_SAMPLE_CODES,) if len(moment) == 3 else tuple(moment) for moment in moments]}
+
+
+def _split_cut_cuts():
+    """Reflectivity-only and Doppler-only cuts at 0.5 degree followed by a combined 1.5 degree cut."""
+    short = np.full((2, 2), 100, dtype=np.uint8)
+    return [
+        _wsr98d_cut(0.5),
+        _wsr98d_cut(0.5, azimuth=(10.0, 170.0), moments=(_V, _W + (short,))),
+        _wsr98d_cut(1.5, moments=(_DBZ, _V)),
+    ]
+
+
+def _write_wsr98d_volume(directory, cuts, name=_WSR98D_NAME):
+    """Write ``_build_wsr98d_volume(cuts)`` to ``directory/name`` and return the path."""
+    path = Path(directory) / name
+    path.write_bytes(_build_wsr98d_volume(cuts))
+    return path
+
+
+def _build_sab_volume(cuts, record_size=2432):
+    """Assemble a minimal SA/SB/CB file; each cut lists azimuths and optional dBZ/V/W codes per ray."""
+    from pycwr.io.BaseDataProtocol.SABProtocol import dtype_sab
+
+    header_fmt = "<" + "".join(item[1] for item in dtype_sab.RadialHeader())
+    records = []
+    for icut, cut in enumerate(cuts):
+        nrays = len(cut["azimuth"])
+        dbz = cut.get("dBZ")
+        velocity = cut.get("V")
+        width = cut.get("W")
+        nref = 0 if dbz is None else dbz.shape[1]
+        ndop = 0 if velocity is None else velocity.shape[1]
+        for iray, azimuth in enumerate(cut["azimuth"]):
+            status = 1
+            if iray == 0:
+                status = 3 if icut == 0 else 0
+            elif iray == nrays - 1:
+                status = 4 if icut == len(cuts) - 1 else 2
+            header = struct.pack(header_fmt, b"", 1, b"", 1000 * iray, 17390, 4600, int(azimuth / 180. * 4096 * 8),
+                                 iray + 1, status, int(cut["elevation"] / 180. * 4096 * 8), icut + 1, 0, 0, 1000,
+                                 250, nref, ndop, 0, 0, 100, 100 + nref, 100 + nref + ndop, 2, 21, b"", 2700, b"")
+            record = bytearray(record_size)
+            record[:len(header)] = header
+            for codes, pointer in ((dbz, 100), (velocity, 100 + nref), (width, 100 + nref + ndop)):
+                if codes is not None:
+                    start = pointer + dtype_sab.InfSize
+                    record[start:start + codes.shape[1]] = codes[iray].tobytes()
+            records.append(bytes(record))
+    return b"".join(records)
+
+
 WSR98D_BASELINES = {
     "Z_RADR_I_Z9046_20260317065928_O_DOR_SAD_CAP_FMT.bin.bz2": {
         "station": "Z9046",
@@ -97,6 +207,439 @@ class WSR98DRegressionTests(unittest.TestCase):
                     self.assertAlmostEqual(float(np.nanmean(arr)), field_expected["nanmean"])
                     self.assertEqual(int(np.isnan(arr).sum()), field_expected["nancount"])
 
+    def test_wsr98d_bulk_decoder_matches_moment_scaling_and_pairs_split_sweeps(self):
+        from pycwr.io import read_auto
+        from pycwr.io.WSR98DFile import WSR98DBaseData
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write_wsr98d_volume(tmpdir, _split_cut_cuts())
+            base = WSR98DBaseData(str(path))
+            prd = read_auto(str(path))
+
+        self.assertEqual(base.moment_index.size, 10)
+        self.assertEqual(base.get_ray_field_names(2), ("V", "W"))
+        codes = _SAMPLE_CODES.astype(np.float32)
+        expected_dbz = np.where(codes >= 5, (codes - 66) / 2, np.nan)
+        expected_v = np.where(codes >= 5, (codes - 129) / 2, np.nan)
+        np.testing.assert_array_equal(base.radial[0]["fields"]["dBZ"], expected_dbz[0])
+
+        self.assertEqual(int(prd.nsweeps), 2)
+        self.assertEqual(list(prd.fields[0].data_vars)[:3], ["V", "W", "dBZ"])
+        np.testing.assert_array_equal(prd.fields[0]["dBZ"].values, expected_dbz)
+        np.testing.assert_array_equal(prd.fields[0]["V"].values, expected_v)
+        np.testing.assert_array_equal(prd.fields[0]["W"].values[:, 2:], np.full((2, 2), np.nan))
+        np.testing.assert_array_equal(prd.fields[1]["V"].values, expected_v)
+
+    def test_wsr98d_field_selection_skips_unrequested_moments_without_changing_geometry(self):
+        from pycwr.io import read_auto
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write_wsr98d_volume(tmpdir, _split_cut_cuts())
+            full = read_auto(str(path))
+            dbz_only = read_auto(str(path), fields=["dBZ"])
+            w_only = read_auto(str(path), fields="W")
+
+        self.assertEqual(list(dbz_only.fields[0].data_vars), ["dBZ"])
+        self.assertEqual(list(w_only.fields[0].data_vars), ["W"])
+        self.assertIsNone(w_only.vol)
+        for prd in (dbz_only, w_only):
+            self.assertEqual(int(prd.nsweeps), int(full.nsweeps))
+            np.testing.assert_array_equal(prd.scan_info.rays_per_sweep.values, full.scan_info.rays_per_sweep.values)
+            for sweep in range(int(full.nsweeps)):
+                np.testing.assert_array_equal(prd.fields[sweep].range.values, full.fields[sweep].range.values)
+                np.testing.assert_array_equal(prd.fields[sweep].azimuth.values, full.fields[sweep].azimuth.values)
+        np.testing.assert_array_equal(dbz_only.fields[0]["dBZ"].values, full.fields[0]["dBZ"].values)
+        np.testing.assert_array_equal(w_only.fields[0]["W"].values, full.fields[0]["W"].values)
+
+    def test_wsr98d_sweep_selection_keeps_split_cut_pairs_and_matches_full_read(self):
+        from pycwr.io import read_auto
+        from pycwr.io.WSR98DFile import WSR98DBaseData
+
+        cuts = [
+            _wsr98d_cut(0.5),
+            _wsr98d_cut(0.5, azimuth=(10.0, 170.0), moments=(_V,)),
+            _wsr98d_cut(1.5, moments=(_DBZ, _V)),
+            _wsr98d_cut(3.0, moments=(_DBZ + (_SAMPLE_CODES + 1,), _V)),
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write_wsr98d_volume(tmpdir, cuts)
+            full = read_auto(str(path))
+            low = read_auto(str(path), max_elevation=1.5)
+            picked = read_auto(str(path), sweeps=[0, 2])
+            lowest = WSR98DBaseData(str(path), max_elevation=0.5)
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always", ResourceWarning)
+                with self.assertRaises(ValueError):
+                    read_auto(str(path), sweeps=[3])
+                with self.assertRaises(ValueError):
+                    read_auto(str(path), max_elevation=0.1)
+                gc.collect()
+            # rejected selections still close the file
+            self.assertEqual([item for item in caught if issubclass(item.category, ResourceWarning)], [])
+
+        self.assertEqual(int(full.nsweeps), 3)
+        self.assertEqual(lowest.nrays, 4)
+        self.assertEqual(int(lowest.moment_index.size), 4)
+        np.testing.assert_allclose(low.scan_info.fixed_angle.values, [0.5, 1.5])
+        np.testing.assert_allclose(picked.scan_info.fixed_angle.values, [0.5, 3.0])
+        for prd, selected in ((low, [0, 1]), (picked, [0, 2])):
+            self.assertEqual(int(prd.nrays), 2 * len(selected))
+            for new_sweep, sweep in enumerate(selected):
+                for name in ("dBZ", "V"):
+                    np.testing.assert_array_equal(
+                        prd.fields[new_sweep][name].values, full.fields[sweep][name].values
+                    )
+                np.testing.assert_array_equal(prd.fields[new_sweep].x.values, full.fields[sweep].x.values)
+
+    def test_iter_sweeps_yields_split_cut_sweeps_before_the_volume_is_complete(self):
+        import io
+        from pycwr.io import iter_sweeps, read_auto
+
+        class TrickleStream(io.RawIOBase):
+            def __init__(self, data):
+                self.data = data
+                self.pos = 0
+
+            def readable(self):
+                return True
+
+            def read(self, size=-1):
+                chunk = self.data[self.pos:self.pos + min(size, 64)]
+                self.pos += len(chunk)
+                return chunk
+
+        data = _build_wsr98d_volume(_split_cut_cuts() + [_wsr98d_cut(2.5)])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / _WSR98D_NAME
+            path.write_bytes(data)
+            full = read_auto(str(path))
+            dbz_only = [(sweep, list(prd.fields[0].data_vars)) for sweep, prd in iter_sweeps(str(path), fields="dBZ")]
+
+        stream = TrickleStream(data)
+        consumed = []
+        for sweep, prd in iter_sweeps(stream):
+            consumed.append(stream.pos)
+            self.assertEqual(int(prd.nsweeps), 1)
+            np.testing.assert_array_equal(prd.scan_info.fixed_angle.values, full.scan_info.fixed_angle.values[[sweep]])
+            np.testing.assert_array_equal(prd.fields[0].azimuth.values, full.fields[sweep].azimuth.values)
+            for field_name in prd.fields[0].data_vars:
+                np.testing.assert_array_equal(prd.fields[0][field_name].values, full.fields[sweep][field_name].values)
+        self.assertEqual(len(consumed), int(full.nsweeps))
+        # each sweep is handed over before the radials of the next cut have been read
+        self.assertTrue(consumed[0] < consumed[1] < consumed[2] == len(data))
+        self.assertEqual(dbz_only, [(0, ["dBZ"]), (1, ["dBZ"]), (2, ["dBZ"])])
+
+    def test_iter_sweeps_reports_a_volume_cut_off_mid_sweep(self):
+        import io
+        from pycwr.io import iter_sweeps
+        from pycwr.io.BaseDataProtocol.WSR98DProtocol import dtype_98D
+
+        codes = np.arange(4, 16, dtype=np.uint8).reshape(3, 4)
+        data = _build_wsr98d_volume([_wsr98d_cut(elevation, azimuth=(0.0, 120.0, 240.0), moments=(_DBZ + (codes,),))
+                                     for elevation in (0.5, 1.5, 2.5)])
+        structure_size = lambda structure: struct.calcsize("<" + "".join(item[1] for item in structure))
+        radial_size = structure_size(dtype_98D.RadialHeader()) + structure_size(dtype_98D.RadialData()) + 4
+        self.assertEqual(len(list(iter_sweeps(io.BytesIO(data)))), 3)
+        # cut off after the first radial of the last cut, and exactly at the end of the second cut
+        for dropped in (2, 3):
+            yielded = []
+            with self.assertRaisesRegex(ValueError, "WSR98D cut 3 is truncated"):
+                for sweep, prd in iter_sweeps(io.BytesIO(data[:len(data) - dropped * radial_size])):
+                    yielded.append(sweep)
+            self.assertEqual(yielded, [0, 1])
+
+    def test_wsr98d_read_metadata_reports_header_summary_without_payloads(self):
+        from pycwr.io import read_metadata
+
+        cuts = [
+            _wsr98d_cut(0.5),
+            _wsr98d_cut(0.5, azimuth=(10.0, 170.0), moments=(_V, _W)),
+            _wsr98d_cut(1.5, moments=(_DBZ, _ZDR)),
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write_wsr98d_volume(tmpdir, cuts)
+            meta = read_metadata(str(path))
+
+        self.assertEqual(meta["format"], "WSR98D")
+        self.assertEqual(meta["site_code"], "Z9999")
+        self.assertEqual(meta["site_name"], "SYNTH")
+        self.assertEqual(meta["task_name"], "VCP21D")
+        self.assertEqual((meta["latitude"], meta["longitude"], meta["altitude"]), (30.0, 120.0, 50.0))
+        self.assertEqual(meta["start_time"], datetime.datetime(2023, 11, 14, 22, 13, 20))
+        self.assertEqual([cut["elevation"] for cut in meta["cuts"]], [0.5, 0.5, 1.5])
+        self.assertEqual({cut["log_resolution"] for cut in meta["cuts"]}, {250.0})
+        self.assertEqual(meta["fields"], ["dBZ", "V", "W"])
+
+    def test_async_reads_match_sync_reads_and_hold_slots_until_cancelled_reads_finish(self):
+        import asyncio
+        import threading
+        import xarray as xr
+        from unittest import mock
+        from pycwr.io import aread_auto, aread_metadata, read_auto, read_metadata
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking_read(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return None
+
+        async def main(path):
+            meta, prd = await asyncio.gather(aread_metadata(path), aread_auto(path, fields=["dBZ"]))
+            semaphore = asyncio.Semaphore(1)
+            with mock.patch("pycwr.io.read_auto", side_effect=blocking_read) as patched:
+                running = asyncio.ensure_future(aread_auto(path, semaphore=semaphore))
+                queued = asyncio.ensure_future(aread_auto(path, semaphore=semaphore))
+                await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+                running.cancel()
+                queued.cancel()
+                await asyncio.gather(running, queued, return_exceptions=True)
+                still_locked = semaphore.locked()
+                release.set()
+                await asyncio.wait_for(semaphore.acquire(), 5)
+            return meta, prd, still_locked, patched.call_count
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(_write_wsr98d_volume(tmpdir, [_wsr98d_cut()]))
+            meta, prd, still_locked, calls = asyncio.run(main(path))
+            self.assertEqual(meta, read_metadata(path))
+            xr.testing.assert_identical(prd.fields[0], read_auto(path, fields=["dBZ"]).fields[0])
+
+        self.assertTrue(still_locked)
+        self.assertEqual(calls, 1)
+
+    def test_read_auto_decompresses_bz2_archives_once_for_detection_and_decoding(self):
+        import bz2
+        from unittest import mock
+        from pycwr.io import read_auto, read_metadata
+
+        volume = _build_wsr98d_volume([_wsr98d_cut(elevation, moments=(_DBZ, _V)) for elevation in (0.5, 1.5)])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plain = Path(tmpdir) / _WSR98D_NAME
+            packed = Path(tmpdir) / (_WSR98D_NAME + ".bz2")
+            plain.write_bytes(volume)
+            packed.write_bytes(bz2.compress(volume))
+            expected = read_auto(str(plain))
+            with mock.patch("pycwr.io.util.bz2.BZ2File", wraps=bz2.BZ2File) as opened:
+                prd = read_auto(str(packed))
+                self.assertEqual(opened.call_count, 1)
+                meta = read_metadata(str(packed))
+                self.assertEqual(opened.call_count, 2)
+
+        self.assertEqual(meta["fields"], ["dBZ", "V"])
+        for sweep in range(2):
+            np.testing.assert_array_equal(prd.fields[sweep]["dBZ"].values, expected.fields[sweep]["dBZ"].values)
+            np.testing.assert_array_equal(prd.fields[sweep]["V"].values, expected.fields[sweep]["V"].values)
+
+    def test_write_wsr98d_packs_sweeps_that_read_back_identically(self):
+        from pycwr.io import read_auto, write_wsr98d
+        from pycwr.io.WSR98DFile import WSR98DBaseData
+
+        long_dbz = _DBZ + (np.arange(4, 20, dtype=np.uint8).reshape(2, 8),)
+        cuts = [
+            _wsr98d_cut(0.5, moments=(long_dbz, _ZDR)),
+            _wsr98d_cut(1.5, azimuth=(10.0, 190.0), moments=(long_dbz, _V)),
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write_wsr98d_volume(tmpdir, cuts)
+            prd = read_auto(str(path))
+            out = Path(tmpdir) / "export.bin"
+            write_wsr98d(prd, str(out))
+            roundtrip = read_auto(str(out))
+            base = WSR98DBaseData(str(out))
+
+        np.testing.assert_array_equal(base.radial_header["RadialState"], [3, 2, 0, 4])
+        np.testing.assert_array_equal(base.radial_header["SequenceNumber"], [1, 2, 3, 4])
+        np.testing.assert_array_equal(base.radial_header["ElevationNumber"], [1, 1, 2, 2])
+        self.assertEqual(roundtrip.nsweeps, prd.nsweeps)
+        for sweep in range(2):
+            np.testing.assert_array_equal(roundtrip.fields[sweep]["time"].values, prd.fields[sweep]["time"].values)
+            np.testing.assert_array_equal(roundtrip.fields[sweep]["azimuth"].values, prd.fields[sweep]["azimuth"].values)
+            for name in prd.available_fields(sweep=sweep, range_mode=None):
+                np.testing.assert_array_equal(
+                    roundtrip.get_sweep_field(sweep, name, range_mode=None).values,
+                    prd.get_sweep_field(sweep, name, range_mode=None).values,
+                )
+
+    def test_nexrad_writers_emit_bzip2_ldm_records_matching_the_uncompressed_stream(self):
+        import bz2
+        from pycwr.io import read_auto, write_nexrad_level2_msg1, write_nexrad_level2_msg31
+        from pycwr.io.NEXRADLevel2File import MSG31_HEADER_DTYPE, MSG_HEADER_DTYPE, RECORD_SIZE
+
+        cuts = [
+            _wsr98d_cut(0.5, moments=(_DBZ, _V, _W)),
+            _wsr98d_cut(1.5, azimuth=(10.0, 190.0), moments=(_DBZ, _V, _W)),
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write_wsr98d_volume(tmpdir, cuts)
+            prd = read_auto(str(path))
+            streams = {}
+            for writer in (write_nexrad_level2_msg31, write_nexrad_level2_msg1):
+                plain = Path(tmpdir) / "plain.ar2v"
+                packed = Path(tmpdir) / "packed.ar2v"
+                writer(prd, str(plain), overwrite=True)
+                writer(prd, str(packed), overwrite=True, compress=True, workers=2)
+                streams[writer.__name__] = (plain.read_bytes(), packed.read_bytes())
+
+        for name, (plain, packed) in streams.items():
+            self.assertEqual(packed[:24], plain[:24])
+            body, pos, records = b"", 24, 0
+            while pos < len(packed):
+                size = struct.unpack(">i", packed[pos:pos + 4])[0]
+                self.assertEqual(packed[pos + 4:pos + 7], b"BZh")
+                body += bz2.decompress(packed[pos + 4:pos + 4 + size])
+                pos, records = pos + 4 + size, records + 1
+            self.assertEqual(body, plain[24:], name)
+            # one metadata record, then one record per sweep of two radials
+            self.assertEqual(records, 3, name)
+
+        plain = streams["write_nexrad_level2_msg31"][0]
+        offset = 24 + 12 + RECORD_SIZE
+        states = []
+        for _ in range(4):
+            message = np.frombuffer(plain, dtype=MSG_HEADER_DTYPE, count=1, offset=offset)[0]
+            radial = np.frombuffer(plain, dtype=MSG31_HEADER_DTYPE, count=1, offset=offset + 16)[0]
+            self.assertEqual(message["type"], 31)
+            states.append((int(radial["elevation_number"]), int(radial["azimuth_number"]), int(radial["cut_sector"])))
+            offset += 16 + int(message["size"]) * 2 - 4
+        self.assertEqual(states, [(1, 1, 3), (1, 2, 2), (2, 1, 0), (2, 2, 4)])
+
+    def test_nexrad_reader_round_trips_written_archives_with_field_and_sweep_selection(self):
+        from pycwr.io import read_auto, read_metadata, write_nexrad_level2_msg1, write_nexrad_level2_msg31
+
+        # codes 0-4 exercise the no-data gates of every moment
+        codes = np.arange(0, 8, dtype=np.uint8).reshape(2, 4)
+        moments = (_DBZ + (np.arange(4, 20, dtype=np.uint8).reshape(2, 8),), _V + (codes,), _W + (codes,),
+                   _ZDR + (codes,))
+        cuts = [_wsr98d_cut(0.5, moments=moments), _wsr98d_cut(1.5, azimuth=(10.0, 190.0), moments=moments)]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write_wsr98d_volume(tmpdir, cuts)
+            prd = read_auto(str(path))
+            plain = Path(tmpdir) / "KPYC20231114_221320_V06"
+            packed = Path(tmpdir) / "KPYC20231114_221320_V06.ldm"
+            legacy = Path(tmpdir) / "KPYC20231114_221320"
+            write_nexrad_level2_msg31(prd, str(plain), icao="KPYC")
+            write_nexrad_level2_msg31(prd, str(packed), icao="KPYC", compress=True)
+            write_nexrad_level2_msg1(prd, str(legacy), icao="KPYC")
+
+            volumes = [read_auto(str(plain)), read_auto(str(packed))]
+            subset = read_auto(str(packed), fields=["V"], sweeps=[1])
+            msg1 = read_auto(str(legacy), station_lon=120.0, station_lat=30.0, station_alt=50.0)
+            metadata = read_metadata(str(packed))
+            with self.assertRaisesRegex(ValueError, "no site location"):
+                read_auto(str(legacy))
+
+        for volume in volumes + [msg1]:
+            self.assertEqual(volume.metadata["original_container"], "NEXRAD_LEVEL2")
+            self.assertEqual(volume.sitename, "KPYC")
+            self.assertEqual(volume.nsweeps, 2)
+            np.testing.assert_allclose(volume.scan_info["fixed_angle"].values, [0.5, 1.5], atol=0.01)
+            self.assertEqual(float(volume.scan_info["latitude"].values), float(prd.scan_info["latitude"].values))
+            fields = ("dBZ", "V", "W", "ZDR") if volume is not msg1 else ("dBZ", "V", "W")
+            self.assertEqual(sorted(volume.fields[0].data_vars), sorted(fields))
+            for sweep in range(2):
+                np.testing.assert_allclose(volume.fields[sweep]["azimuth"].values, prd.fields[sweep]["azimuth"].values,
+                                           atol=0.01)
+                for name in fields:
+                    expected = prd.get_sweep_field(sweep, name, range_mode=None)
+                    actual = volume.get_sweep_field(sweep, name, range_mode=None)
+                    bins = 4 if volume is msg1 else expected.shape[1]
+                    np.testing.assert_array_equal(actual["range"].values[:bins], expected["range"].values[:bins])
+                    np.testing.assert_array_equal(actual.values[:, :bins], expected.values[:, :bins])
+        # reflectivity past the Doppler range keeps its native gates, as in the source volume
+        self.assertEqual(volumes[0].get_sweep_field(0, "dBZ", range_mode=None).shape, (2, 8))
+        self.assertEqual(volumes[0].fields[0]["dBZ"].shape, (2, 4))
+
+        self.assertEqual(subset.nsweeps, 1)
+        self.assertEqual(list(subset.fields[0].data_vars), ["V"])
+        np.testing.assert_allclose(subset.scan_info["fixed_angle"].values, [1.5], atol=0.01)
+        np.testing.assert_array_equal(subset.fields[0]["V"].values, prd.fields[1]["V"].values)
+
+        self.assertEqual(metadata["format"], "NEXRAD_LEVEL2")
+        self.assertEqual(metadata["site_code"], "KPYC")
+        self.assertEqual(metadata["fields"], ["dBZ", "V", "W", "ZDR"])
+        self.assertEqual(len(metadata["cuts"]), 2)
+
+    def test_read_auto_cache_dir_reloads_identical_volume_and_evicts_by_size(self):
+        import os
+        import xarray as xr
+        from unittest import mock
+        from pycwr.io import read_auto
+
+        long_dbz = _DBZ + (np.arange(4, 20, dtype=np.uint8).reshape(2, 8),)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_dir = Path(tmpdir) / "cache"
+            path = _write_wsr98d_volume(tmpdir, [_wsr98d_cut(elevation, moments=(long_dbz, _V))
+                                                 for elevation in (0.5, 1.5)])
+            decoded = read_auto(str(path), cache_dir=str(cache_dir))
+            with mock.patch("pycwr.io.radar_format", side_effect=AssertionError("cache miss")):
+                cached = read_auto(str(path), cache_dir=str(cache_dir))
+            dbz_only = read_auto(str(path), cache_dir=str(cache_dir), fields=["dBZ"])
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+            read_auto(str(path), cache_dir=str(cache_dir), sweeps=[1], cache_max_bytes=1)
+            self.assertEqual(len(os.listdir(cache_dir)), 0)
+
+        self.assertEqual(list(dbz_only.fields[0].data_vars), ["dBZ"])
+        xr.testing.assert_identical(cached.scan_info, decoded.scan_info)
+        self.assertEqual(cached.metadata, decoded.metadata)
+        self.assertEqual(sorted(cached.extended_fields["dBZ"]), [0, 1])
+        np.testing.assert_array_equal(
+            cached.extended_fields["dBZ"][1]["data"], decoded.extended_fields["dBZ"][1]["data"]
+        )
+        for sweep in range(2):
+            xr.testing.assert_identical(cached.fields[sweep], decoded.fields[sweep])
+
+    def test_read_many_returns_volumes_in_order_with_shared_memory_fields(self):
+        import os
+        import xarray as xr
+        from pycwr.io import read_auto, read_many
+        from pycwr.core.shared_arrays import SharedBuffer
+        from pycwr.io.batch import SHARED_MEMORY_RESULTS
+
+        paths = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for index, elevation in enumerate((0.5, 1.5, 2.4)):
+                cut = _wsr98d_cut(elevation, moments=(_DBZ + (_SAMPLE_CODES + index,), _V))
+                name = "Z_RADR_I_Z9999_2023111422132%d_O_DOR_SAD_CAP_FMT.bin" % index
+                paths.append(str(_write_wsr98d_volume(tmpdir, [cut], name=name)))
+            volumes = read_many(paths, workers=2, fields=["dBZ"])
+            expected = [read_auto(path, fields=["dBZ"]) for path in paths]
+            with self.assertRaises(ValueError):
+                read_many(paths, workers=0)
+
+        self.assertEqual(len(volumes), 3)
+        for volume, reference in zip(volumes, expected):
+            self.assertEqual(list(volume.fields[0].data_vars), ["dBZ"])
+            xr.testing.assert_identical(volume.scan_info, reference.scan_info)
+            xr.testing.assert_identical(volume.fields[0], reference.fields[0])
+        if SHARED_MEMORY_RESULTS:
+            base = volumes[0].fields[0]["dBZ"].values
+            while not isinstance(base, SharedBuffer):
+                base = base.base
+            block_name = base._block.name
+            self.assertFalse(os.path.exists("/dev/shm/" + block_name))
+
+    def test_read_many_unlinks_every_block_when_rebuilding_a_volume_fails(self):
+        import os
+        from unittest import mock
+
+        from pycwr.io import batch, read_many
+
+        if not batch.SHARED_MEMORY_RESULTS or not os.path.isdir("/dev/shm"):
+            self.skipTest("volumes are not returned through /dev/shm on this platform")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for index in range(3):
+                cut = _wsr98d_cut(moments=(_DBZ + (_SAMPLE_CODES + index,),))
+                name = "Z_RADR_I_Z9999_2023111422132%d_O_DOR_SAD_CAP_FMT.bin" % index
+                paths.append(str(_write_wsr98d_volume(tmpdir, [cut], name=name)))
+            before = set(os.listdir("/dev/shm"))
+            with mock.patch.object(batch, "_rebuild_prd", side_effect=RuntimeError("rebuild failed")):
+                with self.assertRaises(RuntimeError):
+                    read_many(paths, workers=2)
+        self.assertEqual(set(os.listdir("/dev/shm")) - before, set())
+
 
 class SABRegressionTests(unittest.TestCase):
     def test_sab_sample_regressions(self):
@@ -130,6 +673,196 @@ class SABRegressionTests(unittest.TestCase):
                     self.assertAlmostEqual(float(np.nanmean(arr)), field_expected["nanmean"])
                     self.assertEqual(int(np.isnan(arr).sum()), field_expected["nancount"])
 
+    def test_sab_bulk_decoder_scales_gate_blocks_and_fills_doppler_only_sweeps(self):
+        from pycwr.io import read_auto
+
+        def decode(codes, base):
+            return np.where(codes > 1, (codes.astype(np.float32) - 2.0) / 2.0 + base, np.nan)
+
+        dbz_low = np.array([[0, 1, 66], [70, 80, 90], [100, 110, 120], [130, 140, 150]], dtype=np.uint8)
+        dbz_high = dbz_low[::-1].copy()
+        velocity = np.arange(32, dtype=np.uint8).reshape(4, 8) * 4
+        width = velocity[::-1].copy()
+        cuts = [
+            {"elevation": 0.5, "azimuth": [0.0, 90.0, 180.0, 270.0], "dBZ": dbz_low},
+            {"elevation": 0.5, "azimuth": [1.0, 91.0, 181.0, 271.0], "V": velocity, "W": width},
+            {"elevation": 1.5, "azimuth": [0.0, 90.0, 180.0, 270.0], "dBZ": dbz_high, "V": velocity, "W": width},
+        ]
+        # 1000 m reflectivity gates starting at 250 m, nearest to the 250 m Doppler gates
+        nearest = [0, 0, 0, 1, 1, 1, 1, 2]
+        for record_size in (2432, 4132):
+            with self.subTest(record_size=record_size), tempfile.TemporaryDirectory() as tmpdir:
+                path = Path(tmpdir) / "Z_RADR_I_Z9517_20170811180500_O_DOR_SA_CAP.bin"
+                path.write_bytes(_build_sab_volume(cuts, record_size))
+                prd = read_auto(str(path))
+
+                self.assertEqual((int(prd.nrays), int(prd.nsweeps)), (8, 2))
+                for sweep, dbz in ((0, dbz_low), (1, dbz_high)):
+                    np.testing.assert_array_equal(prd.fields[sweep]["V"].values, decode(velocity, -63.5))
+                    np.testing.assert_array_equal(prd.fields[sweep]["W"].values, decode(width, -63.5))
+                    np.testing.assert_array_equal(prd.fields[sweep]["dBZ"].values, decode(dbz, -32.0)[:, nearest])
+                self.assertEqual(prd.scan_info["fixed_angle"].values.size, 2)
+                self.assertEqual(prd.fields[0]["time"].values[1], np.datetime64("2017-08-11T00:00:01"))
+
+
+    def test_sab_quantized_read_keeps_native_codes_and_decodes_on_access(self):
+        from pycwr.io import read_auto
+
+        dbz = np.array([[0, 1, 66], [70, 80, 90], [100, 110, 120], [130, 140, 255]], dtype=np.uint8)
+        velocity = np.arange(32, dtype=np.uint8).reshape(4, 8) * 8
+        cuts = [
+            {"elevation": 0.5, "azimuth": [0.0, 90.0, 180.0, 270.0], "dBZ": dbz},
+            {"elevation": 0.5, "azimuth": [1.0, 91.0, 181.0, 271.0], "V": velocity, "W": velocity},
+            {"elevation": 1.5, "azimuth": [0.0, 90.0, 180.0, 270.0], "dBZ": dbz, "V": velocity, "W": velocity},
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "Z_RADR_I_Z9517_20170811180500_O_DOR_SA_CAP.bin"
+            path.write_bytes(_build_sab_volume(cuts))
+            expected = read_auto(str(path))
+            packed = read_auto(str(path), quantized=True)
+
+        self.assertIsNone(packed.vol)
+        for sweep in range(int(packed.nsweeps)):
+            for field_name in ("dBZ", "V", "W"):
+                field = packed.fields[sweep][field_name]
+                self.assertEqual(field.encoding["dtype"], np.dtype(np.uint8))
+                self.assertEqual(field.dtype, np.float32)
+                self.assertEqual(field.attrs["units"], expected.fields[sweep][field_name].attrs["units"])
+                np.testing.assert_array_equal(field.values, expected.fields[sweep][field_name].values)
+        packed.get_vol_data()
+        expected.get_vol_data()
+        for packed_value, expected_value in zip(packed.vol[3], expected.vol[3]):
+            np.testing.assert_array_equal(packed_value, expected_value)
+
+        cc = np.array([[0.985, np.nan, 0.2], [1.0, 0.5, 7.5]], dtype=np.float32)
+        expected.fields[0]["CC"] = (("time", "range"), np.pad(cc, ((0, 2), (0, 5)), constant_values=np.nan))
+        expected.quantize_fields()
+        packed_cc = expected.fields[0]["CC"]
+        self.assertEqual(packed_cc.encoding["dtype"], np.dtype(np.uint16))
+        np.testing.assert_allclose(packed_cc.values[:2, :3], [[0.985, np.nan, 0.2], [1.0, 0.5, 6.5534]], atol=5e-5)
+        self.assertEqual(expected.fields[0]["dBZ"].encoding["dtype"], np.dtype(np.uint16))
+
+    def test_sc_and_cc_quantized_reads_use_their_native_codes(self):
+        import sys
+
+        from pycwr.io import read_auto
+
+        sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+        try:
+            import synthetic
+        finally:
+            sys.path.pop(0)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sc_path = synthetic.generate("SC", tmpdir, cuts=2, gates=100)
+            cc_path = synthetic.generate("CC", tmpdir, cuts=2, rays=60)
+            reads = {name: (read_auto(path), read_auto(path, quantized=True))
+                     for name, path in (("SC", sc_path), ("CC", cc_path))}
+
+        for radar_format, code_dtype in (("SC", np.uint8), ("CC", np.int16)):
+            expected, packed = reads[radar_format]
+            for sweep in range(int(packed.nsweeps)):
+                for field_name in expected.fields[sweep].data_vars:
+                    field = packed.fields[sweep][field_name]
+                    self.assertEqual(field.encoding["dtype"], np.dtype(code_dtype))
+                    if radar_format == "SC":
+                        np.testing.assert_array_equal(field.values, expected.fields[sweep][field_name].values)
+                    else:
+                        # tenths of a unit decoded in float32 may differ in the last bit
+                        np.testing.assert_allclose(field.values, expected.fields[sweep][field_name].values,
+                                                   rtol=1e-6, atol=0)
+
+    def test_cached_quantized_reads_pack_with_the_reader_encoding(self):
+        import sys
+
+        from pycwr.io import read_auto
+
+        sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+        try:
+            import synthetic
+        finally:
+            sys.path.pop(0)
+
+        dbz = np.array([[0, 1, 66], [70, 80, 90], [100, 110, 120], [130, 140, 255]], dtype=np.uint8)
+        velocity = np.arange(32, dtype=np.uint8).reshape(4, 8) * 8
+        cuts = [
+            {"elevation": 0.5, "azimuth": [0.0, 90.0, 180.0, 270.0], "dBZ": dbz, "V": velocity, "W": velocity},
+            {"elevation": 1.5, "azimuth": [0.0, 90.0, 180.0, 270.0], "dBZ": dbz, "V": velocity, "W": velocity},
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sab_path = Path(tmpdir) / "Z_RADR_I_Z9517_20170811180500_O_DOR_SA_CAP.bin"
+            sab_path.write_bytes(_build_sab_volume(cuts))
+            sc_path = synthetic.generate("SC", tmpdir, cuts=2, gates=100)
+            cache_dir = Path(tmpdir) / "cache"
+            for path in (str(sab_path), sc_path):
+                expected = read_auto(path, quantized=True)
+                # the first cached read decodes and stores the volume, the second reloads it
+                for cached in (read_auto(path, cache_dir=cache_dir, quantized=True) for _ in range(2)):
+                    for sweep in range(int(expected.nsweeps)):
+                        for field_name in expected.fields[sweep].data_vars:
+                            field = cached.fields[sweep][field_name]
+                            reference = expected.fields[sweep][field_name]
+                            self.assertEqual(field.encoding["dtype"], np.dtype(np.uint8))
+                            for key in ("dtype", "scale_factor", "add_offset", "_FillValue"):
+                                self.assertEqual(field.encoding[key], reference.encoding[key])
+                            np.testing.assert_array_equal(field.values, reference.values)
+
+
+class BenchmarkRegressionTests(unittest.TestCase):
+    def test_benchmark_synthetic_volumes_read_back_with_stage_timings(self):
+        import sys
+
+        sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+        try:
+            import bench_readers
+            import synthetic
+        finally:
+            sys.path.pop(0)
+
+        # small shapes; CC and SC radials have a fixed layout
+        shapes = {"CC": {"rays": 60, "gates": 500}, "SC": {"rays": 360, "gates": 100}}
+        expected_formats = {"NEXRAD": "NEXRAD_LEVEL2", "NEXRAD_LDM": "NEXRAD_LEVEL2", "NEXRAD_MSG1": "NEXRAD_LEVEL2"}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for radar_format in synthetic.GENERATORS:
+                options = dict({"cuts": 2, "rays": 60, "gates": 100}, **shapes.get(radar_format, {}))
+                compression = "gz" if radar_format in ("WSR98D", "SAB") else "none"
+                path = bench_readers.prepare_case(radar_format, compression, tmpdir, options)
+                result = bench_readers.run_case(radar_format, compression, path, 1, False)
+                self.assertEqual(result["format"], expected_formats.get(radar_format, radar_format))
+                self.assertEqual(result["nsweeps"], 2)
+                self.assertEqual(result["nrays"], 2 * options["rays"])
+                self.assertEqual(set(result["stages_s"]), set(bench_readers.STAGES))
+                self.assertGreater(result["decoded_mb"], result["input_mb"] if compression == "gz" else 0.0)
+            with self.assertRaises(ValueError):
+                synthetic.generate("CC", tmpdir, gates=100)
+
+    def test_benchmark_charges_inflation_to_the_decompress_stage(self):
+        import sys
+        from unittest import mock
+
+        from pycwr.io import util
+
+        sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+        try:
+            import bench_readers
+        finally:
+            sys.path.pop(0)
+
+        detect_sizes = []
+
+        def recording_radar_format(filename):
+            # the decompressed size must already be known when detection starts
+            detect_sizes.append(util._SHARED_DECODING.get()["source"]._size)
+            return radar_format(filename)
+
+        radar_format = util.radar_format
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = bench_readers.prepare_case("SAB", "gz", tmpdir, {"cuts": 2, "rays": 60, "gates": 100})
+            with mock.patch("pycwr.io.util.radar_format", side_effect=recording_radar_format):
+                result = bench_readers.measure_read(path)
+        self.assertEqual(result["format"], "SAB")
+        self.assertEqual(detect_sizes, [result["decoded_bytes"]])
+
 
 if __name__ == "__main__":
     unittest.main()
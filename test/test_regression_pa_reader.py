@@ -1,9 +1,50 @@
+import gc
+import struct
+import tempfile
 import unittest
+import warnings
 from pathlib import Path
 
 import numpy as np
 
 
+def _build_pa_volume(cuts):
+    """Assemble a minimal PA file; each cut lists radial numbers and (data_type, scale, offset, codes) moments."""
+    from pycwr.io.BaseDataProtocol.PAProtocol import dtype_PA
+
+    def fmt(structure):
+        return "<" + "".join(item[1] for item in structure)
+
+    header = dtype_PA.BaseDataHeader
+    blocks = [
+        struct.pack(fmt(header["GenericHeaderBlock"]), 1297371986, 1, 0, 16, 0, b""),
+        struct.pack(fmt(header["SiteConfigurationBlock"]), b"ZA460", b"SYNTH", 30.0, 120.0, 50, 40,
+                    9400.0, 1.0, 1.0, 1, 1, b""),
+        struct.pack(fmt(header["TaskConfigurationBlock"]), b"PA", b"", 3, 0, 1, len(cuts), 1, 1700000000, b""),
+        np.zeros(1, dtype=header["BeamConfigurationBlock"]).tobytes(),
+    ]
+    cut_config = np.zeros(len(cuts), dtype=header["CutConfigurationBlock"])
+    cut_config["Elevation"] = [0.75 + 1.5 * icut for icut in range(len(cuts))]
+    cut_config["LogResolution"] = 30
+    cut_config["DopplerResolution"] = 30
+    blocks.append(cut_config.tobytes())
+    sequence = 0
+    for icut, cut in enumerate(cuts):
+        for radial_number, moments in zip(cut["radial_number"], cut["moments"]):
+            payload = b""
+            for data_type, scale, offset, codes in moments:
+                data = codes.tobytes()
+                payload += struct.pack(fmt(dtype_PA.RadialData()), data_type, scale, offset, codes.itemsize, 0,
+                                       len(data), b"")
+                payload += data
+            sequence += 1
+            blocks.append(struct.pack(fmt(dtype_PA.RadialHeader()), 1, 0, sequence, radial_number, icut + 1,
+                                      3.0 * radial_number, 0.75 + 1.5 * icut, 1700000000 + sequence, 0,
+                                      len(payload), len(moments), 0, 0, 0, 0, b""))
+            blocks.append(payload)
+    return b"".join(blocks)
+
+
 class PAReaderRegressionTests(unittest.TestCase):
     @staticmethod
     def _sample_path():
@@ -130,3 +171,57 @@ class PAReaderRegressionTests(unittest.TestCase):
         for sweep_index, expected_counts in zip((0, 1, 38), base_counts):
             for field_name, expected in expected_counts.items():
                 self.assertEqual(finite_count(prd.fields[sweep_index], field_name), expected)
+
+    def test_pa_bulk_decoder_scales_moments_and_drops_radials_without_named_moments(self):
+        from pycwr.io import read_PA
+        from pycwr.io.PAFile import PABaseData
+
+        dbt = np.array([[0, 4, 5, 70], [80, 90, 100, 110], [120, 130, 140, 150]], dtype=np.uint8)
+        velocity = np.array([[0, 32768, 32868, 32668]] * 3, dtype="<u2")
+        unnamed = (60, 1, 0, np.arange(6, dtype=np.uint8))
+        cut = {
+            "radial_number": [1, 2, 3],
+            "moments": [
+                [(1, 2, 66, dbt[0]), unnamed, (3, 100, 32768, velocity[0])],
+                [(1, 4, 66, dbt[1]), (3, 100, 32768, velocity[1])],
+                [(1, 2, 66, dbt[2]), (3, 100, 32768, velocity[2])],
+            ],
+        }
+        second = dict(cut, radial_number=[1, 2, 3, 4], moments=cut["moments"] + [[unnamed]])
+        expected_dbt = np.where(dbt >= 5, (dbt - 66.0) / np.array([[2.0], [4.0], [2.0]]), np.nan).astype(np.float32)
+        expected_v = np.where(velocity >= 5, (velocity - 32768.0) / 100.0, np.nan).astype(np.float32)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "Z_RADR_I_ZA460_20240808142000_O_DOR-XPD-CAP-FMT.BIN"
+            path.write_bytes(_build_pa_volume([cut, second]))
+            base = PABaseData(str(path))
+            prd = read_PA(str(path))
+            path.write_bytes(_build_pa_volume([dict(cut, radial_number=[1, 1, 2]), second]))
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always", ResourceWarning)
+                with self.assertRaises(ValueError):
+                    PABaseData(str(path))
+                gc.collect()
+            self.assertEqual([item for item in caught if issubclass(item.category, ResourceWarning)], [])
+
+        np.testing.assert_array_equal(base.sweep_start_ray_index, [0, 3])
+        np.testing.assert_array_equal(base.sweep_end_ray_index, [2, 5])
+        self.assertEqual(base.radial[1]["field_bins"], {"dBT": 4, "V": 4})
+        for sweep in range(2):
+            np.testing.assert_array_equal(prd.fields[sweep]["dBT"].values, expected_dbt)
+            np.testing.assert_array_equal(prd.fields[sweep]["V"].values, expected_v)
+
+    def test_iter_sweeps_splits_pa_cuts_on_radial_numbering_without_end_states(self):
+        from pycwr.io import iter_sweeps, read_PA
+
+        codes = np.arange(5, 13, dtype=np.uint8).reshape(2, 4)
+        cut = {"radial_number": [1, 2], "moments": [[(2, 2, 66, codes[0])], [(2, 2, 66, codes[1])]]}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "Z_RADR_I_ZA460_20240808142000_O_DOR-XPD-CAP-FMT.BIN"
+            path.write_bytes(_build_pa_volume([cut, cut, cut]))
+            full = read_PA(str(path))
+            streamed = list(iter_sweeps(str(path)))
+
+        self.assertEqual([sweep for sweep, _ in streamed], [0, 1, 2])
+        for sweep, prd in streamed:
+            self.assertEqual(float(prd.scan_info.fixed_angle.values[0]), float(full.scan_info.fixed_angle.values[sweep]))
+            np.testing.assert_array_equal(prd.fields[0]["dBZ"].values, full.fields[sweep]["dBZ"].values)
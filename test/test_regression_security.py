@@ -1,5 +1,7 @@
 import bz2
+import gzip
 import io
+import struct
 import tempfile
 import unittest
 import zipfile
@@ -14,6 +16,76 @@ class ReaderSecurityTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             _read_all(io.BytesIO(b"0123456789"), "test payload", max_bytes=8)
 
+    def test_read_all_maps_uncompressed_files_and_copies_compressed_streams(self):
+        import os
+
+        from pycwr.io.util import MMAP_SETTLE_SECONDS, _prepare_for_read, _read_all
+
+        payload = b"RSTM" + bytes(range(256)) * 4
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plain = Path(tmpdir) / "plain.bin"
+            packed = Path(tmpdir) / "packed.bin.bz2"
+            plain.write_bytes(payload)
+            packed.write_bytes(bz2.compress(payload))
+
+            # a file that may still be receiving writes is copied rather than mapped
+            fh = _prepare_for_read(str(plain))
+            try:
+                self.assertEqual(_read_all(fh, "test payload"), payload)
+            finally:
+                fh.close()
+            settled = plain.stat().st_mtime - 2 * MMAP_SETTLE_SECONDS
+            os.utime(plain, (settled, settled))
+
+            fh = _prepare_for_read(str(plain))
+            try:
+                self.assertEqual(fh.read(4), b"RSTM")
+                mapped = _read_all(fh, "test payload")
+                self.assertIsInstance(mapped, memoryview)
+                self.assertTrue(mapped.readonly)
+                self.assertEqual(bytes(mapped), payload[4:])
+                with self.assertRaises(ValueError):
+                    fh.seek(0)
+                    _read_all(fh, "test payload", max_bytes=8)
+                mapped.release()
+            finally:
+                fh.close()
+
+            fh = _prepare_for_read(str(packed))
+            try:
+                self.assertEqual(_read_all(fh, "test payload"), payload)
+            finally:
+                fh.close()
+
+    def test_replacing_writes_leave_mapped_readers_on_the_previous_file(self):
+        import os
+
+        from pycwr.io.util import MMAP_SETTLE_SECONDS, _open_for_replace, _prepare_for_read, _read_all
+
+        payload = b"RSTM" + bytes(range(256)) * 16
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "volume.bin"
+            path.write_bytes(payload)
+            settled = path.stat().st_mtime - 2 * MMAP_SETTLE_SECONDS
+            os.utime(path, (settled, settled))
+            fh = _prepare_for_read(str(path))
+            try:
+                mapped = _read_all(fh, "test payload")
+                self.assertIsInstance(mapped, memoryview)
+                with _open_for_replace(path) as handle:
+                    handle.write(b"RSTM")
+                # an in-place truncation would make this access raise SIGBUS
+                self.assertEqual(bytes(mapped), payload)
+                mapped.release()
+            finally:
+                fh.close()
+            with self.assertRaises(RuntimeError):
+                with _open_for_replace(path) as handle:
+                    handle.write(b"partial")
+                    raise RuntimeError("writer failed")
+            self.assertEqual(path.read_bytes(), b"RSTM")
+            self.assertEqual(os.listdir(tmpdir), ["volume.bin"])
+
     def test_wsr98d_reader_uses_larger_payload_cap_for_real_world_archives(self):
         from pycwr.io.WSR98DFile import WSR98DBaseData, WSR98D_MAX_DECODED_PAYLOAD_BYTES
 
@@ -21,10 +93,11 @@ class ReaderSecurityTests(unittest.TestCase):
         reader.fid = io.BytesIO(b"")
 
         with mock.patch("pycwr.io.WSR98DFile._read_all", return_value=b"") as read_all:
-            radial, status, azimuth, elevation, seconds, microseconds = reader._parse_radial()
+            radial_header, radial_offset, moment_index, field_data, field_bins = reader._parse_radial()
 
-        self.assertEqual(radial, [])
-        self.assertEqual(status.size, 0)
+        self.assertEqual(field_data, {})
+        self.assertEqual(radial_header.size, 0)
+        self.assertEqual(moment_index.size, 0)
         self.assertEqual(read_all.call_args.kwargs["max_bytes"], WSR98D_MAX_DECODED_PAYLOAD_BYTES)
 
     def test_pa_signature_uses_explicit_validation(self):
@@ -37,21 +110,19 @@ class ReaderSecurityTests(unittest.TestCase):
             reader._check_standard_basedata()
 
     def test_sab_rejects_out_of_bounds_field_offsets(self):
-        from pycwr.io.SABFile import SABBaseData
+        from pycwr.io.SABFile import SABBaseData, _SAB_RADIAL_HEADER_DTYPE
 
+        radial_buf = bytearray(2432)
+        for name, value in (("GatesNumberOfReflectivity", 10), ("PtrOfReflectivity", 4096), ("GatesNumberOfDoppler", 10)):
+            offset = _SAB_RADIAL_HEADER_DTYPE.fields[name][1]
+            radial_buf[offset:offset + 2] = value.to_bytes(2, "little")
         reader = SABBaseData.__new__(SABBaseData)
-        radial_buf = b"\x00" * 2432
-        header = {
-            "GatesNumberOfReflectivity": 10,
-            "PtrOfReflectivity": 4096,
-            "GatesNumberOfDoppler": 10,
-            "PtrOfVelocity": 0,
-            "PtrOfSpectrumWidth": 0,
-        }
-
-        with mock.patch("pycwr.io.SABFile._unpack_from_buf", return_value=(header, 128)):
-            with self.assertRaises(ValueError):
-                reader._parse_radial_single(radial_buf)
+        reader._raw_buf = bytes(radial_buf)
+        reader.RadialNum, reader.nrays = 2432, 1
+        reader.selected_fields = None
+
+        with self.assertRaises(ValueError):
+            reader._parse_radial()
 
     def test_radar_format_returns_none_for_unrelated_archive(self):
         from pycwr.io.util import radar_format
@@ -71,6 +142,37 @@ class ReaderSecurityTests(unittest.TestCase):
             bogus.write_bytes(bytes(payload))
             self.assertIsNone(radar_format(str(bogus)))
 
+    def test_shared_decoding_keeps_memory_bounded_on_decompression_bombs(self):
+        import tracemalloc
+
+        from pycwr.io import read_auto
+        from pycwr.io.util import _prepare_for_read, _read_all, _shared_decoding
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bomb = Path(tmpdir) / "bomb.bin.gz"
+            header = bytearray(1024 * 1024)
+            header[14:16] = b"\x01\x00"
+            with gzip.open(bomb, "wb", compresslevel=1) as fh:
+                fh.write(bytes(header))
+                for _ in range(63):
+                    fh.write(bytes(1024 * 1024))
+                fh.write(b"\x00")
+
+            tracemalloc.start()
+            try:
+                # the SAB size check counts the 64 MiB without keeping them
+                with self.assertRaises(TypeError):
+                    read_auto(str(bomb))
+                with _shared_decoding(str(bomb)):
+                    fh = _prepare_for_read(str(bomb))
+                    with self.assertRaises(ValueError):
+                        _read_all(fh, "bomb payload", max_bytes=4 * 1024 * 1024)
+                    fh.close()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        self.assertLess(peak, 16 * 1024 * 1024)
+
     def test_radar_format_identifies_ar2v_archive_without_station_fallback(self):
         from pycwr.io import read_auto
         from pycwr.io.util import radar_format
@@ -80,9 +182,19 @@ class ReaderSecurityTests(unittest.TestCase):
             sample.write_bytes(bz2.compress(b"AR2V0006.589" + b"\x00" * 256))
 
             self.assertEqual(radar_format(str(sample)), "NEXRAD_LEVEL2")
-            with self.assertRaisesRegex(TypeError, "NEXRAD Level II archive import is not implemented"):
+            with self.assertRaisesRegex(ValueError, "holds no MSG31 or MSG1 radials"):
                 read_auto(str(sample))
 
+            header = b"AR2V0006.589" + b"\x00" * 8 + b"KTLX"
+            record = bz2.compress(b"\x00" * 2444)
+            truncated = Path(tmpdir) / "KTLX20190809_065521_V06"
+            truncated.write_bytes(header + struct.pack(">i", len(record)) + record[:-8])
+            with self.assertRaisesRegex(ValueError, "NEXRAD LDM record is truncated"):
+                read_auto(str(truncated))
+            truncated.write_bytes(header + struct.pack(">i", len(record)) + b"BZh9" + b"\x00" * (len(record) - 4))
+            with self.assertRaisesRegex(ValueError, "not a valid bzip2 stream"):
+                read_auto(str(truncated))
+
     def test_prepare_for_read_wraps_single_member_zip_with_seek_support(self):
         from pycwr.io.util import _prepare_for_read
 
@@ -227,6 +339,53 @@ class WebViewerSecurityTests(unittest.TestCase):
             self.assertEqual(stations[0]["file_count"], 2)
             self.assertEqual(stations[0]["files"][0]["scan_time"], "2026-03-17T06:59:28")
 
+    def test_api_catalog_reads_headers_only_for_files_whose_names_lack_station_or_time(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            allowed = Path(tmpdir)
+            (allowed / "Z_RADR_I_Z9046_20260317065928_O_DOR_SAD_CAP_FMT.bin.bz2").write_bytes(b"RSTM" + b"\x00" * 128)
+            (allowed / "sample.bin").write_bytes(b"RSTM" + b"\x00" * 128)
+            app = self._create_app(tmpdir)
+            client = app.test_client()
+            metadata = {"site_code": "Z9250", "site_name": "Synthetic", "start_time": None}
+            with mock.patch("pycwr.GraphicalInterface.web_app.read_metadata", return_value=metadata) as probe:
+                for _ in range(2):
+                    response = client.get(
+                        "/api/catalog",
+                        query_string={"dir": str(allowed), "token": "test-token"},
+                    )
+                    self.assertEqual(response.status_code, 200)
+
+            # the dated file is never probed, the undated one once across both requests
+            self.assertEqual([Path(call.args[0]).name for call in probe.call_args_list], ["sample.bin"])
+            stations = response.get_json()["catalog"]["stations"]
+            self.assertEqual([(item["station_id"], item["station_name"]) for item in stations],
+                             [("Z9046", "Z9046"), ("Z9250", "Synthetic")])
+
+    def test_api_catalog_takes_station_and_time_from_the_archive_index(self):
+        try:
+            from pycwr.GraphicalInterface.web_app import create_app
+        except ImportError as exc:  # pragma: no cover
+            self.skipTest(f"Flask viewer dependencies are unavailable: {exc}")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            allowed = Path(tmpdir) / "data"
+            allowed.mkdir()
+            (allowed / "Z_RADR_I_Z9046_20260317065928_O_DOR_SAD_CAP_FMT.bin.bz2").write_bytes(b"RSTM" + b"\x00" * 128)
+            (allowed / "sample.bin").write_bytes(b"RSTM" + b"\x00" * 128)
+            app = create_app(allowed_roots=[str(allowed)], auth_token="test-token",
+                             index_path=Path(tmpdir) / "index.sqlite")
+            client = app.test_client()
+            with mock.patch("pycwr.GraphicalInterface.web_app.read_metadata") as probe:
+                response = client.get(
+                    "/api/catalog",
+                    query_string={"dir": str(allowed), "token": "test-token"},
+                )
+
+            self.assertEqual(response.status_code, 200)
+            probe.assert_not_called()
+            stations = response.get_json()["catalog"]["stations"]
+            self.assertEqual([item["station_id"] for item in stations], ["UNKNOWN", "Z9046"])
+            self.assertEqual(stations[1]["files"][0]["scan_time"], "2026-03-17T06:59:28")
+
     def test_default_app_allows_local_directory_scan(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             try: